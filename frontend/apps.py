@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class FrontEndConfig(AppConfig):
     name = "frontend"
     verbose_name = "front-end"
+
+    def ready(self):
+        """Connect the frontend's signal handlers."""
+        from frontend import signals  # pylint: disable=unused-import
@@ -2,18 +2,27 @@
 
 from tasksapi.constants import (
     CREATED,
+    WAITING,
     PUBLISHED,
     RUNNING,
     SUCCESSFUL,
     FAILED,
     TERMINATED,
+    TIMED_OUT,
 )
 
 # Use this to translate from weekday number to day of week
 DATES_LIST = ["Mon", "Tues", "Weds", "Thurs", "Fri", "Sat", "Sun"]
 
 # States we care about emphasizing. The order here is signicant
-INTERESTING_STATES = (SUCCESSFUL, FAILED, TERMINATED, RUNNING, PUBLISHED)
+INTERESTING_STATES = (
+    SUCCESSFUL,
+    FAILED,
+    TERMINATED,
+    TIMED_OUT,
+    RUNNING,
+    PUBLISHED,
+)
 
 # Colours to represent states we care about.
 STATE_COLOR_DICT = {
@@ -22,15 +31,18 @@ STATE_COLOR_DICT = {
     SUCCESSFUL: "#a3d9ff",
     FAILED: "#ff6978",
     TERMINATED: "#fac8cd",
+    TIMED_OUT: "#ffb26b",
 }
 
 STATE_COLOR_LIGHTER_DICT = {
     CREATED: "#f9ebd1",
+    WAITING: "#e4e0f5",
     PUBLISHED: "#f9ebd1",
     RUNNING: "#b5f4c6",
     SUCCESSFUL: "#bce3ff",
     FAILED: "#ffa8b0",
     TERMINATED: "#f9d9dc",
+    TIMED_OUT: "#ffd2a8",
 }
 
 # Cookie attribute name of selected task class
@@ -39,3 +51,13 @@ SELECTED_TASK_CLASS = "selected_task_class"
 # The default number of days to plot for task instances, provided there
 # are tasks within this range.
 DEFAULT_DAYS_TO_PLOT = 7
+
+# The maximum number of seconds to cache statistics for. Cached
+# statistics are thrown out whenever task instances are saved, but
+# changes made by bulk updates (e.g., from the Celery events monitor)
+# only show up once the cached statistics expire.
+STATS_CACHE_TIMEOUT = 60
+
+# Percentiles of task instance run times and queue waits to show on task
+# type pages
+DURATION_PERCENTILES = (50, 90, 99)
@@ -16,6 +16,15 @@ class BaseTaskInstanceCreateForm(forms.Form):
         label="Queue",
         help_text="The queue to run the task instance on.",
     )
+    priority = forms.IntegerField(
+        required=False,
+        min_value=0,
+        help_text=(
+            "An optional priority for the task instance. Higher priority "
+            "task instances are run first. Defaults to the queue's "
+            "default priority."
+        ),
+    )
     arguments = forms.CharField(
         widget=JSONEditorWidget(),
         help_text="Arguments required by the task type as JSON.",
@@ -0,0 +1,75 @@
+"""Contains signal handlers for the frontend."""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from tasksapi.constants import CONTAINER_TASK, EXECUTABLE_TASK
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.signals import task_instances_changed
+from .views.utils_cache import invalidate_stats
+
+
+@receiver(post_init, sender=ContainerTaskInstance)
+@receiver(post_init, sender=ExecutableTaskInstance)
+def task_instance_init_handler(instance, **_):
+    """Remember what state a task instance was loaded in.
+
+    This looks at the instance's dictionary directly so that instances
+    loaded without their state don't go back to the database for it.
+    """
+    instance._stats_state = instance.__dict__.get("state")
+
+
+def task_instance_change_handler(task_class, instance, created):
+    """Throw out cached statistics involving a changed task instance.
+
+    Statistics only depend on task instances' states (and when they
+    reached them), so saving a task instance without changing its state
+    leaves them be.
+
+    Args:
+        task_class: A string which is either "container" or
+            "executable".
+        instance: The task instance saved or deleted.
+        created: A boolean telling us if the task instance was just
+            created or deleted (cf. modified).
+    """
+    if created or instance.state != instance._stats_state:
+        invalidate_stats(task_class, instance.task_type_id)
+
+    instance._stats_state = instance.state
+
+
+@receiver(post_save, sender=ContainerTaskInstance)
+def container_task_instance_save_handler(instance, created, **_):
+    """Throw out cached container task instance statistics."""
+    task_instance_change_handler(CONTAINER_TASK, instance, created)
+
+
+@receiver(post_delete, sender=ContainerTaskInstance)
+def container_task_instance_delete_handler(instance, **_):
+    """Throw out cached container task instance statistics."""
+    task_instance_change_handler(CONTAINER_TASK, instance, True)
+
+
+@receiver(post_save, sender=ExecutableTaskInstance)
+def executable_task_instance_save_handler(instance, created, **_):
+    """Throw out cached executable task instance statistics."""
+    task_instance_change_handler(EXECUTABLE_TASK, instance, created)
+
+
+@receiver(post_delete, sender=ExecutableTaskInstance)
+def executable_task_instance_delete_handler(instance, **_):
+    """Throw out cached executable task instance statistics."""
+    task_instance_change_handler(EXECUTABLE_TASK, instance, True)
+
+
+@receiver(task_instances_changed)
+def task_instances_bulk_change_handler(sender, task_type_ids, **_):
+    """Throw out cached statistics involving task instances changed in bulk."""
+    if sender is ContainerTaskInstance:
+        task_class = CONTAINER_TASK
+    else:
+        task_class = EXECUTABLE_TASK
+
+    for task_type_id in task_type_ids:
+        invalidate_stats(task_class, task_type_id)
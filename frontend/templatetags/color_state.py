@@ -2,6 +2,7 @@
 
 import json
 from django.template import Library
+from django.utils.safestring import mark_safe
 from frontend.constants import STATE_COLOR_LIGHTER_DICT
 
 
@@ -15,3 +16,13 @@ def color_state(state):
         '<span style="background-color: %s; padding: 0 0.169em;">%s</span>'
         % (STATE_COLOR_LIGHTER_DICT[state], state)
     )
+
+
+@register.simple_tag
+def state_colors_json():
+    """Dump the background colours of each state as JSON.
+
+    This is for scripts which need to colour states like the color_state
+    filter does.
+    """
+    return mark_safe(json.dumps(STATE_COLOR_LIGHTER_DICT))
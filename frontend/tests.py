@@ -1,17 +1,35 @@
 """Contains tests for the front-end."""
 
+from datetime import date, timedelta
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from tasksapi.constants import EXECUTABLE_TASK, FAILED, RUNNING, SUCCESSFUL
+from tasksapi.models import (
+    ContainerTaskInstance,
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+from tasksapi.utils import bulk_update_task_instance_states
+from .views.utils_stats import (
+    get_job_state_data,
+    get_task_type_performance_stats,
+)
 
 ADMIN_USER_USERNAME = "adminuser"
 ADMIN_USER_PASSWORD = "qwertyuiop"
 EXECUTABLE_TASK_INSTANCE_UUID = "aa07248f-fdf3-4d34-8215-0c7b21b892ad"
 CONTAINER_TASK_INSTANCE_UUID = "e7133970-ac3c-4026-adcf-55ee170d4eb3"
 EXECUTABLE_TASK_TYPE_PK = 1
+OTHER_EXECUTABLE_TASK_TYPE_PK = 2
 CONTAINER_TASK_TYPE_PK = 1
 TASK_QUEUE_PK = 1
 TASK_WHITELIST_PK = 1
+USER_PK = 1
 
 
 class FrontendRenderTests(TestCase):
@@ -44,6 +62,10 @@ class FrontendRenderTests(TestCase):
                 "containertaskinstance-detail",
                 kwargs={"uuid": CONTAINER_TASK_INSTANCE_UUID},
             ),
+            reverse(
+                "containertaskinstance-updates",
+                kwargs={"uuid": CONTAINER_TASK_INSTANCE_UUID},
+            ),
             reverse(
                 "containertaskinstance-rename",
                 kwargs={"uuid": CONTAINER_TASK_INSTANCE_UUID},
@@ -78,6 +100,10 @@ class FrontendRenderTests(TestCase):
                 "containertasktype-delete",
                 kwargs={"pk": CONTAINER_TASK_TYPE_PK},
             ),
+            reverse(
+                "containertasktype-stats",
+                kwargs={"pk": CONTAINER_TASK_TYPE_PK},
+            ),
             reverse(
                 "containertasktype-update",
                 kwargs={"pk": CONTAINER_TASK_TYPE_PK},
@@ -88,6 +114,10 @@ class FrontendRenderTests(TestCase):
                 "executabletaskinstance-detail",
                 kwargs={"uuid": EXECUTABLE_TASK_INSTANCE_UUID},
             ),
+            reverse(
+                "executabletaskinstance-updates",
+                kwargs={"uuid": EXECUTABLE_TASK_INSTANCE_UUID},
+            ),
             reverse(
                 "executabletaskinstance-rename",
                 kwargs={"uuid": EXECUTABLE_TASK_INSTANCE_UUID},
@@ -122,6 +152,10 @@ class FrontendRenderTests(TestCase):
                 "executabletasktype-delete",
                 kwargs={"pk": EXECUTABLE_TASK_TYPE_PK},
             ),
+            reverse(
+                "executabletasktype-stats",
+                kwargs={"pk": EXECUTABLE_TASK_TYPE_PK},
+            ),
             reverse(
                 "executabletasktype-update",
                 kwargs={"pk": EXECUTABLE_TASK_TYPE_PK},
@@ -142,3 +176,149 @@ class FrontendRenderTests(TestCase):
         for page in pages_to_get:
             get_response = self.client.get(page)
             self.assertEqual(get_response.status_code, status.HTTP_200_OK)
+
+    def test_bad_updates_requests(self):
+        """Make sure malformed log sizes are rejected."""
+        url = reverse(
+            "containertaskinstance-updates",
+            kwargs={"uuid": CONTAINER_TASK_INSTANCE_UUID},
+        )
+
+        for log_sizes in ("not json", "[]", '{"x": "1"}', '{"x": -5}'):
+            response = self.client.get(url, {"log_sizes": log_sizes})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {"log_sizes": '{"x": 5}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class StatsCacheTests(TestCase):
+    """Make sure statistics are cached and thrown out properly."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Start off with an empty cache."""
+        cache.clear()
+
+    def test_stats_caching(self):
+        """Make sure statistics are recomputed only when necessary."""
+        get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        # Now it's cached
+        with self.assertNumQueries(0):
+            get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        # Different arguments are cached separately
+        with self.assertNumQueries(1):
+            get_job_state_data(
+                task_class=EXECUTABLE_TASK,
+                task_type_pk=EXECUTABLE_TASK_TYPE_PK,
+            )
+
+        # Saving a container task instance doesn't affect executable
+        # task instance statistics
+        container_task_instance = ContainerTaskInstance.objects.get(
+            uuid=CONTAINER_TASK_INSTANCE_UUID
+        )
+        container_task_instance.save()
+
+        with self.assertNumQueries(0):
+            get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        with self.assertNumQueries(2):
+            get_job_state_data(task_class="both")
+
+        # Nor does saving an executable task instance without changing
+        # its state
+        executable_task_instance = ExecutableTaskInstance.objects.get(
+            uuid=EXECUTABLE_TASK_INSTANCE_UUID
+        )
+        executable_task_instance.save()
+
+        with self.assertNumQueries(0):
+            get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        # Statistics for other task types are left alone when an
+        # executable task instance changes state
+        get_job_state_data(
+            task_class=EXECUTABLE_TASK,
+            task_type_pk=OTHER_EXECUTABLE_TASK_TYPE_PK,
+        )
+
+        executable_task_instance.state = FAILED
+        executable_task_instance.save()
+
+        with self.assertNumQueries(0):
+            get_job_state_data(
+                task_class=EXECUTABLE_TASK,
+                task_type_pk=OTHER_EXECUTABLE_TASK_TYPE_PK,
+            )
+
+        # But statistics involving its task type are thrown out
+        with self.assertNumQueries(1):
+            get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        with self.assertNumQueries(1):
+            get_job_state_data(
+                task_class=EXECUTABLE_TASK,
+                task_type_pk=EXECUTABLE_TASK_TYPE_PK,
+            )
+
+        # Including when its state changes in bulk
+        ExecutableTaskInstance.objects.filter(
+            uuid=EXECUTABLE_TASK_INSTANCE_UUID
+        ).update(state=RUNNING)
+        get_job_state_data(task_class=EXECUTABLE_TASK)
+
+        bulk_update_task_instance_states(
+            {EXECUTABLE_TASK_INSTANCE_UUID: SUCCESSFUL}
+        )
+
+        with self.assertNumQueries(1):
+            get_job_state_data(task_class=EXECUTABLE_TASK)
+
+
+class TaskTypePerformanceStatsTests(TestCase):
+    """Make sure task type performance statistics are right."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Start off with an empty cache."""
+        cache.clear()
+
+    def test_performance_stats(self):
+        """Make sure the duration percentiles and failure rates add up."""
+        now = timezone.now()
+
+        # Make task instances which waited 1, 2, and 3 minutes and then
+        # ran for 10, 20, and 30 seconds, respectively
+        for i, state in enumerate([SUCCESSFUL, SUCCESSFUL, FAILED], 1):
+            instance = ExecutableTaskInstance.objects.create(
+                user=User.objects.get(pk=USER_PK),
+                task_type=ExecutableTaskType.objects.get(
+                    pk=EXECUTABLE_TASK_TYPE_PK
+                ),
+                task_queue=TaskQueue.objects.get(pk=TASK_QUEUE_PK),
+            )
+            ExecutableTaskInstance.objects.filter(uuid=instance.uuid).update(
+                state=state,
+                datetime_created=now - timedelta(minutes=i, seconds=10 * i),
+                datetime_started=now - timedelta(seconds=10 * i),
+                datetime_finished=now,
+            )
+
+        stats = get_task_type_performance_stats(
+            task_class=EXECUTABLE_TASK,
+            task_type_pk=EXECUTABLE_TASK_TYPE_PK,
+            start_date=date.today() - timedelta(days=1),
+            end_date=date.today(),
+        )
+
+        self.assertEqual(stats["run_time"][50], timedelta(seconds=20))
+        self.assertEqual(stats["run_time"][90], timedelta(seconds=28))
+        self.assertEqual(stats["queue_wait"][50], timedelta(minutes=2))
+
+        self.assertEqual(sum(row["finished"] for row in stats["failures"]), 3)
+        self.assertEqual(sum(row["failed"] for row in stats["failures"]), 1)
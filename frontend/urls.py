@@ -37,6 +37,11 @@ urlpatterns = [
         views.ContainerTaskInstanceDetail.as_view(),
         name="containertaskinstance-detail",
     ),
+    path(
+        r"containertaskinstances/<uuid:uuid>/updates/",
+        views.ContainerTaskInstanceUpdates.as_view(),
+        name="containertaskinstance-updates",
+    ),
     path(
         r"containertaskinstances/<uuid:uuid>/rename/",
         views.ContainerTaskInstanceRename.as_view(),
@@ -87,6 +92,11 @@ urlpatterns = [
         views.ContainerTaskTypeDelete.as_view(),
         name="containertasktype-delete",
     ),
+    path(
+        r"containertasktypes/<int:pk>/stats/",
+        views.ContainerTaskTypeStats.as_view(),
+        name="containertasktype-stats",
+    ),
     path(
         r"containertasktypes/<int:pk>/update/",
         views.ContainerTaskTypeUpdate.as_view(),
@@ -107,6 +117,11 @@ urlpatterns = [
         views.ExecutableTaskInstanceDetail.as_view(),
         name="executabletaskinstance-detail",
     ),
+    path(
+        r"executabletaskinstances/<uuid:uuid>/updates/",
+        views.ExecutableTaskInstanceUpdates.as_view(),
+        name="executabletaskinstance-updates",
+    ),
     path(
         r"executabletaskinstances/<uuid:uuid>/rename/",
         views.ExecutableTaskInstanceRename.as_view(),
@@ -157,6 +172,11 @@ urlpatterns = [
         views.ExecutableTaskTypeDelete.as_view(),
         name="executabletasktype-delete",
     ),
+    path(
+        r"executabletasktypes/<int:pk>/stats/",
+        views.ExecutableTaskTypeStats.as_view(),
+        name="executabletasktype-stats",
+    ),
     path(
         r"executabletasktypes/<int:pk>/update/",
         views.ExecutableTaskTypeUpdate.as_view(),
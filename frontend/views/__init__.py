@@ -26,12 +26,14 @@ from .queues import (
 from .taskinstances import (
     ContainerTaskInstanceList,
     ContainerTaskInstanceDetail,
+    ContainerTaskInstanceUpdates,
     ContainerTaskInstanceRename,
     ContainerTaskInstanceStateUpdate,
     ContainerTaskInstanceTerminate,
     ContainerTaskInstanceDelete,
     ExecutableTaskInstanceList,
     ExecutableTaskInstanceDetail,
+    ExecutableTaskInstanceUpdates,
     ExecutableTaskInstanceRename,
     ExecutableTaskInstanceStateUpdate,
     ExecutableTaskInstanceTerminate,
@@ -47,11 +49,13 @@ from .tasktypes import (
     ContainerTaskTypeList,
     ContainerTaskTypeCreate,
     ContainerTaskTypeDetail,
+    ContainerTaskTypeStats,
     ContainerTaskTypeUpdate,
     ContainerTaskTypeDelete,
     ExecutableTaskTypeList,
     ExecutableTaskTypeCreate,
     ExecutableTaskTypeDetail,
+    ExecutableTaskTypeStats,
     ExecutableTaskTypeUpdate,
     ExecutableTaskTypeDelete,
 )
@@ -3,24 +3,58 @@
 Views for creating and cloning are in a separate module.
 """
 
-from celery.result import AsyncResult
+import json
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+)
 from django.urls import reverse_lazy
-from django.views.generic import DeleteView, DetailView, ListView, UpdateView
+from django.utils import formats, timezone
+from django.views.generic import (
+    DeleteView,
+    DetailView,
+    ListView,
+    UpdateView,
+    View,
+)
+from django.views.generic.detail import SingleObjectMixin
 from tasksapi.constants import CONTAINER_TASK, EXECUTABLE_TASK
 from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.utils import (
+    TASK_INSTANCE_STATES_MAX_WAIT,
+    wait_for_task_instance_states,
+)
 from .mixins import (
     SetContainerTaskClassCookieMixin,
     SetExecutableTaskClassCookieMixin,
 )
 from .utils import get_context_data_for_chartjs
 from .utils_logs import (
+    get_s3_log_deltas_for_task_instance,
+    get_s3_log_deltas_for_executable_task_instance,
     get_s3_logs_for_task_instance,
     get_s3_logs_for_executable_task_instance,
 )
 
 
+def format_datetime(value):
+    """Format a datetime the same way templates do.
+
+    Args:
+        value: A datetime (or None).
+
+    Returns:
+        A string containing the formatted datetime, or None if no
+        datetime was passed in.
+    """
+    if value is None:
+        return None
+
+    return formats.localize(timezone.localtime(value))
+
+
 class BaseTaskInstanceList(LoginRequiredMixin, ListView):
     """A base view for listing task instances."""
 
@@ -59,7 +93,81 @@ class BaseTaskInstanceDetail(LoginRequiredMixin, DetailView):
 
     def get_logs(self):
         """Get the logs for the task instance."""
-        return get_s3_logs_for_task_instance(str(self.get_object().uuid))
+        return get_s3_logs_for_task_instance(
+            str(self.object.get_results_uuid())
+        )
+
+
+class BaseTaskInstanceUpdates(LoginRequiredMixin, SingleObjectMixin, View):
+    """A base view for sending changes to a task instance's page.
+
+    Detail pages request this repeatedly to update themselves in place,
+    passing in the state and log sizes they're showing. The response is
+    sent once the task instance changes state, or after the requested
+    wait if it doesn't, and contains the task instance's state and
+    whatever's been added to its logs.
+    """
+
+    model = None
+    pk_url_kwarg = "uuid"
+
+    def get(self, request, *args, **kwargs):
+        """Wait for the task instance to change and send its updates."""
+        try:
+            log_sizes = json.loads(request.GET.get("log_sizes", "{}"))
+            wait = min(
+                float(request.GET.get("wait", 0)),
+                TASK_INSTANCE_STATES_MAX_WAIT,
+            )
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        # Log sizes need to map file names to byte counts
+        if not isinstance(log_sizes, dict) or not all(
+            isinstance(size, int) and not isinstance(size, bool) and size >= 0
+            for size in log_sizes.values()
+        ):
+            return HttpResponseBadRequest()
+
+        self.object = taskinstance = self.get_object()
+
+        # Wait for the state to change, if asked to
+        if "state" in request.GET and wait > 0:
+            uuid = str(taskinstance.uuid)
+            wait_for_task_instance_states(
+                [uuid], {uuid: request.GET["state"]}, wait
+            )
+            taskinstance.refresh_from_db()
+
+        # Get log changes in a view-specific manner
+        log_deltas = self.get_log_deltas(log_sizes)
+
+        for log_delta in log_deltas.values():
+            log_delta["last_modified"] = format_datetime(
+                log_delta["last_modified"]
+            )
+
+        return JsonResponse(
+            {
+                "state": taskinstance.state,
+                "datetime_published": format_datetime(
+                    taskinstance.datetime_published
+                ),
+                "datetime_started": format_datetime(
+                    taskinstance.datetime_started
+                ),
+                "datetime_finished": format_datetime(
+                    taskinstance.datetime_finished
+                ),
+                "logs": log_deltas,
+            }
+        )
+
+    def get_log_deltas(self, log_sizes):
+        """Get what's been added to the task instance's logs."""
+        return get_s3_log_deltas_for_task_instance(
+            str(self.object.get_results_uuid()), log_sizes
+        )
 
 
 class BaseTaskInstanceRename(LoginRequiredMixin, UpdateView):
@@ -98,7 +206,7 @@ class BaseTaskInstanceTerminate(LoginRequiredMixin, DetailView):
     def post(self, request, *args, **kwargs):
         """Terminate the task instance and redirect."""
         # This will hang unless you have a Celery hooked up and running
-        AsyncResult(self.get_object().uuid).revoke(terminate=True)
+        self.get_object().terminate()
         return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
@@ -133,6 +241,12 @@ class ContainerTaskInstanceDetail(BaseTaskInstanceDetail):
     template_name = "frontend/containertaskinstance_detail.html"
 
 
+class ContainerTaskInstanceUpdates(BaseTaskInstanceUpdates):
+    """A view for sending changes to a container task instance's page."""
+
+    model = ContainerTaskInstance
+
+
 class ContainerTaskInstanceRename(BaseTaskInstanceRename):
     """A view for renaming a container task instance."""
 
@@ -199,7 +313,19 @@ class ExecutableTaskInstanceDetail(BaseTaskInstanceDetail):
     def get_logs(self):
         """Get the logs for the task instance."""
         return get_s3_logs_for_executable_task_instance(
-            str(self.get_object().uuid)
+            str(self.object.get_results_uuid())
+        )
+
+
+class ExecutableTaskInstanceUpdates(BaseTaskInstanceUpdates):
+    """A view for sending changes to an executable task instance's page."""
+
+    model = ExecutableTaskInstance
+
+    def get_log_deltas(self, log_sizes):
+        """Get what's been added to the task instance's logs."""
+        return get_s3_log_deltas_for_executable_task_instance(
+            str(self.object.get_results_uuid()), log_sizes
         )
 
 
@@ -18,7 +18,7 @@ from tasksapi.models import (
     ExecutableTaskInstance,
     ExecutableTaskType,
 )
-from tasksapi.utils import get_allowed_queues_sorted
+from tasksapi.utils import check_task_queue_limits, get_allowed_queues_sorted
 
 # Match instance models with thet success URL names
 SUCCESS_URLNAMES_DICT = {
@@ -104,6 +104,7 @@ class BaseTaskInstanceBaseCreate(
                 task_type=self.get_tasktype(),
                 task_queue=form.cleaned_data["task_queue"],
                 arguments=form.cleaned_data["arguments"],
+                priority=form.cleaned_data["priority"],
             )
 
             if form.cleaned_data["name"]:
@@ -115,6 +116,21 @@ class BaseTaskInstanceBaseCreate(
             form.add_error(field=None, error=e)
             return self.form_invalid(form)
 
+        # Make sure the queue can take the task instance
+        is_allowed, reason, retry_after = check_task_queue_limits(
+            instance_model=self.task_instance_model,
+            task_queue=this_instance.task_queue,
+            user=self.request.user,
+            task_type=this_instance.task_type,
+        )
+
+        if not is_allowed:
+            if retry_after is not None:
+                reason += ". Try again in %d seconds." % retry_after
+
+            form.add_error(field=None, error=reason)
+            return self.form_invalid(form)
+
         # Save the instance
         this_instance.save()
 
@@ -149,6 +165,9 @@ class BaseTaskInstanceClone(BaseTaskInstanceBaseCreate):
         # Use the same queue as before by default
         form.fields["task_queue"].initial = self.get_object().task_queue
 
+        # And priority
+        form.fields["priority"].initial = self.get_object().priority
+
         # And name
         if self.get_object().name:
             form.fields["name"].initial = self.get_object().name
@@ -21,7 +21,10 @@ from .mixins import (
     TaskTypeFormViewMixin,
     UserFormViewMixin,
 )
-from .utils import get_context_data_for_chartjs
+from .utils import (
+    get_context_data_for_chartjs,
+    get_context_data_for_task_type_performance,
+)
 
 
 class BaseTaskTypeCreate(
@@ -106,6 +109,34 @@ class BaseTaskTypeDetail(LoginRequiredMixin, DetailView):
         raise NotImplementedError
 
 
+class BaseTaskTypeStats(LoginRequiredMixin, DetailView):
+    """A base view for a task type's performance statistics."""
+
+    model = None
+    task_class = None
+    context_object_name = "tasktype"
+    template_name = "frontend/base_tasktype_stats.html"
+
+    def get_context_data(self, **kwargs):
+        """Add the statistics into the context."""
+        context = super().get_context_data(**kwargs)
+
+        context["tasktype_urlname"] = self.get_tasktype_urlname()
+
+        context = {
+            **context,
+            **get_context_data_for_task_type_performance(
+                task_class=self.task_class, task_type_pk=self.object.pk
+            ),
+        }
+
+        return context
+
+    def get_tasktype_urlname(self):
+        """Get the URL name for the task type."""
+        raise NotImplementedError
+
+
 class BaseTaskTypeUpdate(
     LoginRequiredMixin,
     IsAdminOrOwnerOnlyMixin,
@@ -179,6 +210,17 @@ class ContainerTaskTypeDetail(BaseTaskTypeDetail):
         return "containertaskinstance-create"
 
 
+class ContainerTaskTypeStats(BaseTaskTypeStats):
+    """A view for a container task type's performance statistics."""
+
+    model = ContainerTaskType
+    task_class = CONTAINER_TASK
+
+    def get_tasktype_urlname(self):
+        """Get the URL name for the task type."""
+        return "containertasktype-detail"
+
+
 class ContainerTaskTypeUpdate(
     ContainerTaskTypeFormViewMixin, BaseTaskTypeUpdate
 ):
@@ -268,6 +310,17 @@ class ExecutableTaskTypeDetail(BaseTaskTypeDetail):
         return "executabletaskinstance-create"
 
 
+class ExecutableTaskTypeStats(BaseTaskTypeStats):
+    """A view for an executable task type's performance statistics."""
+
+    model = ExecutableTaskType
+    task_class = EXECUTABLE_TASK
+
+    def get_tasktype_urlname(self):
+        """Get the URL name for the task type."""
+        return "executabletasktype-detail"
+
+
 class ExecutableTaskTypeUpdate(
     ExecutableTaskTypeFormViewMixin, BaseTaskTypeUpdate
 ):
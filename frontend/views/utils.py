@@ -2,7 +2,14 @@
 
 from datetime import date, timedelta
 import json
-from .utils_stats import determine_days_to_plot, get_job_state_data
+from frontend.constants import DURATION_PERCENTILES, STATE_COLOR_DICT
+from tasksapi.constants import FAILED
+from .utils_stats import (
+    determine_days_to_plot,
+    get_job_state_data,
+    get_task_type_performance_stats,
+    translate_date_to_string,
+)
 
 
 def translate_num_days_to_plot_title(num_days):
@@ -64,3 +71,77 @@ def get_context_data_for_chartjs(task_class="both", task_type_pk=None):
     context["chart_title"] = translate_num_days_to_plot_title(days_to_plot)
 
     return context
+
+
+def format_duration(duration):
+    """Format a duration rounded to the second.
+
+    Args:
+        duration: A datetime.timedelta to format, or None.
+
+    Returns:
+        A string representation of the duration (e.g., "0:03:27"), or
+        None if the duration is None.
+    """
+    if duration is None:
+        return None
+
+    return str(timedelta(seconds=round(duration.total_seconds())))
+
+
+def get_context_data_for_task_type_performance(task_class, task_type_pk):
+    """Get performance statistics for a task type to pass to the context.
+
+    Args:
+        task_class: A string indicating which task class the task type
+            belongs to. Can be either "container" or "executable".
+        task_type_pk: An integer indicating the primary key of the task
+            type.
+
+    Returns:
+        A dictionary ready to meld with the context dictionary.
+    """
+    context = {}
+
+    # Use the same date range as the state charts
+    days_to_plot = determine_days_to_plot(
+        task_class=task_class, task_type_pk=task_type_pk
+    )
+    today = date.today()
+    other_date = date.today() - timedelta(days=days_to_plot - 1)
+
+    stats = get_task_type_performance_stats(
+        task_class=task_class,
+        task_type_pk=task_type_pk,
+        start_date=other_date,
+        end_date=today,
+    )
+
+    # Add in the duration percentiles
+    context["duration_percentiles"] = [
+        {
+            "percentile": percentile,
+            "run_time": format_duration(stats["run_time"][percentile]),
+            "queue_wait": format_duration(stats["queue_wait"][percentile]),
+        }
+        for percentile in DURATION_PERCENTILES
+    ]
+
+    # And the failure rates for Chart.js
+    context["show_failure_chart"] = bool(stats["failures"])
+    context["failure_labels"] = json.dumps(
+        [
+            translate_date_to_string(row["date"], today=today)
+            for row in stats["failures"]
+        ]
+    )
+    context["failure_rates"] = json.dumps(
+        [
+            round(100 * row["failed"] / row["finished"], 1)
+            for row in stats["failures"]
+        ]
+    )
+    context["failed_color"] = STATE_COLOR_DICT[FAILED]
+    context["stats_title"] = translate_num_days_to_plot_title(days_to_plot)
+
+    return context
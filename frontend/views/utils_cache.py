@@ -0,0 +1,141 @@
+"""Contains helpers for caching statistics.
+
+Statistics are cached under version tokens which change whenever a task
+instance is created, changes state, or is deleted, including in bulk
+(see the signals module, and tasksapi's task_instances_changed signal,
+which bulk queries send in place of save and delete signals). Each task
+type has its own token, as does each task class (for
+statistics over all of its task types), so a task instance changing
+only throws out cached statistics involving its task type or all of its
+task class's task types. Cached statistics also expire after a short
+while, which catches changes made without sending signals.
+"""
+
+from functools import wraps
+import hashlib
+import inspect
+from uuid import uuid4
+from django.core.cache import cache
+from django.utils import timezone
+from frontend.constants import STATS_CACHE_TIMEOUT
+from tasksapi.constants import CONTAINER_TASK, EXECUTABLE_TASK
+
+
+def get_stats_version_key(task_class, task_type_pk=None):
+    """Get the cache key of a statistics version token.
+
+    Args:
+        task_class: A string which is either "container" or
+            "executable".
+        task_type_pk: An optional integer indicating the primary key of
+            a task type. Defaults to None, which means, get the key of
+            the token for statistics over all of the task class's task
+            types.
+
+    Returns:
+        A string containing the cache key.
+    """
+    if task_type_pk is None:
+        return "stats-version-%s" % task_class
+
+    return "stats-version-%s-%s" % (task_class, task_type_pk)
+
+
+def get_stats_versions(task_class, task_type_pk=None):
+    """Get the version tokens for statistics.
+
+    Args:
+        task_class: A string which is either "container", "executable",
+            or "both".
+        task_type_pk: An optional integer indicating the primary key of
+            the task type the statistics are for. Defaults to None,
+            which means, the statistics are for all task types.
+
+    Returns:
+        A list of strings containing the version tokens involved.
+    """
+    if task_class == "both":
+        task_classes = [CONTAINER_TASK, EXECUTABLE_TASK]
+    else:
+        task_classes = [task_class]
+
+    return [
+        cache.get_or_set(
+            get_stats_version_key(this_task_class, task_type_pk),
+            uuid4().hex,
+            None,
+        )
+        for this_task_class in task_classes
+    ]
+
+
+def invalidate_stats(task_class, task_type_pk):
+    """Throw out all cached statistics involving a task type.
+
+    This includes statistics over all of the task type's task class's
+    task types.
+
+    Args:
+        task_class: A string which is either "container" or
+            "executable".
+        task_type_pk: An integer indicating the primary key of the task
+            type.
+    """
+    cache.set_many(
+        {
+            get_stats_version_key(task_class): uuid4().hex,
+            get_stats_version_key(task_class, task_type_pk): uuid4().hex,
+        },
+        None,
+    )
+
+
+def cache_stats(func):
+    """Cache the return values of a statistics function.
+
+    The function needs to take the task class as its task_class argument
+    and the task type's primary key (or None, for all task types) as
+    its task_type_pk argument. Its return values are cached by its
+    arguments, the statistics version tokens involved, and the current
+    time zone (since dates depend on it).
+
+    Args:
+        func: The function to cache.
+
+    Returns:
+        The function wrapped with caching.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        """Look for a cached return value before calling the function."""
+        bound_args = signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+
+        key_parts = [
+            func.__module__,
+            func.__name__,
+            timezone.get_current_timezone_name(),
+        ]
+        key_parts += get_stats_versions(
+            bound_args.arguments["task_class"],
+            bound_args.arguments["task_type_pk"],
+        )
+        key_parts += [
+            "%s=%r" % (name, value)
+            for name, value in sorted(bound_args.arguments.items())
+        ]
+        key = "stats-%s" % (
+            hashlib.md5(":".join(key_parts).encode()).hexdigest()
+        )
+
+        value = cache.get(key)
+
+        if value is None:
+            value = func(*args, **kwargs)
+            cache.set(key, value, STATS_CACHE_TIMEOUT)
+
+        return value
+
+    return wrapper
@@ -18,8 +18,8 @@ def get_s3_logs_for_task_instance(job_uuid):
 
     Returns:
         A dictionary where keys are file names and values are
-        dictionaries containing the date the logs were last modified and
-        the text they contain.
+        dictionaries containing the date the logs were last modified,
+        their size in bytes, and the text they contain.
     """
     # Get out if we don't have any AWS stuff defined for the project
     if (
@@ -45,7 +45,11 @@ def get_s3_logs_for_task_instance(job_uuid):
         file_text = log_file.get()["Body"].read().decode("utf-8")
 
         # Add in this log file to our output
-        sub_dict = {"last_modified": file_last_modified, "text": file_text}
+        sub_dict = {
+            "last_modified": file_last_modified,
+            "size": log_file.size,
+            "text": file_text,
+        }
         log_files_dict[file_name] = sub_dict
 
     return log_files_dict
@@ -64,9 +68,10 @@ def get_s3_logs_for_executable_task_instance(job_uuid):
 
     Returns:
         A dictionary with keys "stdout" and "stderr" where the values
-        are dictionaries containing the date the logs were last modified
-        and the text they contain. However, if logs can't be found, then
-        just return an empty dictionary.
+        are dictionaries containing the date the logs were last
+        modified, their size in bytes, and the text they contain.
+        However, if logs can't be found, then just return an empty
+        dictionary.
     """
     # Call the base function
     these_logs = get_s3_logs_for_task_instance(job_uuid)
@@ -80,3 +85,103 @@ def get_s3_logs_for_executable_task_instance(job_uuid):
     these_logs["stderr"] = these_logs.pop(job_uuid + "-" + "stderr.txt")
 
     return these_logs
+
+
+def get_s3_log_deltas_for_task_instance(job_uuid, log_sizes):
+    """Get what's been added to a task instance's logs.
+
+    Only logs which have changed size are downloaded, and for logs which
+    have grown, only the new bytes are downloaded.
+
+    Args:
+        job_uuid: A string specifying the UUID of the task instance to
+            get logs for.
+        log_sizes: A dictionary mapping the file names of the logs the
+            client already has to their sizes in bytes.
+
+    Returns:
+        A dictionary where keys are the file names of logs which have
+        changed and values are dictionaries containing the date the logs
+        were last modified, their new size, the text to add to them, and
+        whether the text replaces what the client has (which is the case
+        for new logs and logs which have shrunk). If the project doesn't
+        have AWS stuff defined, then this just returns an empty
+        dictionary.
+    """
+    # Get out if we don't have any AWS stuff defined for the project
+    if (
+        not os.environ["AWS_ACCESS_KEY_ID"]
+        or not os.environ["AWS_SECRET_ACCESS_KEY"]
+        or not settings.AWS_LOGS_BUCKET_NAME
+    ):
+        return {}
+
+    s3 = boto3.resource("s3")
+    bucket = s3.Bucket(settings.AWS_LOGS_BUCKET_NAME)
+
+    # Get the files which have changed
+    log_deltas_dict = {}
+
+    for log_file in bucket.objects.filter(Prefix=job_uuid):
+        file_name = log_file.key[len(job_uuid) + 1 :]
+        known_size = log_sizes.get(file_name)
+
+        if known_size == log_file.size:
+            continue
+
+        if known_size is not None and known_size < log_file.size:
+            # Only grab the new part
+            body = log_file.get(Range="bytes=%d-" % known_size)["Body"]
+            replace = False
+        else:
+            body = log_file.get()["Body"]
+            replace = True
+
+        log_deltas_dict[file_name] = {
+            "last_modified": log_file.last_modified,
+            "size": log_file.size,
+            "text": body.read().decode("utf-8", errors="replace"),
+            "replace": replace,
+        }
+
+    return log_deltas_dict
+
+
+def get_s3_log_deltas_for_executable_task_instance(job_uuid, log_sizes):
+    """Get what's been added to an executable task instance's logs.
+
+    This is basically the same thing as
+    get_s3_log_deltas_for_task_instance except it uses the key names
+    "stdout" and "stderr", like get_s3_logs_for_executable_task_instance.
+
+    Args:
+        job_uuid: A string specifying the UUID of the executable task
+            instance to get logs for.
+        log_sizes: A dictionary mapping "stdout" and "stderr" to the
+            sizes in bytes of the logs the client already has.
+
+    Returns:
+        A dictionary like the one get_s3_log_deltas_for_task_instance
+        returns, but with keys "stdout" and "stderr".
+    """
+    file_names = {
+        "stdout": job_uuid + "-" + "stdout.txt",
+        "stderr": job_uuid + "-" + "stderr.txt",
+    }
+
+    # Call the base function with the real file names
+    these_log_deltas = get_s3_log_deltas_for_task_instance(
+        job_uuid,
+        {
+            file_names[name]: size
+            for name, size in log_sizes.items()
+            if name in file_names
+        },
+    )
+
+    # Update the key names
+    return {
+        name: these_log_deltas[file_name]
+        for name, file_name in file_names.items()
+        if file_name in these_log_deltas
+    }
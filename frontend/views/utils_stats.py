@@ -1,14 +1,56 @@
 """Contains helpers for getting and packaging data statistics."""
 
 from datetime import date, timedelta
+from django.db.models import (
+    Aggregate,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+)
+from django.db.models.functions import TruncDate
 from frontend.constants import (
     DATES_LIST,
     DEFAULT_DAYS_TO_PLOT,
+    DURATION_PERCENTILES,
     INTERESTING_STATES,
     STATE_COLOR_DICT,
 )
-from tasksapi.constants import CONTAINER_TASK, CREATED
+from tasksapi.constants import (
+    CONTAINER_TASK,
+    CREATED,
+    SUCCESSFUL,
+    FAILED,
+    TIMED_OUT,
+)
 from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from .utils_cache import cache_stats
+
+
+class PercentileCont(Aggregate):
+    """Postgres' percentile_cont ordered-set aggregate.
+
+    This computes a continuous percentile of an expression (e.g., a
+    duration) in the database.
+    """
+
+    function = "percentile_cont"
+    template = (
+        "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    )
+
+    def __init__(self, expression, fraction, **extra):
+        """Set the percentile to compute.
+
+        Args:
+            expression: The expression to compute the percentile of.
+            fraction: A float between 0 and 1 specifying the percentile
+                to compute.
+            **extra: Extra keyword arguments for Aggregate (e.g.,
+                filter).
+        """
+        super().__init__(expression, fraction=float(fraction), **extra)
 
 
 def translate_date_to_string(
@@ -47,6 +89,7 @@ def translate_date_to_string(
     return this_date.isoformat()
 
 
+@cache_stats
 def determine_days_to_plot(task_class="both", task_type_pk=None):
     """Determine how many days to plot using the "default behavior".
 
@@ -112,6 +155,7 @@ def determine_days_to_plot(task_class="both", task_type_pk=None):
     return delta_days + 7
 
 
+@cache_stats
 def get_job_state_data(
     task_class="both",
     task_type_pk=None,
@@ -172,13 +216,19 @@ def get_job_state_data(
             for x in querysets
         ]
 
+    # Count up the states, letting the database do the grouping
+    state_counts = {state: 0 for state in INTERESTING_STATES}
+
+    for queryset in querysets:
+        for row in (
+            queryset.order_by().values("state").annotate(count=Count("pk"))
+        ):
+            if row["state"] in state_counts:
+                state_counts[row["state"]] += row["count"]
+
     # Now build up the dataset based on state
     dataset = dict()
-
-    dataset["data"] = [
-        sum([x.filter(state=state).count() for x in querysets])
-        for state in INTERESTING_STATES
-    ]
+    dataset["data"] = [state_counts[state] for state in INTERESTING_STATES]
     dataset["backgroundColor"] = [
         STATE_COLOR_DICT[state] for state in INTERESTING_STATES
     ]
@@ -192,6 +242,7 @@ def get_job_state_data(
     return {"labels": labels, "datasets": [dataset], "has_data": has_data}
 
 
+@cache_stats
 def get_job_state_data_date_enumerated(
     task_class="both",
     task_type_pk=None,
@@ -251,6 +302,28 @@ def get_job_state_data_date_enumerated(
 
     my_dates = [start_date + timedelta(i) for i in range(delta.days + 1)]
 
+    # Count up the states per date, letting the database do the
+    # grouping
+    state_counts = {
+        state: {d: 0 for d in my_dates} for state in INTERESTING_STATES
+    }
+
+    for queryset in querysets:
+        rows = (
+            queryset.filter(
+                datetime_created__date__gte=start_date,
+                datetime_created__date__lte=end_date,
+            )
+            .annotate(date=TruncDate("datetime_created"))
+            .order_by()
+            .values("state", "date")
+            .annotate(count=Count("pk"))
+        )
+
+        for row in rows:
+            if row["state"] in state_counts:
+                state_counts[row["state"]][row["date"]] += row["count"]
+
     # Here we have datasets for each state, each of which has data per
     # date
     datasets = []
@@ -259,18 +332,7 @@ def get_job_state_data_date_enumerated(
         dataset = dict()
         dataset["backgroundColor"] = STATE_COLOR_DICT[state]
         dataset["label"] = state
-
-        dataset["data"] = [
-            sum(
-                [
-                    x.filter(state=state)
-                    .filter(datetime_created__date=d)
-                    .count()
-                    for x in querysets
-                ]
-            )
-            for d in my_dates
-        ]
+        dataset["data"] = [state_counts[state][d] for d in my_dates]
 
         datasets.append(dataset)
 
@@ -286,3 +348,101 @@ def get_job_state_data_date_enumerated(
     ]
 
     return {"labels": labels, "datasets": datasets}
+
+
+@cache_stats
+def get_task_type_performance_stats(
+    task_class, task_type_pk, start_date=date.today(), end_date=date.today()
+):
+    """Get performance statistics for a task type's instances.
+
+    All of these are computed in the database. Run times are measured
+    from when task instances start running to when they finish, and
+    queue waits from when they're created to when they start running.
+    Both are only known for task instances which recorded the times
+    they started running. In the arguments below, both start and end
+    date are inclusive.
+
+    Args:
+        task_class: A string indicating which task class the task type
+            belongs to. Can be either "container" or "executable".
+        task_type_pk: An integer indicating the primary key of the task
+            type.
+        start_date: An optional datetime.date indicating the start of
+            the date range. Defaults to today.
+        end_date: An optional datetime.date indicating the end of the
+            date range. Defaults to today.
+
+    Returns:
+        A dictionary containing a dictionary mapping the
+        DURATION_PERCENTILES to datetime.timedeltas (or None, if there
+        weren't any task instances to measure) for each of "run_time"
+        and "queue_wait", and a list of dictionaries containing "date",
+        "finished", and "failed" keys for each date on which task
+        instances finished (failed here includes timing out).
+    """
+    if task_class == CONTAINER_TASK:
+        instance_model = ContainerTaskInstance
+    else:
+        instance_model = ExecutableTaskInstance
+
+    queryset = instance_model.objects.filter(
+        task_type__pk=task_type_pk,
+        datetime_created__date__gte=start_date,
+        datetime_created__date__lte=end_date,
+    ).order_by()
+
+    # Get the duration percentiles in a single query
+    durations = {
+        "run_time": (
+            ExpressionWrapper(
+                F("datetime_finished") - F("datetime_started"),
+                output_field=DurationField(),
+            ),
+            Q(
+                state__in=(SUCCESSFUL, FAILED, TIMED_OUT),
+                datetime_started__isnull=False,
+                datetime_finished__isnull=False,
+            ),
+        ),
+        "queue_wait": (
+            ExpressionWrapper(
+                F("datetime_started") - F("datetime_created"),
+                output_field=DurationField(),
+            ),
+            Q(datetime_started__isnull=False),
+        ),
+    }
+    percentiles = queryset.aggregate(
+        **{
+            "%s_%d"
+            % (name, percentile): PercentileCont(
+                expression, percentile / 100, filter=condition
+            )
+            for name, (expression, condition) in durations.items()
+            for percentile in DURATION_PERCENTILES
+        }
+    )
+
+    # Get the failure rate per date
+    failures = (
+        queryset.filter(state__in=(SUCCESSFUL, FAILED, TIMED_OUT))
+        .annotate(date=TruncDate("datetime_created"))
+        .values("date")
+        .annotate(
+            finished=Count("pk"),
+            failed=Count("pk", filter=Q(state__in=(FAILED, TIMED_OUT))),
+        )
+        .order_by("date")
+    )
+
+    stats = {
+        name: {
+            percentile: percentiles["%s_%d" % (name, percentile)]
+            for percentile in DURATION_PERCENTILES
+        }
+        for name in durations
+    }
+    stats["failures"] = list(failures)
+
+    return stats
@@ -16,6 +16,21 @@ app.conf.update(
     broker_pool_limit=None,
 )
 
+# Declare queues with support for message priorities. Workers only
+# reserve one job at a time per process so that a high priority job
+# isn't stuck behind jobs a worker has already reserved.
+if settings.CELERY_TASK_QUEUE_MAX_PRIORITY:
+    app.conf.update(
+        task_queue_max_priority=settings.CELERY_TASK_QUEUE_MAX_PRIORITY,
+        worker_prefetch_multiplier=1,
+    )
+
+# Have workers (and the Django process that publishes tasks) send task
+# events if the Celery events monitor is in charge of updating task
+# instance states
+if settings.USE_CELERY_EVENTS_MONITOR:
+    app.conf.update(worker_send_task_events=True, task_send_sent_event=True)
+
 # Set SSL setting if we're using SSL
 try:
     app.conf.update(broker_use_ssl=settings.BROKER_USE_SSL)
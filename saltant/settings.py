@@ -54,6 +54,28 @@ if os.environ["RABBITMQ_USES_SSL"] == "True":
 
     BROKER_USE_SSL = {"cert_reqs": ssl.CERT_NONE}
 
+# The maximum message priority the broker's queues support (see
+# https://www.rabbitmq.com/priority.html). 0 disables priorities.
+CELERY_TASK_QUEUE_MAX_PRIORITY = int(
+    os.environ["CELERY_TASK_QUEUE_MAX_PRIORITY"]
+)
+
+if not 0 <= CELERY_TASK_QUEUE_MAX_PRIORITY <= 255:
+    # Bad value in config file!
+    raise ValueError("CELERY_TASK_QUEUE_MAX_PRIORITY must be from 0 to 255")
+
+# Whether task instance states are updated by a Celery events monitor
+# (cf. HTTP requests from workers)
+USE_CELERY_EVENTS_MONITOR_RAW = os.environ["USE_CELERY_EVENTS_MONITOR"]
+
+if USE_CELERY_EVENTS_MONITOR_RAW == "False":
+    USE_CELERY_EVENTS_MONITOR = False
+elif USE_CELERY_EVENTS_MONITOR_RAW == "True":
+    USE_CELERY_EVENTS_MONITOR = True
+else:
+    # Bad value in config file!
+    raise ValueError("USE_CELERY_EVENTS_MONITOR must be True/False")
+
 # Rollbar settings
 PROJECT_USES_ROLLBAR_RAW = os.environ["PROJECT_USES_ROLLBAR"]
 
@@ -152,6 +174,15 @@ if not IM_A_CELERY_WORKER:
         }
     }
 
+    # Cache
+    # https://docs.djangoproject.com/en/2.1/topics/cache/
+    CACHES = {
+        "default": {
+            "BACKEND": os.environ["CACHE_BACKEND"],
+            "LOCATION": os.environ["CACHE_LOCATION"],
+        }
+    }
+
     # User model
     AUTH_USER_MODEL = "tasksapi.User"
 
@@ -255,6 +286,14 @@ if not IM_A_CELERY_WORKER:
     # AWS S3 logs bucket settings
     AWS_LOGS_BUCKET_NAME = os.environ["AWS_LOGS_BUCKET_NAME"]
 
+    # Whether workers upload container task instances' results once
+    # their jobs succeed (see the tasks module)
+    WORKERS_UPLOAD_RESULTS = bool(os.environ["WORKER_RESULTS_BUCKET_NAME"])
+
+    # Where to move old task instances to (see the
+    # archive_task_instances command)
+    TASK_INSTANCE_ARCHIVE_DIR = os.environ["TASK_INSTANCE_ARCHIVE_DIR"]
+
     # Where to redirect to after login and logout
     LOGIN_URL = "login"
     LOGIN_REDIRECT_URL = "home"
@@ -10,6 +10,7 @@ from tasksapi.models import (
     TaskQueue,
     TaskWhitelist,
     User,
+    Worker,
 )
 
 
@@ -87,5 +88,24 @@ class TaskWhitelistAdmin(admin.ModelAdmin):
     list_display = ("name",)
 
 
-# Register custom user
-admin.site.register(User, UserAdmin)
+@admin.register(Worker)
+class WorkerAdmin(admin.ModelAdmin):
+    """Interface modifiers for workers on the admin page."""
+
+    list_display = (
+        "name",
+        "concurrency",
+        "num_active_jobs",
+        "load_average",
+        "datetime_last_heartbeat",
+    )
+
+
+@admin.register(User)
+class SaltantUserAdmin(UserAdmin):
+    """Interface modifiers for users on the admin page."""
+
+    # Show our custom fields along with the default ones
+    fieldsets = UserAdmin.fieldsets + (
+        ("Scheduling", {"fields": ("fair_share_weight",)}),
+    )
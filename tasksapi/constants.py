@@ -2,26 +2,82 @@
 
 # Choices for the task instance's state field. The states are based off
 # of signals provided by Celery (which in fact set the state field):
-# http://docs.celeryproject.org/en/master/userguide/signals.html.
+# http://docs.celeryproject.org/en/master/userguide/signals.html. The
+# exception is the waiting state, which task instances are in while
+# they wait for the task instances they depend on to finish.
 CREATED = "created"
+WAITING = "waiting"
 PUBLISHED = "published"
 RUNNING = "running"
 SUCCESSFUL = "successful"
 FAILED = "failed"
 TERMINATED = "terminated"
+TIMED_OUT = "timed_out"
 
 # Tuple of (key, display_name)s
 STATE_CHOICES = (
     (CREATED, "created"),
+    (WAITING, "waiting"),
     (PUBLISHED, "published"),
     (RUNNING, "running"),
     (SUCCESSFUL, "successful"),
     (FAILED, "failed"),
     (TERMINATED, "terminated"),
+    (TIMED_OUT, "timed out"),
 )
 
 STATE_MAX_LENGTH = 10
 
+# States from which a task instance never moves on
+TERMINAL_STATES = (SUCCESSFUL, FAILED, TERMINATED, TIMED_OUT)
+
+# States which a task instance can move on to from a given state. Note
+# that Celery events for a task instance can arrive out of order (e.g.,
+# the sent event comes from the publisher while the started event comes
+# from a worker), so anything that updates states in bulk uses this to
+# avoid moving task instances backwards.
+PRECEDING_STATES_DICT = {
+    CREATED: (),
+    WAITING: (),
+    PUBLISHED: (CREATED,),
+    RUNNING: (CREATED, PUBLISHED),
+    SUCCESSFUL: (CREATED, PUBLISHED, RUNNING),
+    FAILED: (CREATED, WAITING, PUBLISHED, RUNNING),
+    TERMINATED: (CREATED, WAITING, PUBLISHED, RUNNING),
+    TIMED_OUT: (CREATED, PUBLISHED, RUNNING),
+}
+
+# The task instance fields which record when task instances reached
+# each state
+STATE_DATETIME_FIELDS_DICT = {
+    PUBLISHED: "datetime_published",
+    RUNNING: "datetime_started",
+    SUCCESSFUL: "datetime_finished",
+    FAILED: "datetime_finished",
+    TERMINATED: "datetime_finished",
+    TIMED_OUT: "datetime_finished",
+}
+
+# Classes of failures which jobs can be retried after. Task types choose
+# which of these are worth retrying (see the tasks module for how
+# failures are classified).
+IMAGE_PULL_FAILURE = "image_pull"
+CONNECTION_FAILURE = "connection"
+FILESYSTEM_FAILURE = "filesystem"
+NONZERO_EXIT_FAILURE = "nonzero_exit"
+TIMEOUT_FAILURE = "timeout"
+
+# Tuple of (key, display_name)s
+RETRYABLE_FAILURE_CHOICES = (
+    (IMAGE_PULL_FAILURE, "container image pull failed"),
+    (CONNECTION_FAILURE, "lost connection (e.g., to the Docker daemon)"),
+    (FILESYSTEM_FAILURE, "filesystem error (e.g., on a network share)"),
+    (NONZERO_EXIT_FAILURE, "command exited with a non-zero code"),
+    (TIMEOUT_FAILURE, "job timed out"),
+)
+
+RETRYABLE_FAILURE_MAX_LENGTH = 12
+
 # Choices for container types.
 DOCKER = "docker"
 SINGULARITY = "singularity"
@@ -34,3 +90,16 @@ CONTAINER_TYPE_MAX_LENGTH = 11
 # Choices for class of task
 CONTAINER_TASK = "container"
 EXECUTABLE_TASK = "executable"
+
+# Formats task instances can be exported in
+CSV_EXPORT = "csv"
+JSONL_EXPORT = "jsonl"
+
+# Tuple of (key, display_name)s
+EXPORT_FORMAT_CHOICES = ((CSV_EXPORT, "CSV"), (JSONL_EXPORT, "JSON Lines"))
+
+# How many seconds workers wait between heartbeats, and how many seconds
+# after a worker's last heartbeat it's considered dead (which allows for
+# a couple of heartbeats to go missing)
+WORKER_HEARTBEAT_INTERVAL = 30
+WORKER_HEARTBEAT_TIMEOUT = 3 * WORKER_HEARTBEAT_INTERVAL
@@ -9,6 +9,7 @@ from tasksapi.models import (
     TaskQueue,
     TaskWhitelist,
     User,
+    Worker,
 )
 
 # Common lookups for filter fields
@@ -22,6 +23,8 @@ CHAR_FIELD_LOOKUPS = [
 ]
 BOOLEAN_FIELD_LOOKUPS = ["exact"]
 FOREIGN_KEY_FIELD_LOOKUPS = ["exact", "in"]
+INTEGER_FIELD_LOOKUPS = ["exact", "isnull", "lt", "lte", "gt", "gte"]
+UUID_FIELD_LOOKUPS = ["exact", "isnull"]
 DATE_FIELD_LOOKUPS = ["exact", "year", "range", "lt", "lte", "gt", "gte"]
 
 # Common sets of fields to use or extend
@@ -32,7 +35,11 @@ ABSTRACT_TASK_INSTANCE_FIELDS = {
     "task_type": FOREIGN_KEY_FIELD_LOOKUPS,
     "task_queue": FOREIGN_KEY_FIELD_LOOKUPS,
     "datetime_created": DATE_FIELD_LOOKUPS,
+    "datetime_published": DATE_FIELD_LOOKUPS,
+    "datetime_started": DATE_FIELD_LOOKUPS,
     "datetime_finished": DATE_FIELD_LOOKUPS,
+    "batch_uuid": UUID_FIELD_LOOKUPS,
+    "priority": INTEGER_FIELD_LOOKUPS,
 }
 ABSTRACT_TASK_TYPE_FIELDS = {
     "name": CHAR_FIELD_LOOKUPS,
@@ -40,6 +47,7 @@ ABSTRACT_TASK_TYPE_FIELDS = {
     "user__username": CHAR_FIELD_LOOKUPS,
     "command_to_run": CHAR_FIELD_LOOKUPS,
     "datetime_created": DATE_FIELD_LOOKUPS,
+    "max_runtime": INTEGER_FIELD_LOOKUPS,
 }
 
 
@@ -67,6 +75,7 @@ class ContainerTaskTypeFilter(filters.FilterSet):
         container_fields = {
             "container_image": CHAR_FIELD_LOOKUPS,
             "container_type": CHAR_FIELD_LOOKUPS,
+            "warm_pool_size": INTEGER_FIELD_LOOKUPS,
         }
         fields = {**ABSTRACT_TASK_TYPE_FIELDS, **container_fields}
 
@@ -101,6 +110,14 @@ class TaskQueueFilter(filters.FilterSet):
             "runs_docker_container_tasks": BOOLEAN_FIELD_LOOKUPS,
             "runs_singularity_container_tasks": BOOLEAN_FIELD_LOOKUPS,
             "active": BOOLEAN_FIELD_LOOKUPS,
+            "default_max_runtime": INTEGER_FIELD_LOOKUPS,
+            "max_in_flight": INTEGER_FIELD_LOOKUPS,
+            "max_in_flight_per_task_type": INTEGER_FIELD_LOOKUPS,
+            "max_submissions_per_minute_per_user": INTEGER_FIELD_LOOKUPS,
+            "uses_fair_share": BOOLEAN_FIELD_LOOKUPS,
+            "max_in_flight_per_user": INTEGER_FIELD_LOOKUPS,
+            "max_priority": INTEGER_FIELD_LOOKUPS,
+            "default_priority": INTEGER_FIELD_LOOKUPS,
         }
 
 
@@ -114,3 +131,17 @@ class TaskWhitelistFilter(filters.FilterSet):
             "description": CHAR_FIELD_LOOKUPS,
             "user__username": CHAR_FIELD_LOOKUPS,
         }
+
+
+class WorkerFilter(filters.FilterSet):
+    """A filterset to support queries for worker attributes."""
+
+    class Meta:
+        model = Worker
+        fields = {
+            "name": CHAR_FIELD_LOOKUPS,
+            "task_queues__name": CHAR_FIELD_LOOKUPS,
+            "concurrency": INTEGER_FIELD_LOOKUPS,
+            "num_active_jobs": INTEGER_FIELD_LOOKUPS,
+            "datetime_last_heartbeat": DATE_FIELD_LOOKUPS,
+        }
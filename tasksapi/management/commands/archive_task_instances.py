@@ -0,0 +1,70 @@
+"""Contains a command to archive old task instances.
+
+The task instance tables otherwise grow without bound, slowing down
+everything which reads them. This moves finished task instances older
+than a given age out of the database and into compressed files on disk.
+Run it periodically (e.g., daily with cron).
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.utils import archive_task_instances
+
+
+class Command(BaseCommand):
+    """Archive old finished task instances."""
+
+    help = (
+        "Move finished task instances older than a given age out of the "
+        "database and into gzip-compressed JSON Lines files."
+    )
+
+    def add_arguments(self, parser):
+        """Add options for what to archive and where to."""
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help=(
+                "Archive finished task instances created more than this "
+                "many days ago. Defaults to 90."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help=(
+                "The maximum number of task instances to archive per "
+                "file and transaction. Defaults to 1000."
+            ),
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.TASK_INSTANCE_ARCHIVE_DIR,
+            help=(
+                "The directory to write archive files to. Defaults to "
+                "the TASK_INSTANCE_ARCHIVE_DIR setting."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Archive task instances of each class."""
+        created_before = timezone.now() - timedelta(days=options["days"])
+
+        for instance_model in (ContainerTaskInstance, ExecutableTaskInstance):
+            num_archived = archive_task_instances(
+                instance_model=instance_model,
+                created_before=created_before,
+                archive_dir=options["archive_dir"],
+                batch_size=options["batch_size"],
+            )
+
+            if options["verbosity"] > 0:
+                self.stdout.write(
+                    "Archived %d %s"
+                    % (num_archived, instance_model._meta.verbose_name_plural)
+                )
@@ -0,0 +1,61 @@
+"""Contains a command to release task instances held back by queues.
+
+Task instances on queues using fair-share scheduling aren't published
+when they're created. Instead, this single long-running process
+periodically publishes them a few at a time per user, so that the
+message broker only ever holds a bounded number of each user's jobs and
+one user submitting lots of jobs can't starve everyone else.
+
+It also publishes task instances on other queues with in-flight limits
+whose dependencies succeeded while the queue was full.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from tasksapi.models import TaskQueue
+from tasksapi.models.dependencies import release_held_task_instances
+from tasksapi.utils import dispatch_fair_share_task_instances
+
+
+class Command(BaseCommand):
+    """Publish task instances held back by queues."""
+
+    help = (
+        "Publish task instances held by queues using fair-share "
+        "scheduling or by queues' in-flight limits. Runs until "
+        "interrupted."
+    )
+
+    def add_arguments(self, parser):
+        """Add an option for how often to dispatch."""
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help=(
+                "The number of seconds to wait between dispatches. "
+                "Defaults to 1."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Dispatch task instances until interrupted."""
+        while True:
+            for task_queue in TaskQueue.objects.filter(uses_fair_share=True):
+                num_published = dispatch_fair_share_task_instances(task_queue)
+
+                if num_published and options["verbosity"] > 1:
+                    self.stdout.write(
+                        "Published %d task instances on %s"
+                        % (num_published, task_queue.name)
+                    )
+
+            for task_queue in TaskQueue.objects.filter(
+                Q(max_in_flight__isnull=False)
+                | Q(max_in_flight_per_task_type__isnull=False),
+                uses_fair_share=False,
+            ):
+                release_held_task_instances(task_queue)
+
+            time.sleep(options["interval"])
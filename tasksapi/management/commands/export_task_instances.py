@@ -0,0 +1,115 @@
+"""Contains a command to export task instances as CSV or JSON Lines.
+
+This is the same as the API's task instance export endpoints, but skips
+the web server, which is handy for very large exports.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from tasksapi.constants import (
+    CONTAINER_TASK,
+    EXECUTABLE_TASK,
+    EXPORT_FORMAT_CHOICES,
+    JSONL_EXPORT,
+)
+from tasksapi.filters import (
+    ContainerTaskInstanceFilter,
+    ExecutableTaskInstanceFilter,
+)
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.utils import export_task_instances
+
+# The task instance models and filtersets for each task class
+TASK_CLASS_MODELS_DICT = {
+    CONTAINER_TASK: (ContainerTaskInstance, ContainerTaskInstanceFilter),
+    EXECUTABLE_TASK: (ExecutableTaskInstance, ExecutableTaskInstanceFilter),
+}
+
+
+class Command(BaseCommand):
+    """Export task instances."""
+
+    help = (
+        "Export task instances matching the API's task instance filters "
+        "as CSV or JSON Lines."
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments for what to export and how."""
+        parser.add_argument(
+            "task_class",
+            choices=list(TASK_CLASS_MODELS_DICT),
+            help="The class of task instances to export.",
+        )
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            choices=[
+                export_format for export_format, _ in EXPORT_FORMAT_CHOICES
+            ],
+            default=JSONL_EXPORT,
+            help="The format to export in. Defaults to jsonl.",
+        )
+        parser.add_argument(
+            "--filter",
+            dest="filters",
+            action="append",
+            default=[],
+            metavar="LOOKUP=VALUE",
+            help=(
+                "A filter to apply, as used in the API's task instance "
+                "lists (e.g., state=successful or "
+                "datetime_created__gte=2018-08-16). Can be given "
+                "multiple times."
+            ),
+        )
+        parser.add_argument(
+            "--output",
+            help=(
+                "The file to write the export to. Defaults to standard "
+                "output."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Export the task instances."""
+        instance_model, filterset_class = TASK_CLASS_MODELS_DICT[
+            options["task_class"]
+        ]
+
+        # Filter the task instances like the API would
+        filter_data = {}
+
+        for this_filter in options["filters"]:
+            lookup, separator, value = this_filter.partition("=")
+
+            if not separator:
+                raise CommandError(
+                    "'%s' isn't of the form LOOKUP=VALUE!" % this_filter
+                )
+
+            if lookup not in filterset_class.base_filters:
+                raise CommandError("'%s' isn't a valid filter!" % lookup)
+
+            filter_data[lookup] = value
+
+        filterset = filterset_class(
+            data=filter_data, queryset=instance_model.objects.all()
+        )
+
+        if not filterset.is_valid():
+            raise CommandError(str(filterset.errors))
+
+        # Write out the export
+        export = export_task_instances(
+            queryset=filterset.qs, export_format=options["export_format"]
+        )
+
+        if options["output"] is None:
+            for chunk in export:
+                self.stdout.write(chunk, ending="")
+
+            return
+
+        with open(options["output"], "w", newline="") as output_file:
+            for chunk in export:
+                output_file.write(chunk)
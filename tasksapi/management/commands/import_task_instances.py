@@ -0,0 +1,102 @@
+"""Contains a command to import task instances from JSON Lines.
+
+This is the same as the API's task instance import endpoints, but skips
+the web server (and queue limits), which is handy for replaying exports
+or archives of lots of task instances.
+"""
+
+import gzip
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from tasksapi.constants import CONTAINER_TASK, EXECUTABLE_TASK
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance, User
+from tasksapi.utils import (
+    TASK_INSTANCE_IMPORT_CHUNK_SIZE,
+    import_task_instances,
+)
+
+# The task instance models for each task class
+TASK_CLASS_MODELS_DICT = {
+    CONTAINER_TASK: ContainerTaskInstance,
+    EXECUTABLE_TASK: ExecutableTaskInstance,
+}
+
+
+class Command(BaseCommand):
+    """Import task instances."""
+
+    help = (
+        "Create and publish task instances from JSON Lines, such as "
+        "exports or archives of task instances."
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments for what to import and how."""
+        parser.add_argument(
+            "task_class",
+            choices=list(TASK_CLASS_MODELS_DICT),
+            help="The class of task instances to import.",
+        )
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="The username of the user to create the task instances as.",
+        )
+        parser.add_argument(
+            "--input",
+            help=(
+                "The file to import. Files ending in .gz (e.g., archive "
+                "files) are decompressed. Defaults to standard input."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=TASK_INSTANCE_IMPORT_CHUNK_SIZE,
+            help=(
+                "The number of task instances to create at a time. "
+                "Defaults to %d." % TASK_INSTANCE_IMPORT_CHUNK_SIZE
+            ),
+        )
+        parser.add_argument(
+            "--enforce-queue-limits",
+            action="store_true",
+            help="Skip task instances which their queue's limits don't allow.",
+        )
+
+    def handle(self, *args, **options):
+        """Import the task instances."""
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError("User %s doesn't exist" % options["user"])
+
+        if options["chunk_size"] < 1:
+            raise CommandError("The chunk size must be positive!")
+
+        if options["input"] is None:
+            input_file = sys.stdin
+        elif options["input"].endswith(".gz"):
+            input_file = gzip.open(options["input"], "rt")
+        else:
+            input_file = open(options["input"])
+
+        try:
+            num_created, errors = import_task_instances(
+                instance_model=TASK_CLASS_MODELS_DICT[options["task_class"]],
+                user=user,
+                lines=input_file,
+                chunk_size=options["chunk_size"],
+                enforce_queue_limits=options["enforce_queue_limits"],
+            )
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+
+        for error in errors:
+            self.stderr.write(
+                "Skipped line %d: %s" % (error["line"], error["reason"])
+            )
+
+        if options["verbosity"] > 0:
+            self.stdout.write("Imported %d task instances" % num_created)
@@ -0,0 +1,283 @@
+"""Contains a command to update task instance states from Celery events.
+
+This is an alternative to having each worker send an HTTP request to the
+saltant server for every state change of every task instance. Instead,
+workers (and the Django process publishing tasks) send Celery events to
+the message broker, and this single long-running process consumes them
+and writes the resulting state changes to the database in bulk.
+
+To use this, set USE_CELERY_EVENTS_MONITOR=True in the .env files of
+both the saltant server and its workers.
+"""
+
+from datetime import datetime
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from saltant.celery import app
+from tasksapi.constants import (
+    PUBLISHED,
+    RUNNING,
+    SUCCESSFUL,
+    FAILED,
+    TERMINATED,
+    TIMED_OUT,
+)
+from tasksapi.tasks import (
+    BATCH_STATES_EVENT_TYPE,
+    RESULTS_EVENT_TYPE,
+    RETRY_EVENT_TYPE,
+    WORKER_HEARTBEAT_EVENT_TYPE,
+    JobTimeout,
+)
+from tasksapi.utils import (
+    bulk_update_task_instance_states,
+    record_task_instance_results,
+    record_task_instance_retry,
+    record_worker_heartbeat,
+)
+
+# Map the Celery task event types we care about to task instance states
+# (see
+# http://docs.celeryproject.org/en/latest/userguide/monitoring.html#task-events)
+EVENT_TYPE_STATE_DICT = {
+    "task-sent": PUBLISHED,
+    "task-started": RUNNING,
+    "task-succeeded": SUCCESSFUL,
+    "task-failed": FAILED,
+    "task-revoked": TERMINATED,
+}
+
+# The name of the queue the monitor consumes events from
+MONITOR_NODE_ID = "saltant-task-events-monitor"
+
+
+def record_worker_heartbeat_event(event):
+    """Record a worker heartbeat sent as a Celery event.
+
+    Args:
+        event: A dictionary containing a Celery event sent by a worker
+            (see the tasks module).
+    """
+    record_worker_heartbeat(
+        name=event["name"],
+        task_queue_names=event["task_queues"],
+        concurrency=event["concurrency"],
+        num_active_jobs=event["num_active_jobs"],
+        load_average=event.get("load_average"),
+    )
+
+
+def record_results_event(event):
+    """Record a task instance's uploaded results sent as a Celery event.
+
+    Args:
+        event: A dictionary containing a Celery event sent by a worker
+            which uploaded a job's results (see the tasks module).
+    """
+    record_task_instance_results(
+        uuid=event["uuid"],
+        location=event["location"],
+        manifest=event["manifest"],
+    )
+
+
+class TaskStateBuffer:
+    """Buffers task instance state changes and writes them in bulk."""
+
+    def __init__(self, batch_size, flush_interval, stdout=None):
+        """Initialize an empty buffer.
+
+        Args:
+            batch_size: An integer specifying how many task instances
+                can have buffered state changes before the buffer is
+                flushed.
+            flush_interval: A float specifying the maximum number of
+                seconds to hold on to buffered state changes.
+            stdout: An optional output stream to log flushes to.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stdout = stdout
+
+        # Maps task instance UUIDs to tuples containing their most
+        # recent state and the timestamp of the event that reported it
+        self.buffer = {}
+
+        # Maps task instance UUIDs to dictionaries mapping each state
+        # they've reached to the timestamp of the event that reported
+        # it, so that we know when they reached states they've already
+        # moved on from by the time the buffer is flushed
+        self.state_timestamps = {}
+        self.last_flush_time = time.time()
+
+    def record_event(self, event):
+        """Record the state change described by a Celery task event.
+
+        Args:
+            event: A dictionary containing a Celery task event.
+        """
+        state = EVENT_TYPE_STATE_DICT[event["type"]]
+
+        # Jobs which ran out of time fail with a JobTimeout exception,
+        # which Celery reports as a string containing its repr
+        if state == FAILED and event.get("exception", "").startswith(
+            JobTimeout.__name__ + "("
+        ):
+            state = TIMED_OUT
+
+        self.record_state(
+            event["uuid"], state, event.get("timestamp", time.time())
+        )
+
+    def record_batch_event(self, event):
+        """Record the state changes described by a batch states event.
+
+        Args:
+            event: A dictionary containing a Celery event sent by a
+                batch of task instances (see the tasks module).
+        """
+        timestamp = event.get("timestamp", time.time())
+
+        for uuid, state in event["states"].items():
+            self.record_state(uuid, state, timestamp)
+
+    def record_state(self, uuid, state, timestamp):
+        """Record a task instance's state change.
+
+        Args:
+            uuid: A string containing the UUID of the task instance.
+            state: A string which must be one of the state constants.
+            timestamp: A float containing the time of the state change.
+        """
+        # Only keep the most recent state change for each task instance
+        if uuid not in self.buffer or self.buffer[uuid][1] <= timestamp:
+            self.buffer[uuid] = (state, timestamp)
+
+        self.state_timestamps.setdefault(uuid, {})[state] = timestamp
+
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def record_retry_event(self, event):
+        """Record the retry of a task instance's job.
+
+        Retries move task instances back to published, which bulk state
+        updates never do, so they're recorded right away, after flushing
+        whatever state changes led up to them.
+
+        Args:
+            event: A dictionary containing a Celery event sent by a
+                worker retrying a job (see the tasks module).
+        """
+        self.flush()
+
+        record_task_instance_retry(
+            uuid=event["uuid"],
+            failure=event["failure"],
+            error=event["error"],
+            retry_delay=event["retry_delay"],
+            failure_datetime=datetime.fromtimestamp(
+                event.get("timestamp", time.time()), tz=timezone.utc
+            ),
+        )
+
+    def flush_if_due(self):
+        """Flush the buffer if it's been held for long enough."""
+        if time.time() - self.last_flush_time >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered state changes to the database."""
+        self.last_flush_time = time.time()
+
+        if not self.buffer:
+            return
+
+        num_updated = bulk_update_task_instance_states(
+            uuid_states={
+                uuid: state for uuid, (state, _) in self.buffer.items()
+            },
+            uuid_state_datetimes={
+                uuid: {
+                    state: datetime.fromtimestamp(timestamp, tz=timezone.utc)
+                    for state, timestamp in state_timestamps.items()
+                }
+                for uuid, state_timestamps in self.state_timestamps.items()
+            },
+        )
+
+        if self.stdout is not None:
+            self.stdout.write(
+                "Updated %d of %d task instances"
+                % (num_updated, len(self.buffer))
+            )
+
+        self.buffer = {}
+        self.state_timestamps = {}
+
+
+class Command(BaseCommand):
+    """Update task instance states from Celery events."""
+
+    help = (
+        "Consume Celery task events and update task instance states in "
+        "bulk. Runs until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        """Add options for batching state updates."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help=(
+                "The maximum number of task instances to buffer state "
+                "changes for before writing them. Defaults to 500."
+            ),
+        )
+        parser.add_argument(
+            "--flush-interval",
+            type=float,
+            default=1.0,
+            help=(
+                "The maximum number of seconds to buffer state changes "
+                "for before writing them. Defaults to 1."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Consume events until interrupted."""
+        state_buffer = TaskStateBuffer(
+            batch_size=options["batch_size"],
+            flush_interval=options["flush_interval"],
+            stdout=self.stdout if options["verbosity"] > 1 else None,
+        )
+        handlers = {
+            event_type: state_buffer.record_event
+            for event_type in EVENT_TYPE_STATE_DICT
+        }
+        handlers[BATCH_STATES_EVENT_TYPE] = state_buffer.record_batch_event
+        handlers[RETRY_EVENT_TYPE] = state_buffer.record_retry_event
+        handlers[RESULTS_EVENT_TYPE] = record_results_event
+        handlers[WORKER_HEARTBEAT_EVENT_TYPE] = record_worker_heartbeat_event
+
+        with app.connection() as connection:
+            receiver = app.events.Receiver(
+                connection,
+                handlers=handlers,
+                routing_key="task.#",
+                node_id=MONITOR_NODE_ID,
+            )
+
+            # The receiver polls the broker about once a second whether
+            # or not there are any events, so use that to make sure
+            # nothing sits in the buffer for too long
+            receiver.on_iteration = state_buffer.flush_if_due
+
+            try:
+                for _ in receiver.itercapture(limit=None, timeout=None):
+                    pass
+            finally:
+                # Don't lose anything we've already received
+                state_buffer.flush()
@@ -0,0 +1,149 @@
+"""Contains a command to fail task instances whose jobs have been lost.
+
+When a worker dies partway through a job, or the state updates it sends
+are lost, the job's task instance stays published or running forever,
+counting against its queue's limits. This asks the workers which jobs
+they have and fails stale task instances whose jobs none of them have.
+Nothing is reaped unless every live worker (see the Worker model)
+replies in full.
+Run it periodically (e.g., every few minutes with cron).
+"""
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from tasksapi.constants import PUBLISHED, RUNNING
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.utils import (
+    TASK_INSTANCE_REAP_BATCH_SIZE,
+    get_worker_job_ids,
+    reap_task_instances,
+    resubmit_task_instances,
+)
+
+
+class Command(BaseCommand):
+    """Fail task instances whose jobs have been lost."""
+
+    help = (
+        "Fail published or running task instances whose jobs no worker "
+        "has, and optionally resubmit them."
+    )
+
+    def add_arguments(self, parser):
+        """Add options for what to reap and how."""
+        parser.add_argument(
+            "--running-minutes",
+            type=float,
+            default=10,
+            help=(
+                "Look at running task instances which haven't changed "
+                "in this many minutes. Defaults to 10."
+            ),
+        )
+        parser.add_argument(
+            "--published-minutes",
+            type=float,
+            help=(
+                "Look at published task instances which haven't changed "
+                "in this many minutes. Jobs waiting in the message "
+                "broker don't belong to any worker yet, so make this "
+                "comfortably longer than jobs ever wait. By default, "
+                "published task instances aren't looked at."
+            ),
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10,
+            help=(
+                "The number of seconds to wait for workers to say which "
+                "jobs they have. Defaults to 10."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TASK_INSTANCE_REAP_BATCH_SIZE,
+            help=(
+                "The number of task instances to look at at a time. "
+                "Defaults to %d." % TASK_INSTANCE_REAP_BATCH_SIZE
+            ),
+        )
+        parser.add_argument(
+            "--resubmit",
+            action="store_true",
+            help="Clone failed task instances to run them again.",
+        )
+
+    def handle(self, *args, **options):
+        """Reap task instances of each class."""
+        # Ask the workers what they have before looking at the task
+        # instances, so that jobs they pick up in the meantime aren't
+        # mistaken for lost ones
+        now = timezone.now()
+        worker_job_ids, unreplied_workers = get_worker_job_ids(
+            options["timeout"]
+        )
+
+        # If a worker didn't answer, we can't tell its jobs from lost
+        # ones
+        if unreplied_workers:
+            raise CommandError(
+                "%s didn't reply, so nothing was reaped"
+                % ", ".join(unreplied_workers)
+            )
+
+        # If nobody answered, we can't tell lost jobs from a broken
+        # connection to the workers
+        if worker_job_ids is None:
+            raise CommandError("No workers replied, so nothing was reaped")
+
+        state_stale_befores = [
+            (RUNNING, now - timedelta(minutes=options["running_minutes"]))
+        ]
+
+        if options["published_minutes"] is not None:
+            state_stale_befores.append(
+                (
+                    PUBLISHED,
+                    now - timedelta(minutes=options["published_minutes"]),
+                )
+            )
+
+        for instance_model in (ContainerTaskInstance, ExecutableTaskInstance):
+            failed_uuids = []
+
+            for state, stale_before in state_stale_befores:
+                failed_uuids += reap_task_instances(
+                    instance_model=instance_model,
+                    state=state,
+                    stale_before=stale_before,
+                    worker_job_ids=worker_job_ids,
+                    batch_size=options["batch_size"],
+                )
+
+            if options["verbosity"] > 0:
+                self.stdout.write(
+                    "Failed %d lost %s"
+                    % (
+                        len(failed_uuids),
+                        instance_model._meta.verbose_name_plural,
+                    )
+                )
+
+            if not options["resubmit"] or not failed_uuids:
+                continue
+
+            clones, errors = resubmit_task_instances(
+                instance_model=instance_model, uuids=failed_uuids
+            )
+
+            for error in errors:
+                self.stderr.write(error)
+
+            if options["verbosity"] > 0:
+                self.stdout.write(
+                    "Resubmitted %d %s"
+                    % (len(clones), instance_model._meta.verbose_name_plural)
+                )
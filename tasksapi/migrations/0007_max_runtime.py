@@ -0,0 +1,38 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasksapi', '0006_auto_20181217_1212'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='containertasktype',
+            name='max_runtime',
+            field=models.PositiveIntegerField(blank=True, default=None, help_text="The maximum number of seconds an instance can run for before it's stopped and marked as timed out. Specify null to use the default of the queue the instance runs on. Defaults to null.", null=True),
+        ),
+        migrations.AddField(
+            model_name='executabletasktype',
+            name='max_runtime',
+            field=models.PositiveIntegerField(blank=True, default=None, help_text="The maximum number of seconds an instance can run for before it's stopped and marked as timed out. Specify null to use the default of the queue the instance runs on. Defaults to null.", null=True),
+        ),
+        migrations.AddField(
+            model_name='taskqueue',
+            name='default_max_runtime',
+            field=models.PositiveIntegerField(blank=True, default=None, help_text="The maximum number of seconds instances of task types which don't specify their own maximum runtime can run for on this queue. Specify null for no limit. Defaults to null.", null=True),
+        ),
+        migrations.AlterField(
+            model_name='containertaskinstance',
+            name='state',
+            field=models.CharField(choices=[('created', 'created'), ('published', 'published'), ('running', 'running'), ('successful', 'successful'), ('failed', 'failed'), ('terminated', 'terminated'), ('timed_out', 'timed out')], default='created', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='executabletaskinstance',
+            name='state',
+            field=models.CharField(choices=[('created', 'created'), ('published', 'published'), ('running', 'running'), ('successful', 'successful'), ('failed', 'failed'), ('terminated', 'terminated'), ('timed_out', 'timed out')], default='created', max_length=10),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasksapi', '0007_max_runtime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='containertasktype',
+            name='warm_pool_max_jobs_per_container',
+            field=models.PositiveIntegerField(blank=True, default=100, help_text="The number of instances a warm container runs before it's replaced. Warm containers are also replaced after any instance fails in them. Defaults to 100.", verbose_name='warm pool max jobs per container'),
+        ),
+        migrations.AddField(
+            model_name='containertasktype',
+            name='warm_pool_size',
+            field=models.PositiveIntegerField(blank=True, default=0, help_text='The number of idle containers each worker process keeps started for running instances of this task type, which are run by exec-ing their command in one of these containers. Requires a POSIX shell in the container. Only supported for Docker containers. Specify 0 to start a fresh container for each instance. Defaults to 0.'),
+        ),
+    ]
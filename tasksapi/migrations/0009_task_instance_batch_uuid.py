@@ -0,0 +1,23 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasksapi', '0008_container_task_type_warm_pool'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='containertaskinstance',
+            name='batch_uuid',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, help_text='The UUID of the batch the instance was created in, if any. All instances in a batch run in a single job.', null=True, verbose_name='batch UUID'),
+        ),
+        migrations.AddField(
+            model_name='executabletaskinstance',
+            name='batch_uuid',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, help_text='The UUID of the batch the instance was created in, if any. All instances in a batch run in a single job.', null=True, verbose_name='batch UUID'),
+        ),
+    ]
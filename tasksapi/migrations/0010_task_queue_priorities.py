@@ -0,0 +1,49 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0009_task_instance_batch_uuid")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="priority",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=None,
+                help_text="The priority of the instance. Higher priority instances are run first. This can be at most the maximum priority of the instance's queue. Specify null to use the queue's default priority. Defaults to null.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="priority",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=None,
+                help_text="The priority of the instance. Higher priority instances are run first. This can be at most the maximum priority of the instance's queue. Specify null to use the queue's default priority. Defaults to null.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="default_priority",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=0,
+                help_text="The priority of task instances on this queue which don't specify one. Defaults to 0.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="max_priority",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=0,
+                help_text="The highest priority task instances on this queue can have. Higher priority task instances are run first. Defaults to 0.",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:37
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0010_task_queue_priorities")]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskqueue",
+            name="max_in_flight_per_user",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=10,
+                help_text="With fair-share scheduling, how many task instances each user can have published or running on this queue at once. This is multiplied by the user's fair-share weight. Defaults to 10.",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="uses_fair_share",
+            field=models.BooleanField(
+                blank=True,
+                default=False,
+                help_text="A boolean specifying whether task instances on this queue are held by saltant and released to the queue a few at a time per user, so that no one user can starve the others. Requires the task instance dispatcher to be running. Defaults to False.",
+                verbose_name="uses fair-share scheduling",
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="fair_share_weight",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="How many times more task instances the user can have published at once on queues using fair-share scheduling than a user with weight 1. Defaults to 1.",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
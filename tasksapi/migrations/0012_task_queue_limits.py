@@ -0,0 +1,81 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0011_fair_share_scheduling")]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskqueue",
+            name="max_in_flight",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="The maximum number of task instances which can be published or running on this queue at once. Specify null for no limit. Defaults to null.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="max_in_flight_per_task_type",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="The maximum number of instances of any one task type which can be published or running on this queue at once. Specify null for no limit. Defaults to null.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="max_submissions_per_minute_per_user",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="The maximum number of task instances each user can create on this queue in any one minute. Specify null for no limit. Defaults to null.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=models.Index(
+                fields=["task_queue", "state"],
+                name="ctaskinst_queue_state_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=models.Index(
+                fields=["task_queue", "user", "datetime_created"],
+                name="ctaskinst_queue_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=models.Index(
+                fields=["task_type", "state"], name="ctaskinst_type_state_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=models.Index(
+                fields=["task_queue", "state"],
+                name="etaskinst_queue_state_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=models.Index(
+                fields=["task_queue", "user", "datetime_created"],
+                name="etaskinst_queue_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=models.Index(
+                fields=["task_type", "state"], name="etaskinst_type_state_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:48
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0012_task_queue_limits")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="depends_on",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(),
+                blank=True,
+                default=list,
+                help_text="A JSON array of the UUIDs of task instances (of either class) which need to succeed before this instance is run. If any of them don't succeed, this instance fails. Defaults to [].",
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="depends_on",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(),
+                blank=True,
+                default=list,
+                help_text="A JSON array of the UUIDs of task instances (of either class) which need to succeed before this instance is run. If any of them don't succeed, this instance fails. Defaults to [].",
+                size=None,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="containertaskinstance",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("created", "created"),
+                    ("waiting", "waiting"),
+                    ("published", "published"),
+                    ("running", "running"),
+                    ("successful", "successful"),
+                    ("failed", "failed"),
+                    ("terminated", "terminated"),
+                    ("timed_out", "timed out"),
+                ],
+                default="created",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="executabletaskinstance",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("created", "created"),
+                    ("waiting", "waiting"),
+                    ("published", "published"),
+                    ("running", "running"),
+                    ("successful", "successful"),
+                    ("failed", "failed"),
+                    ("terminated", "terminated"),
+                    ("timed_out", "timed out"),
+                ],
+                default="created",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["depends_on"], name="ctaskinst_depends_on_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["depends_on"], name="etaskinst_depends_on_idx"
+            ),
+        ),
+    ]
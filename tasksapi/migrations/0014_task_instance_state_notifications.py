@@ -0,0 +1,45 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:52
+
+from django.db import migrations
+
+# Announce task instance state changes on a Postgres channel so that
+# clients waiting on them can be woken up right away, no matter which
+# code path changed the state
+NOTIFY_FUNCTION_SQL = """
+CREATE FUNCTION tasksapi_notify_task_instance_state() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('saltant_task_instance_states', NEW.uuid::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+NOTIFY_TRIGGER_SQL = """
+CREATE TRIGGER {name}
+AFTER UPDATE OF state ON {table}
+FOR EACH ROW WHEN (OLD.state IS DISTINCT FROM NEW.state)
+EXECUTE PROCEDURE tasksapi_notify_task_instance_state();
+"""
+
+TABLE_TRIGGER_NAMES = (
+    ("tasksapi_containertaskinstance", "ctaskinst_state_notify"),
+    ("tasksapi_executabletaskinstance", "etaskinst_state_notify"),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0013_task_instance_dependencies")]
+
+    operations = [
+        migrations.RunSQL(
+            NOTIFY_FUNCTION_SQL,
+            "DROP FUNCTION tasksapi_notify_task_instance_state();",
+        )
+    ] + [
+        migrations.RunSQL(
+            NOTIFY_TRIGGER_SQL.format(name=name, table=table),
+            "DROP TRIGGER {name} ON {table};".format(name=name, table=table),
+        )
+        for table, name in TABLE_TRIGGER_NAMES
+    ]
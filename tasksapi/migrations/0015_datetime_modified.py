@@ -0,0 +1,56 @@
+# Generated by Django 2.1.7 on 2026-10-18 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0014_task_instance_state_notifications")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the job was last modified."
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="When the task type was last modified.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the job was last modified."
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="When the task type was last modified.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskqueue",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True, help_text="When the queue was last modified."
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskwhitelist",
+            name="datetime_modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="When the whitelist was last modified.",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0015_datetime_modified")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="datetime_started",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the job started running.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="datetime_started",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the job started running.",
+                null=True,
+            ),
+        ),
+    ]
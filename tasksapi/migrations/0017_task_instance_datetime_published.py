@@ -0,0 +1,29 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0016_task_instance_datetime_started")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="datetime_published",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the job was sent to its queue.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="datetime_published",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the job was sent to its queue.",
+                null=True,
+            ),
+        ),
+    ]
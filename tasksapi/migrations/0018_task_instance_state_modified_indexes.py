@@ -0,0 +1,25 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0017_task_instance_datetime_published")]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=models.Index(
+                fields=["state", "datetime_modified"],
+                name="ctaskinst_state_mod_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=models.Index(
+                fields=["state", "datetime_modified"],
+                name="etaskinst_state_mod_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0018_task_instance_state_modified_indexes")]
+
+    operations = [
+        migrations.CreateModel(
+            name="Worker",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="The node name of the worker (e.g., celery@myhost).",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "concurrency",
+                    models.PositiveIntegerField(
+                        help_text="How many jobs the worker can run at once."
+                    ),
+                ),
+                (
+                    "num_active_jobs",
+                    models.PositiveIntegerField(
+                        help_text="How many jobs the worker is running."
+                    ),
+                ),
+                (
+                    "load_average",
+                    models.FloatField(
+                        blank=True,
+                        help_text="The load average of the worker's host over a minute.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "datetime_created",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="When the worker first sent a heartbeat.",
+                    ),
+                ),
+                (
+                    "datetime_modified",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="When the worker was last modified.",
+                    ),
+                ),
+                (
+                    "datetime_last_heartbeat",
+                    models.DateTimeField(
+                        help_text="When the worker last sent a heartbeat."
+                    ),
+                ),
+                (
+                    "task_queues",
+                    models.ManyToManyField(
+                        blank=True,
+                        help_text="The queues the worker consumes from.",
+                        related_name="workers",
+                        to="tasksapi.TaskQueue",
+                    ),
+                ),
+            ],
+            options={"ordering": ["name"]},
+        )
+    ]
@@ -0,0 +1,161 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:37
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0019_workers")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="num_retries",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of times the job has been retried.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="retry_history",
+            field=django.contrib.postgres.fields.jsonb.JSONField(
+                default=list,
+                editable=False,
+                help_text="A JSON array describing each failed attempt which was retried: when it failed, its class of failure, its error, and how many seconds the job backed off for.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="max_retries",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=0,
+                help_text="The maximum number of times an instance is retried after failing in one of the retryable ways. Defaults to 0.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="retry_backoff",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=30,
+                help_text="The number of seconds to back off for before the first retry, which doubles with each further retry. The actual wait is chosen at random between 0 and this, so that instances which failed together aren't all retried together. Defaults to 30.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="retry_backoff_max",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=600,
+                help_text="The maximum number of seconds to back off for before any retry. Defaults to 600.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="retryable_failures",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(
+                    choices=[
+                        ("image_pull", "container image pull failed"),
+                        (
+                            "connection",
+                            "lost connection (e.g., to the Docker daemon)",
+                        ),
+                        (
+                            "filesystem",
+                            "filesystem error (e.g., on a network share)",
+                        ),
+                        (
+                            "nonzero_exit",
+                            "command exited with a non-zero code",
+                        ),
+                        ("timeout", "job timed out"),
+                    ],
+                    max_length=12,
+                ),
+                blank=True,
+                default=list,
+                help_text='A JSON array of the classes of failures to retry instances after: "image_pull" (container image pull failed), "connection" (lost connection (e.g., to the Docker daemon)), "filesystem" (filesystem error (e.g., on a network share)), "nonzero_exit" (command exited with a non-zero code), "timeout" (job timed out). Defaults to [].',
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="num_retries",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of times the job has been retried.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="retry_history",
+            field=django.contrib.postgres.fields.jsonb.JSONField(
+                default=list,
+                editable=False,
+                help_text="A JSON array describing each failed attempt which was retried: when it failed, its class of failure, its error, and how many seconds the job backed off for.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="max_retries",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=0,
+                help_text="The maximum number of times an instance is retried after failing in one of the retryable ways. Defaults to 0.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="retry_backoff",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=30,
+                help_text="The number of seconds to back off for before the first retry, which doubles with each further retry. The actual wait is chosen at random between 0 and this, so that instances which failed together aren't all retried together. Defaults to 30.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="retry_backoff_max",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=600,
+                help_text="The maximum number of seconds to back off for before any retry. Defaults to 600.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="retryable_failures",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(
+                    choices=[
+                        ("image_pull", "container image pull failed"),
+                        (
+                            "connection",
+                            "lost connection (e.g., to the Docker daemon)",
+                        ),
+                        (
+                            "filesystem",
+                            "filesystem error (e.g., on a network share)",
+                        ),
+                        (
+                            "nonzero_exit",
+                            "command exited with a non-zero code",
+                        ),
+                        ("timeout", "job timed out"),
+                    ],
+                    max_length=12,
+                ),
+                blank=True,
+                default=list,
+                help_text='A JSON array of the classes of failures to retry instances after: "image_pull" (container image pull failed), "connection" (lost connection (e.g., to the Docker daemon)), "filesystem" (filesystem error (e.g., on a network share)), "nonzero_exit" (command exited with a non-zero code), "timeout" (job timed out). Defaults to [].',
+                size=None,
+            ),
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0020_task_retry_policies")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="cached_from",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="The UUID of the instance whose results this instance reuses, if it was completed from the result cache rather than running. Its results and logs are that instance's.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="result_cache_key",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="A hash of what the job runs with, which is used to find results to reuse. Only set for deterministic task types.",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="datetime_result_cache_invalidated",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the results of the task type's instances were last invalidated. Results from before this aren't reused.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="deterministic",
+            field=models.BooleanField(
+                blank=True,
+                default=False,
+                help_text="Whether instances' results only depend on the task type and their arguments. If so, new instances which match an instance which already succeeded are marked as successful right away, and reuse that instance's results rather than running. Defaults to false.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertasktype",
+            name="result_cache_ttl",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="The maximum age in seconds of the results deterministic instances reuse. Specify null to reuse results of any age. Defaults to null.",
+                null=True,
+                verbose_name="result cache TTL",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="cached_from",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="The UUID of the instance whose results this instance reuses, if it was completed from the result cache rather than running. Its results and logs are that instance's.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletaskinstance",
+            name="result_cache_key",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="A hash of what the job runs with, which is used to find results to reuse. Only set for deterministic task types.",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="datetime_result_cache_invalidated",
+            field=models.DateTimeField(
+                editable=False,
+                help_text="When the results of the task type's instances were last invalidated. Results from before this aren't reused.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="deterministic",
+            field=models.BooleanField(
+                blank=True,
+                default=False,
+                help_text="Whether instances' results only depend on the task type and their arguments. If so, new instances which match an instance which already succeeded are marked as successful right away, and reuse that instance's results rather than running. Defaults to false.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="executabletasktype",
+            name="result_cache_ttl",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text="The maximum age in seconds of the results deterministic instances reuse. Specify null to reuse results of any age. Defaults to null.",
+                null=True,
+                verbose_name="result cache TTL",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="containertaskinstance",
+            index=models.Index(
+                fields=["result_cache_key", "state"],
+                name="ctaskinst_cache_key_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="executabletaskinstance",
+            index=models.Index(
+                fields=["result_cache_key", "state"],
+                name="etaskinst_cache_key_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.1.7 on 2026-10-18 23:47
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("tasksapi", "0021_task_result_cache")]
+
+    operations = [
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="results_location",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Where the instance's results were uploaded to (e.g., s3://bucket/uuid/). Blank if they haven't been uploaded.",
+                max_length=400,
+            ),
+        ),
+        migrations.AddField(
+            model_name="containertaskinstance",
+            name="results_manifest",
+            field=django.contrib.postgres.fields.jsonb.JSONField(
+                blank=True,
+                editable=False,
+                help_text="A JSON array describing each uploaded results file: its path in the results directory, its size in bytes, and its SHA-256 hash. Null if the results haven't been uploaded.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.7 on 2026-10-19 00:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasksapi', '0022_container_task_instance_results'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='containertasktype',
+            name='warm_pool_size',
+            field=models.PositiveIntegerField(blank=True, default=0, help_text="The number of idle containers each worker process keeps started for running instances of this task type, which are run by exec-ing their command in one of these containers (after the image's entrypoint, as usual). Requires a POSIX shell in the container image, since the containers idle in a shell in place of the entrypoint. Only supported for Docker containers. Specify 0 to start a fresh container for each instance. Defaults to 0."),
+        ),
+    ]
@@ -5,3 +5,4 @@ from .container_tasks import ContainerTaskInstance, ContainerTaskType
 from .executable_tasks import ExecutableTaskInstance, ExecutableTaskType
 from .task_queues import TaskQueue, TaskWhitelist
 from .users import User
+from .workers import Worker
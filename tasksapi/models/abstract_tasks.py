@@ -4,22 +4,39 @@ Other task type and task instance models should inherit from these.
 """
 
 import json
-from uuid import uuid4
-from django.contrib.postgres.fields import JSONField
+from uuid import UUID, uuid4
+from celery.result import AsyncResult
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from tasksapi.constants import (
     CREATED,
+    TERMINATED,
+    WAITING,
     STATE_CHOICES,
     STATE_MAX_LENGTH,
     EXECUTABLE_TASK,
     DOCKER,
     SINGULARITY,
+    RETRYABLE_FAILURE_CHOICES,
+    RETRYABLE_FAILURE_MAX_LENGTH,
 )
+from tasksapi.signals import send_task_instances_changed
+from tasksapi.tasks import run_task
+from .dependencies import (
+    get_task_instance_states,
+    release_dependent_task_instances,
+)
+from .result_cache import link_cached_results
 from .task_queues import TaskQueue
 from .users import User
 from .utils import determine_task_class
-from .validators import task_instance_args_are_valid, task_type_args_are_valid
+from .validators import (
+    task_instance_args_are_valid,
+    task_type_args_are_valid,
+    task_type_retry_policy_is_valid,
+)
 
 
 class AbstractTaskType(models.Model):
@@ -43,6 +60,9 @@ class AbstractTaskType(models.Model):
     # https://docs.djangoproject.com/en/2.0/ref/models/fields/#django.db.models.DateField.auto_now_add
     # for more details.
     datetime_created = models.DateTimeField(auto_now_add=True)
+    datetime_modified = models.DateTimeField(
+        auto_now=True, help_text="When the task type was last modified."
+    )
 
     command_to_run = models.CharField(
         max_length=400,
@@ -87,6 +107,95 @@ class AbstractTaskType(models.Model):
         ),
     )
 
+    # How long instances can run for
+    max_runtime = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The maximum number of seconds an instance can run for "
+            "before it's stopped and marked as timed out. Specify null "
+            "to use the default of the queue the instance runs on. "
+            "Defaults to null."
+        ),
+    )
+
+    # How to retry instances which fail in transient ways
+    max_retries = models.PositiveSmallIntegerField(
+        blank=True,
+        default=0,
+        help_text=(
+            "The maximum number of times an instance is retried after "
+            "failing in one of the retryable ways. Defaults to 0."
+        ),
+    )
+    retry_backoff = models.PositiveIntegerField(
+        blank=True,
+        default=30,
+        help_text=(
+            "The number of seconds to back off for before the first "
+            "retry, which doubles with each further retry. The actual "
+            "wait is chosen at random between 0 and this, so that "
+            "instances which failed together aren't all retried "
+            "together. Defaults to 30."
+        ),
+    )
+    retry_backoff_max = models.PositiveIntegerField(
+        blank=True,
+        default=600,
+        help_text=(
+            "The maximum number of seconds to back off for before any "
+            "retry. Defaults to 600."
+        ),
+    )
+    retryable_failures = ArrayField(
+        models.CharField(
+            max_length=RETRYABLE_FAILURE_MAX_LENGTH,
+            choices=RETRYABLE_FAILURE_CHOICES,
+        ),
+        blank=True,
+        default=list,
+        help_text=(
+            "A JSON array of the classes of failures to retry "
+            "instances after: %s. Defaults to []."
+            % ", ".join(
+                '"%s" (%s)' % choice for choice in RETRYABLE_FAILURE_CHOICES
+            )
+        ),
+    )
+
+    # Whether to reuse instances' results
+    deterministic = models.BooleanField(
+        blank=True,
+        default=False,
+        help_text=(
+            "Whether instances' results only depend on the task type "
+            "and their arguments. If so, new instances which match an "
+            "instance which already succeeded are marked as successful "
+            "right away, and reuse that instance's results rather than "
+            "running. Defaults to false."
+        ),
+    )
+    result_cache_ttl = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        verbose_name="result cache TTL",
+        help_text=(
+            "The maximum age in seconds of the results deterministic "
+            "instances reuse. Specify null to reuse results of any "
+            "age. Defaults to null."
+        ),
+    )
+    datetime_result_cache_invalidated = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text=(
+            "When the results of the task type's instances were last "
+            "invalidated. Results from before this aren't reused."
+        ),
+    )
+
     class Meta:
         # Don't make an actual database table for this. Note that this
         # gets set to False when the model is inherited.
@@ -172,6 +281,43 @@ class AbstractTaskType(models.Model):
         if not is_valid:
             raise ValidationError(reason)
 
+        # Make sure the retry policy is valid
+        if self.retryable_failures is None:
+            self.retryable_failures = []
+
+        is_valid, reason = task_type_retry_policy_is_valid(
+            max_retries=self.max_retries,
+            retry_backoff=self.retry_backoff,
+            retry_backoff_max=self.retry_backoff_max,
+            retryable_failures=self.retryable_failures,
+        )
+
+        # Retry policy is not valid!
+        if not is_valid:
+            raise ValidationError(reason)
+
+    def invalidate_result_cache(self):
+        """Stop reusing the results of the task type's past instances."""
+        self.datetime_result_cache_invalidated = timezone.now()
+        self.save()
+
+    def get_retry_policy(self):
+        """Get the policy for retrying instances' jobs.
+
+        Returns:
+            A dictionary to pass to the run_task Celery task, or None if
+            instances aren't retried.
+        """
+        if not self.max_retries:
+            return None
+
+        return {
+            "max_retries": self.max_retries,
+            "backoff": self.retry_backoff,
+            "backoff_max": self.retry_backoff_max,
+            "retryable_failures": self.retryable_failures,
+        }
+
 
 class AbstractTaskInstance(models.Model):
     """A running instance of a task type.
@@ -209,9 +355,90 @@ class AbstractTaskInstance(models.Model):
     datetime_created = models.DateTimeField(
         auto_now_add=True, help_text="When the job was created."
     )
+    datetime_published = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text="When the job was sent to its queue.",
+    )
+    datetime_started = models.DateTimeField(
+        null=True, editable=False, help_text="When the job started running."
+    )
     datetime_finished = models.DateTimeField(
         null=True, editable=False, help_text="When the job finished."
     )
+    datetime_modified = models.DateTimeField(
+        auto_now=True, help_text="When the job was last modified."
+    )
+    batch_uuid = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="batch UUID",
+        help_text=(
+            "The UUID of the batch the instance was created in, if "
+            "any. All instances in a batch run in a single job."
+        ),
+    )
+
+    result_cache_key = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=(
+            "A hash of what the job runs with, which is used to find "
+            "results to reuse. Only set for deterministic task types."
+        ),
+    )
+    cached_from = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=(
+            "The UUID of the instance whose results this instance "
+            "reuses, if it was completed from the result cache rather "
+            "than running. Its results and logs are that instance's."
+        ),
+    )
+
+    num_retries = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="The number of times the job has been retried.",
+    )
+    retry_history = JSONField(
+        default=list,
+        editable=False,
+        help_text=(
+            "A JSON array describing each failed attempt which was "
+            "retried: when it failed, its class of failure, its error, "
+            "and how many seconds the job backed off for."
+        ),
+    )
+
+    priority = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The priority of the instance. Higher priority instances "
+            "are run first. This can be at most the maximum priority "
+            "of the instance's queue. Specify null to use the queue's "
+            "default priority. Defaults to null."
+        ),
+    )
+
+    depends_on = ArrayField(
+        models.UUIDField(),
+        blank=True,
+        default=list,
+        help_text=(
+            "A JSON array of the UUIDs of task instances (of either "
+            "class) which need to succeed before this instance is run. "
+            "If any of them don't succeed, this instance fails. "
+            "Defaults to []."
+        ),
+    )
 
     # Arguments encoded as a dictionary. The arguments pass in must
     # contain all of the required arguments of the task type for which
@@ -247,9 +474,101 @@ class AbstractTaskInstance(models.Model):
         # Call clean
         self.clean(fill_in_missing_args=True)
 
+        # Hold new instances with dependencies until they're ready
+        if self._state.adding and self.depends_on and self.state == CREATED:
+            self.state = WAITING
+
+        # Reuse results where possible
+        if self._state.adding:
+            link_cached_results(type(self), [self])
+
         # Call the parent save method
         super().save(*args, **kwargs)
 
+    def get_task_kwargs(self):
+        """Get the keyword arguments to run the instance's job with.
+
+        Make sure you define this when you subclass this!
+
+        Returns:
+            A dictionary containing keyword arguments for the run_task
+            Celery task.
+        """
+        raise NotImplementedError
+
+    def publish(self, producer=None):
+        """Queue up the instance's job.
+
+        Args:
+            producer: An optional Kombu producer to send the message
+                with. Pass one in when publishing lots of instances at
+                once to save acquiring one for each of them.
+        """
+        run_task.apply_async(
+            kwargs=self.get_task_kwargs(),
+            queue=self.task_queue.name,
+            task_id=str(self.uuid),
+            priority=self.get_priority(),
+            producer=producer,
+        )
+
+    def terminate(self):
+        """Send a terminate signal to the instance's job.
+
+        Note that task instances in a batch share a single job, so
+        terminating one of them terminates the whole batch. Instances
+        which haven't been published yet (e.g., ones held back by
+        fair-share scheduling or waiting on other instances) are marked
+        as terminated right away so that they're never published.
+        """
+        AsyncResult(str(self.batch_uuid or self.uuid)).revoke(terminate=True)
+
+        if (
+            type(self)
+            .objects.filter(uuid=self.uuid, state__in=(CREATED, WAITING))
+            .update(
+                state=TERMINATED,
+                datetime_finished=timezone.now(),
+                datetime_modified=timezone.now(),
+            )
+        ):
+            self.state = TERMINATED
+            send_task_instances_changed(type(self), [self.task_type_id])
+
+            # Fail anything waiting on the instance
+            release_dependent_task_instances({self.uuid: TERMINATED})
+
+    def get_results_uuid(self):
+        """Get the UUID of the job which made the instance's results.
+
+        Returns:
+            A UUID, which is the instance's own unless it reuses another
+            instance's results.
+        """
+        return self.cached_from or self.uuid
+
+    def get_max_runtime(self):
+        """Get the maximum number of seconds the instance can run for.
+
+        Returns:
+            An integer, or None if there's no limit.
+        """
+        if self.task_type.max_runtime is not None:
+            return self.task_type.max_runtime
+
+        return self.task_queue.default_max_runtime
+
+    def get_priority(self):
+        """Get the priority to publish the instance's job with.
+
+        Returns:
+            An integer.
+        """
+        if self.priority is not None:
+            return self.priority
+
+        return self.task_queue.default_priority
+
     def clean(
         self, fill_in_missing_args=False
     ):  # pylint: disable=arguments-differ
@@ -271,6 +590,57 @@ class AbstractTaskInstance(models.Model):
                 "'%s' is not a valid JSON dictionary!" % self.arguments
             )
 
+        # Make sure the queue will take the instance
+        self.clean_task_queue()
+
+        # Make sure the queue allows the instance's priority
+        if (
+            self.priority is not None
+            and self.priority > self.task_queue.max_priority
+        ):
+            raise ValidationError(
+                "Queue %s only allows priorities up to %d"
+                % (self.task_queue.name, self.task_queue.max_priority)
+            )
+
+        # Make sure a new instance's dependencies exist
+        if self._state.adding and self.depends_on:
+            try:
+                self.depends_on = list(
+                    {UUID(str(uuid)) for uuid in self.depends_on}
+                )
+            except ValueError:
+                raise ValidationError(
+                    "'%s' is not a valid JSON array of UUIDs!"
+                    % self.depends_on
+                )
+
+            missing_uuids = {str(uuid) for uuid in self.depends_on} - set(
+                get_task_instance_states(self.depends_on)
+            )
+
+            if missing_uuids:
+                raise ValidationError(
+                    "Task instances %s don't exist"
+                    % ", ".join(sorted(missing_uuids))
+                )
+
+        # Make sure arguments are valid
+        is_valid, reason = task_instance_args_are_valid(
+            instance=self, fill_missing_args=fill_in_missing_args
+        )
+
+        # Arguments are not valid!
+        if not is_valid:
+            raise ValidationError(reason)
+
+    def clean_task_queue(self):
+        """Validate that the instance's queue will take it.
+
+        This only depends on the instance's user, task type, and queue,
+        so when validating lots of instances which share those, this
+        only needs to be called once.
+        """
         # Make sure the queue is active
         if not self.task_queue.active:
             raise ValidationError(
@@ -331,12 +701,3 @@ class AbstractTaskInstance(models.Model):
                     "Queue %s does not accept Singularity container tasks"
                     % self.task_queue.name
                 )
-
-        # Make sure arguments are valid
-        is_valid, reason = task_instance_args_are_valid(
-            instance=self, fill_missing_args=fill_in_missing_args
-        )
-
-        # Arguments are not valid!
-        if not is_valid:
-            raise ValidationError(reason)
@@ -1,18 +1,27 @@
 """Models to represent task types and instances which use containers."""
 
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from tasksapi.constants import (
-    SUCCESSFUL,
-    FAILED,
+    CREATED,
+    STATE_DATETIME_FIELDS_DICT,
+    TERMINAL_STATES,
+    WAITING,
     CONTAINER_CHOICES,
     CONTAINER_TYPE_MAX_LENGTH,
     CONTAINER_TASK,
 )
-from tasksapi.tasks import run_task
 from .abstract_tasks import AbstractTaskInstance, AbstractTaskType
+from .dependencies import (
+    release_dependent_task_instances,
+    update_waiting_task_instances,
+)
+from .validators import container_task_type_warm_pool_is_valid
 
 
 class ContainerTaskType(AbstractTaskType):
@@ -56,6 +65,49 @@ class ContainerTaskType(AbstractTaskType):
         help_text="The type of container provided.",
     )
 
+    # Warm pool settings
+    warm_pool_size = models.PositiveIntegerField(
+        blank=True,
+        default=0,
+        help_text=(
+            "The number of idle containers each worker process keeps "
+            "started for running instances of this task type, which "
+            "are run by exec-ing their command in one of these "
+            "containers (after the image's entrypoint, as usual). "
+            "Requires a POSIX shell in the container image, since the "
+            "containers idle in a shell in place of the entrypoint. "
+            "Only supported for Docker containers. Specify 0 to start "
+            "a fresh container for each instance. Defaults to 0."
+        ),
+    )
+    warm_pool_max_jobs_per_container = models.PositiveIntegerField(
+        blank=True,
+        default=100,
+        verbose_name="warm pool max jobs per container",
+        help_text=(
+            "The number of instances a warm container runs before it's "
+            "replaced. Warm containers are also replaced after any "
+            "instance fails in them. Defaults to 100."
+        ),
+    )
+
+    def clean(self):
+        """Validate a container task type's warm pool settings."""
+        # Call the parent clean method
+        super().clean()
+
+        is_valid, reason = container_task_type_warm_pool_is_valid(
+            container_type=self.container_type,
+            warm_pool_size=self.warm_pool_size,
+            warm_pool_max_jobs_per_container=(
+                self.warm_pool_max_jobs_per_container
+            ),
+        )
+
+        # Warm pool settings are not valid!
+        if not is_valid:
+            raise ValidationError(reason)
+
 
 class ContainerTaskInstance(AbstractTaskInstance):
     """A running instance of a container task type."""
@@ -66,48 +118,136 @@ class ContainerTaskInstance(AbstractTaskInstance):
         help_text="The task type for which this is an instance.",
     )
 
+    # Where the instance's results were uploaded to by its worker (see
+    # the results_uploads tasks module)
+    results_location = models.CharField(
+        max_length=400,
+        blank=True,
+        editable=False,
+        help_text=(
+            "Where the instance's results were uploaded to "
+            "(e.g., s3://bucket/uuid/). Blank if they haven't been "
+            "uploaded."
+        ),
+    )
+    results_manifest = JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=(
+            "A JSON array describing each uploaded results file: its "
+            "path in the results directory, its size in bytes, and its "
+            "SHA-256 hash. Null if the results haven't been uploaded."
+        ),
+    )
+
+    class Meta(AbstractTaskInstance.Meta):
+        """Model metadata."""
+
+        # Index what's needed to check queue limits (see the tasksapi
+        # utils module)
+        indexes = [
+            models.Index(
+                fields=["task_queue", "state"],
+                name="ctaskinst_queue_state_idx",
+            ),
+            models.Index(
+                fields=["task_queue", "user", "datetime_created"],
+                name="ctaskinst_queue_user_idx",
+            ),
+            models.Index(
+                fields=["task_type", "state"], name="ctaskinst_type_state_idx"
+            ),
+            GinIndex(fields=["depends_on"], name="ctaskinst_depends_on_idx"),
+            # Find task instances stuck in a state (see the
+            # reap_task_instances command)
+            models.Index(
+                fields=["state", "datetime_modified"],
+                name="ctaskinst_state_mod_idx",
+            ),
+            # Find results to reuse (see the result cache module)
+            models.Index(
+                fields=["result_cache_key", "state"],
+                name="ctaskinst_cache_key_idx",
+            ),
+        ]
+
+    def get_task_kwargs(self):
+        """Get the keyword arguments to run the instance's job with.
+
+        Returns:
+            A dictionary containing keyword arguments for the run_task
+            Celery task.
+        """
+        return {
+            "uuid": self.uuid,
+            "task_class": CONTAINER_TASK,
+            "command_to_run": self.task_type.command_to_run,
+            "env_vars_list": self.task_type.environment_variables,
+            "args_dict": self.arguments,
+            "max_runtime": self.get_max_runtime(),
+            "retry_policy": self.task_type.get_retry_policy(),
+            "logs_path": self.task_type.logs_path,
+            "results_path": self.task_type.results_path,
+            "container_image": self.task_type.container_image,
+            "container_type": self.task_type.container_type,
+            "task_type_id": self.task_type.id,
+            "warm_pool_size": self.task_type.warm_pool_size,
+            "warm_pool_max_jobs_per_container": (
+                self.task_type.warm_pool_max_jobs_per_container
+            ),
+        }
+
 
 @receiver(pre_save, sender=ContainerTaskInstance)
 def container_task_instance_pre_save_handler(instance, **_):
     """Adds additional behavior before saving a task instance.
 
-    If the state is about to be changed to a finished change, update the
-    datetime finished field.
+    If the state is about to be changed to published, running, or a
+    finished state, fill in the datetime published, datetime started, or
+    datetime finished field, unless it's already been filled in (e.g.,
+    with the time reported by the worker).
 
     Args:
         instance: The task instance about to be saved.
     """
-    if instance.state in (SUCCESSFUL, FAILED):
-        instance.datetime_finished = timezone.now()
+    datetime_field = STATE_DATETIME_FIELDS_DICT.get(instance.state)
+
+    if (
+        datetime_field is not None
+        and getattr(instance, datetime_field) is None
+    ):
+        setattr(instance, datetime_field, timezone.now())
 
 
 @receiver(post_save, sender=ContainerTaskInstance)
 def container_task_instance_post_save_handler(instance, created, **_):
     """Adds additional behavior after saving a task instance.
 
-    Right now this just queues up the task instance upon creation.
+    This queues up the task instance upon creation, unless its queue
+    uses fair-share scheduling, in which case the task instance
+    dispatcher queues it up later, it's waiting on other task
+    instances, or it reused cached results (and so has already
+    succeeded). Once the task instance finishes, any task instances
+    waiting on it are released or failed.
 
     Args:
         instance: The task instance just saved.
         created: A boolean telling us if the task instance was just
             created (cf. modified).
     """
-    # Only start the job if the instance was just created
     if created:
-        kwargs = {
-            "uuid": instance.uuid,
-            "task_class": CONTAINER_TASK,
-            "command_to_run": instance.task_type.command_to_run,
-            "env_vars_list": instance.task_type.environment_variables,
-            "args_dict": instance.arguments,
-            "logs_path": instance.task_type.logs_path,
-            "results_path": instance.task_type.results_path,
-            "container_image": instance.task_type.container_image,
-            "container_type": instance.task_type.container_type,
-        }
-
-        run_task.apply_async(
-            kwargs=kwargs,
-            queue=instance.task_queue.name,
-            task_id=str(instance.uuid),
-        )
+        # Only start the job if the instance was just created (and
+        # isn't waiting on other task instances or reusing results)
+        if instance.state == WAITING:
+            update_waiting_task_instances([instance])
+        elif (
+            instance.state == CREATED
+            and not instance.task_queue.uses_fair_share
+        ):
+            # Wait until the instance is committed, so its job can't
+            # report on it before then
+            transaction.on_commit(instance.publish)
+    elif instance.state in TERMINAL_STATES:
+        # Release or fail anything waiting on the instance
+        release_dependent_task_instances({instance.uuid: instance.state})
@@ -0,0 +1,199 @@
+"""Contains functionality for task instances which depend on others.
+
+Task instances can depend on other task instances (of either class),
+which together form a directed acyclic graph: since a task instance can
+only depend on task instances which already exist, there can't be any
+cycles. Task instances with dependencies wait in the waiting state
+until all of their dependencies succeed, at which point they're
+published as usual. If any of their dependencies don't succeed, they
+fail, and so do the task instances depending on them, and so on.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+from tasksapi.constants import (
+    CREATED,
+    PUBLISHED,
+    SUCCESSFUL,
+    TERMINAL_STATES,
+    FAILED,
+    WAITING,
+)
+from tasksapi.signals import send_task_instances_changed
+from .task_queues import TaskQueue
+from .utils import get_task_instance_models
+
+
+def get_task_instance_states(uuids):
+    """Get the states of task instances of either class.
+
+    Args:
+        uuids: An iterable of task instance UUIDs.
+
+    Returns:
+        A dictionary mapping the UUID strings of the task instances
+        which exist to their states.
+    """
+    uuid_states = {}
+
+    for instance_model in get_task_instance_models():
+        uuid_states.update(
+            (str(uuid), state)
+            for uuid, state in instance_model.objects.filter(
+                uuid__in=uuids
+            ).values_list("uuid", "state")
+        )
+
+    return uuid_states
+
+
+def update_waiting_task_instances(instances):
+    """Release or fail waiting task instances, if their time has come.
+
+    Task instances whose dependencies have all succeeded are published
+    (unless their queue uses fair-share scheduling, in which case they
+    wait for the dispatcher). If their queue's in-flight limits don't
+    have room for them, they keep waiting until the dispatcher finds
+    room for them (see release_held_task_instances). Task instances
+    with a dependency which finished without succeeding (or which no
+    longer exists) are failed.
+
+    Args:
+        instances: A list of task instances in the waiting state.
+
+    Returns:
+        A list containing the UUIDs of the task instances which were
+        failed.
+    """
+    dependency_states = get_task_instance_states(
+        {uuid for instance in instances for uuid in instance.depends_on}
+    )
+    failed_uuids = []
+    changed_instances = []
+
+    for instance in instances:
+        instance_model = type(instance)
+        states = [
+            dependency_states.get(str(uuid)) for uuid in instance.depends_on
+        ]
+
+        if any(
+            state is None or (state in TERMINAL_STATES and state != SUCCESSFUL)
+            for state in states
+        ):
+            # Fail the task instance (unless something else got to it
+            # first)
+            if instance_model.objects.filter(
+                uuid=instance.uuid, state=WAITING
+            ).update(
+                state=FAILED,
+                datetime_finished=timezone.now(),
+                datetime_modified=timezone.now(),
+            ):
+                instance.state = FAILED
+                failed_uuids.append(instance.uuid)
+                changed_instances.append(instance)
+        elif all(state == SUCCESSFUL for state in states):
+            # Hand task instances on fair-share queues over to the
+            # dispatcher (unless something else got to them first)
+            if instance.task_queue.uses_fair_share:
+                if instance_model.objects.filter(
+                    uuid=instance.uuid, state=WAITING
+                ).update(state=CREATED, datetime_modified=timezone.now()):
+                    instance.state = CREATED
+                    changed_instances.append(instance)
+
+                continue
+
+            # Publish the task instance if its queue has room for it
+            # (unless something else got to it first). This locks the
+            # queue's row so that concurrent submissions and releases
+            # don't all squeeze in under its limits.
+            with transaction.atomic():
+                task_queue = TaskQueue.objects.select_for_update().get(
+                    pk=instance.task_queue_id
+                )
+
+                is_allowed, _, _ = task_queue.check_in_flight_limits(
+                    instance_model=instance_model,
+                    task_type=instance.task_type,
+                    num_instances=1,
+                )
+
+                if not is_allowed or not instance_model.objects.filter(
+                    uuid=instance.uuid, state=WAITING
+                ).update(
+                    state=PUBLISHED,
+                    datetime_published=timezone.now(),
+                    datetime_modified=timezone.now(),
+                ):
+                    continue
+
+                instance.state = PUBLISHED
+                transaction.on_commit(instance.publish)
+                changed_instances.append(instance)
+
+    for instance_model in get_task_instance_models():
+        send_task_instances_changed(
+            instance_model,
+            (
+                instance.task_type_id
+                for instance in changed_instances
+                if isinstance(instance, instance_model)
+            ),
+        )
+
+    return failed_uuids
+
+
+def release_dependent_task_instances(uuid_states):
+    """Update the task instances waiting on newly finished ones.
+
+    Failures cascade through the dependency graph, so this keeps going
+    until there are no more newly failed task instances.
+
+    Args:
+        uuid_states: A dictionary where keys are task instance UUIDs
+            and values are their new states. Task instances whose new
+            states aren't terminal states are ignored.
+    """
+    finished_uuids = [
+        uuid for uuid, state in uuid_states.items() if state in TERMINAL_STATES
+    ]
+
+    while finished_uuids:
+        waiting_instances = []
+
+        for instance_model in get_task_instance_models():
+            waiting_instances += instance_model.objects.filter(
+                depends_on__overlap=finished_uuids, state=WAITING
+            ).select_related("task_queue", "task_type")
+
+        finished_uuids = update_waiting_task_instances(waiting_instances)
+
+
+def release_held_task_instances(task_queue):
+    """Publish waiting task instances which a queue now has room for.
+
+    Task instances whose dependencies have all succeeded keep waiting
+    if their queue's in-flight limits don't have room for them, so this
+    is run periodically (by the dispatcher) for queues with in-flight
+    limits.
+
+    Args:
+        task_queue: The queue to release task instances on. This
+            shouldn't use fair-share scheduling.
+    """
+    waiting_instances = []
+
+    for instance_model in get_task_instance_models():
+        waiting_instances += instance_model.objects.filter(
+            task_queue=task_queue, state=WAITING
+        ).select_related("task_queue", "task_type")
+
+    failed_uuids = update_waiting_task_instances(waiting_instances)
+
+    if failed_uuids:
+        release_dependent_task_instances(
+            {uuid: FAILED for uuid in failed_uuids}
+        )
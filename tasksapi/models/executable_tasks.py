@@ -1,12 +1,22 @@
 """Models to represent task types and instances which run commands directly."""
 
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from tasksapi.constants import SUCCESSFUL, FAILED, EXECUTABLE_TASK
-from tasksapi.tasks import run_task
+from tasksapi.constants import (
+    CREATED,
+    STATE_DATETIME_FIELDS_DICT,
+    TERMINAL_STATES,
+    WAITING,
+    EXECUTABLE_TASK,
+)
 from .abstract_tasks import AbstractTaskInstance, AbstractTaskType
+from .dependencies import (
+    release_dependent_task_instances,
+    update_waiting_task_instances,
+)
 
 
 class ExecutableTaskType(AbstractTaskType):
@@ -38,45 +48,105 @@ class ExecutableTaskInstance(AbstractTaskInstance):
         help_text="The task type for which this is an instance.",
     )
 
+    class Meta(AbstractTaskInstance.Meta):
+        """Model metadata."""
+
+        # Index what's needed to check queue limits (see the tasksapi
+        # utils module)
+        indexes = [
+            models.Index(
+                fields=["task_queue", "state"],
+                name="etaskinst_queue_state_idx",
+            ),
+            models.Index(
+                fields=["task_queue", "user", "datetime_created"],
+                name="etaskinst_queue_user_idx",
+            ),
+            models.Index(
+                fields=["task_type", "state"], name="etaskinst_type_state_idx"
+            ),
+            GinIndex(fields=["depends_on"], name="etaskinst_depends_on_idx"),
+            # Find task instances stuck in a state (see the
+            # reap_task_instances command)
+            models.Index(
+                fields=["state", "datetime_modified"],
+                name="etaskinst_state_mod_idx",
+            ),
+            # Find results to reuse (see the result cache module)
+            models.Index(
+                fields=["result_cache_key", "state"],
+                name="etaskinst_cache_key_idx",
+            ),
+        ]
+
+    def get_task_kwargs(self):
+        """Get the keyword arguments to run the instance's job with.
+
+        Returns:
+            A dictionary containing keyword arguments for the run_task
+            Celery task.
+        """
+        return {
+            "uuid": self.uuid,
+            "task_class": EXECUTABLE_TASK,
+            "command_to_run": self.task_type.command_to_run,
+            "env_vars_list": self.task_type.environment_variables,
+            "args_dict": self.arguments,
+            "max_runtime": self.get_max_runtime(),
+            "retry_policy": self.task_type.get_retry_policy(),
+            "json_file_option": self.task_type.json_file_option,
+        }
+
 
 @receiver(pre_save, sender=ExecutableTaskInstance)
 def executable_task_instance_pre_save_handler(instance, **_):
     """Adds additional behavior before saving a task instance.
 
-    If the state is about to be changed to a finished change, update the
-    datetime finished field.
+    If the state is about to be changed to published, running, or a
+    finished state, fill in the datetime published, datetime started, or
+    datetime finished field, unless it's already been filled in (e.g.,
+    with the time reported by the worker).
 
     Args:
         instance: The task instance about to be saved.
     """
-    if instance.state in (SUCCESSFUL, FAILED):
-        instance.datetime_finished = timezone.now()
+    datetime_field = STATE_DATETIME_FIELDS_DICT.get(instance.state)
+
+    if (
+        datetime_field is not None
+        and getattr(instance, datetime_field) is None
+    ):
+        setattr(instance, datetime_field, timezone.now())
 
 
 @receiver(post_save, sender=ExecutableTaskInstance)
 def executable_task_instance_post_save_handler(instance, created, **_):
     """Adds additional behavior after saving a task instance.
 
-    Right now this just queues up the task instance upon creation.
+    This queues up the task instance upon creation, unless its queue
+    uses fair-share scheduling, in which case the task instance
+    dispatcher queues it up later, it's waiting on other task
+    instances, or it reused cached results (and so has already
+    succeeded). Once the task instance finishes, any task instances
+    waiting on it are released or failed.
 
     Args:
         instance: The task instance just saved.
         created: A boolean telling us if the task instance was just
             created (cf. modified).
     """
-    # Only start the job if the instance was just created
     if created:
-        kwargs = {
-            "uuid": instance.uuid,
-            "task_class": EXECUTABLE_TASK,
-            "command_to_run": instance.task_type.command_to_run,
-            "env_vars_list": instance.task_type.environment_variables,
-            "args_dict": instance.arguments,
-            "json_file_option": instance.task_type.json_file_option,
-        }
-
-        run_task.apply_async(
-            kwargs=kwargs,
-            queue=instance.task_queue.name,
-            task_id=str(instance.uuid),
-        )
+        # Only start the job if the instance was just created (and
+        # isn't waiting on other task instances or reusing results)
+        if instance.state == WAITING:
+            update_waiting_task_instances([instance])
+        elif (
+            instance.state == CREATED
+            and not instance.task_queue.uses_fair_share
+        ):
+            # Wait until the instance is committed, so its job can't
+            # report on it before then
+            transaction.on_commit(instance.publish)
+    elif instance.state in TERMINAL_STATES:
+        # Release or fail anything waiting on the instance
+        release_dependent_task_instances({instance.uuid: instance.state})
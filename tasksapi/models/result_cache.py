@@ -0,0 +1,145 @@
+"""Contains functionality for reusing the results of task instances.
+
+Task types which are deterministic (i.e., whose instances' results only
+depend on what they run and with which arguments) can opt in to having
+their results cached. Each of their instances gets a result cache key,
+which is a hash of everything its job runs with except for its UUID and
+things which don't affect its results (e.g., its maximum runtime). A new
+instance with the same key as an instance which succeeded recently
+enough is marked as successful right away, and links to that instance's
+results rather than running.
+
+Note that container images are keyed on by name, so task types whose
+image tags move should pin images by digest (e.g.,
+"ubuntu@sha256:...") or have their result caches invalidated when their
+images change.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from tasksapi.constants import CREATED, SUCCESSFUL
+
+# Job arguments which don't affect a job's results, and so are left out
+# of result cache keys
+RESULT_CACHE_IGNORED_KWARGS = (
+    "uuid",
+    "max_runtime",
+    "retry_policy",
+    "task_type_id",
+    "warm_pool_size",
+    "warm_pool_max_jobs_per_container",
+)
+
+
+def get_result_cache_key(instance):
+    """Get the result cache key of a task instance.
+
+    Args:
+        instance: A task instance whose arguments have been validated
+            (and filled in with their default values).
+
+    Returns:
+        A string containing the hex digest of a SHA-256 hash.
+    """
+    kwargs = {
+        name: value
+        for name, value in instance.get_task_kwargs().items()
+        if name not in RESULT_CACHE_IGNORED_KWARGS
+    }
+
+    # Hash a canonical encoding of the job's arguments
+    encoded_kwargs = json.dumps(
+        kwargs, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder
+    )
+
+    return hashlib.sha256(encoded_kwargs.encode()).hexdigest()
+
+
+def get_result_cache_cutoff(task_type, now):
+    """Get when results need to be from to be reused for a task type.
+
+    Args:
+        task_type: A task type.
+        now: A datetime to use as the current time.
+
+    Returns:
+        A datetime, or None if results of any age can be reused.
+    """
+    cutoffs = []
+
+    if task_type.result_cache_ttl is not None:
+        cutoffs.append(now - timedelta(seconds=task_type.result_cache_ttl))
+
+    if task_type.datetime_result_cache_invalidated is not None:
+        cutoffs.append(task_type.datetime_result_cache_invalidated)
+
+    return max(cutoffs, default=None)
+
+
+def link_cached_results(instance_model, instances):
+    """Complete new task instances from the result cache where possible.
+
+    New task instances of deterministic task types are given result
+    cache keys, and those whose keys match a task instance which
+    succeeded recently enough (by actually running) are marked as
+    successful, linking to that task instance's results. Task instances
+    which depend on others aren't completed from the cache, since their
+    results might depend on their dependencies' side effects. This
+    issues one query, however many task instances there are.
+
+    Args:
+        instance_model: The task instance model the task instances are
+            instances of.
+        instances: A list of unsaved task instances whose arguments have
+            been validated (and filled in with their default values).
+            These are modified in place.
+    """
+    instances = [
+        instance
+        for instance in instances
+        if instance.task_type.deterministic
+        and instance.state == CREATED
+        and not instance.depends_on
+    ]
+
+    if not instances:
+        return
+
+    for instance in instances:
+        instance.result_cache_key = get_result_cache_key(instance)
+
+    # Find the most recent task instance which actually ran for each key
+    cached_results = {
+        result_cache_key: (uuid, datetime_finished)
+        for result_cache_key, uuid, datetime_finished in (
+            instance_model.objects.filter(
+                result_cache_key__in={
+                    instance.result_cache_key for instance in instances
+                },
+                state=SUCCESSFUL,
+                cached_from__isnull=True,
+            )
+            .order_by("result_cache_key", "-datetime_finished")
+            .distinct("result_cache_key")
+            .values_list("result_cache_key", "uuid", "datetime_finished")
+        )
+    }
+
+    now = timezone.now()
+
+    for instance in instances:
+        if instance.result_cache_key not in cached_results:
+            continue
+
+        uuid, datetime_finished = cached_results[instance.result_cache_key]
+        cutoff = get_result_cache_cutoff(instance.task_type, now)
+
+        if cutoff is not None and datetime_finished < cutoff:
+            continue
+
+        instance.state = SUCCESSFUL
+        instance.cached_from = uuid
+        instance.datetime_finished = now
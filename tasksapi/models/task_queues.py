@@ -1,8 +1,21 @@
 """Model to represent task queues."""
 
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+from django.utils.functional import cached_property
+from tasksapi.constants import CREATED, PUBLISHED, RUNNING
 from .users import User
-from .utils import sane_name_validator
+from .utils import (
+    count_up_to,
+    get_task_instance_models,
+    m2m_changed_handler,
+    sane_name_validator,
+)
+from .validators import task_queue_priorities_are_valid
 
 
 class TaskWhitelist(models.Model):
@@ -29,6 +42,9 @@ class TaskWhitelist(models.Model):
         blank=True,
         help_text="The set of executable task types to whitelist.",
     )
+    datetime_modified = models.DateTimeField(
+        auto_now=True, help_text="When the whitelist was last modified."
+    )
 
     class Meta:
         ordering = ["id"]
@@ -106,6 +122,89 @@ class TaskQueue(models.Model):
     whitelists = models.ManyToManyField(
         TaskWhitelist, blank=True, help_text="A set of task whitelists."
     )
+    default_max_runtime = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The maximum number of seconds instances of task types "
+            "which don't specify their own maximum runtime can run for "
+            "on this queue. Specify null for no limit. Defaults to null."
+        ),
+    )
+    max_in_flight = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The maximum number of task instances which can be "
+            "published or running on this queue at once. Specify null "
+            "for no limit. Defaults to null."
+        ),
+    )
+    max_in_flight_per_task_type = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The maximum number of instances of any one task type "
+            "which can be published or running on this queue at once. "
+            "Specify null for no limit. Defaults to null."
+        ),
+    )
+    max_submissions_per_minute_per_user = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        default=None,
+        help_text=(
+            "The maximum number of task instances each user can create "
+            "on this queue in any one minute. Specify null for no "
+            "limit. Defaults to null."
+        ),
+    )
+    uses_fair_share = models.BooleanField(
+        blank=True,
+        default=False,
+        verbose_name="uses fair-share scheduling",
+        help_text=(
+            "A boolean specifying whether task instances on this queue "
+            "are held by saltant and released to the queue a few at a "
+            "time per user, so that no one user can starve the others. "
+            "Requires the task instance dispatcher to be running. "
+            "Defaults to False."
+        ),
+    )
+    max_in_flight_per_user = models.PositiveIntegerField(
+        blank=True,
+        default=10,
+        validators=[MinValueValidator(1)],
+        help_text=(
+            "With fair-share scheduling, how many task instances each "
+            "user can have published or running on this queue at once. "
+            "This is multiplied by the user's fair-share weight. "
+            "Defaults to 10."
+        ),
+    )
+    max_priority = models.PositiveSmallIntegerField(
+        blank=True,
+        default=0,
+        help_text=(
+            "The highest priority task instances on this queue can "
+            "have. Higher priority task instances are run first. "
+            "Defaults to 0."
+        ),
+    )
+    default_priority = models.PositiveSmallIntegerField(
+        blank=True,
+        default=0,
+        help_text=(
+            "The priority of task instances on this queue which don't "
+            "specify one. Defaults to 0."
+        ),
+    )
+    datetime_modified = models.DateTimeField(
+        auto_now=True, help_text="When the queue was last modified."
+    )
 
     class Meta:
         ordering = ["id"]
@@ -113,3 +212,125 @@ class TaskQueue(models.Model):
     def __str__(self):
         """String representation of a queue."""
         return self.name
+
+    @cached_property
+    def worker_stats(self):
+        """Summarize the live workers consuming from the queue.
+
+        Returns:
+            A dictionary containing the number of live workers, how many
+            jobs they can run at once, how many they're running, and how
+            many more they could be running.
+        """
+        stats = self.workers.alive().aggregate(
+            num_workers=Count("pk"),
+            capacity=Coalesce(Sum("concurrency"), 0),
+            num_active_jobs=Coalesce(Sum("num_active_jobs"), 0),
+        )
+        stats["spare_capacity"] = max(
+            stats["capacity"] - stats["num_active_jobs"], 0
+        )
+
+        return stats
+
+    def is_served(self):
+        """Determine whether any live workers consume from the queue.
+
+        Returns:
+            A boolean.
+        """
+        return self.worker_stats["num_workers"] > 0
+
+    def check_in_flight_limits(self, instance_model, task_type, num_instances):
+        """Determine whether the queue has room for more task instances.
+
+        Queues can limit how many task instances (in total, and per task
+        type) are in flight at once. Task instances count as in flight
+        from when they're created (and about to be published) until
+        they finish, so this shouldn't be used for queues using
+        fair-share scheduling, which hold created task instances back.
+
+        To keep concurrent submissions from both squeezing in under the
+        limits, lock the queue's row (with select_for_update) in the
+        same transaction as checking this and creating (or publishing)
+        the task instances.
+
+        Args:
+            instance_model: The task instance model of the instances.
+            task_type: The task type of the task instances.
+            num_instances: An integer specifying how many task
+                instances are being put in flight.
+
+        Returns:
+            A tuple containing a boolean, a string, and an integer,
+            where the boolean signals whether the task instances fit,
+            the string explains why not in the case that the boolean is
+            False (otherwise it's an empty string), and the integer is
+            the limit they don't fit under (otherwise it's None).
+        """
+        in_flight_states = (CREATED, PUBLISHED, RUNNING)
+
+        # Check how many task instances are in flight on the queue
+        limit = self.max_in_flight
+
+        if limit is not None:
+            num_in_flight = sum(
+                count_up_to(
+                    model.objects.filter(
+                        task_queue=self, state__in=in_flight_states
+                    ),
+                    limit,
+                )
+                for model in get_task_instance_models()
+            )
+
+            if num_in_flight + num_instances > limit:
+                return (
+                    False,
+                    "Queue %s only allows %d task instances in flight"
+                    % (self.name, limit),
+                    limit,
+                )
+
+        # And how many of the task type's instances are in flight on it
+        limit = self.max_in_flight_per_task_type
+
+        if limit is not None:
+            num_in_flight = count_up_to(
+                instance_model.objects.filter(
+                    task_queue=self,
+                    task_type=task_type,
+                    state__in=in_flight_states,
+                ),
+                limit,
+            )
+
+            if num_in_flight + num_instances > limit:
+                return (
+                    False,
+                    "Queue %s only allows %d instances of each task type "
+                    "in flight" % (self.name, limit),
+                    limit,
+                )
+
+        return (True, "", None)
+
+    def clean(self):
+        """Validate the queue's priority settings."""
+        is_valid, reason = task_queue_priorities_are_valid(
+            max_priority=self.max_priority,
+            default_priority=self.default_priority,
+        )
+
+        if not is_valid:
+            raise ValidationError(reason)
+
+
+# Mark whitelists and queues as modified when their many-to-many fields
+# change
+for through_model in (
+    TaskWhitelist.whitelisted_container_task_types.through,
+    TaskWhitelist.whitelisted_executable_task_types.through,
+    TaskQueue.whitelists.through,
+):
+    m2m_changed.connect(m2m_changed_handler, sender=through_model)
@@ -1,6 +1,8 @@
 """Contains custom user model."""
 
 from django.contrib.auth.models import AbstractUser
+from django.core.validators import MinValueValidator
+from django.db import models
 from timezone_field import TimeZoneField
 
 
@@ -8,3 +10,12 @@ class User(AbstractUser):
     """Custom user model."""
 
     time_zone = TimeZoneField(default="America/Vancouver")
+    fair_share_weight = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text=(
+            "How many times more task instances the user can have "
+            "published at once on queues using fair-share scheduling "
+            "than a user with weight 1. Defaults to 1."
+        ),
+    )
@@ -1,6 +1,8 @@
 """Common bits of code used by model files."""
 
+from django.apps import apps
 from django.core.validators import RegexValidator
+from django.utils import timezone
 from tasksapi.constants import CONTAINER_TASK, EXECUTABLE_TASK
 
 
@@ -36,3 +38,85 @@ def determine_task_class(obj):
         return EXECUTABLE_TASK
 
     raise TypeError("Must pass in task types or instances!")
+
+
+def get_task_instance_models():
+    """Get the task instance models.
+
+    This looks the models up through Django's app registry so that
+    model files can use it without circular imports.
+
+    Returns:
+        A tuple containing the container and executable task instance
+        models.
+    """
+    return (
+        apps.get_model("tasksapi", "ContainerTaskInstance"),
+        apps.get_model("tasksapi", "ExecutableTaskInstance"),
+    )
+
+
+def count_up_to(queryset, limit):
+    """Count the rows of a queryset, but stop counting at a limit.
+
+    Use this to compare counts against limits: the database stops
+    looking after it finds enough rows, so this is cheap with the right
+    index, no matter how many rows there are.
+
+    Args:
+        queryset: The queryset to count.
+        limit: An integer specifying the most rows to count.
+
+    Returns:
+        An integer containing the number of rows, or the limit if there
+        are more rows than that.
+    """
+    return queryset[:limit].count()
+
+
+def m2m_changed_handler(sender, instance, action, reverse, model, pk_set, **_):
+    """Mark objects as modified when their many-to-many fields change.
+
+    Changing a many-to-many field doesn't save the object it's on, so
+    its datetime_modified field (which conditional requests rely on)
+    would otherwise stay the same. Connect this to the m2m_changed
+    signal for each many-to-many field's through model.
+
+    Args:
+        sender: The through model of the many-to-many field.
+        instance: The object whose relations changed. This is on the
+            other end of the relation from the field if reverse is
+            True.
+        action: A string specifying what kind of change this is.
+        reverse: A boolean specifying whether the relation was changed
+            from the other end of the relation from the field.
+        model: The model of the objects added, removed, or cleared.
+        pk_set: A set of the primary keys of the objects added or
+            removed (or None when clearing).
+    """
+    if not reverse:
+        # The field is on the instance
+        if action == "post_clear" or (
+            action in ("post_add", "post_remove") and pk_set
+        ):
+            type(instance).objects.filter(pk=instance.pk).update(
+                datetime_modified=timezone.now()
+            )
+
+        return
+
+    # The field is on the objects added or removed. When clearing, they
+    # aren't listed, so find them before they're cleared.
+    if action == "pre_clear":
+        field_name = next(
+            field.name
+            for field in model._meta.many_to_many
+            if field.remote_field.through is sender
+        )
+        queryset = model.objects.filter(**{field_name: instance})
+    elif action in ("post_add", "post_remove") and pk_set:
+        queryset = model.objects.filter(pk__in=pk_set)
+    else:
+        return
+
+    queryset.update(datetime_modified=timezone.now())
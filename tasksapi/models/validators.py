@@ -1,5 +1,8 @@
 """Contains validators for task models."""
 
+from django.conf import settings
+from tasksapi.constants import DOCKER, RETRYABLE_FAILURE_CHOICES
+
 
 def task_instance_args_are_valid(instance, fill_missing_args=False):
     """Determines whether a task instance's arguments are valid.
@@ -71,3 +74,123 @@ def task_type_args_are_valid(instance):
 
     # Valid
     return (True, "")
+
+
+def container_task_type_warm_pool_is_valid(
+    container_type, warm_pool_size, warm_pool_max_jobs_per_container
+):
+    """Determines whether a container task type's warm pool is valid.
+
+    Warm pools are only supported for Docker containers, and warm
+    containers need to be able to run at least one job.
+
+    Arg:
+        container_type: A string defined in the constants module
+            representing the type of container.
+        warm_pool_size: An integer specifying how many warm containers
+            to keep.
+        warm_pool_max_jobs_per_container: An integer specifying how many
+            jobs a warm container runs before it's replaced.
+    Returns:
+        A tuple containing a boolean and a string, where the boolean
+        signals whether the warm pool settings are valid and the string
+        explains why, in the case that the boolean is False (otherwise
+        it's an empty string).
+    """
+    if not warm_pool_size:
+        return (True, "")
+
+    if container_type != DOCKER:
+        return (False, "warm pools are only supported for Docker containers!")
+
+    if not warm_pool_max_jobs_per_container:
+        return (False, "warm containers must be able to run at least one job!")
+
+    return (True, "")
+
+
+def task_type_retry_policy_is_valid(
+    max_retries, retry_backoff, retry_backoff_max, retryable_failures
+):
+    """Determines whether a task type's retry policy is valid.
+
+    Only known classes of failures can be retried, and retries need
+    something to retry.
+
+    Arg:
+        max_retries: An integer specifying how many times a failed job
+            is retried.
+        retry_backoff: An integer specifying how many seconds to back
+            off for before the first retry.
+        retry_backoff_max: An integer specifying the most seconds to
+            back off for before any retry.
+        retryable_failures: A list of strings defined in the constants
+            module representing the classes of failures to retry.
+    Returns:
+        A tuple containing a boolean and a string, where the boolean
+        signals whether the retry policy is valid and the string
+        explains why, in the case that the boolean is False (otherwise
+        it's an empty string).
+    """
+    known_failures = [failure for failure, _ in RETRYABLE_FAILURE_CHOICES]
+    unknown_failures = [
+        failure
+        for failure in retryable_failures
+        if failure not in known_failures
+    ]
+
+    if unknown_failures:
+        return (
+            False,
+            "%s are not classes of failures! Choose from %s."
+            % (", ".join(unknown_failures), ", ".join(known_failures)),
+        )
+
+    if len(set(retryable_failures)) != len(retryable_failures):
+        return (False, "retryable failures can't be repeated!")
+
+    if max_retries and not retryable_failures:
+        return (False, "choose which failures to retry!")
+
+    if retry_backoff > retry_backoff_max:
+        return (
+            False,
+            "the retry backoff can't be greater than the maximum retry "
+            "backoff!",
+        )
+
+    return (True, "")
+
+
+def task_queue_priorities_are_valid(max_priority, default_priority):
+    """Determines whether a task queue's priority settings are valid.
+
+    A queue can't allow higher priorities than the message broker
+    supports, and its default priority needs to be one it allows.
+
+    Arg:
+        max_priority: An integer specifying the highest priority task
+            instances on the queue can have.
+        default_priority: An integer specifying the priority of task
+            instances on the queue which don't specify one.
+    Returns:
+        A tuple containing a boolean and a string, where the boolean
+        signals whether the priority settings are valid and the string
+        explains why, in the case that the boolean is False (otherwise
+        it's an empty string).
+    """
+    if max_priority > settings.CELERY_TASK_QUEUE_MAX_PRIORITY:
+        return (
+            False,
+            "the maximum priority can be at most %d!"
+            % settings.CELERY_TASK_QUEUE_MAX_PRIORITY,
+        )
+
+    if default_priority > max_priority:
+        return (
+            False,
+            "the default priority can't be greater than the maximum "
+            "priority!",
+        )
+
+    return (True, "")
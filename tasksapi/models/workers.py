@@ -0,0 +1,89 @@
+"""Model to represent Celery workers."""
+
+from datetime import timedelta
+from django.db import models
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+from tasksapi.constants import WORKER_HEARTBEAT_TIMEOUT
+from .task_queues import TaskQueue
+from .utils import m2m_changed_handler
+
+
+def get_worker_heartbeat_cutoff():
+    """Get the time workers must have sent a heartbeat since to be alive.
+
+    Returns:
+        A datetime.
+    """
+    return timezone.now() - timedelta(seconds=WORKER_HEARTBEAT_TIMEOUT)
+
+
+class WorkerQuerySet(models.QuerySet):
+    """A queryset for workers."""
+
+    def alive(self):
+        """Filter for workers which have sent a heartbeat recently."""
+        return self.filter(
+            datetime_last_heartbeat__gte=get_worker_heartbeat_cutoff()
+        )
+
+
+class Worker(models.Model):
+    """A Celery worker, as described by its heartbeats.
+
+    Workers register themselves by sending heartbeats (see the tasks
+    module), and are considered dead once they stop.
+    """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="The node name of the worker (e.g., celery@myhost).",
+    )
+    task_queues = models.ManyToManyField(
+        TaskQueue,
+        blank=True,
+        related_name="workers",
+        help_text="The queues the worker consumes from.",
+    )
+    concurrency = models.PositiveIntegerField(
+        help_text="How many jobs the worker can run at once."
+    )
+    num_active_jobs = models.PositiveIntegerField(
+        help_text="How many jobs the worker is running."
+    )
+    load_average = models.FloatField(
+        blank=True,
+        null=True,
+        help_text="The load average of the worker's host over a minute.",
+    )
+    datetime_created = models.DateTimeField(
+        auto_now_add=True, help_text="When the worker first sent a heartbeat."
+    )
+    datetime_modified = models.DateTimeField(
+        auto_now=True, help_text="When the worker was last modified."
+    )
+    datetime_last_heartbeat = models.DateTimeField(
+        help_text="When the worker last sent a heartbeat."
+    )
+
+    objects = WorkerQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        """String representation of a worker."""
+        return self.name
+
+    def is_alive(self):
+        """Determine whether the worker has sent a heartbeat recently.
+
+        Returns:
+            A boolean.
+        """
+        return self.datetime_last_heartbeat >= get_worker_heartbeat_cutoff()
+
+
+# Mark workers as modified when the queues they consume from change
+m2m_changed.connect(m2m_changed_handler, sender=Worker.task_queues.through)
@@ -8,9 +8,33 @@ from .executable_tasks import (
     ExecutableTaskTypeSerializer,
     ExecutableTaskInstanceSerializer,
 )
+from .task_instance_batch import (
+    ContainerTaskInstanceBatchCreateRequestSerializer,
+    ExecutableTaskInstanceBatchCreateRequestSerializer,
+)
+from .task_instance_bulk import (
+    TaskInstanceBulkActionRequestSerializer,
+    TaskInstanceBulkCloneResponseSerializer,
+    TaskInstanceBulkTerminateResponseSerializer,
+)
+from .task_instance_export import TaskInstanceExportRequestSerializer
+from .task_instance_import import TaskInstanceImportResponseSerializer
+from .task_instance_results import (
+    TaskInstanceResultsRequestSerializer,
+    TaskInstanceResultsResponseSerializer,
+)
+from .task_instance_states import (
+    TaskInstanceStatesWaitRequestSerializer,
+    TaskInstanceStatesWaitResponseSerializer,
+)
 from .task_instance_update import (
+    TaskInstanceRetryRequestSerializer,
+    TaskInstanceRetryResponseSerializer,
     TaskInstanceStateUpdateRequestSerializer,
     TaskInstanceStateUpdateResponseSerializer,
+    TaskInstanceStatesUpdateRequestSerializer,
+    TaskInstanceStatesUpdateResponseSerializer,
 )
 from .task_queues import TaskQueueSerializer, TaskWhitelistSerializer
 from .users import UserSerializer
+from .workers import WorkerHeartbeatRequestSerializer, WorkerSerializer
@@ -29,7 +29,7 @@ class AbstractTaskTypeSerializer(serializers.ModelSerializer):
         return data
 
     def validate(self, attrs):
-        """Ensure the argument fields passed in are valid.
+        """Ensure the argument and retry fields passed in are valid.
 
         Relies on the model's clean method. Note that the object-level
         validation used here effectively precludes being able to
@@ -70,6 +70,10 @@ class AbstractTaskTypeSerializer(serializers.ModelSerializer):
                 environment_variables=environment_vars,
                 required_arguments_default_values=default_vals,
                 required_arguments=required_args,
+                max_retries=attrs.get("max_retries", 0),
+                retry_backoff=attrs.get("retry_backoff", 30),
+                retry_backoff_max=attrs.get("retry_backoff_max", 600),
+                retryable_failures=attrs.get("retryable_failures", []),
             )
             test_type_instance.clean()
         except ValidationError as e:
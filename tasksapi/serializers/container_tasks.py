@@ -3,6 +3,7 @@
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from tasksapi.models import ContainerTaskInstance, ContainerTaskType
+from tasksapi.models.validators import container_task_type_warm_pool_is_valid
 from .abstract_tasks import (
     AbstractTaskInstanceSerializer,
     AbstractTaskTypeSerializer,
@@ -15,6 +16,25 @@ class ContainerTaskTypeSerializer(AbstractTaskTypeSerializer):
     class Meta(AbstractTaskTypeSerializer.Meta):
         model = ContainerTaskType
 
+    def validate(self, attrs):
+        """Refer to parent class docstring :)"""
+        # Call parent validator
+        attrs = super().validate(attrs)
+
+        # Test the warm pool settings
+        is_valid, reason = container_task_type_warm_pool_is_valid(
+            container_type=attrs["container_type"],
+            warm_pool_size=attrs.get("warm_pool_size", 0),
+            warm_pool_max_jobs_per_container=attrs.get(
+                "warm_pool_max_jobs_per_container", 100
+            ),
+        )
+
+        if not is_valid:
+            raise serializers.ValidationError(reason)
+
+        return attrs
+
 
 class ContainerTaskInstanceSerializer(AbstractTaskInstanceSerializer):
     """A serializer for a container task instance."""
@@ -34,6 +54,8 @@ class ContainerTaskInstanceSerializer(AbstractTaskInstanceSerializer):
                 task_type=attrs["task_type"],
                 task_queue=attrs["task_queue"],
                 arguments=attrs["arguments"],
+                priority=attrs.get("priority"),
+                depends_on=attrs.get("depends_on", []),
             )
             test_instance.clean()
         except ValidationError as e:
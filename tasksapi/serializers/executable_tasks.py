@@ -34,6 +34,8 @@ class ExecutableTaskInstanceSerializer(AbstractTaskInstanceSerializer):
                 task_type=attrs["task_type"],
                 task_queue=attrs["task_queue"],
                 arguments=attrs["arguments"],
+                priority=attrs.get("priority"),
+                depends_on=attrs.get("depends_on", []),
             )
             test_instance.clean()
         except ValidationError as e:
@@ -0,0 +1,80 @@
+"""Contains serializers to create batches of task instances."""
+
+from rest_framework import serializers
+from tasksapi.models import ContainerTaskType, ExecutableTaskType, TaskQueue
+
+# The most task instances a batch can have
+TASK_INSTANCE_BATCH_MAX_SIZE = 1000
+
+
+class TaskInstanceBatchCreateRequestSerializer(serializers.Serializer):
+    """A serializer for a task instance batch creation request.
+
+    Make sure you add a task_type field in the subclass serializer!
+    """
+
+    name = serializers.CharField(
+        max_length=200,
+        required=False,
+        allow_blank=True,
+        default="",
+        help_text="An optional non-unique name for the task instances.",
+    )
+    task_queue = serializers.PrimaryKeyRelatedField(
+        queryset=TaskQueue.objects.all(),
+        help_text="The queue the batch runs on.",
+    )
+    arguments_list = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=TASK_INSTANCE_BATCH_MAX_SIZE,
+        help_text=(
+            "A JSON array of arguments dictionaries, one for each task "
+            "instance in the batch (at most %d)."
+            % TASK_INSTANCE_BATCH_MAX_SIZE
+        ),
+    )
+    priority = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text=(
+            "The priority of the task instances. Defaults to the "
+            "queue's default priority."
+        ),
+    )
+    parallelism = serializers.IntegerField(
+        min_value=1,
+        default=1,
+        help_text=(
+            "How many of the batch's task instances the worker runs at "
+            "once. Defaults to 1."
+        ),
+    )
+
+
+class ContainerTaskInstanceBatchCreateRequestSerializer(
+    TaskInstanceBatchCreateRequestSerializer
+):
+    """A serializer for a container task instance batch creation request."""
+
+    task_type = serializers.PrimaryKeyRelatedField(
+        queryset=ContainerTaskType.objects.all(),
+        help_text=(
+            "The task type of the task instances. Docker task types' "
+            "container images need a POSIX shell (sh), since the batch "
+            "runs in shared warm containers."
+        ),
+    )
+
+
+class ExecutableTaskInstanceBatchCreateRequestSerializer(
+    TaskInstanceBatchCreateRequestSerializer
+):
+    """A serializer for an executable task instance batch creation request."""
+
+    task_type = serializers.PrimaryKeyRelatedField(
+        queryset=ExecutableTaskType.objects.all(),
+        help_text="The task type of the task instances.",
+    )
@@ -0,0 +1,41 @@
+"""Contains serializers for acting on lots of task instances at once."""
+
+from rest_framework import serializers
+
+
+class TaskInstanceBulkActionRequestSerializer(serializers.Serializer):
+    """A serializer for choosing task instances to act on.
+
+    The task instances can instead be chosen with the same filters as
+    task instance lists.
+    """
+
+    uuids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text=(
+            "A JSON array of the UUIDs of the task instances to act on. "
+            "If this isn't provided, the task instances are chosen "
+            "with filters."
+        ),
+    )
+
+
+class TaskInstanceBulkCloneResponseSerializer(serializers.Serializer):
+    """A serializer for a bulk clone request's response."""
+
+    uuids = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="A JSON array of the UUIDs of the clones.",
+    )
+
+
+class TaskInstanceBulkTerminateResponseSerializer(serializers.Serializer):
+    """A serializer for a bulk terminate request's response."""
+
+    num_terminated = serializers.IntegerField(
+        help_text=(
+            "The number of unfinished task instances which were sent a "
+            "terminate signal."
+        )
+    )
@@ -0,0 +1,21 @@
+"""Contains a serializer for exporting task instances."""
+
+from rest_framework import serializers
+from tasksapi.constants import EXPORT_FORMAT_CHOICES, JSONL_EXPORT
+
+
+class TaskInstanceExportRequestSerializer(serializers.Serializer):
+    """A serializer for the query parameters of an export request.
+
+    The task instances to export are chosen with the same filters as
+    task instance lists.
+    """
+
+    export_format = serializers.ChoiceField(
+        choices=EXPORT_FORMAT_CHOICES,
+        default=JSONL_EXPORT,
+        help_text=(
+            "The format to export the task instances in. Defaults to "
+            "JSON Lines."
+        ),
+    )
@@ -0,0 +1,25 @@
+"""Contains serializers for importing task instances."""
+
+from rest_framework import serializers
+
+
+class TaskInstanceImportErrorSerializer(serializers.Serializer):
+    """A serializer for a line skipped in an import."""
+
+    line = serializers.IntegerField(
+        help_text="The line number of the skipped task instance."
+    )
+    reason = serializers.CharField(
+        help_text="Why the task instance was skipped."
+    )
+
+
+class TaskInstanceImportResponseSerializer(serializers.Serializer):
+    """A serializer for an import request's response."""
+
+    num_created = serializers.IntegerField(
+        help_text="The number of task instances created."
+    )
+    errors = TaskInstanceImportErrorSerializer(
+        many=True, help_text="The lines which were skipped, and why."
+    )
@@ -0,0 +1,41 @@
+"""Contains serializers for reporting uploaded task instance results."""
+
+from rest_framework import serializers
+
+
+class TaskInstanceResultsFileSerializer(serializers.Serializer):
+    """A serializer for a file in a task instance's results."""
+
+    path = serializers.CharField(
+        help_text="The file's path relative to the results directory."
+    )
+    size = serializers.IntegerField(
+        min_value=0, help_text="The file's size in bytes."
+    )
+    sha256 = serializers.RegexField(
+        r"^[0-9a-f]{64}$", help_text="The file's SHA-256 hash."
+    )
+
+
+class TaskInstanceResultsRequestSerializer(serializers.Serializer):
+    """A serializer for a task instance results report's request."""
+
+    location = serializers.CharField(
+        max_length=400,
+        help_text=(
+            "Where the results were uploaded to (e.g., s3://bucket/uuid/)."
+        ),
+    )
+    manifest = TaskInstanceResultsFileSerializer(
+        many=True, help_text="The uploaded results files."
+    )
+
+
+class TaskInstanceResultsResponseSerializer(serializers.Serializer):
+    """A serializer for a task instance results report's response."""
+
+    uuid = serializers.CharField(max_length=36)
+    results_location = serializers.CharField(max_length=400)
+    num_files = serializers.IntegerField(
+        help_text="The number of uploaded results files."
+    )
@@ -0,0 +1,91 @@
+"""Contains serializers for waiting on task instance state changes."""
+
+from uuid import UUID
+from rest_framework import serializers
+from tasksapi.constants import STATE_CHOICES
+from tasksapi.utils import TASK_INSTANCE_STATES_MAX_WAIT
+
+
+class TaskInstanceStatesWaitRequestSerializer(serializers.Serializer):
+    """A serializer for the query parameters of a state wait request."""
+
+    uuids = serializers.CharField(
+        help_text=(
+            "A comma-separated list of the UUIDs of the task instances "
+            "(of either class) to wait on."
+        )
+    )
+    states = serializers.CharField(
+        required=False,
+        help_text=(
+            "A comma-separated list of the states the task instances "
+            "were last seen in, in the same order as the UUIDs. The "
+            "response is sent as soon as any task instance is in "
+            "another state. If this isn't provided, the response is "
+            "sent right away."
+        ),
+    )
+    wait = serializers.FloatField(
+        default=0,
+        min_value=0,
+        max_value=TASK_INSTANCE_STATES_MAX_WAIT,
+        help_text=(
+            "The maximum number of seconds to wait for a state change "
+            "for. Defaults to 0."
+        ),
+    )
+
+    def validate_uuids(self, value):
+        """Make sure the task instance UUIDs are valid."""
+        uuids = []
+
+        for uuid in value.split(","):
+            try:
+                uuids.append(str(UUID(uuid)))
+            except ValueError:
+                raise serializers.ValidationError(
+                    "'%s' is not a valid UUID!" % uuid
+                )
+
+        return uuids
+
+    def validate_states(self, value):
+        """Make sure the states are valid."""
+        states = value.split(",")
+        valid_states = [state for state, _ in STATE_CHOICES]
+
+        for state in states:
+            if state not in valid_states:
+                raise serializers.ValidationError(
+                    "'%s' is not a valid state!" % state
+                )
+
+        return states
+
+    def validate(self, attrs):
+        """Pair up the UUIDs with their known states."""
+        if "states" not in attrs:
+            attrs["known_states"] = None
+
+            return attrs
+
+        if len(attrs["states"]) != len(attrs["uuids"]):
+            raise serializers.ValidationError(
+                "There must be as many states as UUIDs!"
+            )
+
+        attrs["known_states"] = dict(zip(attrs["uuids"], attrs["states"]))
+
+        return attrs
+
+
+class TaskInstanceStatesWaitResponseSerializer(serializers.Serializer):
+    """A serializer for a state wait request's response."""
+
+    states = serializers.DictField(
+        child=serializers.ChoiceField(choices=STATE_CHOICES),
+        help_text=(
+            "A JSON dictionary mapping the UUIDs of the task instances "
+            "which exist to their current states."
+        ),
+    )
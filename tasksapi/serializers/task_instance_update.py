@@ -3,14 +3,23 @@
 Emphasis on "any". This works for both container *and* executable tasks.
 """
 
+from uuid import UUID
 from rest_framework import serializers
-from tasksapi.constants import STATE_CHOICES
+from tasksapi.constants import RETRYABLE_FAILURE_CHOICES, STATE_CHOICES
 
 
 class TaskInstanceStateUpdateRequestSerializer(serializers.Serializer):
     """A serializer for a task instance update's request."""
 
     state = serializers.ChoiceField(choices=STATE_CHOICES)
+    datetime = serializers.DateTimeField(
+        required=False,
+        help_text=(
+            "When the task instance reached its new state, as reported "
+            "by whatever ran it. Defaults to when the request is "
+            "received."
+        ),
+    )
 
 
 class TaskInstanceStateUpdateResponseSerializer(serializers.Serializer):
@@ -18,3 +27,75 @@ class TaskInstanceStateUpdateResponseSerializer(serializers.Serializer):
 
     uuid = serializers.CharField(max_length=36)
     state = serializers.ChoiceField(choices=STATE_CHOICES)
+
+
+class TaskInstanceStatesUpdateRequestSerializer(serializers.Serializer):
+    """A serializer for a bulk task instance update's request."""
+
+    states = serializers.DictField(
+        child=serializers.ChoiceField(choices=STATE_CHOICES),
+        help_text=(
+            "A JSON dictionary mapping task instance UUIDs to their new "
+            "states."
+        ),
+    )
+    datetime = serializers.DateTimeField(
+        required=False,
+        help_text=(
+            "When the task instances reached their new states, as "
+            "reported by whatever ran them. Defaults to when the "
+            "request is received."
+        ),
+    )
+
+    def validate_states(self, value):
+        """Make sure the task instance UUIDs are valid."""
+        for uuid in value:
+            try:
+                UUID(uuid)
+            except ValueError:
+                raise serializers.ValidationError(
+                    "'%s' is not a valid UUID!" % uuid
+                )
+
+        return value
+
+
+class TaskInstanceStatesUpdateResponseSerializer(serializers.Serializer):
+    """A serializer for a bulk task instance update's response."""
+
+    num_updated = serializers.IntegerField(
+        help_text="The number of task instances whose state changed."
+    )
+
+
+class TaskInstanceRetryRequestSerializer(serializers.Serializer):
+    """A serializer for a task instance retry's request."""
+
+    failure = serializers.ChoiceField(
+        choices=RETRYABLE_FAILURE_CHOICES,
+        help_text="The class of failure the job is being retried after.",
+    )
+    error = serializers.CharField(
+        allow_blank=True, help_text="The error the job failed with."
+    )
+    retry_delay = serializers.FloatField(
+        min_value=0, help_text="How many seconds the job is backing off for."
+    )
+    datetime = serializers.DateTimeField(
+        required=False,
+        help_text=(
+            "When the job failed, as reported by whatever ran it. "
+            "Defaults to when the request is received."
+        ),
+    )
+
+
+class TaskInstanceRetryResponseSerializer(serializers.Serializer):
+    """A serializer for a task instance retry's response."""
+
+    uuid = serializers.CharField(max_length=36)
+    state = serializers.ChoiceField(choices=STATE_CHOICES)
+    num_retries = serializers.IntegerField(
+        help_text="The number of times the job has been retried."
+    )
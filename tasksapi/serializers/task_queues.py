@@ -2,17 +2,62 @@
 
 from rest_framework import serializers
 from tasksapi.models import TaskQueue, TaskWhitelist
+from tasksapi.models.validators import task_queue_priorities_are_valid
 
 
 class TaskQueueSerializer(serializers.ModelSerializer):
     """A serializer for a task type."""
 
     user = serializers.SlugRelatedField(slug_field="username", read_only=True)
+    is_served = serializers.BooleanField(
+        read_only=True,
+        help_text=(
+            "Whether any live workers are consuming from the queue. "
+            "Task instances on queues which aren't served won't run "
+            "until a worker comes along."
+        ),
+    )
+    num_workers = serializers.IntegerField(
+        source="worker_stats.num_workers",
+        read_only=True,
+        help_text="How many live workers are consuming from the queue.",
+    )
+    worker_capacity = serializers.IntegerField(
+        source="worker_stats.capacity",
+        read_only=True,
+        help_text="How many jobs the queue's live workers can run at once.",
+    )
+    spare_worker_capacity = serializers.IntegerField(
+        source="worker_stats.spare_capacity",
+        read_only=True,
+        help_text=(
+            "How many more jobs the queue's live workers could be "
+            "running right now."
+        ),
+    )
 
     class Meta:
         model = TaskQueue
         fields = "__all__"
 
+    def validate(self, attrs):
+        """Validate the queue's priority settings."""
+        # Fall back to the existing queue's values for partial updates
+        is_valid, reason = task_queue_priorities_are_valid(
+            max_priority=attrs.get(
+                "max_priority", getattr(self.instance, "max_priority", 0)
+            ),
+            default_priority=attrs.get(
+                "default_priority",
+                getattr(self.instance, "default_priority", 0),
+            ),
+        )
+
+        if not is_valid:
+            raise serializers.ValidationError(reason)
+
+        return attrs
+
 
 class TaskWhitelistSerializer(serializers.ModelSerializer):
     """A serializer for a task whitelist."""
@@ -0,0 +1,44 @@
+"""Contains serializers for workers."""
+
+from rest_framework import serializers
+from tasksapi.models import Worker
+
+
+class WorkerSerializer(serializers.ModelSerializer):
+    """A serializer for a worker."""
+
+    task_queues = serializers.SlugRelatedField(
+        many=True, slug_field="name", read_only=True
+    )
+    is_alive = serializers.BooleanField(
+        read_only=True,
+        help_text="Whether the worker has sent a heartbeat recently.",
+    )
+
+    class Meta:
+        model = Worker
+        fields = "__all__"
+
+
+class WorkerHeartbeatRequestSerializer(serializers.Serializer):
+    """A serializer for a worker heartbeat's request."""
+
+    name = serializers.CharField(
+        max_length=255,
+        help_text="The node name of the worker (e.g., celery@myhost).",
+    )
+    task_queues = serializers.ListField(
+        child=serializers.CharField(),
+        help_text="The names of the queues the worker consumes from.",
+    )
+    concurrency = serializers.IntegerField(
+        min_value=0, help_text="How many jobs the worker can run at once."
+    )
+    num_active_jobs = serializers.IntegerField(
+        min_value=0, help_text="How many jobs the worker is running."
+    )
+    load_average = serializers.FloatField(
+        required=False,
+        allow_null=True,
+        help_text="The load average of the worker's host over a minute.",
+    )
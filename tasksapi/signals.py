@@ -0,0 +1,25 @@
+"""Contains custom signals for task instances."""
+
+from django.dispatch import Signal
+
+# Sent when task instances are created, change state, or are deleted
+# without their save or delete signals being sent (e.g., with bulk
+# queries). The sender is the task instance model, and task_type_ids
+# contains the IDs of the task instances' task types.
+task_instances_changed = Signal(providing_args=["task_type_ids"])
+
+
+def send_task_instances_changed(instance_model, task_type_ids):
+    """Tell receivers that task instances changed in bulk.
+
+    Args:
+        instance_model: The task instance model of the instances.
+        task_type_ids: An iterable containing the IDs of the task
+            instances' task types. Nothing is sent if this is empty.
+    """
+    task_type_ids = set(task_type_ids)
+
+    if task_type_ids:
+        task_instances_changed.send(
+            sender=instance_model, task_type_ids=task_type_ids
+        )
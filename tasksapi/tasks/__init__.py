@@ -3,9 +3,18 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-from .base_task import run_task
+from .base_task import (
+    BATCH_STATES_EVENT_TYPE,
+    RETRY_EVENT_TYPE,
+    run_task,
+    run_task_batch,
+)
 from .container_tasks import (
     run_docker_container_command,
     run_singularity_container_command,
 )
+from .docker_warm_pool import run_docker_warm_pool_command
 from .executable_tasks import run_executable_command
+from .heartbeats import WORKER_HEARTBEAT_EVENT_TYPE
+from .results_uploads import RESULTS_EVENT_TYPE
+from .utils import JobTimeout
@@ -4,7 +4,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import os
-from celery import shared_task
+from celery import current_app, shared_task
 from celery.signals import (
     after_task_publish,
     task_prerun,
@@ -19,30 +19,55 @@ from tasksapi.constants import (
     SUCCESSFUL,
     FAILED,
     TERMINATED,
+    TIMED_OUT,
     CONTAINER_TASK,
     EXECUTABLE_TASK,
     DOCKER,
     SINGULARITY,
 )
+from .batch_tasks import run_batch
 from .container_tasks import (
     run_docker_container_command,
     run_singularity_container_command,
 )
+from .docker_warm_pool import run_docker_warm_pool_command
 from .executable_tasks import run_executable_command
+from .results_uploads import queue_results_upload
+from .retries import get_failure_class, get_retry_delay
+from .utils import JobTimeout, get_current_datetime_string
 
+# The type of the Celery events which report the states of a batch's
+# task instances to the Celery events monitor
+BATCH_STATES_EVENT_TYPE = "task-batch-states"
 
-@shared_task
+# The type of the Celery events which report retries of task instances'
+# jobs to the Celery events monitor
+RETRY_EVENT_TYPE = "task-instance-retry"
+
+# How many characters of a failed job's error to report when retrying it
+RETRY_ERROR_MAX_LENGTH = 1000
+
+
+@shared_task(bind=True)
 def run_task(
+    self,
     uuid,
     task_class,
     command_to_run,
     env_vars_list,
     args_dict,
+    max_runtime=None,
+    retry_policy=None,
     **task_class_kwargs
 ):
-    """Launch an instance's job.
+    """Launch an instance's job, retrying it if it fails transiently.
 
     This is the main function used to launch all tasks instance jobs.
+    Jobs which fail in one of the ways their retry policy allows are
+    sent back to their queue (with the same job ID) to be run again
+    after backing off, and the retry is reported to the saltant server.
+    Once a container job succeeds, its results are queued up to be
+    uploaded in the background (see the results_uploads module).
 
     Args:
         uuid: A string containing the uuid of the job being run.
@@ -54,6 +79,86 @@ def run_task(
             environment.
         args_dict: A dictionary containing arguments and corresponding
             values.
+        max_runtime: An optional integer specifying how many seconds
+            the job can run for before it's stopped.
+        retry_policy: An optional dictionary containing the retry policy
+            of the job's task type (see the task type models). If this
+            isn't given, the job isn't retried.
+        **task_class_kwargs: Arbitrary keywords arguments containing
+            variables specific to the class of the task. See run_job.
+
+    Raises:
+        celery.exceptions.Retry: The job is being retried.
+        JobTimeout: The job ran for longer than its maximum runtime.
+        NotImplementedError: An unsupported container type was passed
+            in.
+    """
+    try:
+        result = run_job(
+            uuid=uuid,
+            task_class=task_class,
+            command_to_run=command_to_run,
+            env_vars_list=env_vars_list,
+            args_dict=args_dict,
+            max_runtime=max_runtime,
+            **task_class_kwargs
+        )
+    except Exception as exc:
+        retry_delay = get_retry_delay(
+            retry_policy=retry_policy,
+            exception=exc,
+            num_retries=self.request.retries,
+        )
+
+        # Fail like usual if the job can't be retried
+        if retry_delay is None:
+            raise
+
+        report_task_instance_retry(
+            job_uuid=self.request.id,
+            failure=get_failure_class(exc),
+            error=repr(exc)[:RETRY_ERROR_MAX_LENGTH],
+            retry_delay=retry_delay,
+        )
+
+        # Send the job back to its queue with the same priority
+        raise self.retry(
+            exc=exc,
+            countdown=retry_delay,
+            max_retries=retry_policy["max_retries"],
+            priority=(self.request.delivery_info or {}).get("priority"),
+        )
+
+    # Upload the job's results while the worker moves on to its next job
+    if task_class == CONTAINER_TASK and task_class_kwargs["results_path"]:
+        queue_results_upload(uuid)
+
+    return result
+
+
+def run_job(
+    uuid,
+    task_class,
+    command_to_run,
+    env_vars_list,
+    args_dict,
+    max_runtime=None,
+    **task_class_kwargs
+):
+    """Run an instance's job.
+
+    Args:
+        uuid: A string containing the uuid of the job being run.
+        task_class: A string defined in the constants module resprenting
+            one of the task classes.
+        command_to_run: A string containing the command to run.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        args_dict: A dictionary containing arguments and corresponding
+            values.
+        max_runtime: An optional integer specifying how many seconds
+            the job can run for before it's stopped.
         **task_class_kwargs: Arbitrary keywords arguments containing
             variables specific to the class of the task:
 
@@ -67,6 +172,16 @@ def run_task(
                 container to pull.
             container_type: A string defined in the constants module
                 representing the type of container.
+            task_type_id: An optional integer containing the ID of
+                the task type, whose warm pool the job runs in (Docker
+                only).
+            warm_pool_size: An optional integer specifying how many
+                warm containers to keep for the task type (Docker only).
+                If this is zero or not given, a fresh container is
+                started for the job.
+            warm_pool_max_jobs_per_container: An optional integer
+                specifying how many jobs a warm container runs before
+                it's replaced.
 
             For executable task types you should be passing in
 
@@ -75,6 +190,7 @@ def run_task(
                 to read from.
 
     Raises:
+        JobTimeout: The job ran for longer than its maximum runtime.
         NotImplementedError: An unsupported container type was passed
             in.
     """
@@ -87,6 +203,25 @@ def run_task(
         container_type = task_class_kwargs["container_type"]
 
         # Determine whether to run a Docker or Singularity container
+        if container_type == DOCKER and task_class_kwargs.get(
+            "warm_pool_size"
+        ):
+            return run_docker_warm_pool_command(
+                uuid=uuid,
+                task_type_id=task_class_kwargs["task_type_id"],
+                container_image=container_image,
+                command_to_run=command_to_run,
+                logs_path=logs_path,
+                results_path=results_path,
+                env_vars_list=env_vars_list,
+                args_dict=args_dict,
+                warm_pool_size=task_class_kwargs["warm_pool_size"],
+                warm_pool_max_jobs_per_container=task_class_kwargs[
+                    "warm_pool_max_jobs_per_container"
+                ],
+                timeout=max_runtime,
+            )
+
         if container_type == DOCKER:
             return run_docker_container_command(
                 uuid=uuid,
@@ -96,6 +231,7 @@ def run_task(
                 results_path=results_path,
                 env_vars_list=env_vars_list,
                 args_dict=args_dict,
+                timeout=max_runtime,
             )
 
         if container_type == SINGULARITY:
@@ -107,6 +243,7 @@ def run_task(
                 results_path=results_path,
                 env_vars_list=env_vars_list,
                 args_dict=args_dict,
+                timeout=max_runtime,
             )
 
         # Container type passed in is not supported!
@@ -123,6 +260,7 @@ def run_task(
             env_vars_list=env_vars_list,
             args_dict=args_dict,
             json_file_option=json_file_option,
+            timeout=max_runtime,
         )
     else:
         # Task class passed in is not supported!
@@ -131,6 +269,76 @@ def run_task(
         )
 
 
+@shared_task
+def run_task_batch(
+    batch_uuid,
+    task_class,
+    command_to_run,
+    env_vars_list,
+    items,
+    parallelism=1,
+    max_runtime=None,
+    **task_class_kwargs
+):
+    """Launch the jobs of a batch of task instances together.
+
+    The states of the batch's task instances are reported by this
+    function (in bulk, except that each task instance is reported as
+    running as soon as it starts), rather than by the signal handlers
+    below. The results of container task instances which succeed are
+    queued up to be uploaded as they finish.
+
+    Args:
+        batch_uuid: A string containing the uuid of the batch being
+            run.
+        task_class: A string defined in the constants module resprenting
+            one of the task classes.
+        command_to_run: A string containing the command to run.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        items: A list of two-element lists, each containing a task
+            instance's UUID and its arguments dictionary.
+        parallelism: An optional integer specifying how many task
+            instances to run at once. Defaults to 1.
+        max_runtime: An optional integer specifying how many seconds
+            each task instance can run for before it's stopped.
+        **task_class_kwargs: Arbitrary keywords arguments containing
+            variables specific to the class of the task. See run_task.
+
+    Raises:
+        NotImplementedError: An unsupported task class or container type
+            was passed in.
+    """
+
+    def report_states(uuid_states):
+        """Report states and upload the results of successful jobs."""
+        report_task_instance_states(
+            batch_uuid=batch_uuid, uuid_states=uuid_states
+        )
+
+        if (
+            task_class != CONTAINER_TASK
+            or not task_class_kwargs["results_path"]
+        ):
+            return
+
+        for uuid, state in uuid_states.items():
+            if state == SUCCESSFUL:
+                queue_results_upload(uuid)
+
+    run_batch(
+        items=items,
+        task_class=task_class,
+        command_to_run=command_to_run,
+        env_vars_list=env_vars_list,
+        parallelism=parallelism,
+        max_runtime=max_runtime,
+        report_states=report_states,
+        **task_class_kwargs
+    )
+
+
 def update_job(api_token, job_uuid, state):
     """Update the status of the job.
 
@@ -152,14 +360,197 @@ def update_job(api_token, job_uuid, state):
     )
     endpoint_url = "/".join(s.strip("/") for s in endpoint_url_pieces) + "/"
 
-    # Make the HTTP request
+    # Make the HTTP request, including when the state changed
     return requests.patch(
         endpoint_url,
-        data={"state": state},
+        data={"state": state, "datetime": get_current_datetime_string()},
         headers={"Authorization": "Token {}".format(api_token)},
     )
 
 
+def report_task_instance_state(job_uuid, state):
+    """Report a task instance's new state to the saltant server.
+
+    If a Celery events monitor is in charge of updating task instance
+    states, then this does nothing, since the monitor picks up the state
+    change from the Celery event stream instead.
+
+    Args:
+        job_uuid: A string containing the UUID for the task instance to
+            update.
+        state: A string which must be one of the state constants.
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request, or None if no request was made.
+    """
+    if os.environ["USE_CELERY_EVENTS_MONITOR"] == "True":
+        return None
+
+    return update_job(
+        api_token=os.environ["API_AUTH_TOKEN"], job_uuid=job_uuid, state=state
+    )
+
+
+def update_jobs(api_token, uuid_states):
+    """Update the statuses of several jobs at once.
+
+    Args:
+        api_token: A string containing a valid token for the API.
+        uuid_states: A dictionary mapping the UUIDs of task instances to
+            update to their new states (which must be one of the state
+            constants).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request.
+    """
+    # Form the API endpoint URL
+    base_url = os.environ["DJANGO_BASE_URL"]
+    endpoint_url_pieces = (base_url, r"/api/updatetaskinstancestatuses/")
+    endpoint_url = "/".join(s.strip("/") for s in endpoint_url_pieces) + "/"
+
+    # Make the HTTP request, including when the states changed
+    return requests.patch(
+        endpoint_url,
+        json={
+            "states": uuid_states,
+            "datetime": get_current_datetime_string(),
+        },
+        headers={"Authorization": "Token {}".format(api_token)},
+    )
+
+
+def report_task_instance_states(batch_uuid, uuid_states):
+    """Report new states for a batch's task instances to the server.
+
+    If a Celery events monitor is in charge of updating task instance
+    states, then this sends the states in a custom Celery event for the
+    monitor to pick up.
+
+    Args:
+        batch_uuid: A string containing the UUID of the batch the task
+            instances are in.
+        uuid_states: A dictionary mapping the UUIDs of task instances to
+            update to their new states (which must be one of the state
+            constants).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request, or None if no request was made.
+    """
+    if os.environ["USE_CELERY_EVENTS_MONITOR"] == "True":
+        with current_app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(
+                BATCH_STATES_EVENT_TYPE, uuid=batch_uuid, states=uuid_states
+            )
+
+        return None
+
+    return update_jobs(
+        api_token=os.environ["API_AUTH_TOKEN"], uuid_states=uuid_states
+    )
+
+
+def update_job_retry(api_token, job_uuid, failure, error, retry_delay):
+    """Tell the server that a job is being retried.
+
+    Args:
+        api_token: A string containing a valid token for the API.
+        job_uuid: A string containing the UUID for the task instance
+            being retried.
+        failure: A string defined in the constants module representing
+            the class of the failure.
+        error: A string describing the error the job failed with.
+        retry_delay: A float specifying how many seconds the job is
+            backing off for.
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request.
+    """
+    # Form the API endpoint URL
+    base_url = os.environ["DJANGO_BASE_URL"]
+    endpoint_url_pieces = (base_url, r"/api/taskinstanceretries/", job_uuid)
+    endpoint_url = "/".join(s.strip("/") for s in endpoint_url_pieces) + "/"
+
+    # Make the HTTP request, including when the job failed
+    return requests.post(
+        endpoint_url,
+        json={
+            "failure": failure,
+            "error": error,
+            "retry_delay": retry_delay,
+            "datetime": get_current_datetime_string(),
+        },
+        headers={"Authorization": "Token {}".format(api_token)},
+    )
+
+
+def report_task_instance_retry(job_uuid, failure, error, retry_delay):
+    """Report a retry of a task instance's job to the saltant server.
+
+    If a Celery events monitor is in charge of updating task instance
+    states, then this sends the retry in a custom Celery event for the
+    monitor to pick up.
+
+    Args:
+        job_uuid: A string containing the UUID for the task instance
+            being retried.
+        failure: A string defined in the constants module representing
+            the class of the failure.
+        error: A string describing the error the job failed with.
+        retry_delay: A float specifying how many seconds the job is
+            backing off for.
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request, or None if no request was made.
+    """
+    if os.environ["USE_CELERY_EVENTS_MONITOR"] == "True":
+        with current_app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(
+                RETRY_EVENT_TYPE,
+                uuid=job_uuid,
+                failure=failure,
+                error=error,
+                retry_delay=retry_delay,
+            )
+
+        return None
+
+    return update_job_retry(
+        api_token=os.environ["API_AUTH_TOKEN"],
+        job_uuid=job_uuid,
+        failure=failure,
+        error=error,
+        retry_delay=retry_delay,
+    )
+
+
+def is_batch_task(task_name):
+    """Determine whether a Celery task runs a batch of task instances.
+
+    Args:
+        task_name: A string containing the name of the Celery task.
+    Returns:
+        A boolean.
+    """
+    return task_name == run_task_batch.name
+
+
+def report_unfinished_batch_states(batch_kwargs, state):
+    """Report a state for all of a batch's unfinished task instances.
+
+    Task instances in the batch which have already finished are left
+    alone by the server.
+
+    Args:
+        batch_kwargs: A dictionary containing the keyword arguments the
+            batch was run with.
+        state: A string which must be one of the state constants.
+    """
+    report_task_instance_states(
+        batch_uuid=batch_kwargs["batch_uuid"],
+        uuid_states={uuid: state for uuid, _ in batch_kwargs["items"]},
+    )
+
+
 @after_task_publish.connect
 def task_sent_handler(**kwargs):
     """Update the state of the task instance.
@@ -173,10 +564,16 @@ def task_sent_handler(**kwargs):
         kwargs: A dictionary containing information about the task
             instance.
     """
-    update_job(
-        api_token=os.environ["API_AUTH_TOKEN"],
-        job_uuid=str(kwargs["headers"]["id"]),
-        state=PUBLISHED,
+    # Batches are created as published
+    if is_batch_task(kwargs["sender"]):
+        return
+
+    # Retries are reported (as being published) before they're sent
+    if kwargs["headers"].get("retries"):
+        return
+
+    report_task_instance_state(
+        job_uuid=str(kwargs["headers"]["id"]), state=PUBLISHED
     )
 
 
@@ -188,11 +585,11 @@ def task_prerun_handler(**kwargs):
         kwargs: A dictionary containing information about the task
             instance.
     """
-    update_job(
-        api_token=os.environ["API_AUTH_TOKEN"],
-        job_uuid=str(kwargs["task_id"]),
-        state=RUNNING,
-    )
+    # Batches report their own task instances' states
+    if is_batch_task(kwargs["task"].name):
+        return
+
+    report_task_instance_state(job_uuid=str(kwargs["task_id"]), state=RUNNING)
 
 
 @task_success.connect
@@ -203,10 +600,12 @@ def task_success_handler(**kwargs):
         kwargs: A dictionary containing information about the task
             instance.
     """
-    update_job(
-        api_token=os.environ["API_AUTH_TOKEN"],
-        job_uuid=kwargs["sender"].request.id,
-        state=SUCCESSFUL,
+    # Batches report their own task instances' states
+    if is_batch_task(kwargs["sender"].name):
+        return
+
+    report_task_instance_state(
+        job_uuid=kwargs["sender"].request.id, state=SUCCESSFUL
     )
 
 
@@ -218,11 +617,19 @@ def task_failure_handler(**kwargs):
         kwargs: A dictionary containing information about the task
             instance.
     """
-    update_job(
-        api_token=os.environ["API_AUTH_TOKEN"],
-        job_uuid=kwargs["task_id"],
-        state=FAILED,
-    )
+    # Jobs which ran out of time get their own state
+    if isinstance(kwargs["exception"], JobTimeout):
+        state = TIMED_OUT
+    else:
+        state = FAILED
+
+    # If a whole batch failed, fail the task instances it didn't get to
+    if is_batch_task(kwargs["sender"].name):
+        report_unfinished_batch_states(kwargs["kwargs"], state)
+
+        return
+
+    report_task_instance_state(job_uuid=kwargs["task_id"], state=state)
 
 
 @task_revoked.connect
@@ -233,8 +640,11 @@ def task_revoked_handler(**kwargs):
         kwargs: A dictionary containing information about the task
             instance.
     """
-    update_job(
-        api_token=os.environ["API_AUTH_TOKEN"],
-        job_uuid=kwargs["request"].task_id,
-        state=TERMINATED,
+    if is_batch_task(kwargs["sender"].name):
+        report_unfinished_batch_states(kwargs["request"].kwargs, TERMINATED)
+
+        return
+
+    report_task_instance_state(
+        job_uuid=kwargs["request"].task_id, state=TERMINATED
     )
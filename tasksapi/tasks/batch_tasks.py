@@ -0,0 +1,310 @@
+"""Contains task functionality for running batches of task instances.
+
+A batch is a set of task instances of the same task type which are run
+by a single job: the job pulls the task type's container (if any) once,
+and then runs each instance's command with that instance's arguments,
+either one after another or a few at a time. Docker instances in a batch
+share containers, which are run as a private warm pool (see the
+docker_warm_pool module), so their images need a POSIX shell.
+
+Note that none of these functions themselves are registered with Celery;
+instead they are used by other functions which *are* registered with
+Celery.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from multiprocessing.pool import ThreadPool
+import os
+import sys
+import threading
+import time
+from tasksapi.constants import (
+    RUNNING,
+    SUCCESSFUL,
+    FAILED,
+    TIMED_OUT,
+    CONTAINER_TASK,
+    EXECUTABLE_TASK,
+    DOCKER,
+    SINGULARITY,
+)
+from .container_tasks import (
+    pull_singularity_image,
+    run_singularity_image_command,
+)
+from .docker_client import get_docker_client
+from .docker_warm_pool import (
+    DockerWarmPool,
+    build_job_command,
+    run_job_in_warm_pool,
+)
+from .executable_tasks import run_executable_command
+from .utils import JobTimeout, on_termination, stop_running_processes
+
+# How many seconds to hold on to finished batch items' states before
+# reporting them (items starting to run are reported right away)
+BATCH_STATE_REPORT_INTERVAL = 5
+
+
+class BatchStateReporter(object):
+    """Buffers the states of a batch's items and reports them in bulk."""
+
+    def __init__(self, report_states):
+        """Initialize an empty buffer.
+
+        Args:
+            report_states: A function which takes a dictionary mapping
+                task instance UUIDs to states and reports them.
+        """
+        self.report_states = report_states
+        self.buffer = {}
+        self.last_report_time = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, uuid, state):
+        """Record a batch item's state, reporting states if it's time.
+
+        Args:
+            uuid: A string containing the UUID of the batch item.
+            state: A string which must be one of the state constants.
+        """
+        with self.lock:
+            self.buffer[uuid] = state
+
+            if time.time() - self.last_report_time < (
+                BATCH_STATE_REPORT_INTERVAL
+            ):
+                return
+
+            uuid_states = self.buffer
+            self.buffer = {}
+            self.last_report_time = time.time()
+
+        self.report_states(uuid_states)
+
+    def record_started(self, uuid):
+        """Report that a batch item started running.
+
+        This is reported right away, along with any buffered states, so
+        that the item's start time is accurate.
+
+        Args:
+            uuid: A string containing the UUID of the batch item.
+        """
+        with self.lock:
+            uuid_states = self.buffer
+            uuid_states[uuid] = RUNNING
+            self.buffer = {}
+            self.last_report_time = time.time()
+
+        self.report_states(uuid_states)
+
+    def flush(self):
+        """Report all buffered states."""
+        with self.lock:
+            uuid_states = self.buffer
+            self.buffer = {}
+            self.last_report_time = time.time()
+
+        if uuid_states:
+            self.report_states(uuid_states)
+
+
+def run_batch(
+    items,
+    task_class,
+    command_to_run,
+    env_vars_list,
+    parallelism,
+    max_runtime,
+    report_states,
+    **task_class_kwargs
+):
+    """Run a batch of task instances.
+
+    Args:
+        items: A list of two-element lists, each containing a task
+            instance's UUID and its arguments dictionary.
+        task_class: A string defined in the constants module
+            representing one of the task classes.
+        command_to_run: A string containing the command to run.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        parallelism: An integer specifying how many items to run at
+            once.
+        max_runtime: An integer (or None) specifying how many seconds
+            each item can run for before it's stopped.
+        report_states: A function which takes a dictionary mapping task
+            instance UUIDs to states and reports them.
+        **task_class_kwargs: Arbitrary keywords arguments containing
+            variables specific to the class of the task. See run_task.
+
+    Raises:
+        NotImplementedError: An unsupported task class or container type
+            was passed in.
+    """
+    state_reporter = BatchStateReporter(report_states)
+    run_item, clean_up = prepare_batch(
+        task_class,
+        command_to_run,
+        env_vars_list,
+        max_runtime,
+        task_class_kwargs,
+    )
+
+    def run_and_record_item(item):
+        """Run a batch item and record how it went."""
+        uuid, args_dict = item
+
+        state_reporter.record_started(uuid)
+
+        try:
+            run_item(uuid, args_dict)
+
+            state = SUCCESSFUL
+        except JobTimeout:
+            state = TIMED_OUT
+        except Exception:  # pylint: disable=broad-except
+            state = FAILED
+
+        state_reporter.record(uuid, state)
+
+    def stop_items():
+        """Stop any running items when the batch is terminated."""
+        stop_running_processes()
+        clean_up()
+
+    try:
+        with on_termination(stop_items):
+            if parallelism > 1:
+                thread_pool = ThreadPool(parallelism)
+
+                try:
+                    thread_pool.map(run_and_record_item, items, chunksize=1)
+                finally:
+                    thread_pool.close()
+                    thread_pool.join()
+            else:
+                for item in items:
+                    run_and_record_item(item)
+    finally:
+        clean_up()
+        state_reporter.flush()
+
+
+def prepare_batch(
+    task_class, command_to_run, env_vars_list, max_runtime, task_class_kwargs
+):
+    """Set up whatever a batch's items need to share to run.
+
+    Args:
+        task_class: A string defined in the constants module
+            representing one of the task classes.
+        command_to_run: A string containing the command to run.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        max_runtime: An integer (or None) specifying how many seconds
+            each item can run for before it's stopped.
+        task_class_kwargs: A dictionary containing variables specific to
+            the class of the task. See run_task.
+
+    Returns:
+        A tuple containing a function which takes an item's UUID and
+        arguments dictionary and runs it, and a function taking no
+        arguments to call once the batch is done.
+
+    Raises:
+        NotImplementedError: An unsupported task class or container type
+            was passed in.
+    """
+    if task_class == EXECUTABLE_TASK:
+
+        def run_item(uuid, args_dict):
+            """Run an executable batch item."""
+            run_executable_command(
+                uuid=uuid,
+                command_to_run=command_to_run,
+                env_vars_list=env_vars_list,
+                args_dict=args_dict,
+                json_file_option=task_class_kwargs["json_file_option"],
+                timeout=max_runtime,
+            )
+
+        return run_item, lambda: None
+
+    if task_class != CONTAINER_TASK:
+        # Task class passed in is not supported!
+        raise NotImplementedError(
+            "Unsupported task class {}".format(task_class)
+        )
+
+    logs_path = task_class_kwargs["logs_path"]
+    results_path = task_class_kwargs["results_path"]
+    container_image = task_class_kwargs["container_image"]
+    container_type = task_class_kwargs["container_type"]
+
+    if container_type == DOCKER:
+        # Consume necessary environment variables
+        try:
+            environment = {key: os.environ[key] for key in env_vars_list}
+        except KeyError as e:
+            raise KeyError(
+                "Environment variable %s not present in the worker's "
+                "environment!" % e
+            )
+
+        # Share containers between items, with one container per item
+        # running at once
+        warm_pool = DockerWarmPool(
+            container_image,
+            environment,
+            size=0,
+            max_jobs=sys.maxsize,
+            always_pull=False,
+        )
+
+        def run_item(uuid, args_dict):
+            """Run a Docker batch item."""
+            run_job_in_warm_pool(
+                warm_pool=warm_pool,
+                uuid=uuid,
+                command=build_job_command(command_to_run, args_dict),
+                logs_path=logs_path,
+                results_path=results_path,
+                timeout=max_runtime,
+            )
+
+        def clean_up():
+            """Remove the batch's containers."""
+            with warm_pool.lock:
+                warm_pool.drain(get_docker_client())
+
+        return run_item, clean_up
+
+    if container_type == SINGULARITY:
+        # Pull the image once for the whole batch
+        singularity_image = pull_singularity_image(container_image)
+
+        def run_item(uuid, args_dict):
+            """Run a Singularity batch item."""
+            run_singularity_image_command(
+                uuid=uuid,
+                singularity_image=singularity_image,
+                command_to_run=command_to_run,
+                logs_path=logs_path,
+                results_path=results_path,
+                env_vars_list=env_vars_list,
+                args_dict=args_dict,
+                timeout=max_runtime,
+            )
+
+        return run_item, lambda: None
+
+    # Container type passed in is not supported!
+    raise NotImplementedError(
+        "Unsupported container type {}".format(container_type)
+    )
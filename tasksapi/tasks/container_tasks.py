@@ -11,8 +11,30 @@ from __future__ import print_function
 import json
 import os
 import shlex
+import threading
+import requests
 import timeout_decorator
-from .utils import create_local_directory
+from .docker_client import get_docker_client, reset_docker_client
+from .utils import (
+    JobTimeout,
+    create_local_directory,
+    on_termination,
+    run_process,
+)
+
+# How many seconds to give a Docker container to stop gracefully before
+# killing it
+DOCKER_CONTAINER_STOP_TIMEOUT = 10
+
+# How many lines of a failed Docker container's stderr to include in
+# the exception raised for it
+DOCKER_CONTAINER_ERROR_LOG_LINES = 50
+
+
+class DockerPullFailure(Exception):
+    """An error for when Docker pulls fail."""
+
+    pass
 
 
 class SingularityPullFailure(Exception):
@@ -29,9 +51,15 @@ def run_docker_container_command(
     results_path,
     env_vars_list,
     args_dict,
+    timeout=None,
 ):
     """Launch an executable within a Docker container.
 
+    The container is run detached, with its stdout and stderr streamed
+    to files in the job's host logs directory as they're written. The
+    container is removed once it's done, and is stopped if the job is
+    terminated.
+
     Args:
         uuid: A string containing the uuid of the job being run.
         container_image: A string containing the name of the container
@@ -46,30 +74,72 @@ def run_docker_container_command(
             environment.
         args_dict: A dictionary containing arguments and corresponding
             values.
+        timeout: An optional integer specifying how many seconds the
+            container can run for before it's stopped.
 
     Raises:
         KeyError: An environment variable specified was not available in
             the worker's environment.
+        docker.errors.ContainerError: The container exited with a
+            non-zero code.
+        DockerPullFailure: The Docker daemon couldn't pull the image.
+        JobTimeout: The container ran for longer than the timeout.
     """
-    # Import Docker. Useful to just import it here if we want to have
-    # workers which *only* can support Singularity.
-    import docker
+    # Get this worker process's Docker client
+    client = get_docker_client()
 
-    # Get the Docker client on the host machine (see
-    # https://docker-py.readthedocs.io/en/stable/client.html#docker.client.from_env)
-    client = docker.from_env()
+    try:
+        _run_docker_container_command(
+            client,
+            uuid,
+            container_image,
+            command_to_run,
+            logs_path,
+            results_path,
+            env_vars_list,
+            args_dict,
+            timeout,
+        )
+    except requests.exceptions.ConnectionError:
+        # Something's wrong with the connection to the Docker daemon, so
+        # don't hand the same client to the next job
+        reset_docker_client()
+
+        raise
+
+
+def _run_docker_container_command(
+    client,
+    uuid,
+    container_image,
+    command_to_run,
+    logs_path,
+    results_path,
+    env_vars_list,
+    args_dict,
+    timeout,
+):
+    """Launch an executable within a Docker container using a client.
+
+    See run_docker_container_command for a description of the
+    arguments; client is the docker.DockerClient to use.
+    """
+    from docker.errors import ContainerError
 
     # Pull the Docker container. This pull in the latest version of the
     # container (with the specified tag if provided).
-    client.images.pull(container_image)
+    pull_docker_image(client, container_image)
+
+    # Set up the host log directory for the job. The container's stdout
+    # and stderr go here regardless of whether it writes any other logs.
+    host_logs_path = os.path.join(os.environ["WORKER_LOGS_DIRECTORY"], uuid)
+
+    create_local_directory(host_logs_path)
 
     # Find out where to put the logs
     if logs_path is None:
         volumes_dict = {}
     else:
-        host_logs_path = os.path.join(
-            os.environ["WORKER_LOGS_DIRECTORY"], uuid
-        )
         volumes_dict = {host_logs_path: {"bind": logs_path, "mode": "rw"}}
 
     # Find out where to put the results
@@ -99,14 +169,151 @@ def run_docker_container_command(
     else:
         command = command_to_run
 
-    # Run the executable
-    client.containers.run(
+    # Start the executable
+    container = client.containers.run(
         image=container_image,
         command=command,
         environment=environment,
         volumes=volumes_dict,
+        detach=True,
     )
 
+    try:
+        # Stop the container if the job is terminated
+        with on_termination(lambda: stop_docker_container(container)):
+            # Stream the container's output to the logs directory
+            log_threads = [
+                start_docker_container_log_thread(
+                    container,
+                    os.path.join(host_logs_path, uuid + "-" + "stdout.txt"),
+                    stdout=True,
+                ),
+                start_docker_container_log_thread(
+                    container,
+                    os.path.join(host_logs_path, uuid + "-" + "stderr.txt"),
+                    stdout=False,
+                ),
+            ]
+
+            # Wait for the container to finish
+            try:
+                exit_status = container.wait(timeout=timeout)["StatusCode"]
+            except (
+                requests.exceptions.ReadTimeout,
+                requests.exceptions.ConnectionError,
+            ):
+                if timeout is None:
+                    raise
+
+                stop_docker_container(container)
+
+                raise JobTimeout(
+                    "Container for job %s ran for longer than %d seconds"
+                    % (uuid, timeout)
+                )
+
+            # Make sure we've got all of the output
+            for log_thread in log_threads:
+                log_thread.join(DOCKER_CONTAINER_STOP_TIMEOUT)
+
+            # Propagate failures
+            if exit_status != 0:
+                raise ContainerError(
+                    container,
+                    exit_status,
+                    command,
+                    container_image,
+                    container.logs(
+                        stdout=False,
+                        stderr=True,
+                        tail=DOCKER_CONTAINER_ERROR_LOG_LINES,
+                    ),
+                )
+    finally:
+        # Reclaim the container's resources
+        remove_docker_container(container)
+
+
+def start_docker_container_log_thread(container, log_file_path, stdout):
+    """Start a thread streaming a container's output to a file.
+
+    Args:
+        container: A docker.models.containers.Container to stream
+            output from.
+        log_file_path: A string containing the path of the file to
+            write to.
+        stdout: A boolean specifying whether to stream stdout (if True)
+            or stderr (if False).
+
+    Returns:
+        The threading.Thread doing the streaming. It finishes when the
+        container exits.
+    """
+
+    def stream_logs():
+        """Write the container's output as it comes in."""
+        with open(log_file_path, "wb") as f:
+            for chunk in container.logs(
+                stdout=stdout, stderr=not stdout, stream=True, follow=True
+            ):
+                f.write(chunk)
+                f.flush()
+
+    thread = threading.Thread(target=stream_logs)
+    thread.daemon = True
+    thread.start()
+
+    return thread
+
+
+def stop_docker_container(container):
+    """Stop a container, killing it if it doesn't stop in time.
+
+    Args:
+        container: A docker.models.containers.Container to stop.
+    """
+    container.stop(timeout=DOCKER_CONTAINER_STOP_TIMEOUT)
+
+
+def pull_docker_image(client, container_image):
+    """Pull a Docker container image.
+
+    Args:
+        client: The docker.DockerClient to use.
+        container_image: A string containing the name of the container
+            to pull.
+
+    Raises:
+        DockerPullFailure: The Docker daemon couldn't pull the image.
+    """
+    from docker.errors import APIError
+
+    try:
+        client.images.pull(container_image)
+    except APIError as e:
+        raise DockerPullFailure(
+            "Could not pull {image}: {error}".format(
+                image=container_image, error=e
+            )
+        )
+
+
+def remove_docker_container(container):
+    """Remove a container, killing it first if it's still running.
+
+    Failures are ignored, since at this point the job's outcome is
+    already decided.
+
+    Args:
+        container: A docker.models.containers.Container to remove.
+    """
+    from docker.errors import APIError
+
+    try:
+        container.remove(force=True)
+    except (APIError, requests.exceptions.ConnectionError):
+        pass
+
 
 def run_singularity_container_command(
     uuid,
@@ -116,6 +323,7 @@ def run_singularity_container_command(
     results_path,
     env_vars_list,
     args_dict,
+    timeout=None,
 ):
     """Launch an executable within a Singularity container.
 
@@ -133,10 +341,43 @@ def run_singularity_container_command(
             environment.
         args_dict: A dictionary containing arguments and corresponding
             values.
+        timeout: An optional integer specifying how many seconds the
+            container can run for before it's stopped.
 
     Raises:
         KeyError: An environment variable specified was not available in
             the worker's environment.
+        subprocess.CalledProcessError: The container's command returned
+            with a non-zero code.
+        JobTimeout: The container ran for longer than the timeout.
+        SingularityPullFailure: The Singularity pull could not complete
+            with the specified timeout and number of retries.
+    """
+    singularity_image = pull_singularity_image(container_image)
+
+    run_singularity_image_command(
+        uuid=uuid,
+        singularity_image=singularity_image,
+        command_to_run=command_to_run,
+        logs_path=logs_path,
+        results_path=results_path,
+        env_vars_list=env_vars_list,
+        args_dict=args_dict,
+        timeout=timeout,
+    )
+
+
+def pull_singularity_image(container_image):
+    """Pull a Singularity container image.
+
+    Args:
+        container_image: A string containing the name of the container
+            to pull.
+
+    Returns:
+        A string containing the path of the pulled image.
+
+    Raises:
         SingularityPullFailure: The Singularity pull could not complete
             with the specified timeout and number of retries.
     """
@@ -145,12 +386,12 @@ def run_singularity_container_command(
 
     # Pull the specified container. This pull in the latest version of
     # the container (with the specified tag if provided).
-    timeout = int(os.environ["SINGULARITY_PULL_TIMEOUT"])
+    pull_timeout = int(os.environ["SINGULARITY_PULL_TIMEOUT"])
     num_retries = int(os.environ["SINGULARITY_PULL_RETRIES"])
 
     # Put a timeout on the client pull method
     client.pull = timeout_decorator.timeout(
-        timeout, timeout_exception=StopIteration
+        pull_timeout, timeout_exception=StopIteration
     )(client.pull)
 
     for retry in range(num_retries):
@@ -172,23 +413,60 @@ def run_singularity_container_command(
                         "{timeout} seconds after {num_retries} retries."
                     ).format(
                         image_url=container_image,
-                        timeout=timeout,
+                        timeout=pull_timeout,
                         num_retries=num_retries,
                     )
                 )
 
+    return singularity_image
+
+
+def run_singularity_image_command(
+    uuid,
+    singularity_image,
+    command_to_run,
+    logs_path,
+    results_path,
+    env_vars_list,
+    args_dict,
+    timeout=None,
+):
+    """Launch an executable within a pulled Singularity container.
+
+    Args:
+        uuid: A string containing the uuid of the job being run.
+        singularity_image: A string containing the path of the pulled
+            container image.
+        command_to_run: A string containing the command to run.
+        logs_path: A string (or None) containing the path of the
+            directory containing the relevant logs within the container.
+        results_path: A string (or None) containing the path of the
+            directory containing any output files from the container.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        args_dict: A dictionary containing arguments and corresponding
+            values.
+        timeout: An optional integer specifying how many seconds the
+            container can run for before it's stopped.
+
+    Raises:
+        KeyError: An environment variable specified was not available in
+            the worker's environment.
+        subprocess.CalledProcessError: The container's command returned
+            with a non-zero code.
+        JobTimeout: The container ran for longer than the timeout.
+    """
+    # Set up the host log directory for the job. The container's stdout
+    # and stderr go here regardless of whether it writes any other logs.
+    host_logs_path = os.path.join(os.environ["WORKER_LOGS_DIRECTORY"], uuid)
+
+    create_local_directory(host_logs_path)
+
     # Find out where to put the logs
     if logs_path is None:
         bind_option = []
     else:
-        # Create the host logs path. This is required by the Singularity
-        # library (though not the Docker library)
-        host_logs_path = os.path.join(
-            os.environ["WORKER_LOGS_DIRECTORY"], uuid
-        )
-
-        create_local_directory(host_logs_path)
-
         # Build the bind option to pass on to Singularity
         bind_option = [
             host_logs_path.rstrip("/") + ":" + logs_path.rstrip("/")
@@ -221,8 +499,10 @@ def run_singularity_container_command(
             % e
         )
 
-    # Pass along the job's UUID
-    os.environ["JOB_UUID"] = uuid
+    # Pass along the job's UUID. Don't set this in the worker's own
+    # environment, since several jobs can share it (e.g., in a batch).
+    environment = dict(os.environ)
+    environment["JOB_UUID"] = uuid
 
     # Compose the command to run
     command = shlex.split(command_to_run)
@@ -230,18 +510,26 @@ def run_singularity_container_command(
     if args_dict:
         command += [json.dumps(args_dict)]
 
-    # Run the executable
-    iter_ = client.execute(
-        image=singularity_image, command=command, bind=bind_option, stream=True
-    )
-
-    # Okay, here's some magic. The issue is that without stream=True in
-    # the above call, there's no way of determining the return code of
-    # the above operation, and so no way of knowing whether it failed.
-    # However, with stream=True, it'll raise a
-    # subprocess.CalledProcessError exception for any non-zero return
-    # code. Great! But before we can get that exception triggered we
-    # need to iterate through all of the command's stdout, which is what
-    # the below (seemingly useless) loop does.
-    for _ in iter_:
-        pass
+    # Run the executable. We run Singularity ourselves rather than
+    # through the Singularity library so that we can enforce the
+    # timeout and stop the container if the job is terminated.
+    singularity_command = ["singularity", "exec"]
+
+    for bind in bind_option:
+        singularity_command += ["--bind", bind]
+
+    singularity_command += [singularity_image] + command
+
+    with open(
+        os.path.join(host_logs_path, uuid + "-" + "stdout.txt"), "w"
+    ) as f_stdout:
+        with open(
+            os.path.join(host_logs_path, uuid + "-" + "stderr.txt"), "w"
+        ) as f_stderr:
+            run_process(
+                args=singularity_command,
+                timeout=timeout,
+                stdout=f_stdout,
+                stderr=f_stderr,
+                env=environment,
+            )
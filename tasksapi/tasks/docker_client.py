@@ -0,0 +1,104 @@
+"""Contains a Docker client shared by all jobs of a worker process.
+
+Creating a Docker client means building a new HTTP-over-Unix-socket
+connection pool, so instead of doing that for every job, each worker
+process creates a client lazily the first time it needs one and then
+reuses it. The client is health-checked periodically and re-created if
+the Docker daemon stops responding to it.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import os
+import threading
+import time
+
+# How many seconds a Docker client can go without being health-checked
+# before it's handed out to a job again
+DOCKER_CLIENT_HEALTH_CHECK_INTERVAL = 30
+
+# The state of this worker process's Docker client. Don't touch these
+# directly; use the functions below.
+_docker_client = None
+_docker_client_pid = None
+_docker_client_last_checked = 0
+_docker_client_lock = threading.Lock()
+
+
+def get_docker_client():
+    """Get this worker process's Docker client.
+
+    The client is created the first time this is called in a process
+    (clients are never shared across forked processes, since their
+    connection pools can't be), and is pinged at most every
+    DOCKER_CLIENT_HEALTH_CHECK_INTERVAL seconds to make sure it's still
+    working; if it isn't, a new client is created.
+
+    Returns:
+        A docker.DockerClient.
+    """
+    global _docker_client, _docker_client_pid, _docker_client_last_checked
+
+    with _docker_client_lock:
+        now = time.time()
+
+        if _docker_client is None or _docker_client_pid != os.getpid():
+            # No client for this process yet
+            _docker_client = create_docker_client()
+        elif now - _docker_client_last_checked >= (
+            DOCKER_CLIENT_HEALTH_CHECK_INTERVAL
+        ):
+            # Make sure the client still works
+            try:
+                _docker_client.ping()
+            except Exception:  # pylint: disable=broad-except
+                close_docker_client(_docker_client)
+                _docker_client = create_docker_client()
+
+        _docker_client_pid = os.getpid()
+        _docker_client_last_checked = now
+
+        return _docker_client
+
+
+def reset_docker_client():
+    """Discard this worker process's Docker client.
+
+    Call this when a job runs into a connection error with the Docker
+    daemon, so that the next job gets a fresh client.
+    """
+    global _docker_client
+
+    with _docker_client_lock:
+        if _docker_client is not None and _docker_client_pid == os.getpid():
+            close_docker_client(_docker_client)
+
+        _docker_client = None
+
+
+def create_docker_client():
+    """Create a Docker client from the environment.
+
+    Returns:
+        A docker.DockerClient.
+    """
+    # Import Docker. Useful to just import it here if we want to have
+    # workers which *only* can support Singularity.
+    import docker
+
+    # Get the Docker client on the host machine (see
+    # https://docker-py.readthedocs.io/en/stable/client.html#docker.client.from_env)
+    return docker.from_env()
+
+
+def close_docker_client(client):
+    """Close a Docker client's connections, ignoring any errors.
+
+    Args:
+        client: The docker.DockerClient to close.
+    """
+    try:
+        client.close()
+    except Exception:  # pylint: disable=broad-except
+        pass
@@ -0,0 +1,743 @@
+"""Contains task functionality for Docker task types using warm pools.
+
+Starting a Docker container takes much longer than a lightweight job
+running inside one. So for task types which opt in to it, each worker
+process keeps a pool of pre-started ("warm") containers idling, and runs
+each job by exec-ing its command in one of them, with the job getting
+its own working directory inside the container. Containers are recycled
+after a set number of jobs, or as soon as a job in them fails.
+
+Each task type gets its own pool, and each warm container gets its own
+staging logs and results directories on the worker (under hidden
+WARM_CONTAINER_STAGING_DIRECTORY subdirectories of the worker's logs and
+results directories), which are mounted in it in place of the worker's
+whole directories. Before a job's command runs, its logs_path and
+results_path are symlinked to the job's subdirectories of these; once
+it's done, these are moved to where jobs' logs and results normally go.
+So jobs only ever see their own logs and results, though a job's logs
+only show up in the usual place once it finishes. Warm containers idle
+in place of the image's entrypoint, so each job's command is exec-ed
+after the entrypoint, just as it would be run in a fresh container.
+This requires a POSIX shell in the container image.
+
+Note that none of these functions themselves are registered with Celery;
+instead they are used by other functions which *are* registered with
+Celery.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import json
+import logging
+import os
+import posixpath
+import shlex
+import shutil
+import threading
+from uuid import uuid4
+from celery.signals import worker_process_shutdown
+import requests
+from .container_tasks import (
+    DOCKER_CONTAINER_ERROR_LOG_LINES,
+    pull_docker_image,
+    remove_docker_container,
+    stop_docker_container,
+)
+from .docker_client import get_docker_client, reset_docker_client
+from .utils import JobTimeout, create_local_directory, on_termination
+
+try:
+    from shlex import quote
+except ImportError:
+    # Python 2
+    from pipes import quote
+
+# Where warm containers' staging logs and results directories are
+# mounted in them, and where jobs' working directories are made
+WARM_CONTAINER_LOGS_DIRECTORY = "/saltant/logs"
+WARM_CONTAINER_RESULTS_DIRECTORY = "/saltant/results"
+WARM_CONTAINER_WORK_DIRECTORY = "/saltant/work"
+
+# The name of the subdirectories of the worker's logs and results
+# directories which hold warm containers' staging directories
+WARM_CONTAINER_STAGING_DIRECTORY = ".warm-containers"
+
+# What warm containers run while they wait for jobs. This idles until
+# it's told to stop.
+WARM_CONTAINER_IDLE_SCRIPT = (
+    "trap 'exit 0' TERM; while :; do sleep 3600 & wait $!; done"
+)
+
+# This process's warm pools, keyed by the IDs of their task types.
+# Don't touch these directly; use the functions below.
+_warm_pools = {}
+_warm_pools_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+class DockerWarmPool(object):
+    """A pool of warm containers for a Docker task type."""
+
+    def __init__(
+        self, container_image, environment, size, max_jobs, always_pull=True
+    ):
+        """Initialize an empty pool.
+
+        Args:
+            container_image: A string containing the name of the
+                container image to run.
+            environment: A dictionary containing the environment to
+                start containers with.
+            size: An integer specifying how many idle containers to
+                keep.
+            max_jobs: An integer specifying how many jobs a container
+                runs before it's replaced.
+            always_pull: A boolean specifying whether to pull the
+                container image every time a container is started (cf.
+                only for the first container). Defaults to True.
+        """
+        self.container_image = container_image
+        self.environment = environment
+        self.size = size
+        self.max_jobs = max_jobs
+        self.always_pull = always_pull
+
+        # Maps the IDs of idle containers to how many jobs they've run
+        self.idle_containers = {}
+
+        # Maps the IDs of containers running jobs to the containers
+        self.busy_containers = {}
+
+        # Maps the IDs of containers to their staging logs and results
+        # directories on the worker
+        self.staging_paths = {}
+
+        # Whether the container image has been pulled yet
+        self.pulled = False
+
+        # The container image's entrypoint, which jobs' commands are
+        # run after. This is looked up when containers are started.
+        self.entrypoint = []
+
+        # Hold this while using the pool, since threads (e.g., those
+        # running a batch of jobs) can share it
+        self.lock = threading.Lock()
+
+    def acquire(self, client):
+        """Take a container out of the pool, starting one if necessary.
+
+        Args:
+            client: The docker.DockerClient to use.
+
+        Returns:
+            A tuple containing a docker.models.containers.Container and
+            the number of jobs it's already run.
+        """
+        from docker.errors import NotFound
+
+        while self.idle_containers:
+            container_id, num_jobs = self.idle_containers.popitem()
+
+            # Make sure the container didn't die while it was idling
+            try:
+                container = client.containers.get(container_id)
+            except NotFound:
+                self.remove_staging_paths(container_id)
+
+                continue
+
+            if container.status == "running":
+                self.busy_containers[container.id] = container
+
+                return container, num_jobs
+
+            remove_docker_container(container)
+            self.remove_staging_paths(container.id)
+
+        container = self.start_container(client)
+        self.busy_containers[container.id] = container
+
+        return container, 0
+
+    def release(self, client, container, num_jobs, healthy):
+        """Return a container to the pool after a job.
+
+        Containers which have run too many jobs, or which just ran a job
+        that failed, are replaced rather than reused.
+
+        Args:
+            client: The docker.DockerClient to use.
+            container: The docker.models.containers.Container to
+                return.
+            num_jobs: An integer containing the number of jobs the
+                container has run, including the one just finished.
+            healthy: A boolean specifying whether the job just finished
+                succeeded.
+        """
+        self.busy_containers.pop(container.id, None)
+
+        if healthy and num_jobs < self.max_jobs:
+            self.idle_containers[container.id] = num_jobs
+        else:
+            remove_docker_container(container)
+            self.remove_staging_paths(container.id)
+
+        # Top up the pool. If this doesn't work out, the job that just
+        # finished shouldn't fail because of it; the next job to
+        # acquire a container will run into the problem instead.
+        try:
+            self.fill(client)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    def fill(self, client):
+        """Start containers until the pool has enough idle containers.
+
+        Args:
+            client: The docker.DockerClient to use.
+        """
+        while len(self.idle_containers) < self.size:
+            self.idle_containers[self.start_container(client).id] = 0
+
+    def drain(self, client):
+        """Remove all of the pool's containers.
+
+        This includes containers running jobs, which should only be the
+        case if the jobs are being terminated, or if the connection to
+        the Docker daemon broke. Containers are looked up with the
+        client given, so that after the connection breaks they can be
+        removed with a fresh client. The IDs of any containers which
+        can't be removed are logged, so they can be cleaned up by hand.
+
+        Args:
+            client: The docker.DockerClient to use.
+        """
+        from docker.errors import APIError, NotFound
+
+        container_ids = list(self.busy_containers) + list(self.idle_containers)
+
+        self.busy_containers.clear()
+        self.idle_containers.clear()
+
+        for container_id in container_ids:
+            try:
+                client.containers.get(container_id).remove(force=True)
+            except NotFound:
+                pass
+            except (APIError, requests.exceptions.ConnectionError):
+                logger.warning(
+                    "Couldn't remove warm container %s", container_id
+                )
+
+            self.remove_staging_paths(container_id)
+
+    def start_container(self, client):
+        """Start a warm container.
+
+        Args:
+            client: The docker.DockerClient to use.
+
+        Returns:
+            The docker.models.containers.Container started.
+        """
+        # Pull the Docker container. This pull in the latest version of
+        # the container (with the specified tag if provided).
+        if self.always_pull or not self.pulled:
+            pull_docker_image(client, self.container_image)
+
+            self.pulled = True
+
+        # Warm containers idle in place of the image's entrypoint, so
+        # jobs need to run it themselves
+        self.entrypoint = (
+            client.images.get(self.container_image).attrs["Config"][
+                "Entrypoint"
+            ]
+            or []
+        )
+
+        # Make the container's staging directories
+        staging_name = uuid4().hex
+        staging_logs_path = os.path.join(
+            os.environ["WORKER_LOGS_DIRECTORY"],
+            WARM_CONTAINER_STAGING_DIRECTORY,
+            staging_name,
+        )
+        staging_results_path = os.path.join(
+            os.environ["WORKER_RESULTS_DIRECTORY"],
+            WARM_CONTAINER_STAGING_DIRECTORY,
+            staging_name,
+        )
+
+        create_local_directory(staging_logs_path)
+        create_local_directory(staging_results_path)
+
+        try:
+            container = client.containers.run(
+                image=self.container_image,
+                entrypoint=["sh", "-c", WARM_CONTAINER_IDLE_SCRIPT],
+                environment=self.environment,
+                volumes={
+                    staging_logs_path: {
+                        "bind": WARM_CONTAINER_LOGS_DIRECTORY,
+                        "mode": "rw",
+                    },
+                    staging_results_path: {
+                        "bind": WARM_CONTAINER_RESULTS_DIRECTORY,
+                        "mode": "rw",
+                    },
+                },
+                detach=True,
+            )
+        except Exception:
+            shutil.rmtree(staging_logs_path, ignore_errors=True)
+            shutil.rmtree(staging_results_path, ignore_errors=True)
+
+            raise
+
+        self.staging_paths[container.id] = (
+            staging_logs_path,
+            staging_results_path,
+        )
+
+        return container
+
+    def remove_staging_paths(self, container_id):
+        """Remove a removed container's staging directories.
+
+        Args:
+            container_id: A string containing the ID of the container.
+        """
+        for staging_path in self.staging_paths.pop(container_id, ()):
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+
+def get_warm_pool(task_type_id, container_image, environment, size, max_jobs):
+    """Get this process's warm pool for a task type.
+
+    If the task type's container image or environment changed since its
+    pool was made, the old pool's containers are removed and a new pool
+    is made.
+
+    Args:
+        task_type_id: An integer containing the ID of the task type.
+        container_image: A string containing the name of the container
+            image to run.
+        environment: A dictionary containing the environment to start
+            containers with.
+        size: An integer specifying how many idle containers to keep.
+        max_jobs: An integer specifying how many jobs a container runs
+            before it's replaced.
+
+    Returns:
+        A DockerWarmPool.
+    """
+    warm_pool = _warm_pools.get(task_type_id)
+
+    if warm_pool is not None and (
+        warm_pool.container_image != container_image
+        or warm_pool.environment != environment
+    ):
+        with warm_pool.lock:
+            warm_pool.drain(get_docker_client())
+
+        warm_pool = None
+
+    if warm_pool is None:
+        warm_pool = DockerWarmPool(
+            container_image, environment, size, max_jobs
+        )
+        _warm_pools[task_type_id] = warm_pool
+
+    # Pick up any changes to the task type's pool settings
+    warm_pool.size = size
+    warm_pool.max_jobs = max_jobs
+
+    return warm_pool
+
+
+@worker_process_shutdown.connect
+def drain_warm_pools(**_):
+    """Remove all of this process's warm containers.
+
+    This runs when a worker process shuts down, so that warm containers
+    don't outlive the worker which started them.
+    """
+    with _warm_pools_lock:
+        if not _warm_pools:
+            return
+
+        client = get_docker_client()
+
+        for warm_pool in _warm_pools.values():
+            with warm_pool.lock:
+                warm_pool.drain(client)
+
+        _warm_pools.clear()
+
+
+def run_docker_warm_pool_command(
+    uuid,
+    task_type_id,
+    container_image,
+    command_to_run,
+    logs_path,
+    results_path,
+    env_vars_list,
+    args_dict,
+    warm_pool_size,
+    warm_pool_max_jobs_per_container,
+    timeout=None,
+):
+    """Launch an executable within a warm Docker container.
+
+    Args:
+        uuid: A string containing the uuid of the job being run.
+        task_type_id: An integer containing the ID of the job's task
+            type, whose warm pool the job runs in.
+        container_image: A string containing the name of the container
+            to run.
+        command_to_run: A string containing the command to run.
+        logs_path: A string (or None) containing the path of the
+            directory containing the relevant logs within the container.
+        results_path: A string (or None) containing the path of the
+            directory containing any output files from the container.
+        env_vars_list: A list of strings containing the environment
+            variable names for the worker to consume from its
+            environment.
+        args_dict: A dictionary containing arguments and corresponding
+            values.
+        warm_pool_size: An integer specifying how many idle containers
+            to keep for the task type.
+        warm_pool_max_jobs_per_container: An integer specifying how
+            many jobs a container runs before it's replaced.
+        timeout: An optional integer specifying how many seconds the
+            job can run for before it's stopped.
+
+    Raises:
+        KeyError: An environment variable specified was not available in
+            the worker's environment.
+        docker.errors.ContainerError: The command exited with a non-zero
+            code.
+        DockerPullFailure: The Docker daemon couldn't pull the image.
+        JobTimeout: The command ran for longer than the timeout.
+    """
+    # Consume necessary environment variables
+    try:
+        environment = {key: os.environ[key] for key in env_vars_list}
+    except KeyError as e:
+        raise KeyError(
+            "Environment variable %s not present in the worker's environment!"
+            % e
+        )
+
+    with _warm_pools_lock:
+        warm_pool = get_warm_pool(
+            task_type_id,
+            container_image,
+            environment,
+            warm_pool_size,
+            warm_pool_max_jobs_per_container,
+        )
+
+    run_job_in_warm_pool(
+        warm_pool=warm_pool,
+        uuid=uuid,
+        command=build_job_command(command_to_run, args_dict),
+        logs_path=logs_path,
+        results_path=results_path,
+        timeout=timeout,
+    )
+
+
+def build_job_command(command_to_run, args_dict):
+    """Compose the command to run for a job in a warm container.
+
+    Args:
+        command_to_run: A string containing the command to run.
+        args_dict: A dictionary containing arguments and corresponding
+            values.
+
+    Returns:
+        A list of strings containing the command.
+    """
+    command = shlex.split(command_to_run)
+
+    if args_dict:
+        command += [json.dumps(args_dict)]
+
+    return command
+
+
+def run_job_in_warm_pool(
+    warm_pool, uuid, command, logs_path, results_path, timeout
+):
+    """Run a job in a container from a warm pool.
+
+    Args:
+        warm_pool: The DockerWarmPool to take a container from.
+        uuid: A string containing the uuid of the job being run.
+        command: A list of strings containing the command to run,
+            after the container image's entrypoint.
+        logs_path: A string (or None) containing the path of the
+            directory containing the relevant logs within the container.
+        results_path: A string (or None) containing the path of the
+            directory containing any output files from the container.
+        timeout: An integer (or None) specifying how many seconds the
+            job can run for before it's stopped.
+
+    Raises:
+        docker.errors.ContainerError: The command exited with a non-zero
+            code.
+        JobTimeout: The command ran for longer than the timeout.
+    """
+    client = get_docker_client()
+
+    with warm_pool.lock:
+        try:
+            container, num_jobs = warm_pool.acquire(client)
+        except requests.exceptions.ConnectionError:
+            reset_docker_client()
+
+            raise
+
+        staging_paths = warm_pool.staging_paths[container.id]
+        entrypoint = warm_pool.entrypoint
+
+    try:
+        run_command_in_warm_container(
+            client,
+            container,
+            warm_pool.container_image,
+            staging_paths,
+            uuid,
+            entrypoint + command,
+            logs_path,
+            results_path,
+            timeout,
+        )
+    except requests.exceptions.ConnectionError:
+        # Something's wrong with the connection to the Docker daemon, so
+        # don't hand the same client (or its containers) to the next
+        # job. Remove the pool's containers with a fresh client instead.
+        reset_docker_client()
+
+        with warm_pool.lock:
+            warm_pool.drain(get_docker_client())
+
+        raise
+    except Exception:
+        # Don't reuse a container a job failed in
+        with warm_pool.lock:
+            warm_pool.release(client, container, num_jobs + 1, False)
+
+        raise
+
+    with warm_pool.lock:
+        warm_pool.release(client, container, num_jobs + 1, True)
+
+
+def run_command_in_warm_container(
+    client,
+    container,
+    container_image,
+    staging_paths,
+    uuid,
+    command,
+    logs_path,
+    results_path,
+    timeout,
+):
+    """Run a job's command in a warm container.
+
+    The job's logs and results directories are made in the container's
+    staging directories, and moved out of them into the worker's logs
+    and results directories once the job's done.
+
+    Args:
+        client: The docker.DockerClient to use.
+        container: The docker.models.containers.Container to run the
+            command in.
+        container_image: A string containing the name of the
+            container's image.
+        staging_paths: A two-tuple containing the paths of the
+            container's staging logs and results directories.
+        uuid: A string containing the uuid of the job being run.
+        command: A list of strings containing the command to run.
+        logs_path: A string (or None) containing the path of the
+            directory containing the relevant logs within the container.
+        results_path: A string (or None) containing the path of the
+            directory containing any output files from the container.
+        timeout: An integer (or None) specifying how many seconds the
+            job can run for before it's stopped.
+
+    Raises:
+        docker.errors.ContainerError: The command exited with a non-zero
+            code.
+        JobTimeout: The command ran for longer than the timeout.
+    """
+    from docker.errors import ContainerError
+
+    # Set up the job's staging directories. The logs directory is where
+    # the command's stdout and stderr go.
+    job_directories = [(staging_paths[0], os.environ["WORKER_LOGS_DIRECTORY"])]
+
+    if results_path is not None:
+        job_directories.append(
+            (staging_paths[1], os.environ["WORKER_RESULTS_DIRECTORY"])
+        )
+
+    for staging_path, _ in job_directories:
+        create_local_directory(os.path.join(staging_path, uuid))
+
+    exec_id = client.api.exec_create(
+        container.id,
+        ["sh", "-c", build_job_script(uuid, command, logs_path, results_path)],
+        environment={"JOB_UUID": uuid},
+    )["Id"]
+
+    # Run the command in a separate thread so we can time it out
+    exec_thread = threading.Thread(
+        target=client.api.exec_start, args=(exec_id,)
+    )
+    exec_thread.daemon = True
+
+    try:
+        # Stop the container if the job is terminated. Its pool
+        # replaces it.
+        with on_termination(lambda: stop_docker_container(container)):
+            exec_thread.start()
+            exec_thread.join(timeout)
+
+            if exec_thread.is_alive():
+                stop_docker_container(container)
+
+                raise JobTimeout(
+                    "Job %s ran for longer than %d seconds" % (uuid, timeout)
+                )
+    finally:
+        # Move the job's logs and results to where they normally go
+        for staging_path, host_path in job_directories:
+            job_staging_path = os.path.join(staging_path, uuid)
+
+            if os.path.isdir(job_staging_path):
+                move_directory(job_staging_path, os.path.join(host_path, uuid))
+
+    # Propagate failures
+    exit_status = client.api.exec_inspect(exec_id)["ExitCode"]
+
+    if exit_status != 0:
+        host_stderr_log_path = os.path.join(
+            os.environ["WORKER_LOGS_DIRECTORY"],
+            uuid,
+            uuid + "-" + "stderr.txt",
+        )
+
+        try:
+            with open(host_stderr_log_path, "rb") as f:
+                stderr = b"".join(
+                    f.readlines()[-DOCKER_CONTAINER_ERROR_LOG_LINES:]
+                )
+        except IOError:
+            stderr = b""
+
+        raise ContainerError(
+            container, exit_status, " ".join(command), container_image, stderr
+        )
+
+
+def build_job_script(uuid, command, logs_path, results_path):
+    """Build the shell script which runs a job in a warm container.
+
+    The script makes the job's working directory, points the job's logs
+    and results paths at the job's subdirectories of the mounted staging
+    directories, runs the command with its output going to the job's
+    logs directory, and cleans up the working directory.
+
+    Args:
+        uuid: A string containing the uuid of the job being run.
+        command: A list of strings containing the command to run.
+        logs_path: A string (or None) containing the path of the
+            directory containing the relevant logs within the container.
+        results_path: A string (or None) containing the path of the
+            directory containing any output files from the container.
+
+    Returns:
+        A string containing the script.
+    """
+    job_logs_path = posixpath.join(WARM_CONTAINER_LOGS_DIRECTORY, uuid)
+    job_results_path = posixpath.join(WARM_CONTAINER_RESULTS_DIRECTORY, uuid)
+    job_work_path = posixpath.join(WARM_CONTAINER_WORK_DIRECTORY, uuid)
+
+    lines = [
+        "set -e",
+        "mkdir -p %s %s" % (quote(job_logs_path), quote(job_work_path)),
+    ]
+
+    for container_path, job_path in (
+        (logs_path, job_logs_path),
+        (results_path, job_results_path),
+    ):
+        if container_path is None:
+            continue
+
+        container_path = quote(container_path.rstrip("/"))
+
+        lines += [
+            "mkdir -p %s" % quote(job_path),
+            "rm -rf %s" % container_path,
+            'mkdir -p "$(dirname %s)"' % container_path,
+            "ln -s %s %s" % (quote(job_path), container_path),
+        ]
+
+    lines += [
+        "cd %s" % quote(job_work_path),
+        "set +e",
+        "%s > %s 2> %s"
+        % (
+            " ".join(quote(piece) for piece in command),
+            quote(posixpath.join(job_logs_path, uuid + "-" + "stdout.txt")),
+            quote(posixpath.join(job_logs_path, uuid + "-" + "stderr.txt")),
+        ),
+        "status=$?",
+        "cd /",
+        "rm -rf %s" % quote(job_work_path),
+        "exit $status",
+    ]
+
+    return "\n".join(lines)
+
+
+def move_directory(source_path, destination_path):
+    """Move a directory, merging it into the destination if it exists.
+
+    The destination can already exist if a job is retried on the same
+    worker. Files in the destination are replaced by files with the
+    same paths in the source.
+
+    Args:
+        source_path: A string containing the path of the directory to
+            move.
+        destination_path: A string containing the path to move it to.
+    """
+    if not os.path.isdir(destination_path):
+        os.rename(source_path, destination_path)
+
+        return
+
+    for name in os.listdir(source_path):
+        source_entry_path = os.path.join(source_path, name)
+        destination_entry_path = os.path.join(destination_path, name)
+
+        if (
+            os.path.isdir(source_entry_path)
+            and not os.path.islink(source_entry_path)
+            and os.path.isdir(destination_entry_path)
+        ):
+            move_directory(source_entry_path, destination_entry_path)
+        else:
+            os.rename(source_entry_path, destination_entry_path)
+
+    os.rmdir(source_path)
@@ -11,12 +11,16 @@ from __future__ import print_function
 import json
 import os
 import shlex
-import subprocess
-from .utils import create_local_directory
+from .utils import create_local_directory, run_process
 
 
 def run_executable_command(
-    uuid, command_to_run, env_vars_list, args_dict, json_file_option
+    uuid,
+    command_to_run,
+    env_vars_list,
+    args_dict,
+    json_file_option,
+    timeout=None,
 ):
     """Launch an executable within a Docker container.
 
@@ -31,12 +35,15 @@ def run_executable_command(
         json_file_option: A string (or None) containing the name of the
             command line option to specify a JSON-encoded file to read
             from.
+        timeout: An optional integer specifying how many seconds the
+            command can run for before it's stopped.
 
     Raises:
         KeyError: An environment variable specified was not available in
             the worker's environment.
         subprocess.CalledProcessError: The process returned with a
             non-zero code.
+        JobTimeout: The command ran for longer than the timeout.
     """
     # Set up the host log directory for the job
     host_logs_path = os.path.join(os.environ["WORKER_LOGS_DIRECTORY"], uuid)
@@ -110,8 +117,9 @@ def run_executable_command(
         with open(host_stdout_log_path, "w") as f_stdout:
             with open(host_stderr_log_path, "w") as f_stderr:
                 # Run command
-                subprocess.check_call(
+                run_process(
                     args=cmd_list,
+                    timeout=timeout,
                     stdout=f_stdout,
                     stderr=f_stderr,
                     env=environment,
@@ -0,0 +1,139 @@
+"""Contains signal handlers which send worker heartbeats.
+
+Once a worker is ready, it periodically tells the saltant server which
+queues it consumes from, how many jobs it can run at once, how many
+it's running, and how loaded its host is. This lets saltant tell which
+queues are being served, and how much spare capacity they have.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import logging
+import os
+import threading
+from celery import current_app
+from celery.signals import worker_ready, worker_shutdown
+from celery.worker import state as worker_state
+import requests
+from tasksapi.constants import WORKER_HEARTBEAT_INTERVAL
+
+# The type of the Celery events which send worker heartbeats to the
+# Celery events monitor. This is named like a task event since the
+# monitor only listens for task events.
+WORKER_HEARTBEAT_EVENT_TYPE = "task-worker-heartbeat"
+
+# Set this to stop sending heartbeats
+_stop_heartbeats = threading.Event()
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_heartbeat(consumer):
+    """Describe the worker for a heartbeat.
+
+    Args:
+        consumer: The worker's Celery consumer.
+    Returns:
+        A dictionary containing the worker's node name, the names of
+        the queues it consumes from, its concurrency, how many jobs
+        it's running, and its host's load average over the last minute
+        (or None if that's not available).
+    """
+    try:
+        load_average = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load_average = None
+
+    return {
+        "name": consumer.hostname,
+        "task_queues": sorted(consumer.app.amqp.queues.consume_from),
+        "concurrency": consumer.controller.concurrency,
+        "num_active_jobs": len(worker_state.active_requests),
+        "load_average": load_average,
+    }
+
+
+def send_worker_heartbeat(api_token, heartbeat):
+    """Send a worker heartbeat to the saltant server.
+
+    Args:
+        api_token: A string containing a valid token for the API.
+        heartbeat: A dictionary describing the worker (see
+            get_worker_heartbeat).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request.
+    """
+    # Form the API endpoint URL
+    base_url = os.environ["DJANGO_BASE_URL"]
+    endpoint_url_pieces = (base_url, r"/api/workerheartbeats/")
+    endpoint_url = "/".join(s.strip("/") for s in endpoint_url_pieces) + "/"
+
+    return requests.post(
+        endpoint_url,
+        json=heartbeat,
+        headers={"Authorization": "Token {}".format(api_token)},
+        timeout=WORKER_HEARTBEAT_INTERVAL,
+    )
+
+
+def report_worker_heartbeat(heartbeat):
+    """Report a worker heartbeat.
+
+    If a Celery events monitor is in charge of updating task instance
+    states, then this sends the heartbeat in a custom Celery event for
+    the monitor to pick up.
+
+    Args:
+        heartbeat: A dictionary describing the worker (see
+            get_worker_heartbeat).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request, or None if no request was made.
+    """
+    if os.environ["USE_CELERY_EVENTS_MONITOR"] == "True":
+        with current_app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(WORKER_HEARTBEAT_EVENT_TYPE, **heartbeat)
+
+        return None
+
+    return send_worker_heartbeat(
+        api_token=os.environ["API_AUTH_TOKEN"], heartbeat=heartbeat
+    )
+
+
+def send_worker_heartbeats(consumer):
+    """Report worker heartbeats until the worker shuts down.
+
+    Args:
+        consumer: The worker's Celery consumer.
+    """
+    while not _stop_heartbeats.is_set():
+        # A missed heartbeat isn't worth taking down the worker for
+        try:
+            report_worker_heartbeat(get_worker_heartbeat(consumer))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Couldn't send worker heartbeat")
+
+        _stop_heartbeats.wait(WORKER_HEARTBEAT_INTERVAL)
+
+
+@worker_ready.connect
+def worker_ready_handler(sender, **_):
+    """Start sending heartbeats once the worker is ready.
+
+    Args:
+        sender: The worker's Celery consumer.
+    """
+    _stop_heartbeats.clear()
+
+    thread = threading.Thread(target=send_worker_heartbeats, args=(sender,))
+    thread.daemon = True
+    thread.start()
+
+
+@worker_shutdown.connect
+def worker_shutdown_handler(**_):
+    """Stop sending heartbeats when the worker shuts down."""
+    _stop_heartbeats.set()
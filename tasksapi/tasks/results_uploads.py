@@ -0,0 +1,353 @@
+"""Contains the uploader which ships job results to S3-compatible storage.
+
+Once a container job finishes successfully, its results directory
+(WORKER_RESULTS_DIRECTORY/<uuid>) is queued up to be uploaded to
+WORKER_RESULTS_BUCKET_NAME, and the job returns right away. Each worker
+process uploads its queued results in a background thread, so uploads
+run alongside the process's next job rather than holding up its worker
+slot. Files (and the parts of large files) are uploaded concurrently,
+and a manifest of the uploaded files, with their sizes and SHA-256
+hashes, is then reported to the saltant server.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import hashlib
+import logging
+import os
+import threading
+from celery import current_app
+from celery.signals import worker_process_shutdown, worker_shutdown
+import requests
+
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
+# The type of the Celery events which report uploaded results to the
+# Celery events monitor
+RESULTS_EVENT_TYPE = "task-instance-results"
+
+# Files bigger than this are uploaded in parts of this size
+RESULTS_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+# How many bytes to read at a time while hashing files
+RESULTS_HASH_BLOCK_SIZE = 1024 * 1024
+
+# How many seconds to wait for queued results to finish uploading when
+# a worker process shuts down
+RESULTS_UPLOADER_SHUTDOWN_TIMEOUT = 300
+
+# The UUIDs of the jobs whose results are waiting to be uploaded, and
+# the thread uploading them. Don't touch these directly; use the
+# functions below.
+_results_uploads = queue.Queue()
+_results_uploader = None
+_results_uploader_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def results_uploads_are_enabled():
+    """Determine whether the worker uploads results.
+
+    Returns:
+        A boolean.
+    """
+    return bool(os.environ["WORKER_RESULTS_BUCKET_NAME"])
+
+
+def get_results_directory(job_uuid):
+    """Get the directory a job's results are saved in on the worker.
+
+    Args:
+        job_uuid: A string containing the UUID of the job.
+    Returns:
+        A string containing the path of the directory.
+    """
+    return os.path.join(os.environ["WORKER_RESULTS_DIRECTORY"], job_uuid)
+
+
+def get_results_location(job_uuid):
+    """Get where a job's results are uploaded to.
+
+    Args:
+        job_uuid: A string containing the UUID of the job.
+    Returns:
+        A string containing an S3 URL for the prefix of the job's
+        results (e.g., s3://bucket/uuid/).
+    """
+    return "s3://{}/{}/".format(
+        os.environ["WORKER_RESULTS_BUCKET_NAME"], job_uuid
+    )
+
+
+def get_file_sha256(path):
+    """Hash a file with SHA-256.
+
+    Args:
+        path: A string containing the path of the file.
+    Returns:
+        A string containing the hex digest of the file's contents.
+    """
+    sha256 = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(RESULTS_HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+
+    return sha256.hexdigest()
+
+
+def get_results_files(results_directory):
+    """Find all of the files in a results directory.
+
+    Args:
+        results_directory: A string containing the path of the
+            directory.
+    Returns:
+        A sorted list of two-tuples, each containing the path of a file
+        and its path relative to the results directory (always using
+        forward slashes, so it can be used in object keys).
+    """
+    results_files = []
+
+    for dirpath, _, filenames in os.walk(results_directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+
+            # Skip anything which isn't a regular file (e.g., sockets
+            # or broken symlinks)
+            if not os.path.isfile(path):
+                continue
+
+            relative_path = os.path.relpath(path, results_directory)
+            results_files.append((path, relative_path.replace(os.sep, "/")))
+
+    return sorted(results_files, key=lambda results_file: results_file[1])
+
+
+def upload_results(job_uuid):
+    """Upload a job's results directory.
+
+    Each file is uploaded to <uuid>/<path relative to the results
+    directory> in the results bucket, with its SHA-256 hash stored in
+    its metadata. Files are hashed one after the other while earlier
+    files upload, and large files are uploaded in parts; up to
+    WORKER_RESULTS_UPLOAD_CONCURRENCY files and parts are uploaded at
+    once.
+
+    Args:
+        job_uuid: A string containing the UUID of the job.
+    Returns:
+        A list of dictionaries describing the uploaded files, each
+        containing the file's path relative to the results directory,
+        its size in bytes, and its SHA-256 hash.
+    """
+    import boto3
+    from boto3.s3.transfer import TransferConfig, create_transfer_manager
+
+    bucket_name = os.environ["WORKER_RESULTS_BUCKET_NAME"]
+    client = boto3.client(
+        "s3", endpoint_url=os.environ["WORKER_RESULTS_S3_ENDPOINT_URL"] or None
+    )
+    config = TransferConfig(
+        multipart_threshold=RESULTS_MULTIPART_CHUNKSIZE,
+        multipart_chunksize=RESULTS_MULTIPART_CHUNKSIZE,
+        max_concurrency=int(os.environ["WORKER_RESULTS_UPLOAD_CONCURRENCY"]),
+    )
+
+    manifest = []
+    futures = []
+
+    with create_transfer_manager(client, config) as transfer_manager:
+        for path, relative_path in get_results_files(
+            get_results_directory(job_uuid)
+        ):
+            sha256 = get_file_sha256(path)
+
+            manifest.append(
+                {
+                    "path": relative_path,
+                    "size": os.path.getsize(path),
+                    "sha256": sha256,
+                }
+            )
+            futures.append(
+                transfer_manager.upload(
+                    path,
+                    bucket_name,
+                    "{}/{}".format(job_uuid, relative_path),
+                    extra_args={"Metadata": {"sha256": sha256}},
+                )
+            )
+
+        # Raise the first error any of the uploads ran into
+        for future in futures:
+            future.result()
+
+    return manifest
+
+
+def send_results(api_token, job_uuid, location, manifest):
+    """Tell the server where a job's results were uploaded.
+
+    Args:
+        api_token: A string containing a valid token for the API.
+        job_uuid: A string containing the UUID for the task instance
+            whose results were uploaded.
+        location: A string containing where the results were uploaded
+            to (see get_results_location).
+        manifest: A list of dictionaries describing the uploaded files
+            (see upload_results).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request.
+    """
+    # Form the API endpoint URL
+    base_url = os.environ["DJANGO_BASE_URL"]
+    endpoint_url_pieces = (base_url, r"/api/taskinstanceresults/", job_uuid)
+    endpoint_url = "/".join(s.strip("/") for s in endpoint_url_pieces) + "/"
+
+    return requests.post(
+        endpoint_url,
+        json={"location": location, "manifest": manifest},
+        headers={"Authorization": "Token {}".format(api_token)},
+    )
+
+
+def report_results(job_uuid, location, manifest):
+    """Report a job's uploaded results to the saltant server.
+
+    If a Celery events monitor is in charge of updating task instance
+    states, then this sends the results in a custom Celery event for the
+    monitor to pick up.
+
+    Args:
+        job_uuid: A string containing the UUID for the task instance
+            whose results were uploaded.
+        location: A string containing where the results were uploaded
+            to (see get_results_location).
+        manifest: A list of dictionaries describing the uploaded files
+            (see upload_results).
+    Returns:
+        A requests.Response object containing the server's response to
+            the HTTP request, or None if no request was made.
+    """
+    if os.environ["USE_CELERY_EVENTS_MONITOR"] == "True":
+        with current_app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(
+                RESULTS_EVENT_TYPE,
+                uuid=job_uuid,
+                location=location,
+                manifest=manifest,
+            )
+
+        return None
+
+    return send_results(
+        api_token=os.environ["API_AUTH_TOKEN"],
+        job_uuid=job_uuid,
+        location=location,
+        manifest=manifest,
+    )
+
+
+def upload_queued_results():
+    """Upload queued results until told to stop.
+
+    This runs in each worker process's uploader thread. A None in the
+    queue tells it to stop.
+    """
+    while True:
+        job_uuid = _results_uploads.get()
+
+        try:
+            if job_uuid is None:
+                return
+
+            # A failed upload isn't worth taking down the worker for;
+            # the results are still on the worker
+            try:
+                manifest = upload_results(job_uuid)
+                report_results(
+                    job_uuid=job_uuid,
+                    location=get_results_location(job_uuid),
+                    manifest=manifest,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    "Couldn't upload results for job %s", job_uuid
+                )
+        finally:
+            _results_uploads.task_done()
+
+
+def queue_results_upload(job_uuid):
+    """Queue up a job's results to be uploaded in the background.
+
+    This does nothing if the worker doesn't upload results.
+
+    Args:
+        job_uuid: A string containing the UUID of the job.
+    """
+    global _results_uploader
+
+    if not results_uploads_are_enabled():
+        return
+
+    # Start this process's uploader if it isn't running yet
+    with _results_uploader_lock:
+        if _results_uploader is None or not _results_uploader.is_alive():
+            _results_uploader = threading.Thread(target=upload_queued_results)
+            _results_uploader.daemon = True
+            _results_uploader.start()
+
+    _results_uploads.put(job_uuid)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def finish_results_uploads(**_):
+    """Wait for this process's queued results to finish uploading.
+
+    This runs when a worker process (or, with pools which don't fork, a
+    worker) shuts down, so that results queued up by its last jobs
+    aren't lost. It waits at most RESULTS_UPLOADER_SHUTDOWN_TIMEOUT
+    seconds, and then logs the UUIDs of the jobs whose results are
+    still queued up.
+    """
+    global _results_uploader
+
+    # Take the uploader out of circulation, but don't hold on to the
+    # lock while waiting for it
+    with _results_uploader_lock:
+        uploader = _results_uploader
+        _results_uploader = None
+
+        if uploader is None:
+            return
+
+        _results_uploads.put(None)
+
+    uploader.join(RESULTS_UPLOADER_SHUTDOWN_TIMEOUT)
+
+    if not uploader.is_alive():
+        return
+
+    with _results_uploads.mutex:
+        job_uuids = [
+            job_uuid
+            for job_uuid in _results_uploads.queue
+            if job_uuid is not None
+        ]
+
+    logger.warning(
+        "Gave up waiting for results uploads after %s seconds; results "
+        "still queued for jobs: %s",
+        RESULTS_UPLOADER_SHUTDOWN_TIMEOUT,
+        ", ".join(job_uuids) or "none",
+    )
@@ -0,0 +1,97 @@
+"""Contains helpers for retrying jobs which fail in transient ways.
+
+Task types can have their instances' jobs retried after certain classes
+of failures (e.g., a registry hiccup while pulling a container image).
+Retries back off exponentially, with "full jitter": the wait before each
+retry is chosen at random between zero and the exponential backoff, so
+that jobs which failed together (e.g., when a registry went down) don't
+all come back at once. See
+https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import random
+import subprocess
+import requests
+from tasksapi.constants import (
+    IMAGE_PULL_FAILURE,
+    CONNECTION_FAILURE,
+    FILESYSTEM_FAILURE,
+    NONZERO_EXIT_FAILURE,
+    TIMEOUT_FAILURE,
+)
+from .container_tasks import DockerPullFailure, SingularityPullFailure
+from .utils import JobTimeout
+
+
+def get_failure_class(exception):
+    """Classify why a job failed.
+
+    Args:
+        exception: The exception the job raised.
+
+    Returns:
+        A string defined in the constants module representing the class
+        of the failure, or None if the failure isn't one which can be
+        retried.
+    """
+    nonzero_exit_exceptions = (subprocess.CalledProcessError,)
+
+    # Workers without docker-py (e.g., Singularity-only ones) can't have
+    # run into Docker's errors
+    try:
+        from docker.errors import ContainerError
+    except ImportError:
+        pass
+    else:
+        nonzero_exit_exceptions += (ContainerError,)
+
+    if isinstance(exception, (DockerPullFailure, SingularityPullFailure)):
+        return IMAGE_PULL_FAILURE
+
+    if isinstance(exception, JobTimeout):
+        return TIMEOUT_FAILURE
+
+    if isinstance(exception, nonzero_exit_exceptions):
+        return NONZERO_EXIT_FAILURE
+
+    # Note that requests' exceptions (which include Docker API errors)
+    # are environment errors too, so look for them first
+    if isinstance(exception, requests.exceptions.RequestException):
+        return CONNECTION_FAILURE
+
+    if isinstance(exception, EnvironmentError):
+        return FILESYSTEM_FAILURE
+
+    return None
+
+
+def get_retry_delay(retry_policy, exception, num_retries):
+    """Determine whether and when to retry a failed job.
+
+    Args:
+        retry_policy: A dictionary (or None) containing the retry policy
+            of the job's task type (see the task type models).
+        exception: The exception the job raised.
+        num_retries: An integer specifying how many times the job has
+            already been retried.
+
+    Returns:
+        A float specifying how many seconds to wait before retrying the
+        job, or None if it shouldn't be retried.
+    """
+    if not retry_policy or num_retries >= retry_policy["max_retries"]:
+        return None
+
+    if get_failure_class(exception) not in retry_policy["retryable_failures"]:
+        return None
+
+    return random.uniform(
+        0,
+        min(
+            retry_policy["backoff_max"],
+            retry_policy["backoff"] * 2 ** num_retries,
+        ),
+    )
@@ -3,9 +3,42 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
+import contextlib
+import datetime
 import errno
 import os
+import signal
+import subprocess
 import sys
+import threading
+import time
+
+# How many seconds to give a process to exit after sending it SIGTERM
+# before killing it
+PROCESS_TERMINATE_TIMEOUT = 10
+
+# The processes started by run_process which are still running. Don't
+# touch these directly; use the functions below.
+_running_processes = set()
+_running_processes_lock = threading.Lock()
+
+
+class JobTimeout(Exception):
+    """An error for when a job runs for longer than it's allowed to."""
+
+    pass
+
+
+def get_current_datetime_string():
+    """Get the current time as an ISO 8601 string.
+
+    This is used to tell the saltant server when things happened on the
+    worker, rather than having it use the time it hears about them.
+
+    Returns:
+        A string containing the current UTC time in ISO 8601 format.
+    """
+    return datetime.datetime.utcnow().isoformat() + "Z"
 
 
 def create_local_directory(path):
@@ -38,3 +71,146 @@ def mkdir_p(path):
             pass
         else:
             raise
+
+
+@contextlib.contextmanager
+def on_termination(callback):
+    """Run a callback if the process is terminated during a block.
+
+    This is used to clean up after a job (e.g., stop its container) when
+    its task instance is terminated, which Celery does by sending
+    SIGTERM to the worker process running the job. After the callback
+    runs, the signal is re-delivered to whatever handler was there
+    before, so the process still terminates as usual.
+
+    Signal handlers can only be installed from the main thread; outside
+    of it, this does nothing.
+
+    Args:
+        callback: A function taking no arguments to run on SIGTERM.
+    """
+
+    def handler(signum, frame):
+        """Run the callback and pass the signal along."""
+        try:
+            callback()
+        finally:
+            signal.signal(signum, previous_handler or signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+    try:
+        previous_handler = signal.signal(signal.SIGTERM, handler)
+    except ValueError:
+        # Not in the main thread
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler or signal.SIG_DFL)
+
+
+def run_process(args, timeout=None, **popen_kwargs):
+    """Run a process to completion.
+
+    This is like subprocess.check_call, except that it supports a
+    timeout in Python 2, and that it stops the process gracefully:
+    first with SIGTERM, then with SIGKILL if the process is still
+    running PROCESS_TERMINATE_TIMEOUT seconds later. The process is
+    stopped the same way if the job is terminated.
+
+    Args:
+        args: A list of strings containing the command to run.
+        timeout: An optional integer specifying how many seconds the
+            process can run for before it's stopped.
+        **popen_kwargs: Keyword arguments to pass on to
+            subprocess.Popen.
+
+    Raises:
+        subprocess.CalledProcessError: The process returned with a
+            non-zero code.
+        JobTimeout: The process ran for longer than the timeout.
+    """
+    process = subprocess.Popen(args, **popen_kwargs)
+
+    with _running_processes_lock:
+        _running_processes.add(process)
+
+    try:
+        with on_termination(lambda: stop_process(process)):
+            if not wait_for_process(process, timeout):
+                stop_process(process)
+
+                raise JobTimeout(
+                    "%s ran for longer than %d seconds" % (args[0], timeout)
+                )
+    finally:
+        with _running_processes_lock:
+            _running_processes.discard(process)
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+
+def wait_for_process(process, timeout):
+    """Wait for a process to exit.
+
+    Args:
+        process: The subprocess.Popen to wait for.
+        timeout: An integer (or None) specifying the maximum number of
+            seconds to wait.
+
+    Returns:
+        A boolean specifying whether the process exited in time.
+    """
+    if timeout is None:
+        process.wait()
+
+        return True
+
+    # Poll the process, backing off so short processes are noticed
+    # quickly and long ones don't keep the worker busy
+    deadline = time.time() + timeout
+    poll_interval = 0.01
+
+    while process.poll() is None:
+        remaining = deadline - time.time()
+
+        if remaining <= 0:
+            return False
+
+        time.sleep(min(poll_interval, remaining))
+        poll_interval = min(poll_interval * 2, 1)
+
+    return True
+
+
+def stop_process(process):
+    """Stop a process with SIGTERM, escalating to SIGKILL if necessary.
+
+    Args:
+        process: The subprocess.Popen to stop.
+    """
+    if process.poll() is not None:
+        return
+
+    process.terminate()
+
+    if not wait_for_process(process, PROCESS_TERMINATE_TIMEOUT):
+        process.kill()
+        process.wait()
+
+
+def stop_running_processes():
+    """Stop all processes started by run_process which are running.
+
+    run_process can only stop its process when the job is terminated if
+    it's running in the main thread, so use this to clean up after jobs
+    running in other threads.
+    """
+    with _running_processes_lock:
+        processes = list(_running_processes)
+
+    for process in processes:
+        stop_process(process)
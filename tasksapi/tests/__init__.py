@@ -1,6 +1,16 @@
 """Import tests here so Django notices them."""
 
 # Comment out any tests you don't want to run
+from .commands_tests.archive_task_instances_tests import (
+    TaskInstanceArchiveTests,
+)
+from .commands_tests.dispatch_task_instances_tests import (
+    FairShareDispatcherTests,
+)
+from .commands_tests.monitor_task_events_tests import TaskEventsMonitorTests
+from .commands_tests.reap_task_instances_tests import (
+    TaskInstanceReaperTests,
+)
 from .execution_tests.container_execution_tests import ContainerExecutionTests
 from .execution_tests.executable_execution_tests import (
     ExecutableExecutionTests,
@@ -8,13 +18,50 @@ from .execution_tests.executable_execution_tests import (
 from .models_tests.queue_permission_attrs_tests import (
     TaskQueuePermissionAttributesTests,
 )
+from .models_tests.queue_priority_tests import TaskQueuePriorityTests
 from .models_tests.queue_whitelist_tests import (
     TaskQueueWhitelistTests,
 )
+from .models_tests.task_instance_dependencies_tests import (
+    TaskInstanceDependenciesTests,
+)
 from .requests_tests.basic_requests_tests import BasicHTTPRequestsTests
+from .requests_tests.bulk_actions_requests_tests import (
+    TaskInstanceBulkActionsRequestsTests,
+)
+from .requests_tests.conditional_requests_tests import (
+    ConditionalRequestsTests,
+)
+from .requests_tests.export_requests_tests import (
+    TaskInstanceExportRequestsTests,
+)
+from .requests_tests.import_requests_tests import (
+    TaskInstanceImportRequestsTests,
+)
+from .requests_tests.queue_limits_requests_tests import (
+    QueueLimitsRequestsTests,
+)
+from .requests_tests.result_cache_requests_tests import (
+    ResultCacheRequestsTests,
+)
+from .requests_tests.task_instance_lifecycle_requests_tests import (
+    TaskInstanceLifecycleRequestsTests,
+)
+from .requests_tests.task_instance_results_requests_tests import (
+    TaskInstanceResultsRequestsTests,
+)
+from .requests_tests.task_instance_retries_requests_tests import (
+    TaskInstanceRetriesRequestsTests,
+)
+from .requests_tests.task_instance_states_requests_tests import (
+    TaskInstanceStatesRequestsTests,
+)
 from .requests_tests.user_editing_permissions_requests_tests import (
     UserEditPermissionsRequestsTests,
 )
 from .requests_tests.user_queue_permissions_requests_tests import (
     UserQueuePermissionsRequestsTests,
 )
+from .requests_tests.worker_heartbeats_requests_tests import (
+    WorkerHeartbeatsRequestsTests,
+)
@@ -0,0 +1,102 @@
+"""Contains tests for the task instance archival command."""
+
+from datetime import timedelta
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from tasksapi.constants import RUNNING, SUCCESSFUL
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceArchiveTests(TestCase):
+    """Test moving old task instances out of the database."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Make some old task instances and a place to archive them."""
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+
+        self.instances = [
+            ExecutableTaskInstance.objects.create(
+                user=User.objects.get(pk=USER_PK),
+                task_type=ExecutableTaskType.objects.get(
+                    pk=EXECUTABLE_TASK_TYPE_PK
+                ),
+                task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+            )
+            for _ in range(3)
+        ]
+
+        ExecutableTaskInstance.objects.filter(
+            uuid__in=[instance.uuid for instance in self.instances]
+        ).update(
+            state=SUCCESSFUL,
+            datetime_created=timezone.now() - timedelta(days=100),
+        )
+
+    def test_archiving(self):
+        """Make sure only old finished task instances are archived."""
+        # Unfinished task instances are left alone
+        ExecutableTaskInstance.objects.filter(
+            uuid=self.instances[0].uuid
+        ).update(state=RUNNING)
+
+        num_instances = ExecutableTaskInstance.objects.count()
+
+        call_command(
+            "archive_task_instances",
+            days=90,
+            batch_size=1,
+            archive_dir=self.archive_dir,
+            verbosity=0,
+        )
+
+        num_archived = num_instances - ExecutableTaskInstance.objects.count()
+
+        self.assertGreaterEqual(num_archived, 2)
+        self.assertTrue(
+            ExecutableTaskInstance.objects.filter(
+                uuid=self.instances[0].uuid
+            ).exists()
+        )
+
+        # Each batch gets its own file
+        archive_files = [
+            archive_file
+            for archive_file in os.listdir(self.archive_dir)
+            if archive_file.startswith("executabletaskinstance-")
+        ]
+        self.assertEqual(len(archive_files), num_archived)
+
+        archived_uuids = set()
+
+        for archive_file in archive_files:
+            with gzip.open(
+                os.path.join(self.archive_dir, archive_file), "rt"
+            ) as f:
+                archived_uuids.update(json.loads(line)["uuid"] for line in f)
+
+        self.assertEqual(len(archived_uuids), num_archived)
+        self.assertTrue(
+            archived_uuids.issuperset(
+                str(instance.uuid) for instance in self.instances[1:]
+            )
+        )
@@ -0,0 +1,130 @@
+"""Contains tests for the fair-share task instance dispatcher."""
+
+from django.test import TestCase
+from tasksapi.constants import (
+    CREATED,
+    PUBLISHED,
+    RUNNING,
+    SUCCESSFUL,
+    TERMINATED,
+)
+from tasksapi.models import (
+    ContainerTaskInstance,
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+from tasksapi.utils import dispatch_fair_share_task_instances
+
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+OTHER_USER_PK = 2
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class FairShareDispatcherTests(TestCase):
+    """Test publishing task instances on fair-share queues."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Make a fair-share queue with a backlog from two users."""
+        self.queue = TaskQueue.objects.get(pk=QUEUE_PK)
+        self.queue.uses_fair_share = True
+        self.queue.max_in_flight_per_user = 2
+        self.queue.save()
+
+        self.user = User.objects.get(pk=USER_PK)
+        self.other_user = User.objects.get(pk=OTHER_USER_PK)
+        self.other_user.fair_share_weight = 2
+        self.other_user.save()
+
+        task_type = ExecutableTaskType.objects.get(pk=EXECUTABLE_TASK_TYPE_PK)
+
+        # Keep track of the new instances, since the fixture data has
+        # instances of its own
+        self.uuids = []
+
+        for user in (self.user, self.other_user):
+            for _ in range(5):
+                instance = ExecutableTaskInstance.objects.create(
+                    user=user, task_type=task_type, task_queue=self.queue
+                )
+                self.uuids.append(instance.uuid)
+
+    def count_instances(self, user, state):
+        """Count a user's task instances in a given state."""
+        return ExecutableTaskInstance.objects.filter(
+            uuid__in=self.uuids, user=user, state=state
+        ).count()
+
+    def test_instances_held_until_dispatched(self):
+        """Make sure instances on fair-share queues aren't published."""
+        self.assertEqual(self.count_instances(self.user, CREATED), 5)
+        self.assertEqual(self.count_instances(self.other_user, CREATED), 5)
+
+    def test_in_flight_caps(self):
+        """Make sure users only get their share of the queue."""
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 6)
+        self.assertEqual(self.count_instances(self.user, PUBLISHED), 2)
+        self.assertEqual(self.count_instances(self.other_user, PUBLISHED), 4)
+
+        # Nothing more goes out until something finishes
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 0)
+
+        ExecutableTaskInstance.objects.filter(
+            uuid__in=self.uuids, user=self.user, state=PUBLISHED
+        ).update(state=SUCCESSFUL)
+
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 2)
+        self.assertEqual(self.count_instances(self.user, PUBLISHED), 2)
+        self.assertEqual(self.count_instances(self.user, CREATED), 1)
+
+    def test_terminate_held_instance(self):
+        """Make sure terminated held instances are never published."""
+        for instance in ExecutableTaskInstance.objects.filter(
+            uuid__in=self.uuids, user=self.user
+        ):
+            instance.terminate()
+            self.assertEqual(instance.state, TERMINATED)
+
+        dispatch_fair_share_task_instances(self.queue)
+
+        self.assertEqual(self.count_instances(self.user, TERMINATED), 5)
+        self.assertEqual(self.count_instances(self.user, PUBLISHED), 0)
+
+    def test_queue_in_flight_limits(self):
+        """Make sure the queue's in-flight limits are respected."""
+        num_in_flight = sum(
+            instance_model.objects.filter(
+                task_queue=self.queue, state__in=(PUBLISHED, RUNNING)
+            ).count()
+            for instance_model in (
+                ContainerTaskInstance,
+                ExecutableTaskInstance,
+            )
+        )
+
+        self.queue.max_in_flight = num_in_flight + 3
+        self.queue.save()
+
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 3)
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 0)
+
+        # Now limit the task type instead
+        self.queue.max_in_flight = None
+        self.queue.max_in_flight_per_task_type = (
+            ExecutableTaskInstance.objects.filter(
+                task_queue=self.queue,
+                task_type=EXECUTABLE_TASK_TYPE_PK,
+                state__in=(PUBLISHED, RUNNING),
+            ).count()
+            + 1
+        )
+        self.queue.save()
+
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 1)
+        self.assertEqual(dispatch_fair_share_task_instances(self.queue), 0)
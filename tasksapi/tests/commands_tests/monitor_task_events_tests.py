@@ -0,0 +1,195 @@
+"""Contains tests for the Celery events monitor command."""
+
+from datetime import datetime
+import time
+from django.test import TestCase
+from django.utils import timezone
+from tasksapi.constants import FAILED, RUNNING, SUCCESSFUL, TIMED_OUT
+from tasksapi.management.commands.monitor_task_events import TaskStateBuffer
+from tasksapi.models import (
+    ContainerTaskInstance,
+    ContainerTaskType,
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+CONTAINER_TASK_TYPE_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskEventsMonitorTests(TestCase):
+    """Test updating task instance states from Celery events."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Create some task instances to update."""
+        user = User.objects.get(pk=USER_PK)
+        queue = TaskQueue.objects.get(pk=QUEUE_PK)
+
+        self.container_instance = ContainerTaskInstance.objects.create(
+            user=user,
+            task_type=ContainerTaskType.objects.get(pk=CONTAINER_TASK_TYPE_PK),
+            task_queue=queue,
+        )
+        self.executable_instance = ExecutableTaskInstance.objects.create(
+            user=user,
+            task_type=ExecutableTaskType.objects.get(
+                pk=EXECUTABLE_TASK_TYPE_PK
+            ),
+            task_queue=queue,
+        )
+
+        # Use a buffer which is only flushed when we say so
+        self.state_buffer = TaskStateBuffer(
+            batch_size=1000, flush_interval=1000
+        )
+
+    def test_bulk_state_updates(self):
+        """Make sure buffered state changes make it to the database."""
+        now = time.time()
+
+        for uuid in (
+            str(self.container_instance.uuid),
+            str(self.executable_instance.uuid),
+        ):
+            self.state_buffer.record_event(
+                {"type": "task-sent", "uuid": uuid, "timestamp": now}
+            )
+            self.state_buffer.record_event(
+                {"type": "task-started", "uuid": uuid, "timestamp": now + 1}
+            )
+
+        self.state_buffer.record_event(
+            {
+                "type": "task-succeeded",
+                "uuid": str(self.container_instance.uuid),
+                "timestamp": now + 2,
+            }
+        )
+        self.state_buffer.flush()
+
+        self.container_instance.refresh_from_db()
+        self.executable_instance.refresh_from_db()
+
+        self.assertEqual(self.container_instance.state, SUCCESSFUL)
+        self.assertIsNotNone(self.container_instance.datetime_finished)
+        self.assertEqual(self.executable_instance.state, RUNNING)
+
+    def test_timed_out_events(self):
+        """Make sure jobs which ran out of time are marked as such."""
+        now = time.time()
+
+        self.state_buffer.record_event(
+            {
+                "type": "task-failed",
+                "uuid": str(self.container_instance.uuid),
+                "timestamp": now,
+                "exception": "JobTimeout('sleep ran for longer than 1 "
+                "seconds',)",
+            }
+        )
+        self.state_buffer.record_event(
+            {
+                "type": "task-failed",
+                "uuid": str(self.executable_instance.uuid),
+                "timestamp": now,
+                "exception": "CalledProcessError()",
+            }
+        )
+        self.state_buffer.flush()
+
+        self.container_instance.refresh_from_db()
+        self.executable_instance.refresh_from_db()
+
+        self.assertEqual(self.container_instance.state, TIMED_OUT)
+        self.assertIsNotNone(self.container_instance.datetime_finished)
+        self.assertEqual(self.executable_instance.state, FAILED)
+
+    def test_out_of_order_events(self):
+        """Make sure late events don't move task instances backwards."""
+        uuid = str(self.container_instance.uuid)
+        now = time.time()
+
+        self.state_buffer.record_event(
+            {"type": "task-started", "uuid": uuid, "timestamp": now + 1}
+        )
+        self.state_buffer.flush()
+
+        # The sent event shows up late
+        self.state_buffer.record_event(
+            {"type": "task-sent", "uuid": uuid, "timestamp": now}
+        )
+        self.state_buffer.flush()
+
+        self.container_instance.refresh_from_db()
+        self.assertEqual(self.container_instance.state, RUNNING)
+
+        # And within a single batch
+        uuid = str(self.executable_instance.uuid)
+
+        self.state_buffer.record_event(
+            {"type": "task-started", "uuid": uuid, "timestamp": now + 1}
+        )
+        self.state_buffer.record_event(
+            {"type": "task-sent", "uuid": uuid, "timestamp": now}
+        )
+        self.state_buffer.flush()
+
+        self.executable_instance.refresh_from_db()
+        self.assertEqual(self.executable_instance.state, RUNNING)
+
+    def test_batch_states_events(self):
+        """Make sure batches' bulk state events are recorded."""
+        self.state_buffer.record_batch_event(
+            {
+                "type": "task-batch-states",
+                "timestamp": time.time(),
+                "states": {
+                    str(self.container_instance.uuid): SUCCESSFUL,
+                    str(self.executable_instance.uuid): TIMED_OUT,
+                },
+            }
+        )
+        self.state_buffer.flush()
+
+        self.container_instance.refresh_from_db()
+        self.executable_instance.refresh_from_db()
+
+        self.assertEqual(self.container_instance.state, SUCCESSFUL)
+        self.assertEqual(self.executable_instance.state, TIMED_OUT)
+
+    def test_lifecycle_datetimes(self):
+        """Make sure the times events were reported at are recorded."""
+        uuid = str(self.container_instance.uuid)
+        now = time.time()
+
+        # Go through every state before the buffer is flushed
+        self.state_buffer.record_event(
+            {"type": "task-sent", "uuid": uuid, "timestamp": now}
+        )
+        self.state_buffer.record_event(
+            {"type": "task-started", "uuid": uuid, "timestamp": now + 1}
+        )
+        self.state_buffer.record_event(
+            {"type": "task-revoked", "uuid": uuid, "timestamp": now + 3}
+        )
+        self.state_buffer.flush()
+
+        self.container_instance.refresh_from_db()
+
+        for field, timestamp in (
+            ("datetime_published", now),
+            ("datetime_started", now + 1),
+            ("datetime_finished", now + 3),
+        ):
+            self.assertEqual(
+                getattr(self.container_instance, field),
+                datetime.fromtimestamp(timestamp, tz=timezone.utc),
+            )
@@ -0,0 +1,144 @@
+"""Contains tests for failing task instances whose jobs are lost."""
+
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from tasksapi.constants import FAILED, PUBLISHED, RUNNING
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+    Worker,
+)
+from tasksapi.utils import (
+    get_worker_job_ids,
+    reap_task_instances,
+    resubmit_task_instances,
+)
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceReaperTests(TestCase):
+    """Test failing and resubmitting task instances with lost jobs."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Make some running task instances."""
+        self.uuids = [
+            ExecutableTaskInstance.objects.create(
+                user=User.objects.get(pk=USER_PK),
+                task_type=ExecutableTaskType.objects.get(
+                    pk=EXECUTABLE_TASK_TYPE_PK
+                ),
+                task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+            ).uuid
+            for _ in range(4)
+        ]
+
+        # The first three haven't changed in a while, and the last one
+        # just started
+        self.stale_before = timezone.now() - timedelta(minutes=10)
+
+        ExecutableTaskInstance.objects.filter(uuid__in=self.uuids[:3]).update(
+            state=RUNNING,
+            datetime_modified=self.stale_before - timedelta(minutes=1),
+        )
+        ExecutableTaskInstance.objects.filter(uuid=self.uuids[3]).update(
+            state=RUNNING
+        )
+
+    def test_reap(self):
+        """Make sure only stale task instances with lost jobs are failed."""
+        # A worker still has the first job
+        failed_uuids = reap_task_instances(
+            instance_model=ExecutableTaskInstance,
+            state=RUNNING,
+            stale_before=self.stale_before,
+            worker_job_ids={str(self.uuids[0])},
+            batch_size=1,
+        )
+
+        self.assertEqual(set(failed_uuids), set(self.uuids[1:3]))
+        self.assertEqual(
+            list(
+                ExecutableTaskInstance.objects.filter(
+                    uuid__in=self.uuids
+                ).values_list("state", flat=True)
+            ).count(FAILED),
+            2,
+        )
+        self.assertIsNotNone(
+            ExecutableTaskInstance.objects.get(
+                uuid=self.uuids[1]
+            ).datetime_finished
+        )
+
+        # Nothing else is stale
+        self.assertEqual(
+            reap_task_instances(
+                instance_model=ExecutableTaskInstance,
+                state=RUNNING,
+                stale_before=self.stale_before,
+                worker_job_ids={str(self.uuids[0])},
+            ),
+            [],
+        )
+
+    def test_resubmit(self):
+        """Make sure failed task instances can be run again."""
+        clones, errors = resubmit_task_instances(
+            instance_model=ExecutableTaskInstance, uuids=self.uuids[:2]
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(clones), 2)
+        self.assertEqual({clone.state for clone in clones}, {PUBLISHED})
+
+    @mock.patch("tasksapi.utils.reaping.run_task.app.control.inspect")
+    def test_partial_replies(self, inspect):
+        """Make sure workers' jobs are only trusted if they all reply."""
+        for name in ("celery@alive", "celery@quiet"):
+            Worker.objects.create(
+                name=name,
+                concurrency=1,
+                num_active_jobs=1,
+                datetime_last_heartbeat=timezone.now(),
+            )
+
+        job = {"id": str(self.uuids[0])}
+        inspect.return_value.active.return_value = {
+            "celery@alive": [job],
+            "celery@partial": [job],
+        }
+        inspect.return_value.reserved.return_value = {
+            "celery@alive": [],
+            "celery@partial": [],
+        }
+        inspect.return_value.scheduled.return_value = {
+            "celery@alive": [{"request": job}]
+        }
+
+        # Neither the worker which missed an inquiry nor the live worker
+        # which didn't reply at all can be vouched for
+        job_ids, unreplied_workers = get_worker_job_ids(timeout=1)
+
+        self.assertEqual(job_ids, {str(self.uuids[0])})
+        self.assertEqual(unreplied_workers, ["celery@partial", "celery@quiet"])
+
+        # Dead workers aren't expected to reply
+        Worker.objects.filter(name="celery@quiet").update(
+            datetime_last_heartbeat=timezone.now() - timedelta(days=1)
+        )
+        inspect.return_value.active.return_value = {"celery@alive": [job]}
+        inspect.return_value.reserved.return_value = {"celery@alive": []}
+
+        self.assertEqual(
+            get_worker_job_ids(timeout=1), ({str(self.uuids[0])}, [])
+        )
@@ -9,8 +9,10 @@ from django.conf import settings
 from django.test import TestCase
 from tasksapi.tasks import (
     run_docker_container_command,
+    run_docker_warm_pool_command,
     run_singularity_container_command,
 )
+from tasksapi.tasks.docker_client import get_docker_client, reset_docker_client
 
 
 class ContainerExecutionTests(TestCase):
@@ -67,6 +69,58 @@ class ContainerExecutionTests(TestCase):
             args_dict={"name": "AzureDiamond"},
         )
 
+        # Make sure the container's output was captured
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(
+                    os.environ["WORKER_LOGS_DIRECTORY"],
+                    "test-docker-success-uuid",
+                    "test-docker-success-uuid-stdout.txt",
+                )
+            )
+        )
+
+    def test_docker_warm_pool_success(self):
+        """Make sure Docker jobs in warm containers work properly."""
+        # Run a couple of jobs so one of them reuses a warm container
+        for job_number in range(2):
+            run_docker_warm_pool_command(
+                uuid="test-docker-warm-pool-success-uuid-%d" % job_number,
+                task_type_id=1,
+                container_image="mwiens91/hello-world",
+                command_to_run="/app/hello_world.py",
+                logs_path="/logs/",
+                results_path="/results/",
+                env_vars_list=["SHELL"],
+                args_dict={"name": "AzureDiamond"},
+                warm_pool_size=1,
+                warm_pool_max_jobs_per_container=10,
+            )
+
+    def test_docker_warm_pool_failure(self):
+        """Make sure Docker jobs that fail in warm containers are noticed."""
+        with self.assertRaises(docker.errors.ContainerError):
+            run_docker_warm_pool_command(
+                uuid="test-docker-warm-pool-failure-uuid",
+                task_type_id=2,
+                container_image="mwiens91/test-error-containers",
+                command_to_run="/app/error_raise.py",
+                logs_path=None,
+                results_path=None,
+                env_vars_list=[],
+                args_dict={},
+                warm_pool_size=1,
+                warm_pool_max_jobs_per_container=10,
+            )
+
+    def test_docker_client_reuse(self):
+        """Make sure Docker jobs share a client until it's reset."""
+        client = get_docker_client()
+        self.assertIs(get_docker_client(), client)
+
+        reset_docker_client()
+        self.assertIsNot(get_docker_client(), client)
+
     def test_singularity_success(self):
         """Make sure Singularity jobs work properly."""
         run_singularity_container_command(
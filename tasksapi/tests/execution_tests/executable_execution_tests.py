@@ -8,10 +8,28 @@ import os
 import pathlib
 import shutil
 import subprocess
+import sys
+from unittest import mock
 import uuid
 from django.conf import settings
 from django.test import TestCase
-from tasksapi.tasks import run_executable_command
+from tasksapi.constants import (
+    EXECUTABLE_TASK,
+    FAILED,
+    NONZERO_EXIT_FAILURE,
+    SUCCESSFUL,
+    TIMEOUT_FAILURE,
+    TIMED_OUT,
+)
+from tasksapi.tasks import JobTimeout, run_executable_command, run_task
+from tasksapi.tasks.batch_tasks import run_batch
+from tasksapi.tasks.retries import get_failure_class
+
+# A command which exits with the code given in its arguments
+BATCH_ITEM_COMMAND = (
+    sys.executable
+    + " -c 'import json, sys; sys.exit(json.loads(sys.argv[1])[\"code\"])'"
+)
 
 
 class ExecutableExecutionTests(TestCase):
@@ -68,3 +86,116 @@ class ExecutableExecutionTests(TestCase):
             args_dict={"toy": "example"},
             json_file_option="--json-file",
         )
+
+    def test_executable_timeout(self):
+        """Make sure executable jobs are stopped when they time out."""
+        with self.assertRaises(JobTimeout):
+            run_executable_command(
+                uuid="test-executable-timeout-uuid",
+                command_to_run="sleep 30",
+                env_vars_list=[],
+                args_dict={},
+                json_file_option=None,
+                timeout=1,
+            )
+
+    def test_executable_batch(self):
+        """Make sure each item of a batch gets its own state."""
+        items = [
+            ["test-executable-batch-uuid-%d" % i, {"code": i % 2}]
+            for i in range(4)
+        ]
+
+        for parallelism in (1, 2):
+            reported_states = {}
+
+            run_batch(
+                items=items,
+                task_class=EXECUTABLE_TASK,
+                command_to_run=BATCH_ITEM_COMMAND,
+                env_vars_list=[],
+                parallelism=parallelism,
+                max_runtime=None,
+                report_states=reported_states.update,
+                json_file_option=None,
+            )
+
+            self.assertEqual(
+                reported_states,
+                {
+                    uuid: SUCCESSFUL if args["code"] == 0 else FAILED
+                    for uuid, args in items
+                },
+            )
+
+    def test_executable_batch_timeout(self):
+        """Make sure batch items which run out of time are noticed."""
+        reported_states = {}
+
+        run_batch(
+            items=[["test-executable-batch-timeout-uuid", {}]],
+            task_class=EXECUTABLE_TASK,
+            command_to_run="sleep 30",
+            env_vars_list=[],
+            parallelism=1,
+            max_runtime=1,
+            report_states=reported_states.update,
+            json_file_option=None,
+        )
+
+        self.assertEqual(
+            reported_states, {"test-executable-batch-timeout-uuid": TIMED_OUT}
+        )
+
+    @mock.patch("tasksapi.tasks.base_task.report_task_instance_state")
+    @mock.patch("tasksapi.tasks.base_task.report_task_instance_retry")
+    def test_executable_retries(self, report_retry, _):
+        """Make sure jobs are retried after retryable failures only."""
+        task_kwargs = dict(
+            uuid="test-executable-retries-uuid",
+            task_class=EXECUTABLE_TASK,
+            command_to_run="false",
+            env_vars_list=[],
+            args_dict={},
+            json_file_option=None,
+            retry_policy={
+                "max_retries": 2,
+                "backoff": 1,
+                "backoff_max": 1,
+                "retryable_failures": [NONZERO_EXIT_FAILURE],
+            },
+        )
+
+        # Failures are retried until the retries run out
+        result = run_task.apply(
+            kwargs=task_kwargs, task_id=task_kwargs["uuid"]
+        )
+
+        self.assertIsInstance(result.result, subprocess.CalledProcessError)
+        self.assertEqual(report_retry.call_count, 2)
+        self.assertEqual(
+            report_retry.call_args[1]["failure"], NONZERO_EXIT_FAILURE
+        )
+        self.assertLessEqual(report_retry.call_args[1]["retry_delay"], 1)
+
+        # Other failures aren't retried
+        report_retry.reset_mock()
+        task_kwargs["retry_policy"]["retryable_failures"] = [TIMEOUT_FAILURE]
+
+        result = run_task.apply(
+            kwargs=task_kwargs, task_id=task_kwargs["uuid"]
+        )
+
+        self.assertIsInstance(result.result, subprocess.CalledProcessError)
+        report_retry.assert_not_called()
+
+    def test_failure_classes_without_docker(self):
+        """Make sure failures are classified on workers without Docker."""
+        with mock.patch.dict(sys.modules, {"docker.errors": None}):
+            self.assertEqual(
+                get_failure_class(subprocess.CalledProcessError(1, "false")),
+                NONZERO_EXIT_FAILURE,
+            )
+            self.assertEqual(
+                get_failure_class(JobTimeout("too slow")), TIMEOUT_FAILURE
+            )
@@ -0,0 +1,77 @@
+"""Contains tests for queue priorities."""
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+@override_settings(CELERY_TASK_QUEUE_MAX_PRIORITY=10)
+class TaskQueuePriorityTests(TestCase):
+    """Test task queue priorities."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Prep common test objects."""
+        self.user = User.objects.get(pk=USER_PK)
+        self.executable_task_type = ExecutableTaskType.objects.get(
+            pk=EXECUTABLE_TASK_TYPE_PK
+        )
+        self.queue = TaskQueue.objects.get(pk=QUEUE_PK)
+        self.queue.max_priority = 5
+        self.queue.default_priority = 2
+        self.queue.save()
+
+    def test_default_priority(self):
+        """Make sure instances fall back to their queue's priority."""
+        instance = ExecutableTaskInstance.objects.create(
+            user=self.user,
+            task_type=self.executable_task_type,
+            task_queue=self.queue,
+        )
+        self.assertEqual(instance.get_priority(), 2)
+
+        instance = ExecutableTaskInstance.objects.create(
+            user=self.user,
+            task_type=self.executable_task_type,
+            task_queue=self.queue,
+            priority=5,
+        )
+        self.assertEqual(instance.get_priority(), 5)
+
+    def test_priority_above_queue_maximum(self):
+        """Test rejection of priorities the queue doesn't allow."""
+        # Ensure this doesn't go through
+        with self.assertRaises(ValidationError):
+            ExecutableTaskInstance.objects.create(
+                user=self.user,
+                task_type=self.executable_task_type,
+                task_queue=self.queue,
+                priority=6,
+            )
+
+    def test_invalid_queue_priorities(self):
+        """Test rejection of queue priorities that can't be used."""
+        # The broker doesn't support priorities this high
+        self.queue.max_priority = 11
+
+        with self.assertRaises(ValidationError):
+            self.queue.clean()
+
+        # The default priority isn't allowed on the queue
+        self.queue.max_priority = 5
+        self.queue.default_priority = 6
+
+        with self.assertRaises(ValidationError):
+            self.queue.clean()
@@ -0,0 +1,148 @@
+"""Contains tests for task instance dependencies."""
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from tasksapi.constants import (
+    CREATED,
+    PUBLISHED,
+    SUCCESSFUL,
+    FAILED,
+    TERMINATED,
+    WAITING,
+)
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+from tasksapi.utils import bulk_update_task_instance_states
+
+
+# Put info about our fixtures data as constants here
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceDependenciesTests(TestCase):
+    """Test releasing and failing task instances with dependencies."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Prep common test objects."""
+        self.user = User.objects.get(pk=USER_PK)
+        self.executable_task_type = ExecutableTaskType.objects.get(
+            pk=EXECUTABLE_TASK_TYPE_PK
+        )
+        self.queue = TaskQueue.objects.get(pk=QUEUE_PK)
+
+    def create_instance(self, depends_on=()):
+        """Create an executable task instance.
+
+        Args:
+            depends_on: An optional iterable of task instances for the
+                new task instance to depend on.
+
+        Returns:
+            The new task instance.
+        """
+        return ExecutableTaskInstance.objects.create(
+            user=self.user,
+            task_type=self.executable_task_type,
+            task_queue=self.queue,
+            depends_on=[instance.uuid for instance in depends_on],
+        )
+
+    def get_state(self, instance):
+        """Get a task instance's state from the database."""
+        return ExecutableTaskInstance.objects.get(uuid=instance.uuid).state
+
+    def test_release_on_success(self):
+        """Make sure dependents run once all dependencies succeed."""
+        first = self.create_instance()
+        second = self.create_instance()
+        dependent = self.create_instance(depends_on=[first, second])
+
+        self.assertEqual(self.get_state(first), CREATED)
+        self.assertEqual(self.get_state(dependent), WAITING)
+
+        first.state = SUCCESSFUL
+        first.save()
+        self.assertEqual(self.get_state(dependent), WAITING)
+
+        second.state = SUCCESSFUL
+        second.save()
+        self.assertEqual(self.get_state(dependent), PUBLISHED)
+
+    def test_already_finished_dependencies(self):
+        """Make sure finished dependencies are accounted for."""
+        dependency = self.create_instance()
+        dependency.state = SUCCESSFUL
+        dependency.save()
+
+        dependent = self.create_instance(depends_on=[dependency])
+        self.assertEqual(self.get_state(dependent), PUBLISHED)
+
+        dependency = self.create_instance()
+        dependency.state = FAILED
+        dependency.save()
+
+        dependent = self.create_instance(depends_on=[dependency])
+        self.assertEqual(self.get_state(dependent), FAILED)
+
+    def test_failure_cascades(self):
+        """Make sure failures propagate through chains of dependents."""
+        first = self.create_instance()
+        second = self.create_instance(depends_on=[first])
+        third = self.create_instance(depends_on=[second])
+
+        first.state = FAILED
+        first.save()
+
+        self.assertEqual(self.get_state(second), FAILED)
+        self.assertEqual(self.get_state(third), FAILED)
+
+    def test_terminate_waiting(self):
+        """Make sure terminating a waiting instance fails dependents."""
+        first = self.create_instance()
+        second = self.create_instance(depends_on=[first])
+        third = self.create_instance(depends_on=[second])
+
+        second.terminate()
+
+        self.assertEqual(self.get_state(second), TERMINATED)
+        self.assertEqual(self.get_state(third), FAILED)
+
+    def test_bulk_updates(self):
+        """Make sure bulk state updates release dependents."""
+        succeeding = self.create_instance()
+        failing = self.create_instance()
+        released = self.create_instance(depends_on=[succeeding])
+        failed = self.create_instance(depends_on=[succeeding, failing])
+
+        bulk_update_task_instance_states(
+            {str(succeeding.uuid): SUCCESSFUL, str(failing.uuid): FAILED}
+        )
+
+        self.assertEqual(self.get_state(released), PUBLISHED)
+        self.assertEqual(self.get_state(failed), FAILED)
+
+    def test_missing_dependencies(self):
+        """Make sure dependencies need to exist."""
+        with self.assertRaises(ValidationError):
+            ExecutableTaskInstance.objects.create(
+                user=self.user,
+                task_type=self.executable_task_type,
+                task_queue=self.queue,
+                depends_on=["1a2b3c4d-0000-4000-8000-000000000000"],
+            )
+
+        with self.assertRaises(ValidationError):
+            ExecutableTaskInstance.objects.create(
+                user=self.user,
+                task_type=self.executable_task_type,
+                task_queue=self.queue,
+                depends_on=["not-a-uuid"],
+            )
@@ -0,0 +1,143 @@
+"""Contains requests tests for bulk cloning and terminating."""
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import CREATED, PUBLISHED, TERMINATED
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+ADMIN_USER_AUTH_TOKEN = "89afc52edb7ba88d127cde415e5e2e5b3c106001"
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+USER_PK = 2
+OTHER_USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+INSTANCE_NAME = "bulk action instance"
+
+
+class TaskInstanceBulkActionsRequestsTests(APITestCase):
+    """Test cloning and terminating lots of task instances at once."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client and make some task instances."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.uuids = [
+            str(
+                ExecutableTaskInstance.objects.create(
+                    name=INSTANCE_NAME,
+                    user=User.objects.get(pk=USER_PK),
+                    task_type=ExecutableTaskType.objects.get(
+                        pk=EXECUTABLE_TASK_TYPE_PK
+                    ),
+                    task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+                ).uuid
+            )
+            for _ in range(3)
+        ]
+
+    def test_bulk_terminate(self):
+        """Make sure chosen task instances are terminated."""
+        # Unpublished instances are terminated right away
+        ExecutableTaskInstance.objects.filter(uuid__in=self.uuids).update(
+            state=CREATED
+        )
+
+        response = self.client.post(
+            "/api/executabletaskinstances/bulk_terminate/",
+            {"uuids": self.uuids[:2]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["num_terminated"], 2)
+
+        self.assertEqual(
+            list(
+                ExecutableTaskInstance.objects.filter(
+                    uuid__in=self.uuids
+                ).values_list("state", flat=True)
+            ).count(TERMINATED),
+            2,
+        )
+
+        # Finished instances are left alone
+        response = self.client.post(
+            "/api/executabletaskinstances/bulk_terminate/?name="
+            + INSTANCE_NAME,
+            format="json",
+        )
+        self.assertEqual(response.data["num_terminated"], 1)
+
+    def test_bulk_clone(self):
+        """Make sure chosen task instances are cloned and published."""
+        response = self.client.post(
+            "/api/executabletaskinstances/bulk_clone/?name=" + INSTANCE_NAME,
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["uuids"]), 3)
+
+        clones = ExecutableTaskInstance.objects.filter(
+            uuid__in=response.data["uuids"]
+        )
+        self.assertEqual(
+            set(clones.values_list("state", flat=True)), {PUBLISHED}
+        )
+        self.assertEqual(
+            set(clones.values_list("name", flat=True)), {INSTANCE_NAME}
+        )
+
+    def test_other_users_instances(self):
+        """Make sure only staff can act on other users' task instances."""
+        ExecutableTaskInstance.objects.filter(uuid__in=self.uuids).update(
+            user=User.objects.get(pk=OTHER_USER_PK), state=CREATED
+        )
+
+        for action, key in (
+            ("bulk_clone", "uuids"),
+            ("bulk_terminate", "num_terminated"),
+        ):
+            response = self.client.post(
+                "/api/executabletaskinstances/%s/" % action,
+                {"uuids": self.uuids},
+                format="json",
+            )
+            self.assertFalse(response.data[key])
+
+        self.assertEqual(
+            set(
+                ExecutableTaskInstance.objects.filter(
+                    uuid__in=self.uuids
+                ).values_list("state", flat=True)
+            ),
+            {CREATED},
+        )
+
+        # Staff can, though
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + ADMIN_USER_AUTH_TOKEN
+        )
+
+        response = self.client.post(
+            "/api/executabletaskinstances/bulk_terminate/",
+            {"uuids": self.uuids},
+            format="json",
+        )
+        self.assertEqual(response.data["num_terminated"], 3)
+
+    def test_no_choice(self):
+        """Make sure task instances have to be chosen."""
+        for action in ("bulk_clone", "bulk_terminate"):
+            response = self.client.post(
+                "/api/executabletaskinstances/%s/" % action, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,117 @@
+"""Contains requests tests for conditional GET requests."""
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import RUNNING
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    TaskQueue,
+    TaskWhitelist,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+EXECUTABLE_TASK_INSTANCE_UUID = "aa07248f-fdf3-4d34-8215-0c7b21b892ad"
+QUEUE_PK = 1
+
+
+class ConditionalRequestsTests(APITestCase):
+    """Test ETags, Last-Modified headers, and 304 responses."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+    def test_retrieve(self):
+        """Test conditional GETs for single objects."""
+        url = "/api/taskqueues/%d/" % QUEUE_PK
+
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("no-cache", response["Cache-Control"])
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        # The client already has the latest version
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Now it doesn't
+        queue = TaskQueue.objects.get(pk=QUEUE_PK)
+        queue.description = "a new description"
+        queue.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_many_to_many_changes(self):
+        """Make sure changing many-to-many fields changes objects' ETags."""
+        url = "/api/taskqueues/%d/" % QUEUE_PK
+
+        etag = self.client.get(url)["ETag"]
+
+        whitelist = TaskWhitelist.objects.create(
+            name="my-whitelist", user=User.objects.get(pk=1)
+        )
+        TaskQueue.objects.get(pk=QUEUE_PK).whitelists.add(whitelist)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        # Changing the relation from the other end counts too
+        whitelist.taskqueue_set.clear()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list(self):
+        """Test conditional GETs for lists of objects."""
+        url = "/api/executabletaskinstances/"
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Filtered lists are different
+        response = self.client.get(
+            url + "?state=successful", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Deleting objects changes lists
+        ExecutableTaskInstance.objects.get(
+            uuid=EXECUTABLE_TASK_INSTANCE_UUID
+        ).delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_finished_task_instance_caching(self):
+        """Make sure finished task instances can be cached for a while."""
+        url = "/api/executabletaskinstances/%s/" % (
+            EXECUTABLE_TASK_INSTANCE_UUID
+        )
+
+        response = self.client.get(url)
+        self.assertIn("max-age=86400", response["Cache-Control"])
+
+        # Unfinished task instances can't be cached
+        ExecutableTaskInstance.objects.filter(
+            uuid=EXECUTABLE_TASK_INSTANCE_UUID
+        ).update(state=RUNNING)
+
+        response = self.client.get(url)
+        self.assertIn("no-cache", response["Cache-Control"])
@@ -0,0 +1,77 @@
+"""Contains requests tests for exporting task instances."""
+
+import csv
+import io
+import json
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import SUCCESSFUL
+from tasksapi.models import ExecutableTaskInstance
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+
+
+class TaskInstanceExportRequestsTests(APITestCase):
+    """Test exporting task instances."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+    def get_export(self, **params):
+        """Export executable task instances and return the response body."""
+        response = self.client.get(
+            "/api/executabletaskinstances/export/", params
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return b"".join(response.streaming_content).decode()
+
+    def test_jsonl_export(self):
+        """Make sure JSON Lines exports contain matching instances."""
+        rows = [
+            json.loads(line)
+            for line in self.get_export(state=SUCCESSFUL).splitlines()
+        ]
+
+        self.assertEqual(
+            {row["uuid"] for row in rows},
+            {
+                str(uuid)
+                for uuid in ExecutableTaskInstance.objects.filter(
+                    state=SUCCESSFUL
+                ).values_list("uuid", flat=True)
+            },
+        )
+
+        # Filters are respected
+        self.assertEqual(self.get_export(name="no-such-task-instance"), "")
+
+    def test_csv_export(self):
+        """Make sure CSV exports contain every instance."""
+        rows = list(
+            csv.DictReader(io.StringIO(self.get_export(export_format="csv")))
+        )
+
+        self.assertEqual(len(rows), ExecutableTaskInstance.objects.count())
+        self.assertIn("arguments", rows[0])
+        self.assertIsInstance(json.loads(rows[0]["arguments"]), dict)
+
+    def test_export_command(self):
+        """Make sure the export command matches the endpoint."""
+        output = io.StringIO()
+
+        call_command(
+            "export_task_instances",
+            "executable",
+            filters=["state=%s" % SUCCESSFUL],
+            stdout=output,
+        )
+
+        self.assertEqual(output.getvalue(), self.get_export(state=SUCCESSFUL))
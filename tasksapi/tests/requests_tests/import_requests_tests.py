@@ -0,0 +1,144 @@
+"""Contains requests tests for importing task instances."""
+
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import PUBLISHED
+from tasksapi.models import ExecutableTaskInstance
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+EXECUTABLE_TASK_TYPE_NAME = "echo SHELL"
+NOT_WHITELISTED_EXECUTABLE_TASK_TYPE_NAME = "not whitelisted exec task type"
+ACTIVE_QUEUE_NAME = "adminusers_all_nonprivate_active_queue"
+INACTIVE_QUEUE_NAME = "adminusers_all_nonprivate_inactive_queue"
+ADMIN_USER_USERNAME = "adminuser"
+
+
+class TaskInstanceImportRequestsTests(APITestCase):
+    """Test importing task instances."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+    def post_import(self, lines):
+        """Import executable task instances and return the response."""
+        return self.client.post(
+            "/api/executabletaskinstances/import/",
+            data="\n".join(lines).encode(),
+            content_type="application/x-ndjson",
+        )
+
+    def test_import(self):
+        """Make sure valid lines are imported and invalid ones skipped."""
+        num_instances = ExecutableTaskInstance.objects.count()
+
+        response = self.post_import(
+            [
+                json.dumps(
+                    {
+                        "name": "imported",
+                        "task_type": EXECUTABLE_TASK_TYPE_NAME,
+                        "task_queue": ACTIVE_QUEUE_NAME,
+                    }
+                ),
+                "",
+                "not json",
+                json.dumps(
+                    {
+                        "task_type": EXECUTABLE_TASK_TYPE_NAME,
+                        "task_queue": INACTIVE_QUEUE_NAME,
+                    }
+                ),
+                json.dumps(
+                    {
+                        "task_type": NOT_WHITELISTED_EXECUTABLE_TASK_TYPE_NAME,
+                        "task_queue": ACTIVE_QUEUE_NAME,
+                    }
+                ),
+                json.dumps(
+                    {
+                        "task_type": "no such task type",
+                        "task_queue": ACTIVE_QUEUE_NAME,
+                    }
+                ),
+                json.dumps(
+                    {
+                        "name": "imported",
+                        "task_type": EXECUTABLE_TASK_TYPE_NAME,
+                        "task_queue": ACTIVE_QUEUE_NAME,
+                        "arguments": "not a dictionary",
+                    }
+                ),
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["num_created"], 1)
+        self.assertEqual(
+            [error["line"] for error in response.data["errors"]],
+            [3, 4, 5, 6, 7],
+        )
+
+        self.assertEqual(
+            ExecutableTaskInstance.objects.count(), num_instances + 1
+        )
+        self.assertEqual(
+            ExecutableTaskInstance.objects.get(name="imported").state,
+            PUBLISHED,
+        )
+
+    def test_replay_export(self):
+        """Make sure exported task instances can be imported as is."""
+        response = self.client.get("/api/executabletaskinstances/export/")
+        export = b"".join(response.streaming_content).decode()
+        num_instances = ExecutableTaskInstance.objects.count()
+
+        response = self.post_import(export.splitlines())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["num_created"], num_instances)
+        self.assertEqual(response.data["errors"], [])
+
+        self.assertEqual(
+            ExecutableTaskInstance.objects.count(), 2 * num_instances
+        )
+
+    def test_import_command(self):
+        """Make sure the import command creates task instances."""
+        num_instances = ExecutableTaskInstance.objects.count()
+
+        with tempfile.TemporaryDirectory() as input_dir:
+            input_path = os.path.join(input_dir, "instances.jsonl")
+
+            with open(input_path, "w") as input_file:
+                for _ in range(3):
+                    input_file.write(
+                        json.dumps(
+                            {
+                                "task_type": EXECUTABLE_TASK_TYPE_NAME,
+                                "task_queue": ACTIVE_QUEUE_NAME,
+                            }
+                        )
+                        + "\n"
+                    )
+
+            call_command(
+                "import_task_instances",
+                "executable",
+                user=ADMIN_USER_USERNAME,
+                input=input_path,
+                chunk_size=2,
+                stdout=io.StringIO(),
+            )
+
+        self.assertEqual(
+            ExecutableTaskInstance.objects.count(), num_instances + 3
+        )
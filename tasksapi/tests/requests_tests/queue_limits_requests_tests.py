@@ -0,0 +1,162 @@
+"""Contains requests tests for queue limits."""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import PUBLISHED, RUNNING
+from tasksapi.models import (
+    ContainerTaskInstance,
+    ExecutableTaskInstance,
+    TaskQueue,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class QueueLimitsRequestsTests(APITestCase):
+    """Test queue submission rate and in-flight limits."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.queue = TaskQueue.objects.get(pk=QUEUE_PK)
+
+    def post_task_instance(self):
+        """Post an executable task instance to the queue."""
+        return self.client.post(
+            "/api/executabletaskinstances/",
+            dict(task_type=EXECUTABLE_TASK_TYPE_PK, task_queue=QUEUE_PK),
+            format="json",
+        )
+
+    def count_in_flight(self):
+        """Count the task instances in flight on the queue."""
+        return sum(
+            instance_model.objects.filter(
+                task_queue=self.queue, state__in=(PUBLISHED, RUNNING)
+            ).count()
+            for instance_model in (
+                ContainerTaskInstance,
+                ExecutableTaskInstance,
+            )
+        )
+
+    def test_no_limits(self):
+        """Make sure submissions to queues without limits don't wait."""
+        with CaptureQueriesContext(connection) as context:
+            post_response = self.post_task_instance()
+
+        self.assertEqual(post_response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(
+            any("FOR UPDATE" in query["sql"] for query in context)
+        )
+
+        # But they do once there's a limit to check
+        self.queue.max_in_flight = 10
+        self.queue.save()
+
+        with CaptureQueriesContext(connection) as context:
+            post_response = self.post_task_instance()
+
+        self.assertEqual(post_response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(any("FOR UPDATE" in query["sql"] for query in context))
+
+    def test_submission_rate_limit(self):
+        """Test submitting too many task instances in a minute."""
+        self.queue.max_submissions_per_minute_per_user = 2
+        self.queue.save()
+
+        post_response_1 = self.post_task_instance()
+        post_response_2 = self.post_task_instance()
+        post_response_3 = self.post_task_instance()
+
+        self.assertEqual(post_response_1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(post_response_2.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            post_response_3.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn(int(post_response_3["Retry-After"]), range(1, 62))
+
+    def test_in_flight_limit(self):
+        """Test submitting to a queue with too much in flight."""
+        post_response_1 = self.post_task_instance()
+        ExecutableTaskInstance.objects.filter(
+            uuid=post_response_1.data["uuid"]
+        ).update(state=RUNNING)
+
+        self.queue.max_in_flight = self.count_in_flight()
+        self.queue.save()
+
+        post_response_2 = self.post_task_instance()
+
+        self.assertEqual(post_response_1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            post_response_2.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", post_response_2)
+
+        # A batch that could never fit is a bad request instead
+        self.queue.max_in_flight = 1
+        self.queue.save()
+
+        batch_response = self.client.post(
+            "/api/executabletaskinstances/batch/",
+            dict(
+                task_type=EXECUTABLE_TASK_TYPE_PK,
+                task_queue=QUEUE_PK,
+                arguments_list=[{}, {}],
+            ),
+            format="json",
+        )
+
+        self.assertEqual(
+            batch_response.status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_in_flight_per_task_type_limit(self):
+        """Test submitting a task type with too much in flight."""
+        post_response_1 = self.post_task_instance()
+        ExecutableTaskInstance.objects.filter(
+            uuid=post_response_1.data["uuid"]
+        ).update(state=PUBLISHED)
+
+        self.queue.max_in_flight_per_task_type = ExecutableTaskInstance.objects.filter(
+            task_queue=self.queue,
+            task_type=EXECUTABLE_TASK_TYPE_PK,
+            state__in=(PUBLISHED, RUNNING),
+        ).count()
+        self.queue.save()
+
+        post_response_2 = self.post_task_instance()
+
+        self.assertEqual(
+            post_response_2.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_fair_share_batch(self):
+        """Make sure fair-share queues don't take batches."""
+        self.queue.uses_fair_share = True
+        self.queue.save()
+
+        batch_response = self.client.post(
+            "/api/executabletaskinstances/batch/",
+            dict(
+                task_type=EXECUTABLE_TASK_TYPE_PK,
+                task_queue=QUEUE_PK,
+                arguments_list=[{}, {}],
+            ),
+            format="json",
+        )
+
+        self.assertEqual(
+            batch_response.status_code, status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,125 @@
+"""Contains requests tests for reusing cached results."""
+
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import SUCCESSFUL
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+ADMIN_USER_AUTH_TOKEN = "89afc52edb7ba88d127cde415e5e2e5b3c106001"
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class ResultCacheRequestsTests(APITestCase):
+    """Test completing task instances from the result cache."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Make a deterministic task type with a finished instance."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.task_type = ExecutableTaskType.objects.get(
+            pk=EXECUTABLE_TASK_TYPE_PK
+        )
+        self.task_type.deterministic = True
+        self.task_type.save()
+
+        self.instance = ExecutableTaskInstance.objects.create(
+            user=User.objects.get(pk=USER_PK),
+            task_type=self.task_type,
+            task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+            arguments={"foo": "bar"},
+        )
+        ExecutableTaskInstance.objects.filter(uuid=self.instance.uuid).update(
+            state=SUCCESSFUL, datetime_finished=timezone.now()
+        )
+
+    def create_instance(self, arguments):
+        """Create a task instance of the deterministic task type."""
+        return self.client.post(
+            "/api/executabletaskinstances/",
+            dict(
+                task_type=EXECUTABLE_TASK_TYPE_PK,
+                task_queue=QUEUE_PK,
+                arguments=arguments,
+            ),
+            format="json",
+        )
+
+    def test_cache_hits(self):
+        """Make sure matching task instances reuse results."""
+        response = self.create_instance({"foo": "bar"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["state"], SUCCESSFUL)
+        self.assertEqual(response.data["cached_from"], str(self.instance.uuid))
+
+        # Cached results are linked to where they were made, not reused
+        # again from task instances which reused them
+        response = self.client.post(
+            "/api/executabletaskinstances/%s/clone/" % response.data["uuid"]
+        )
+        self.assertEqual(response.data["cached_from"], str(self.instance.uuid))
+
+        # Different arguments mean different results
+        response = self.create_instance({"foo": "baz"})
+        self.assertNotEqual(response.data["state"], SUCCESSFUL)
+        self.assertIsNone(response.data["cached_from"])
+
+        # Non-deterministic task types never reuse results
+        self.task_type.deterministic = False
+        self.task_type.save()
+
+        response = self.create_instance({"foo": "bar"})
+        self.assertNotEqual(response.data["state"], SUCCESSFUL)
+
+    def test_cache_expiry(self):
+        """Make sure old and invalidated results aren't reused."""
+        # Old results
+        self.task_type.result_cache_ttl = 60
+        self.task_type.save()
+
+        ExecutableTaskInstance.objects.filter(uuid=self.instance.uuid).update(
+            datetime_finished=timezone.now() - timedelta(minutes=5)
+        )
+
+        response = self.create_instance({"foo": "bar"})
+        self.assertIsNone(response.data["cached_from"])
+
+        self.task_type.result_cache_ttl = None
+        self.task_type.save()
+
+        response = self.create_instance({"foo": "bar"})
+        self.assertEqual(response.data["cached_from"], str(self.instance.uuid))
+
+        # Invalidated results. Only the task type's owner can do this.
+        url = "/api/executabletasktypes/%d/invalidate_result_cache/" % (
+            EXECUTABLE_TASK_TYPE_PK
+        )
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + ADMIN_USER_AUTH_TOKEN
+        )
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(
+            response.data["datetime_result_cache_invalidated"]
+        )
+
+        response = self.create_instance({"foo": "bar"})
+        self.assertIsNone(response.data["cached_from"])
@@ -0,0 +1,108 @@
+"""Contains requests tests for task instances' lifecycles."""
+
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import CONNECTION_FAILURE, PUBLISHED, RUNNING
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceLifecycleRequestsTests(APITestCase):
+    """Test recording task instances' states and when they reach them."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client and make a task instance."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.instance = ExecutableTaskInstance.objects.create(
+            user=User.objects.get(pk=USER_PK),
+            task_type=ExecutableTaskType.objects.get(
+                pk=EXECUTABLE_TASK_TYPE_PK
+            ),
+            task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+        )
+        self.url = "/api/updatetaskinstancestatus/%s/" % self.instance.uuid
+
+    def update_state(self, state, datetime):
+        """Report a state the task instance reached and when."""
+        response = self.client.patch(
+            self.url, dict(state=state, datetime=datetime), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reported_datetimes(self):
+        """Make sure the times workers report states at are recorded."""
+        ExecutableTaskInstance.objects.filter(uuid=self.instance.uuid).update(
+            datetime_published=None
+        )
+
+        self.update_state(PUBLISHED, "2018-08-16T17:30:59Z")
+        self.update_state(RUNNING, "2018-08-16T17:31:00Z")
+
+        # A retried job reports running again, but the task instance
+        # keeps when it first started, like with bulk state updates
+        response = self.client.post(
+            "/api/taskinstanceretries/%s/" % self.instance.uuid,
+            dict(failure=CONNECTION_FAILURE, error="oops", retry_delay=1),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.update_state(RUNNING, "2018-08-16T17:32:00Z")
+
+        response = self.client.get(
+            "/api/executabletaskinstances/%s/" % self.instance.uuid
+        )
+        self.assertEqual(
+            parse_datetime(response.data["datetime_published"]),
+            parse_datetime("2018-08-16T17:30:59Z"),
+        )
+        self.assertEqual(
+            parse_datetime(response.data["datetime_started"]),
+            parse_datetime("2018-08-16T17:31:00Z"),
+        )
+
+    def test_batch_states(self):
+        """Make sure batches' task instances belong together."""
+        batch_response = self.client.post(
+            "/api/executabletaskinstances/batch/",
+            dict(
+                name="my-task-instance-batch",
+                task_type=EXECUTABLE_TASK_TYPE_PK,
+                task_queue=QUEUE_PK,
+                arguments_list=[{"name": "Daniel"}, {"name": "Bob"}, {}],
+                parallelism=2,
+            ),
+            format="json",
+        )
+        self.assertEqual(batch_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(batch_response.data), 3)
+        self.assertEqual(
+            len({instance["batch_uuid"] for instance in batch_response.data}),
+            1,
+        )
+
+        # Update their states in bulk
+        batch_uuids = [instance["uuid"] for instance in batch_response.data]
+        statuses_response = self.client.patch(
+            "/api/updatetaskinstancestatuses/",
+            dict(states={uuid: RUNNING for uuid in batch_uuids}),
+            format="json",
+        )
+        self.assertEqual(statuses_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(statuses_response.data["num_updated"], 3)
@@ -0,0 +1,113 @@
+"""Contains requests tests for reporting uploaded task instance results."""
+
+import hashlib
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import SUCCESSFUL
+from tasksapi.models import ContainerTaskInstance
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+CONTAINER_TASK_INSTANCE_UUID = "28717f82-7f17-463e-8d02-d974e9fde61e"
+EXECUTABLE_TASK_INSTANCE_UUID = "aa07248f-fdf3-4d34-8215-0c7b21b892ad"
+
+
+class TaskInstanceResultsRequestsTests(APITestCase):
+    """Test recording where task instances' results were uploaded."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.url = "/api/taskinstanceresults/%s/" % (
+            CONTAINER_TASK_INSTANCE_UUID
+        )
+        self.location = "s3://results/%s/" % CONTAINER_TASK_INSTANCE_UUID
+        self.manifest = [
+            {
+                "path": "anagrams.txt",
+                "size": 5,
+                "sha256": hashlib.sha256(b"stop\n").hexdigest(),
+            },
+            {
+                "path": "plots/anagrams.png",
+                "size": 0,
+                "sha256": hashlib.sha256(b"").hexdigest(),
+            },
+        ]
+
+    def test_record_results(self):
+        """Make sure uploaded results are recorded on task instances."""
+        response = self.client.post(
+            self.url,
+            dict(location=self.location, manifest=self.manifest),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["num_files"], 2)
+
+        instance = ContainerTaskInstance.objects.get(
+            uuid=CONTAINER_TASK_INSTANCE_UUID
+        )
+        self.assertEqual(instance.results_location, self.location)
+        self.assertEqual(instance.results_manifest, self.manifest)
+
+        # The manifest shows up with the task instance
+        response = self.client.get(
+            "/api/containertaskinstances/%s/" % CONTAINER_TASK_INSTANCE_UUID
+        )
+        self.assertEqual(response.data["results_manifest"], self.manifest)
+
+    @override_settings(WORKERS_UPLOAD_RESULTS=True)
+    def test_caching_before_results(self):
+        """Make sure clients don't cache task instances awaiting results."""
+        ContainerTaskInstance.objects.filter(
+            uuid=CONTAINER_TASK_INSTANCE_UUID
+        ).update(state=SUCCESSFUL)
+        detail_url = (
+            "/api/containertaskinstances/%s/" % CONTAINER_TASK_INSTANCE_UUID
+        )
+
+        response = self.client.get(detail_url)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # Once the results are in, the task instance won't change
+        response = self.client.post(
+            self.url,
+            dict(location=self.location, manifest=self.manifest),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(detail_url)
+        self.assertIn("max-age=86400", response["Cache-Control"])
+
+    def test_bad_results(self):
+        """Make sure bad results reports are rejected."""
+        bad_file_dict = dict(self.manifest[0], sha256="not a hash")
+
+        response = self.client.post(
+            self.url,
+            dict(location=self.location, manifest=[bad_file_dict]),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Only container task instances have results directories
+        response = self.client.post(
+            "/api/taskinstanceresults/%s/" % EXECUTABLE_TASK_INSTANCE_UUID,
+            dict(location=self.location, manifest=self.manifest),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertIsNone(
+            ContainerTaskInstance.objects.get(
+                uuid=CONTAINER_TASK_INSTANCE_UUID
+            ).results_manifest
+        )
@@ -0,0 +1,131 @@
+"""Contains requests tests for task instance retries."""
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import (
+    CONNECTION_FAILURE,
+    IMAGE_PULL_FAILURE,
+    PUBLISHED,
+    RUNNING,
+    TERMINATED,
+)
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceRetriesRequestsTests(APITestCase):
+    """Test retry policies and recording retries."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client and make a task instance."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.instance = ExecutableTaskInstance.objects.create(
+            user=User.objects.get(pk=USER_PK),
+            task_type=ExecutableTaskType.objects.get(
+                pk=EXECUTABLE_TASK_TYPE_PK
+            ),
+            task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+        )
+        self.url = "/api/taskinstanceretries/%s/" % self.instance.uuid
+
+    def test_retry_policies(self):
+        """Make sure task types' retry policies are validated."""
+        url = "/api/executabletasktypes/"
+        task_type_dict = dict(
+            name="retried task type",
+            command_to_run="true",
+            max_retries=3,
+            retryable_failures=[IMAGE_PULL_FAILURE],
+        )
+
+        response = self.client.post(url, task_type_dict, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            ExecutableTaskType.objects.get(
+                pk=response.data["id"]
+            ).get_retry_policy()["retryable_failures"],
+            [IMAGE_PULL_FAILURE],
+        )
+
+        # Bad policies
+        for policy in (
+            dict(retryable_failures=["gremlins"]),
+            dict(retryable_failures=[]),
+            dict(retry_backoff=1000, retry_backoff_max=10),
+        ):
+            response = self.client.post(
+                url,
+                dict(task_type_dict, name="bad retried task type", **policy),
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_record_retries(self):
+        """Make sure retries are recorded on task instances."""
+        ExecutableTaskInstance.objects.filter(uuid=self.instance.uuid).update(
+            state=RUNNING
+        )
+
+        response = self.client.post(
+            self.url,
+            dict(
+                failure=CONNECTION_FAILURE,
+                error="ConnectionError()",
+                retry_delay=12.5,
+            ),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["state"], PUBLISHED)
+        self.assertEqual(response.data["num_retries"], 1)
+
+        self.instance.refresh_from_db()
+        self.assertEqual(self.instance.state, PUBLISHED)
+        self.assertEqual(len(self.instance.retry_history), 1)
+        self.assertEqual(
+            self.instance.retry_history[0]["failure"], CONNECTION_FAILURE
+        )
+
+        # Finished task instances aren't revived
+        ExecutableTaskInstance.objects.filter(uuid=self.instance.uuid).update(
+            state=TERMINATED
+        )
+
+        response = self.client.post(
+            self.url,
+            dict(failure=CONNECTION_FAILURE, error="", retry_delay=1),
+            format="json",
+        )
+        self.assertEqual(response.data["state"], TERMINATED)
+        self.assertEqual(response.data["num_retries"], 2)
+
+        # Bad requests
+        response = self.client.post(
+            self.url,
+            dict(failure="gremlins", error="", retry_delay=1),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            "/api/taskinstanceretries/%s/"
+            % "00000000-0000-0000-0000-000000000000",
+            dict(failure=CONNECTION_FAILURE, error="", retry_delay=1),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,101 @@
+"""Contains requests tests for waiting on task instance states."""
+
+import threading
+import time
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from tasksapi.constants import CREATED, RUNNING
+from tasksapi.models import (
+    ExecutableTaskInstance,
+    ExecutableTaskType,
+    TaskQueue,
+    User,
+)
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+USER_PK = 1
+EXECUTABLE_TASK_TYPE_PK = 1
+
+
+class TaskInstanceStatesRequestsTests(APITransactionTestCase):
+    """Test waiting on task instance state changes.
+
+    State changes are only announced once they're committed, so these
+    tests can't be run inside of a transaction.
+    """
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client and make a task instance."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+        self.instance = ExecutableTaskInstance.objects.create(
+            user=User.objects.get(pk=USER_PK),
+            task_type=ExecutableTaskType.objects.get(
+                pk=EXECUTABLE_TASK_TYPE_PK
+            ),
+            task_queue=TaskQueue.objects.get(pk=QUEUE_PK),
+        )
+        self.uuid = str(self.instance.uuid)
+
+    def get_states(self, **params):
+        """Request the task instance's state."""
+        return self.client.get(
+            "/api/taskinstancestates/", dict(uuids=self.uuid, **params)
+        )
+
+    def test_no_wait(self):
+        """Make sure states come back right away when appropriate."""
+        # No known states
+        response = self.get_states(wait=30)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["states"], {self.uuid: CREATED})
+
+        # Out-of-date known states
+        start_time = time.time()
+        response = self.get_states(states=RUNNING, wait=30)
+        self.assertEqual(response.data["states"], {self.uuid: CREATED})
+        self.assertLess(time.time() - start_time, 10)
+
+        # Bad parameters
+        response = self.get_states(states=",".join([CREATED, CREATED]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.get_states(states="sleepy")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_wait_timeout(self):
+        """Make sure waits end when nothing happens."""
+        start_time = time.time()
+        response = self.get_states(states=CREATED, wait=1)
+
+        self.assertEqual(response.data["states"], {self.uuid: CREATED})
+        self.assertGreaterEqual(time.time() - start_time, 1)
+
+    def test_wait_for_change(self):
+        """Make sure waits end as soon as a state changes."""
+
+        def run_instance():
+            """Mark the task instance as running after a moment."""
+            time.sleep(0.5)
+
+            ExecutableTaskInstance.objects.filter(uuid=self.uuid).update(
+                state=RUNNING
+            )
+            connection.close()
+
+        thread = threading.Thread(target=run_instance)
+        thread.start()
+
+        start_time = time.time()
+        response = self.get_states(states=CREATED, wait=30)
+        thread.join()
+
+        self.assertEqual(response.data["states"], {self.uuid: RUNNING})
+        self.assertLess(time.time() - start_time, 10)
@@ -0,0 +1,113 @@
+"""Contains requests tests for worker heartbeats."""
+
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tasksapi.constants import WORKER_HEARTBEAT_TIMEOUT
+from tasksapi.models import Worker
+
+# Put info about our fixtures data as constants here
+NON_ADMIN_USER_AUTH_TOKEN = "02d205bc79d5e8f15f83e249ac227ef0085f953f"
+QUEUE_PK = 1
+QUEUE_NAME = "adminusers_all_nonprivate_active_queue"
+WORKER_NAME = "celery@myhost"
+
+
+class WorkerHeartbeatsRequestsTests(APITestCase):
+    """Test worker heartbeats and the queue capacities they report."""
+
+    fixtures = ["test-fixture.yaml"]
+
+    def setUp(self):
+        """Add in user's auth to client."""
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Token " + NON_ADMIN_USER_AUTH_TOKEN
+        )
+
+    def send_heartbeat(self, num_active_jobs=1):
+        """Send a heartbeat for a worker serving the fixture queue."""
+        return self.client.post(
+            "/api/workerheartbeats/",
+            dict(
+                name=WORKER_NAME,
+                task_queues=[QUEUE_NAME, "not a real queue"],
+                concurrency=4,
+                num_active_jobs=num_active_jobs,
+                load_average=0.5,
+            ),
+            format="json",
+        )
+
+    def test_heartbeats(self):
+        """Make sure heartbeats keep queues' workers up to date."""
+        url = "/api/taskqueues/%d/" % QUEUE_PK
+
+        # No workers yet
+        response = self.client.get(url)
+        self.assertFalse(response.data["is_served"])
+        self.assertEqual(response.data["num_workers"], 0)
+        etag = response["ETag"]
+
+        # Start up a worker
+        response = self.send_heartbeat()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["task_queues"], [QUEUE_NAME])
+        self.assertTrue(response.data["is_alive"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_served"])
+        self.assertEqual(response.data["num_workers"], 1)
+        self.assertEqual(response.data["worker_capacity"], 4)
+        self.assertEqual(response.data["spare_worker_capacity"], 3)
+
+        # Heartbeats update the worker rather than adding more
+        self.send_heartbeat(num_active_jobs=4)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["num_workers"], 1)
+        self.assertEqual(response.data["spare_worker_capacity"], 0)
+        etag = response["ETag"]
+
+        # Heartbeats which don't change anything leave the queue be
+        self.send_heartbeat(num_active_jobs=4)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Let the worker die
+        Worker.objects.update(
+            datetime_last_heartbeat=timezone.now()
+            - timedelta(seconds=WORKER_HEARTBEAT_TIMEOUT + 1)
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["is_served"])
+        self.assertEqual(response.data["num_workers"], 0)
+
+        # Dead workers are still listed, but marked as such
+        response = self.client.get("/api/workers/")
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(response.data["results"][0]["is_alive"])
+
+        # Workers coming back to life change their queues
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        self.send_heartbeat(num_active_jobs=4)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["num_workers"], 1)
+
+    def test_bad_heartbeats(self):
+        """Make sure malformed heartbeats are rejected."""
+        response = self.client.post(
+            "/api/workerheartbeats/",
+            dict(name=WORKER_NAME, task_queues=[QUEUE_NAME]),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Worker.objects.exists())
@@ -30,6 +30,7 @@ router.register("executabletaskinstances", views.ExecutableTaskInstanceViewSet)
 router.register("executabletasktypes", views.ExecutableTaskTypeViewSet)
 router.register("taskqueues", views.TaskQueueViewSet)
 router.register("taskwhitelists", views.TaskWhitelistViewSet)
+router.register("workers", views.WorkerViewSet)
 
 
 # Schema for Swagger API
@@ -65,6 +66,31 @@ urlpatterns = [
         views.update_task_instance_status,
         name="update_task_instance_status",
     ),
+    path(
+        r"updatetaskinstancestatuses/",
+        views.update_task_instance_statuses,
+        name="update_task_instance_statuses",
+    ),
+    path(
+        r"taskinstancestates/",
+        views.wait_for_task_instance_state_changes,
+        name="wait_for_task_instance_state_changes",
+    ),
+    path(
+        r"taskinstanceretries/<slug:uuid>/",
+        views.receive_task_instance_retry,
+        name="receive_task_instance_retry",
+    ),
+    path(
+        r"taskinstanceresults/<slug:uuid>/",
+        views.receive_task_instance_results,
+        name="receive_task_instance_results",
+    ),
+    path(
+        r"workerheartbeats/",
+        views.receive_worker_heartbeat,
+        name="receive_worker_heartbeat",
+    ),
     path(
         r"token/",
         views.TokenObtainPairPermissiveView.as_view(),
@@ -0,0 +1,28 @@
+"""Collect all helpers to "export" from this directory."""
+
+from .allowed_queues import get_allowed_queues, get_allowed_queues_sorted
+from .archive import archive_task_instances
+from .batches import create_task_instance_batch
+from .bulk_actions import (
+    TASK_INSTANCE_IMPORT_CHUNK_SIZE,
+    bulk_create_task_instances,
+    clone_task_instances,
+    terminate_task_instances,
+)
+from .export import export_task_instances
+from .fair_share import dispatch_fair_share_task_instances
+from .imports import import_task_instances
+from .queue_limits import check_task_queue_limits
+from .reaping import (
+    get_worker_job_ids,
+    reap_task_instances,
+    resubmit_task_instances,
+)
+from .results import record_task_instance_results
+from .retries import record_task_instance_retry
+from .state_updates import bulk_update_task_instance_states
+from .state_waits import (
+    TASK_INSTANCE_STATES_MAX_WAIT,
+    wait_for_task_instance_states,
+)
+from .workers import get_workers_last_changed, record_worker_heartbeat
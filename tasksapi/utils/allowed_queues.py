@@ -1,4 +1,4 @@
-"""Helpful functions for the tasksapi."""
+"""Contains helpers for finding the queues users can use."""
 
 from django.db.models import Case, IntegerField, Q, When
 from tasksapi.constants import DOCKER
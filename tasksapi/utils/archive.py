@@ -0,0 +1,88 @@
+"""Contains helpers for archiving old task instances."""
+
+import gzip
+import json
+import os
+from uuid import uuid4
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from tasksapi.constants import TERMINAL_STATES
+from tasksapi.signals import send_task_instances_changed
+
+
+def archive_task_instances(
+    instance_model, created_before, archive_dir, batch_size
+):
+    """Move old finished task instances out of the database.
+
+    Finished task instances created before a given time are written, a
+    batch at a time, to gzip-compressed JSON Lines files (one task
+    instance per line, containing its database columns) and are then
+    deleted. Each batch is archived in its own transaction, so the
+    tables are never locked for long, and stopping partway through
+    loses nothing.
+
+    Args:
+        instance_model: The task instance model to archive instances
+            of.
+        created_before: A datetime. Finished task instances created
+            before this are archived.
+        archive_dir: A string containing the path of the directory to
+            write archive files to. It's created if it doesn't exist.
+        batch_size: An integer specifying the maximum number of task
+            instances to archive per file (and transaction).
+
+    Returns:
+        An integer containing the number of task instances archived.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+
+    num_archived = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                instance_model.objects.filter(
+                    state__in=TERMINAL_STATES,
+                    datetime_created__lt=created_before,
+                )
+                .select_for_update(skip_locked=True)
+                .order_by("datetime_created")
+                .values()[:batch_size]
+            )
+
+            if not rows:
+                return num_archived
+
+            # Write out the batch before deleting it
+            archive_path = os.path.join(
+                archive_dir,
+                "%s-%s-%s.jsonl.gz"
+                % (
+                    instance_model._meta.model_name,
+                    rows[0]["datetime_created"].strftime("%Y%m%dT%H%M%S"),
+                    uuid4().hex[:8],
+                ),
+            )
+
+            with gzip.open(archive_path, "wt") as archive_file:
+                for row in rows:
+                    archive_file.write(
+                        json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+                    )
+
+            # Don't leave behind an archive of task instances which are
+            # still in the database
+            try:
+                instance_model.objects.filter(
+                    uuid__in=[row["uuid"] for row in rows]
+                ).delete()
+            except Exception:
+                os.remove(archive_path)
+                raise
+
+        send_task_instances_changed(
+            instance_model, (row["task_type_id"] for row in rows)
+        )
+
+        num_archived += len(rows)
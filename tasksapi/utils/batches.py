@@ -0,0 +1,131 @@
+"""Contains helpers for running task instances in batches."""
+
+from uuid import uuid4
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from tasksapi.constants import PUBLISHED
+from tasksapi.models.validators import task_instance_args_are_valid
+from tasksapi.signals import send_task_instances_changed
+from tasksapi.tasks import run_task_batch
+
+
+def create_task_instance_batch(
+    instance_model,
+    user,
+    task_type,
+    task_queue,
+    arguments_list,
+    name="",
+    priority=None,
+    parallelism=1,
+):
+    """Create a batch of task instances and run them in a single job.
+
+    The task instances are validated and created in bulk (already in
+    the published state), and then a single Celery message is sent to
+    run all of them once they're committed. Since they're created in
+    bulk, their post-save handlers (which would queue a job for each
+    instance) don't run.
+
+    Queues using fair-share scheduling don't take batches, since their
+    task instances are published one at a time by the fair-share
+    dispatcher.
+
+    Args:
+        instance_model: The task instance model to create instances of.
+        user: The user creating the task instances.
+        task_type: The task type of the task instances.
+        task_queue: The queue to run the batch on.
+        arguments_list: A list of arguments dictionaries, one for each
+            task instance.
+        name: An optional non-unique name for the task instances.
+        priority: An optional integer specifying the priority of the
+            task instances. Defaults to the queue's default priority.
+        parallelism: An optional integer specifying how many task
+            instances the worker should run at once. Defaults to 1.
+
+    Returns:
+        A list of the task instances created.
+
+    Raises:
+        django.core.exceptions.ValidationError: One of the task
+            instances isn't valid, or the queue uses fair-share
+            scheduling.
+    """
+    if task_queue.uses_fair_share:
+        raise ValidationError(
+            "Queue %s uses fair-share scheduling, so it doesn't take "
+            "batches" % task_queue.name
+        )
+
+    batch_uuid = uuid4()
+    instances = [
+        instance_model(
+            name=name,
+            user=user,
+            task_type=task_type,
+            task_queue=task_queue,
+            arguments=arguments,
+            priority=priority,
+            batch_uuid=batch_uuid,
+        )
+        for arguments in arguments_list
+    ]
+
+    # Everything but the arguments is the same for each instance, so
+    # only fully validate the first instance
+    instances[0].clean(fill_in_missing_args=True)
+
+    for instance in instances[1:]:
+        if not isinstance(instance.arguments, dict):
+            raise ValidationError(
+                "'%s' is not a valid JSON dictionary!" % instance.arguments
+            )
+
+        is_valid, reason = task_instance_args_are_valid(
+            instance=instance, fill_missing_args=True
+        )
+
+        if not is_valid:
+            raise ValidationError(reason)
+
+    # Queue up the batch's job. This reuses the job arguments of a
+    # single instance, minus what's specific to that instance.
+    kwargs = instances[0].get_task_kwargs()
+    del kwargs["uuid"]
+    del kwargs["args_dict"]
+
+    # Batches share a single job, so their task instances can't be
+    # retried one by one
+    del kwargs["retry_policy"]
+
+    kwargs["batch_uuid"] = str(batch_uuid)
+    kwargs["items"] = [
+        [str(instance.uuid), instance.arguments] for instance in instances
+    ]
+    kwargs["parallelism"] = parallelism
+
+    # Batches' task instances are created as published rather than
+    # marked as published when the message is sent (see the tasks
+    # module), so nothing (e.g., terminating them) can get in between
+    now = timezone.now()
+
+    for instance in instances:
+        instance.state = PUBLISHED
+        instance.datetime_published = now
+
+    with transaction.atomic():
+        instance_model.objects.bulk_create(instances)
+        send_task_instances_changed(instance_model, [task_type.id])
+
+        transaction.on_commit(
+            lambda: run_task_batch.apply_async(
+                kwargs=kwargs,
+                queue=task_queue.name,
+                task_id=str(batch_uuid),
+                priority=instances[0].get_priority(),
+            )
+        )
+
+    return instances
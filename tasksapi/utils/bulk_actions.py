@@ -0,0 +1,248 @@
+"""Contains helpers for creating, cloning, and terminating task instances in bulk."""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from tasksapi.constants import (
+    CREATED,
+    PUBLISHED,
+    TERMINAL_STATES,
+    TERMINATED,
+    WAITING,
+)
+from tasksapi.models import TaskQueue
+from tasksapi.models.dependencies import (
+    release_dependent_task_instances,
+    update_waiting_task_instances,
+)
+from tasksapi.models.result_cache import link_cached_results
+from tasksapi.models.validators import task_instance_args_are_valid
+from tasksapi.signals import send_task_instances_changed
+from tasksapi.tasks import run_task
+
+
+# How many task instances to create at a time when importing or cloning
+# them
+TASK_INSTANCE_IMPORT_CHUNK_SIZE = 1000
+
+
+def bulk_create_task_instances(instance_model, instances):
+    """Create task instances in bulk and queue up their jobs.
+
+    Since the task instances are created in bulk, their post-save
+    handlers (which would publish each of them over its own connection
+    to the message broker) don't run, so this does their job instead:
+    instances waiting on others are released (or failed) if their
+    dependencies have finished, instances on queues using fair-share
+    scheduling are left for the dispatcher, instances of deterministic
+    task types with cached results reuse them, and the rest are
+    published over a single connection once they're committed.
+
+    Args:
+        instance_model: The task instance model to create instances of.
+        instances: A list of unsaved task instances.
+    """
+    # Reuse results where possible
+    link_cached_results(instance_model, instances)
+
+    # The instances to publish are marked as published here rather than
+    # when their messages are sent, and their messages are only sent
+    # once they're committed
+    instances_to_publish = [
+        instance
+        for instance in instances
+        if instance.state == CREATED
+        and not instance.task_queue.uses_fair_share
+    ]
+    now = timezone.now()
+
+    for instance in instances_to_publish:
+        instance.state = PUBLISHED
+        instance.datetime_published = now
+
+    def publish_instances():
+        """Queue up the instances' jobs over a single connection."""
+        with run_task.app.producer_or_acquire() as producer:
+            for instance in instances_to_publish:
+                instance.publish(producer=producer)
+
+    with transaction.atomic():
+        instance_model.objects.bulk_create(
+            instances, batch_size=TASK_INSTANCE_IMPORT_CHUNK_SIZE
+        )
+        send_task_instances_changed(
+            instance_model, (instance.task_type_id for instance in instances)
+        )
+
+        # Release anything whose dependencies have already finished
+        waiting_instances = [
+            instance for instance in instances if instance.state == WAITING
+        ]
+
+        if waiting_instances:
+            update_waiting_task_instances(waiting_instances)
+
+        if instances_to_publish:
+            transaction.on_commit(publish_instances)
+
+
+def terminate_task_instances(instance_model, queryset):
+    """Send a terminate signal to lots of task instances' jobs at once.
+
+    All of the jobs are revoked with a single broadcast message, and the
+    instances which haven't been published yet are marked as terminated
+    in bulk. Like terminating a single task instance, terminating an
+    instance in a batch terminates the whole batch.
+
+    Args:
+        instance_model: The task instance model of the instances.
+        queryset: A queryset of the task instances to terminate.
+
+    Returns:
+        An integer containing the number of unfinished task instances
+        which were sent a terminate signal.
+    """
+    rows = list(
+        queryset.exclude(state__in=TERMINAL_STATES)
+        .order_by()
+        .values_list("uuid", "batch_uuid")
+    )
+
+    if not rows:
+        return 0
+
+    run_task.app.control.revoke(
+        sorted({str(batch_uuid or uuid) for uuid, batch_uuid in rows}),
+        terminate=True,
+    )
+
+    # Terminate anything which hasn't been published yet right away so
+    # that it's never published
+    with transaction.atomic():
+        terminated_rows = list(
+            instance_model.objects.select_for_update()
+            .filter(
+                uuid__in=[uuid for uuid, _ in rows],
+                state__in=(CREATED, WAITING),
+            )
+            .values_list("uuid", "task_type_id")
+        )
+        terminated_uuids = [uuid for uuid, _ in terminated_rows]
+
+        instance_model.objects.filter(uuid__in=terminated_uuids).update(
+            state=TERMINATED,
+            datetime_finished=timezone.now(),
+            datetime_modified=timezone.now(),
+        )
+
+    send_task_instances_changed(
+        instance_model, (task_type_id for _, task_type_id in terminated_rows)
+    )
+
+    # Fail anything waiting on them
+    release_dependent_task_instances(
+        {uuid: TERMINATED for uuid in terminated_uuids}
+    )
+
+    return len(rows)
+
+
+def clone_task_instances(instance_model, queryset, user):
+    """Clone lots of task instances at once.
+
+    Each task instance is cloned with the same name, task type, queue,
+    arguments, priority, and dependencies, like cloning a single task
+    instance. Whether the queues will take the clones is only checked
+    once for each task type and queue, and the clones are created and
+    published in bulk. Clones depending on task instances which no
+    longer exist are failed right away.
+
+    Args:
+        instance_model: The task instance model of the instances.
+        queryset: A queryset of the task instances to clone.
+        user: The user cloning the task instances.
+
+    Returns:
+        A list of the clones.
+
+    Raises:
+        django.core.exceptions.ValidationError: One of the clones isn't
+            valid. No clones are created in this case.
+    """
+    task_type_model = instance_model._meta.get_field("task_type").related_model
+    task_types_dict = {}
+    task_queues_dict = {}
+    checked_pairs = set()
+    clones = []
+
+    for (
+        name,
+        task_type_id,
+        task_queue_id,
+        arguments,
+        priority,
+        depends_on,
+    ) in (
+        queryset.order_by()
+        .values_list(
+            "name",
+            "task_type_id",
+            "task_queue_id",
+            "arguments",
+            "priority",
+            "depends_on",
+        )
+        .iterator()
+    ):
+        # Look up the task type and queue the first time they come up
+        if task_type_id not in task_types_dict:
+            task_types_dict[task_type_id] = task_type_model.objects.get(
+                pk=task_type_id
+            )
+
+        if task_queue_id not in task_queues_dict:
+            task_queues_dict[task_queue_id] = TaskQueue.objects.get(
+                pk=task_queue_id
+            )
+
+        clone = instance_model(
+            name=name,
+            user=user,
+            task_type=task_types_dict[task_type_id],
+            task_queue=task_queues_dict[task_queue_id],
+            arguments=arguments,
+            priority=priority,
+            depends_on=depends_on,
+            state=WAITING if depends_on else CREATED,
+        )
+
+        # Make sure the queue will take instances of the task type the
+        # first time they come up together
+        if (task_type_id, task_queue_id) not in checked_pairs:
+            clone.clean_task_queue()
+
+            checked_pairs.add((task_type_id, task_queue_id))
+
+        # Validate what's specific to the clone
+        if (
+            clone.priority is not None
+            and clone.priority > clone.task_queue.max_priority
+        ):
+            raise ValidationError(
+                "Queue %s only allows priorities up to %d"
+                % (clone.task_queue.name, clone.task_queue.max_priority)
+            )
+
+        is_valid, reason = task_instance_args_are_valid(
+            instance=clone, fill_missing_args=True
+        )
+
+        if not is_valid:
+            raise ValidationError(reason)
+
+        clones.append(clone)
+
+    if clones:
+        bulk_create_task_instances(instance_model, clones)
+
+    return clones
@@ -0,0 +1,106 @@
+"""Contains helpers for exporting task instances."""
+
+import csv
+from datetime import datetime
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from tasksapi.constants import CSV_EXPORT
+
+
+# How many task instances to fetch from the database at a time when
+# exporting them
+TASK_INSTANCE_EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """A file-like object which hands back whatever is written to it.
+
+    This lets the csv module format rows without buffering them.
+    """
+
+    def write(self, value):
+        """Hand back the value written."""
+        return value
+
+
+def format_csv_value(value):
+    """Format a task instance's column value for a CSV export.
+
+    Args:
+        value: The value to format.
+
+    Returns:
+        The value, with JSON (e.g., arguments and dependencies) dumped
+        to strings and datetimes in ISO 8601 format.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return value
+
+
+def export_task_instances(
+    queryset, export_format, chunk_size=TASK_INSTANCE_EXPORT_CHUNK_SIZE
+):
+    """Export task instances as CSV or JSON Lines.
+
+    This uses a server-side cursor to fetch the task instances a chunk
+    at a time, and yields the export a chunk at a time, so it runs in
+    constant memory no matter how many task instances are exported.
+    Task instances are exported with their database columns, in no
+    particular order (sorting them would mean the database has to
+    gather all of them first).
+
+    Args:
+        queryset: A queryset of the task instances to export.
+        export_format: A string which must be one of the export format
+            constants.
+        chunk_size: An optional integer specifying how many task
+            instances to fetch (and yield) at a time. Defaults to
+            TASK_INSTANCE_EXPORT_CHUNK_SIZE.
+
+    Yields:
+        Strings containing consecutive pieces of the export.
+    """
+    field_names = [
+        field.attname for field in queryset.model._meta.concrete_fields
+    ]
+    rows = (
+        queryset.order_by()
+        .values_list(*field_names)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    if export_format == CSV_EXPORT:
+        writer = csv.writer(Echo())
+
+        yield writer.writerow(field_names)
+
+        lines = (
+            writer.writerow([format_csv_value(value) for value in row])
+            for row in rows
+        )
+    else:
+        lines = (
+            json.dumps(dict(zip(field_names, row)), cls=DjangoJSONEncoder)
+            + "\n"
+            for row in rows
+        )
+
+    # Yield whole chunks rather than individual rows, which would be
+    # much slower to send
+    chunk = []
+
+    for line in lines:
+        chunk.append(line)
+
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk)
+
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,182 @@
+"""Contains helpers for fair-share scheduling on shared queues."""
+
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from tasksapi.constants import CREATED, PUBLISHED, RUNNING
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance, User
+from tasksapi.signals import send_task_instances_changed
+
+
+def dispatch_fair_share_task_instances(task_queue):
+    """Publish the task instances a fair-share queue has room for.
+
+    Instances on queues using fair-share scheduling are held in the
+    created state until this publishes them. Each user can have at most
+    the queue's max_in_flight_per_user times their fair-share weight
+    instances published or running on the queue at once. Each user's
+    instances are published in order of priority and then age. The
+    instances of different users are interleaved in proportion to their
+    weights, so the broker never holds a long run of one user's jobs.
+
+    The queue's in-flight limits (in total and per task type) also
+    apply.
+
+    Only one dispatcher should run at a time, since nothing stops two
+    dispatchers from publishing the same task instance.
+
+    Args:
+        task_queue: The fair-share queue to publish instances on.
+
+    Returns:
+        An integer containing the number of task instances published.
+    """
+    instance_models = (ContainerTaskInstance, ExecutableTaskInstance)
+
+    # Count how many instances each user has in flight on the queue
+    num_in_flight = {}
+
+    for instance_model in instance_models:
+        for row in (
+            instance_model.objects.filter(
+                task_queue=task_queue, state__in=(PUBLISHED, RUNNING)
+            )
+            .order_by()
+            .values("user")
+            .annotate(num=Count("uuid"))
+        ):
+            num_in_flight[row["user"]] = (
+                num_in_flight.get(row["user"], 0) + row["num"]
+            )
+
+    # Find the users waiting on the queue and how much room they have
+    user_pks = set()
+
+    for instance_model in instance_models:
+        user_pks.update(
+            instance_model.objects.filter(
+                task_queue=task_queue, state=CREATED
+            ).values_list("user", flat=True)
+        )
+
+    weights = dict(
+        User.objects.filter(pk__in=user_pks).values_list(
+            "pk", "fair_share_weight"
+        )
+    )
+
+    # Pick each user's next instances and give each a place in line.
+    # The nth instance released for a user goes at (number in flight +
+    # n) / weight, so heavier users get proportionally more slots.
+    releases = []
+
+    for user_pk in user_pks:
+        # Instances of deleted users have no user
+        weight = weights.get(user_pk, 1)
+        num_free = (
+            task_queue.max_in_flight_per_user * weight
+            - num_in_flight.get(user_pk, 0)
+        )
+
+        if num_free <= 0:
+            continue
+
+        candidates = []
+
+        for instance_model in instance_models:
+            candidates += (
+                instance_model.objects.filter(
+                    task_queue=task_queue, user=user_pk, state=CREATED
+                )
+                .annotate(
+                    effective_priority=Coalesce(
+                        F("priority"), Value(task_queue.default_priority)
+                    )
+                )
+                .order_by("-effective_priority", "datetime_created")[:num_free]
+            )
+
+        candidates.sort(
+            key=lambda x: (-x.effective_priority, x.datetime_created)
+        )
+
+        for n, instance in enumerate(candidates[:num_free], start=1):
+            releases.append(
+                ((num_in_flight.get(user_pk, 0) + n) / weight, instance)
+            )
+
+    # Count how many instances of each task type are in flight, if the
+    # queue limits that
+    num_in_flight_per_task_type = {}
+
+    if task_queue.max_in_flight_per_task_type is not None:
+        for instance_model in instance_models:
+            for row in (
+                instance_model.objects.filter(
+                    task_queue=task_queue, state__in=(PUBLISHED, RUNNING)
+                )
+                .order_by()
+                .values("task_type")
+                .annotate(num=Count("uuid"))
+            ):
+                num_in_flight_per_task_type[
+                    (instance_model, row["task_type"])
+                ] = row["num"]
+
+    # Publish the instances in line while the queue has room for them
+    num_free = None
+
+    if task_queue.max_in_flight is not None:
+        num_free = task_queue.max_in_flight - sum(num_in_flight.values())
+
+    published_instances = []
+    releases.sort(key=lambda x: x[0])
+
+    for _, instance in releases:
+        if num_free is not None and num_free <= 0:
+            break
+
+        task_type_key = (type(instance), instance.task_type_id)
+
+        if (
+            task_queue.max_in_flight_per_task_type is not None
+            and num_in_flight_per_task_type.get(task_type_key, 0)
+            >= task_queue.max_in_flight_per_task_type
+        ):
+            continue
+
+        instance.publish()
+        published_instances.append(instance)
+
+        if num_free is not None:
+            num_free -= 1
+
+        num_in_flight_per_task_type[task_type_key] = (
+            num_in_flight_per_task_type.get(task_type_key, 0) + 1
+        )
+
+    # Mark the instances as published. Instances which have moved on in
+    # the meantime (e.g., were terminated) are left alone.
+    for instance_model in instance_models:
+        instance_model.objects.filter(
+            uuid__in=[
+                instance.uuid
+                for instance in published_instances
+                if isinstance(instance, instance_model)
+            ],
+            state=CREATED,
+        ).update(
+            state=PUBLISHED,
+            datetime_published=timezone.now(),
+            datetime_modified=timezone.now(),
+        )
+        send_task_instances_changed(
+            instance_model,
+            (
+                instance.task_type_id
+                for instance in published_instances
+                if isinstance(instance, instance_model)
+            ),
+        )
+
+    return len(published_instances)
@@ -0,0 +1,314 @@
+"""Contains helpers for importing task instances."""
+
+from collections import Counter
+import json
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from tasksapi.models import TaskQueue
+from tasksapi.models.validators import task_instance_args_are_valid
+from .bulk_actions import (
+    TASK_INSTANCE_IMPORT_CHUNK_SIZE,
+    bulk_create_task_instances,
+)
+from .queue_limits import check_task_queue_limits
+
+
+def get_import_spec_object(spec, field_name, model, lookups_dict):
+    """Get the object a task instance import spec refers to.
+
+    Specs can refer to task types and queues either by name (e.g., with
+    a "task_type" key) or by primary key (e.g., with a "task_type_id"
+    key, as in exports).
+
+    Args:
+        spec: A dictionary containing the task instance spec.
+        field_name: A string containing the name of the task instance
+            field the object is for (i.e., "task_type" or
+            "task_queue").
+        model: The model of the object.
+        lookups_dict: A dictionary of the objects already looked up
+            (or found not to exist), which is added to.
+
+    Returns:
+        The object.
+
+    Raises:
+        django.core.exceptions.ValidationError: The spec doesn't refer
+            to an existing object.
+    """
+    verbose_name = model._meta.verbose_name
+
+    if field_name in spec:
+        lookup, value, value_type = "name", spec[field_name], str
+    elif field_name + "_id" in spec:
+        lookup, value, value_type = "pk", spec[field_name + "_id"], int
+    else:
+        raise ValidationError("No %s given" % verbose_name)
+
+    if not isinstance(value, value_type) or isinstance(value, bool):
+        raise ValidationError(
+            "'%s' is not a valid %s %s" % (value, verbose_name, lookup)
+        )
+
+    key = (field_name, lookup, value)
+
+    if key not in lookups_dict:
+        lookups_dict[key] = model.objects.filter(**{lookup: value}).first()
+
+    if lookups_dict[key] is None:
+        raise ValidationError(
+            "%s %s doesn't exist" % (verbose_name.capitalize(), value)
+        )
+
+    return lookups_dict[key]
+
+
+def build_imported_task_instance(instance_model, user, line, lookups_dict):
+    """Build (but don't save) a task instance from an import spec.
+
+    Whether a queue will take a task instance only depends on its user,
+    task type, and queue, so that's only checked once for each task
+    type and queue. Otherwise, this validates the same things as a task
+    instance's clean method, except for dependencies, which imports
+    don't support.
+
+    Args:
+        instance_model: The task instance model to build an instance
+            of.
+        user: The user importing the task instance.
+        line: A string containing the JSON spec of the task instance.
+        lookups_dict: A dictionary of the task types, queues, and queue
+            validation results already looked up, which is added to.
+
+    Returns:
+        The task instance.
+
+    Raises:
+        django.core.exceptions.ValidationError: The spec isn't a valid
+            task instance.
+    """
+    try:
+        spec = json.loads(line)
+    except json.JSONDecodeError:
+        raise ValidationError("%s is not valid JSON!" % line.strip())
+
+    if not isinstance(spec, dict):
+        raise ValidationError(
+            "'%s' is not a valid JSON dictionary!" % line.strip()
+        )
+
+    instance = instance_model(
+        name=spec.get("name") or "",
+        user=user,
+        task_type=get_import_spec_object(
+            spec,
+            "task_type",
+            instance_model._meta.get_field("task_type").related_model,
+            lookups_dict,
+        ),
+        task_queue=get_import_spec_object(
+            spec, "task_queue", TaskQueue, lookups_dict
+        ),
+        arguments=spec.get("arguments") or {},
+        priority=spec.get("priority"),
+    )
+
+    # Make sure the queue will take the instance
+    key = ("queue_reason", instance.task_type.pk, instance.task_queue.pk)
+
+    if key not in lookups_dict:
+        try:
+            instance.clean_task_queue()
+            lookups_dict[key] = ""
+        except ValidationError as e:
+            lookups_dict[key] = "; ".join(e.messages)
+
+    if lookups_dict[key]:
+        raise ValidationError(lookups_dict[key])
+
+    # Validate what's specific to the instance
+    if not isinstance(instance.name, str) or len(instance.name) > 200:
+        raise ValidationError("'%s' is not a valid name" % instance.name)
+
+    if instance.priority is not None and (
+        not isinstance(instance.priority, int)
+        or isinstance(instance.priority, bool)
+        or not 0 <= instance.priority <= instance.task_queue.max_priority
+    ):
+        raise ValidationError(
+            "Queue %s only allows priorities from 0 to %d"
+            % (instance.task_queue.name, instance.task_queue.max_priority)
+        )
+
+    if not isinstance(instance.arguments, dict):
+        raise ValidationError(
+            "'%s' is not a valid JSON dictionary!" % instance.arguments
+        )
+
+    is_valid, reason = task_instance_args_are_valid(
+        instance=instance, fill_missing_args=True
+    )
+
+    if not is_valid:
+        raise ValidationError(reason)
+
+    return instance
+
+
+def create_imported_task_instances(
+    instance_model, line_instances, enforce_queue_limits
+):
+    """Create and publish a chunk of imported task instances.
+
+    Args:
+        instance_model: The task instance model to create instances of.
+        line_instances: A list of tuples containing the line number of
+            each task instance's spec and the (unsaved) task instance.
+        enforce_queue_limits: A boolean specifying whether to skip task
+            instances which their queue's limits don't allow.
+
+    Returns:
+        A tuple containing the number of task instances created and a
+        list of dictionaries containing the line number and reason for
+        each task instance skipped.
+    """
+    errors = []
+
+    # Check the limits and create the instances together, so nothing
+    # else can squeeze in under the limits in between
+    with transaction.atomic():
+        if enforce_queue_limits:
+            rejection_reasons_dict = {}
+
+            # Go through the queues in order, so that concurrent imports
+            # lock them in the same order
+            for (task_queue, task_type), num_instances in sorted(
+                Counter(
+                    (instance.task_queue, instance.task_type)
+                    for _, instance in line_instances
+                ).items(),
+                key=lambda item: (item[0][0].pk, item[0][1].pk),
+            ):
+                is_allowed, reason, _ = check_task_queue_limits(
+                    instance_model=instance_model,
+                    task_queue=task_queue,
+                    user=line_instances[0][1].user,
+                    task_type=task_type,
+                    num_instances=num_instances,
+                )
+
+                if not is_allowed:
+                    rejection_reasons_dict[(task_queue, task_type)] = reason
+
+            errors = [
+                {
+                    "line": line_number,
+                    "reason": rejection_reasons_dict[
+                        (instance.task_queue, instance.task_type)
+                    ],
+                }
+                for line_number, instance in line_instances
+                if (instance.task_queue, instance.task_type)
+                in rejection_reasons_dict
+            ]
+            line_instances = [
+                (line_number, instance)
+                for line_number, instance in line_instances
+                if (instance.task_queue, instance.task_type)
+                not in rejection_reasons_dict
+            ]
+
+        instances = [instance for _, instance in line_instances]
+
+        if not instances:
+            return (0, errors)
+
+        bulk_create_task_instances(instance_model, instances)
+
+        return (len(instances), errors)
+
+
+def import_task_instances(
+    instance_model,
+    user,
+    lines,
+    chunk_size=TASK_INSTANCE_IMPORT_CHUNK_SIZE,
+    enforce_queue_limits=False,
+):
+    """Create task instances from JSON Lines specs.
+
+    Each line specifies a task instance with a JSON dictionary
+    containing its task type ("task_type" by name or "task_type_id" by
+    primary key), queue ("task_queue" or "task_queue_id"), and,
+    optionally, its name, arguments, and priority. Other keys are
+    ignored, so exported task instances can be imported as is to run
+    them again (as new task instances).
+
+    The lines are read and the task instances created and published a
+    chunk at a time, so this runs in constant memory no matter how many
+    task instances are imported. Invalid lines are skipped rather than
+    stopping the import.
+
+    Args:
+        instance_model: The task instance model to create instances of.
+        user: The user importing the task instances.
+        lines: An iterable of strings containing the lines to import.
+        chunk_size: An optional integer specifying how many task
+            instances to create at a time. Defaults to
+            TASK_INSTANCE_IMPORT_CHUNK_SIZE.
+        enforce_queue_limits: An optional boolean specifying whether to
+            skip task instances which their queue's limits don't allow.
+            Defaults to False.
+
+    Returns:
+        A tuple containing the number of task instances created and a
+        list of dictionaries containing the line number and reason for
+        each line skipped.
+    """
+    num_created = 0
+    errors = []
+    lookups_dict = {}
+    line_instances = []
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            line_instances.append(
+                (
+                    line_number,
+                    build_imported_task_instance(
+                        instance_model=instance_model,
+                        user=user,
+                        line=line,
+                        lookups_dict=lookups_dict,
+                    ),
+                )
+            )
+        except ValidationError as e:
+            errors.append(
+                {"line": line_number, "reason": "; ".join(e.messages)}
+            )
+
+        if len(line_instances) >= chunk_size:
+            num_chunk_created, chunk_errors = create_imported_task_instances(
+                instance_model=instance_model,
+                line_instances=line_instances,
+                enforce_queue_limits=enforce_queue_limits,
+            )
+            num_created += num_chunk_created
+            errors += chunk_errors
+
+            line_instances = []
+
+    if line_instances:
+        num_chunk_created, chunk_errors = create_imported_task_instances(
+            instance_model=instance_model,
+            line_instances=line_instances,
+            enforce_queue_limits=enforce_queue_limits,
+        )
+        num_created += num_chunk_created
+        errors += chunk_errors
+
+    return (num_created, sorted(errors, key=lambda error: error["line"]))
@@ -0,0 +1,131 @@
+"""Contains helpers for enforcing queues' limits."""
+
+from datetime import timedelta
+from django.utils import timezone
+from tasksapi.models import (
+    ContainerTaskInstance,
+    ExecutableTaskInstance,
+    TaskQueue,
+)
+
+# How many seconds queues' submission rate limits are measured over
+SUBMISSION_RATE_LIMIT_WINDOW = 60
+
+# How many seconds to ask clients to wait before trying again when a
+# queue has too many task instances in flight. There's no telling when
+# a running task instance will finish, so this is just a guess.
+IN_FLIGHT_LIMIT_RETRY_AFTER = 30
+
+
+def check_task_queue_limits(
+    instance_model, task_queue, user, task_type, num_instances=1
+):
+    """Determine whether a queue's limits allow new task instances.
+
+    Queues can limit how many task instances each user creates per
+    minute, and how many task instances (in total, and per task type)
+    are in flight at once. Queues using fair-share scheduling hold new
+    task instances until there's room for them, so their in-flight
+    limits are enforced by the dispatcher instead.
+
+    If the queue has limits to check, this locks the queue's row until
+    the end of the transaction, so call it in the same transaction as
+    creating the task instances; concurrent submissions to the queue
+    then wait for each other rather than all squeezing in under its
+    limits. Submissions to queues without limits don't wait.
+
+    Args:
+        instance_model: The task instance model to create instances of.
+        task_queue: The queue the task instances are for.
+        user: The user creating the task instances.
+        task_type: The task type of the task instances.
+        num_instances: An optional integer specifying how many task
+            instances are being created. Defaults to 1.
+
+    Returns:
+        A tuple containing a boolean, a string, and an integer, where
+        the boolean signals whether the task instances can be created,
+        the string explains why not in the case that the boolean is
+        False (otherwise it's an empty string), and the integer
+        specifies how many seconds to wait before trying again (or None
+        if trying again won't help).
+    """
+    instance_models = (ContainerTaskInstance, ExecutableTaskInstance)
+
+    # Don't hold up submissions to queues without limits to check
+    if task_queue.max_submissions_per_minute_per_user is None and (
+        task_queue.uses_fair_share
+        or (
+            task_queue.max_in_flight is None
+            and task_queue.max_in_flight_per_task_type is None
+        )
+    ):
+        return (True, "", None)
+
+    # Hold off concurrent submissions to the queue
+    task_queue = TaskQueue.objects.select_for_update().get(pk=task_queue.pk)
+
+    # Check the user's submission rate
+    limit = task_queue.max_submissions_per_minute_per_user
+
+    if limit is not None:
+        if num_instances > limit:
+            return (
+                False,
+                "Queue %s only allows %d task instances per minute"
+                % (task_queue.name, limit),
+                None,
+            )
+
+        # Find the most recent submissions in the window, newest first
+        now = timezone.now()
+        recent_datetimes = []
+
+        for model in instance_models:
+            recent_datetimes += (
+                model.objects.filter(
+                    task_queue=task_queue,
+                    user=user,
+                    datetime_created__gt=now
+                    - timedelta(seconds=SUBMISSION_RATE_LIMIT_WINDOW),
+                )
+                .order_by("-datetime_created")
+                .values_list("datetime_created", flat=True)[:limit]
+            )
+
+        recent_datetimes = sorted(recent_datetimes, reverse=True)[:limit]
+
+        if len(recent_datetimes) + num_instances > limit:
+            # Wait until enough of the recent submissions are out of
+            # the window
+            retry_after = (
+                recent_datetimes[limit - num_instances]
+                + timedelta(seconds=SUBMISSION_RATE_LIMIT_WINDOW)
+                - now
+            ).total_seconds()
+
+            return (
+                False,
+                "Queue %s only allows %d task instances per minute"
+                % (task_queue.name, limit),
+                max(int(retry_after) + 1, 1),
+            )
+
+    if task_queue.uses_fair_share:
+        return (True, "", None)
+
+    # Check how many task instances are in flight on the queue
+    is_allowed, reason, limit = task_queue.check_in_flight_limits(
+        instance_model=instance_model,
+        task_type=task_type,
+        num_instances=num_instances,
+    )
+
+    if not is_allowed:
+        return (
+            False,
+            reason,
+            IN_FLIGHT_LIMIT_RETRY_AFTER if num_instances <= limit else None,
+        )
+
+    return (True, "", None)
@@ -0,0 +1,221 @@
+"""Contains helpers for reaping task instances whose jobs were lost."""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from tasksapi.constants import FAILED
+from tasksapi.models import User, Worker
+from tasksapi.models.dependencies import release_dependent_task_instances
+from tasksapi.signals import send_task_instances_changed
+from tasksapi.tasks import run_task
+from .bulk_actions import clone_task_instances
+
+
+# How many task instances to look at at a time when looking for ones
+# whose jobs have been lost
+TASK_INSTANCE_REAP_BATCH_SIZE = 1000
+
+
+def get_worker_job_ids(timeout):
+    """Ask the workers which jobs they have.
+
+    A worker's jobs are only known if it replies to every inquiry
+    (about its running, reserved, and scheduled jobs), so workers which
+    miss any of them, as well as workers which are alive according to
+    their heartbeats but don't reply at all, are reported back.
+
+    Args:
+        timeout: A float specifying how many seconds to wait for the
+            workers to reply.
+
+    Returns:
+        A two-tuple containing a set of the ID strings of the jobs the
+        workers which replied to every inquiry are running, have
+        reserved, or have scheduled (e.g., jobs backing off before being
+        retried), or None if no workers replied to every inquiry; and a
+        sorted list of the names of workers which didn't reply to every
+        inquiry.
+    """
+    inspect = run_task.app.control.inspect(timeout=timeout)
+    replies = [
+        inspect.active() or {},
+        inspect.reserved() or {},
+        inspect.scheduled() or {},
+    ]
+
+    # Scheduled jobs are wrapped up with when they're scheduled for
+    replies[2] = {
+        worker: [job["request"] for job in jobs]
+        for worker, jobs in replies[2].items()
+    }
+
+    # Find the workers which should have replied to every inquiry but
+    # didn't
+    replied_workers = set.intersection(*(set(reply) for reply in replies))
+    expected_workers = set(
+        Worker.objects.alive().values_list("name", flat=True)
+    ).union(*replies)
+    unreplied_workers = sorted(expected_workers - replied_workers)
+
+    if not replied_workers:
+        return (None, unreplied_workers)
+
+    return (
+        {
+            job["id"]
+            for reply in replies
+            for worker, jobs in reply.items()
+            if worker in replied_workers
+            for job in jobs
+        },
+        unreplied_workers,
+    )
+
+
+def reap_task_instances(
+    instance_model,
+    state,
+    stale_before,
+    worker_job_ids,
+    batch_size=TASK_INSTANCE_REAP_BATCH_SIZE,
+):
+    """Fail task instances whose jobs have been lost.
+
+    A job is lost when the worker running it dies, or when the state
+    updates it sends are lost, leaving its task instance published or
+    running forever. Task instances in a given state which haven't
+    changed since a given time, and whose jobs no worker has, are
+    failed, a batch at a time, and their jobs revoked in case they turn
+    up again.
+
+    Args:
+        instance_model: The task instance model to reap instances of.
+        state: A string containing the state to look for task instances
+            in. This should be either the published or running state.
+        stale_before: A datetime. Task instances which were last
+            modified before this are looked at.
+        worker_job_ids: A set containing the ID strings of the jobs the
+            workers have (see get_worker_job_ids).
+        batch_size: An optional integer specifying how many task
+            instances to look at at a time. Defaults to
+            TASK_INSTANCE_REAP_BATCH_SIZE.
+
+    Returns:
+        A list containing the UUIDs of the task instances failed.
+    """
+    failed_uuids = []
+    stale_instances = instance_model.objects.filter(
+        state=state, datetime_modified__lt=stale_before
+    ).order_by("datetime_modified", "uuid")
+    last_row = None
+
+    while True:
+        # Pick up where the last batch left off
+        if last_row is None:
+            batch = stale_instances
+        else:
+            batch = stale_instances.filter(
+                Q(datetime_modified__gt=last_row[2])
+                | Q(datetime_modified=last_row[2], uuid__gt=last_row[0])
+            )
+
+        rows = list(
+            batch.values_list("uuid", "batch_uuid", "datetime_modified")[
+                :batch_size
+            ]
+        )
+
+        if not rows:
+            return failed_uuids
+
+        last_row = rows[-1]
+
+        lost_rows = [
+            (uuid, batch_uuid)
+            for uuid, batch_uuid, _ in rows
+            if str(batch_uuid or uuid) not in worker_job_ids
+        ]
+
+        if not lost_rows:
+            continue
+
+        # Fail the lost task instances (unless they've changed since we
+        # looked at them)
+        with transaction.atomic():
+            failed_rows = list(
+                instance_model.objects.select_for_update(skip_locked=True)
+                .filter(
+                    uuid__in=[uuid for uuid, _ in lost_rows],
+                    state=state,
+                    datetime_modified__lt=stale_before,
+                )
+                .values_list("uuid", "task_type_id")
+            )
+            batch_failed_uuids = [uuid for uuid, _ in failed_rows]
+
+            instance_model.objects.filter(uuid__in=batch_failed_uuids).update(
+                state=FAILED,
+                datetime_finished=timezone.now(),
+                datetime_modified=timezone.now(),
+            )
+
+        if not batch_failed_uuids:
+            continue
+
+        send_task_instances_changed(
+            instance_model, (task_type_id for _, task_type_id in failed_rows)
+        )
+
+        # Make sure the jobs don't come back from the dead
+        run_task.app.control.revoke(
+            sorted(
+                {
+                    str(batch_uuid or uuid)
+                    for uuid, batch_uuid in lost_rows
+                    if uuid in batch_failed_uuids
+                }
+            ),
+            terminate=True,
+        )
+
+        # Fail anything waiting on them
+        release_dependent_task_instances(
+            {uuid: FAILED for uuid in batch_failed_uuids}
+        )
+
+        failed_uuids += batch_failed_uuids
+
+
+def resubmit_task_instances(instance_model, uuids):
+    """Clone task instances as the users who created them.
+
+    Args:
+        instance_model: The task instance model of the instances.
+        uuids: A list of the UUIDs of the task instances to resubmit.
+
+    Returns:
+        A tuple containing a list of the clones and a list of strings
+        explaining why some of the task instances couldn't be
+        resubmitted.
+    """
+    instances = instance_model.objects.filter(uuid__in=uuids)
+    clones = []
+    errors = []
+
+    for user in User.objects.filter(
+        pk__in=instances.order_by().values("user")
+    ):
+        try:
+            clones += clone_task_instances(
+                instance_model=instance_model,
+                queryset=instances.filter(user=user),
+                user=user,
+            )
+        except ValidationError as e:
+            errors.append(
+                "Couldn't resubmit %s's task instances: %s"
+                % (user, "; ".join(e.messages))
+            )
+
+    return (clones, errors)
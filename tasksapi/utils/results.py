@@ -0,0 +1,31 @@
+"""Contains helpers for recording task instances' uploaded results."""
+
+from django.utils import timezone
+from tasksapi.models import ContainerTaskInstance
+
+
+def record_task_instance_results(uuid, location, manifest):
+    """Record where a container task instance's results were uploaded.
+
+    Args:
+        uuid: A string containing the UUID of the container task
+            instance.
+        location: A string containing where the results were uploaded
+            to (e.g., s3://bucket/uuid/).
+        manifest: A list of dictionaries describing the uploaded files,
+            each containing the file's path relative to the results
+            directory, its size in bytes, and its SHA-256 hash.
+
+    Returns:
+        A boolean specifying whether there's a container task instance
+        with the UUID.
+    """
+    # Update rather than save, since the results are reported after the
+    # task instance's job has already finished
+    num_updated = ContainerTaskInstance.objects.filter(uuid=uuid).update(
+        results_location=location,
+        results_manifest=manifest,
+        datetime_modified=timezone.now(),
+    )
+
+    return bool(num_updated)
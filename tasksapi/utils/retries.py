@@ -0,0 +1,79 @@
+"""Contains helpers for recording retries of task instances' jobs."""
+
+from django.db import transaction
+from django.utils import timezone
+from tasksapi.constants import PUBLISHED, TERMINAL_STATES
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.signals import send_task_instances_changed
+
+
+def record_task_instance_retry(
+    uuid, failure, error, retry_delay, failure_datetime=None
+):
+    """Record that a task instance's job is being retried.
+
+    The failed attempt is added to the task instance's retry history,
+    and, unless the task instance has already finished (e.g., it was
+    terminated while its job was backing off), it's moved back to
+    published, since its job is back in its queue. This is the only way
+    task instances move backwards through their states.
+
+    Args:
+        uuid: A string containing the UUID of the task instance, which
+            can be of either class.
+        failure: A string defined in the constants module representing
+            the class of the failure.
+        error: A string describing the error the job failed with.
+        retry_delay: A float specifying how many seconds the job is
+            backing off for.
+        failure_datetime: An optional datetime specifying when the job
+            failed (as reported by whatever ran it). Defaults to now.
+
+    Returns:
+        The task instance, or None if there isn't one with the UUID.
+    """
+    if failure_datetime is None:
+        failure_datetime = timezone.now()
+
+    for instance_model in (ContainerTaskInstance, ExecutableTaskInstance):
+        with transaction.atomic():
+            instance = (
+                instance_model.objects.select_for_update()
+                .filter(uuid=uuid)
+                .first()
+            )
+
+            if instance is None:
+                continue
+
+            previous_state = instance.state
+            instance.num_retries += 1
+            instance.retry_history.append(
+                {
+                    "datetime": failure_datetime.isoformat(),
+                    "failure": failure,
+                    "error": error,
+                    "retry_delay": round(retry_delay, 3),
+                }
+            )
+
+            if instance.state not in TERMINAL_STATES:
+                instance.state = PUBLISHED
+
+            # Update rather than save, since the task instance has
+            # already been validated and published
+            instance_model.objects.filter(uuid=uuid).update(
+                state=instance.state,
+                num_retries=instance.num_retries,
+                retry_history=instance.retry_history,
+                datetime_modified=timezone.now(),
+            )
+
+        if instance.state != previous_state:
+            send_task_instances_changed(
+                instance_model, [instance.task_type_id]
+            )
+
+        return instance
+
+    return None
@@ -0,0 +1,115 @@
+"""Contains helpers for updating task instance states in bulk."""
+
+from django.db.models import Case, DateTimeField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from tasksapi.constants import (
+    PRECEDING_STATES_DICT,
+    STATE_DATETIME_FIELDS_DICT,
+)
+from tasksapi.models import ContainerTaskInstance, ExecutableTaskInstance
+from tasksapi.models.dependencies import release_dependent_task_instances
+from tasksapi.signals import send_task_instances_changed
+
+
+def bulk_update_task_instance_states(uuid_states, uuid_state_datetimes=None):
+    """Update the states of many task instances at once.
+
+    This is used when we receive state changes in bulk (e.g., from the
+    Celery events monitor), and issues a handful of UPDATE queries per
+    state rather than a query per task instance. Task instances are
+    never moved backwards (e.g., from running to published); see the
+    PRECEDING_STATES_DICT constant for details. Note that since this
+    uses UPDATE queries, no save signals are sent, and so the
+    datetime_published, datetime_started, and datetime_finished fields
+    are filled in here like the task instance pre_save handlers would,
+    and a task_instances_changed signal is sent instead.
+
+    Args:
+        uuid_states: A dictionary where keys are task instance UUID
+            strings and values are their new states (which must be one
+            of the state constants). The UUIDs can be for either class
+            of task instance.
+        uuid_state_datetimes: An optional dictionary where keys are task
+            instance UUID strings and values are dictionaries mapping
+            states to the datetimes the task instances reached them
+            (as reported by whatever ran them). These can include
+            states the task instances passed through on the way to
+            their new states. Task instances reaching their new states
+            without a reported datetime are given the current time.
+
+    Returns:
+        An integer containing the number of task instances updated.
+    """
+    if uuid_state_datetimes is None:
+        uuid_state_datetimes = {}
+
+    # Group the UUIDs by state
+    state_uuids = {}
+
+    for uuid, state in uuid_states.items():
+        state_uuids.setdefault(state, []).append(uuid)
+
+    # Update each class of task instance one state at a time, keeping
+    # track of which UUIDs of each class were updated
+    num_updated = 0
+    updated_uuids_dict = {}
+    now = timezone.now()
+
+    for state, uuids in state_uuids.items():
+        update_kwargs = {"state": state, "datetime_modified": now}
+
+        # Fill in when the task instances reached their new state (and
+        # the states they passed through on the way), without
+        # overwriting anything already recorded
+        new_datetime_field = STATE_DATETIME_FIELDS_DICT.get(state)
+        datetime_field_cases = {}
+
+        if new_datetime_field is not None:
+            datetime_field_cases[new_datetime_field] = []
+
+        for uuid in uuids:
+            for this_state, this_datetime in uuid_state_datetimes.get(
+                uuid, {}
+            ).items():
+                datetime_field = STATE_DATETIME_FIELDS_DICT.get(this_state)
+
+                if datetime_field is not None:
+                    datetime_field_cases.setdefault(datetime_field, []).append(
+                        When(uuid=uuid, then=Value(this_datetime))
+                    )
+
+        for datetime_field, cases in datetime_field_cases.items():
+            update_kwargs[datetime_field] = Coalesce(
+                datetime_field,
+                Case(
+                    *cases,
+                    default=Value(
+                        now if datetime_field == new_datetime_field else None
+                    ),
+                    output_field=DateTimeField()
+                ),
+            )
+
+        for instance_model in (ContainerTaskInstance, ExecutableTaskInstance):
+            num_model_updated = instance_model.objects.filter(
+                uuid__in=uuids, state__in=PRECEDING_STATES_DICT[state]
+            ).update(**update_kwargs)
+
+            if num_model_updated:
+                num_updated += num_model_updated
+                updated_uuids_dict.setdefault(instance_model, []).extend(uuids)
+
+    for instance_model, uuids in updated_uuids_dict.items():
+        send_task_instances_changed(
+            instance_model,
+            instance_model.objects.filter(uuid__in=uuids)
+            .order_by()
+            .values_list("task_type_id", flat=True)
+            .distinct(),
+        )
+
+    # Release or fail anything waiting on finished task instances
+    release_dependent_task_instances(uuid_states)
+
+    return num_updated
@@ -0,0 +1,90 @@
+"""Contains helpers for waiting on task instances to change state."""
+
+import select
+import time
+from django.db import connection
+from tasksapi.models.dependencies import get_task_instance_states
+
+
+# The Postgres channel which task instance state changes are announced
+# on (by triggers on the task instance tables; see the
+# 0014_task_instance_state_notifications migration)
+TASK_INSTANCE_STATES_CHANNEL = "saltant_task_instance_states"
+
+# The maximum number of seconds a client can wait for task instances to
+# change state in a single request. Each waiting client holds on to a
+# server process (or thread) and a database connection, so keep this
+# short.
+TASK_INSTANCE_STATES_MAX_WAIT = 60
+
+
+def wait_for_task_instance_states(uuids, known_states, timeout):
+    """Wait for task instances to change from their known states.
+
+    This returns as soon as any of the task instances is in a state
+    other than its known state, or once the timeout runs out, whichever
+    comes first. Instead of polling the database, this listens for the
+    notifications Postgres sends when a task instance changes state.
+
+    The notifications are listened for on a dedicated database
+    connection, which is closed when this returns, so that they don't
+    pile up on (or get cleared from) the connection Django shares
+    between requests in the same thread. Note that this still ties up
+    whatever is serving the request (e.g., a WSGI worker process) for
+    as long as it waits.
+
+    Args:
+        uuids: A list of task instance UUID strings. The UUIDs can be
+            for either class of task instance.
+        known_states: A dictionary mapping task instance UUID strings to
+            the states the client last saw them in. If this doesn't
+            match the task instances' current states, this returns
+            immediately.
+        timeout: A float specifying the maximum number of seconds to
+            wait for.
+
+    Returns:
+        A dictionary mapping the UUID strings of the task instances
+        which exist to their current states.
+    """
+    deadline = time.time() + timeout
+    uuids = set(uuids)
+
+    # Listen before looking at the current states so that nothing which
+    # happens in between is missed
+    pg_connection = connection.get_new_connection(
+        connection.get_connection_params()
+    )
+
+    try:
+        pg_connection.autocommit = True
+
+        with pg_connection.cursor() as cursor:
+            cursor.execute("LISTEN %s" % TASK_INSTANCE_STATES_CHANNEL)
+
+        while True:
+            uuid_states = get_task_instance_states(uuids)
+            time_left = deadline - time.time()
+
+            if uuid_states != known_states or time_left <= 0:
+                return uuid_states
+
+            # Sleep until a notification for one of our task instances
+            # comes in
+            pg_connection.notifies.clear()
+
+            while time_left > 0:
+                if select.select([pg_connection], [], [], time_left)[0]:
+                    pg_connection.poll()
+
+                    if any(
+                        notify.payload in uuids
+                        for notify in pg_connection.notifies
+                    ):
+                        break
+
+                    pg_connection.notifies.clear()
+
+                time_left = deadline - time.time()
+    finally:
+        pg_connection.close()
@@ -0,0 +1,98 @@
+"""Contains helpers for keeping track of workers."""
+
+from datetime import timedelta
+from django.db.models import Max, Q
+from django.utils import timezone
+from tasksapi.constants import WORKER_HEARTBEAT_TIMEOUT
+from tasksapi.models import TaskQueue, Worker
+from tasksapi.models.workers import get_worker_heartbeat_cutoff
+
+
+def record_worker_heartbeat(
+    name, task_queue_names, concurrency, num_active_jobs, load_average=None
+):
+    """Record a heartbeat sent by a worker.
+
+    Workers are registered by their first heartbeat. Queues the worker
+    consumes from which saltant doesn't know about are ignored. The
+    heartbeat is timestamped with the time it's received rather than
+    sent, so that workers' clocks don't matter.
+
+    The worker is only marked as modified if its concurrency, number of
+    active jobs, or queues change, or if it comes back to life, so that
+    heartbeats which don't change anything leave caches of the queues it
+    serves be (see ConditionalGetMixin in the views module).
+
+    Args:
+        name: A string containing the node name of the worker.
+        task_queue_names: A list of strings containing the names of the
+            queues the worker consumes from.
+        concurrency: An integer specifying how many jobs the worker can
+            run at once.
+        num_active_jobs: An integer specifying how many jobs the worker
+            is running.
+        load_average: An optional float containing the load average of
+            the worker's host over the last minute.
+
+    Returns:
+        The worker.
+    """
+    now = timezone.now()
+    fields = {
+        "concurrency": concurrency,
+        "num_active_jobs": num_active_jobs,
+        "load_average": load_average,
+        "datetime_last_heartbeat": now,
+    }
+
+    worker, created = Worker.objects.get_or_create(name=name, defaults=fields)
+
+    if not created:
+        is_modified = not worker.is_alive() or (
+            worker.concurrency,
+            worker.num_active_jobs,
+        ) != (concurrency, num_active_jobs)
+
+        if is_modified:
+            fields["datetime_modified"] = now
+
+        # Update the fields directly, since saving the worker would mark
+        # it as modified
+        Worker.objects.filter(pk=worker.pk).update(**fields)
+
+        for field, value in fields.items():
+            setattr(worker, field, value)
+
+    # This marks the worker as modified if its queues change
+    worker.task_queues.set(TaskQueue.objects.filter(name__in=task_queue_names))
+
+    return worker
+
+
+def get_workers_last_changed():
+    """Get the last time any worker changed or died.
+
+    Workers die, without being modified, once they haven't sent a
+    heartbeat in a while, so dead workers changed when they died.
+
+    Returns:
+        A datetime, or None if there aren't any workers.
+    """
+    cutoff = get_worker_heartbeat_cutoff()
+    datetimes = Worker.objects.aggregate(
+        live=Max(
+            "datetime_modified", filter=Q(datetime_last_heartbeat__gte=cutoff)
+        ),
+        dead=Max(
+            "datetime_last_heartbeat",
+            filter=Q(datetime_last_heartbeat__lt=cutoff),
+        ),
+    )
+
+    if datetimes["dead"] is not None:
+        datetimes["dead"] += timedelta(seconds=WORKER_HEARTBEAT_TIMEOUT)
+
+    return max(
+        (value for value in datetimes.values() if value is not None),
+        default=None,
+    )
@@ -1,10 +1,19 @@
 """Contains view(sets) related to tasks."""
 
-from celery.result import AsyncResult
-from django.core.exceptions import ObjectDoesNotExist
+from calendar import timegm
+import hashlib
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, serializers, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 from rest_framework.status import (
     HTTP_200_OK,
@@ -16,6 +25,13 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
+from tasksapi.constants import (
+    CSV_EXPORT,
+    JSONL_EXPORT,
+    STATE_DATETIME_FIELDS_DICT,
+    SUCCESSFUL,
+    TERMINAL_STATES,
+)
 from tasksapi.filters import (
     ContainerTaskInstanceFilter,
     ContainerTaskTypeFilter,
@@ -24,6 +40,7 @@ from tasksapi.filters import (
     TaskQueueFilter,
     TaskWhitelistFilter,
     UserFilter,
+    WorkerFilter,
 )
 from tasksapi.models import (
     ContainerTaskInstance,
@@ -33,22 +50,98 @@ from tasksapi.models import (
     TaskQueue,
     TaskWhitelist,
     User,
+    Worker,
 )
 from tasksapi.paginators import SmallResultsSetPagination
 from tasksapi.permissions import IsAdminOrOwnerThenWriteElseReadOnly
 from tasksapi.serializers import (
+    ContainerTaskInstanceBatchCreateRequestSerializer,
     ContainerTaskInstanceSerializer,
     ContainerTaskTypeSerializer,
+    ExecutableTaskInstanceBatchCreateRequestSerializer,
     ExecutableTaskInstanceSerializer,
     ExecutableTaskTypeSerializer,
+    TaskInstanceBulkActionRequestSerializer,
+    TaskInstanceBulkCloneResponseSerializer,
+    TaskInstanceBulkTerminateResponseSerializer,
+    TaskInstanceExportRequestSerializer,
+    TaskInstanceImportResponseSerializer,
+    TaskInstanceResultsRequestSerializer,
+    TaskInstanceResultsResponseSerializer,
+    TaskInstanceRetryRequestSerializer,
+    TaskInstanceRetryResponseSerializer,
     TaskInstanceStateUpdateRequestSerializer,
     TaskInstanceStateUpdateResponseSerializer,
+    TaskInstanceStatesUpdateRequestSerializer,
+    TaskInstanceStatesUpdateResponseSerializer,
+    TaskInstanceStatesWaitRequestSerializer,
+    TaskInstanceStatesWaitResponseSerializer,
     TaskQueueSerializer,
     TaskWhitelistSerializer,
     UserSerializer,
+    WorkerHeartbeatRequestSerializer,
+    WorkerSerializer,
+)
+from tasksapi.utils import (
+    bulk_update_task_instance_states,
+    check_task_queue_limits,
+    clone_task_instances,
+    create_task_instance_batch,
+    export_task_instances,
+    get_workers_last_changed,
+    import_task_instances,
+    record_task_instance_results,
+    record_task_instance_retry,
+    record_worker_heartbeat,
+    terminate_task_instances,
+    wait_for_task_instance_states,
 )
 
 
+# How many seconds clients can cache finished task instances for.
+# Finished task instances don't change (short of being renamed or having
+# their state overridden), so this can be long.
+FINISHED_TASK_INSTANCE_MAX_AGE = 60 * 60 * 24
+
+# The content types of each task instance export format
+EXPORT_CONTENT_TYPES_DICT = {
+    CSV_EXPORT: "text/csv",
+    JSONL_EXPORT: "application/x-ndjson",
+}
+
+
+def enforce_task_queue_limits(
+    instance_model, task_queue, user, task_type, num_instances=1
+):
+    """Make sure a queue's limits allow new task instances.
+
+    Call this in the same transaction as creating the task instances.
+    See the check_task_queue_limits function for details.
+
+    Raises:
+        rest_framework.exceptions.Throttled: The queue can't take the
+            task instances right now. This results in a 429 response
+            with a Retry-After header.
+        rest_framework.serializers.ValidationError: The queue will never
+            take this many task instances at once.
+    """
+    is_allowed, reason, retry_after = check_task_queue_limits(
+        instance_model=instance_model,
+        task_queue=task_queue,
+        user=user,
+        task_type=task_type,
+        num_instances=num_instances,
+    )
+
+    if is_allowed:
+        return
+
+    if retry_after is None:
+        raise serializers.ValidationError(reason)
+
+    raise Throttled(wait=retry_after, detail=reason)
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """A viewset for users."""
 
@@ -59,7 +152,147 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_class = UserFilter
 
 
-class UserInjectedModelViewSet(viewsets.ModelViewSet):
+class ConditionalGetMixin:
+    """Lets clients make conditional GET requests to a viewset.
+
+    Responses to GET requests include ETag and Last-Modified headers
+    based on when the objects were last modified (so the viewset's model
+    needs a datetime_modified field). Requests whose If-None-Match or
+    If-Modified-Since headers show that the client already has the
+    latest version get an empty 304 response, without the objects being
+    serialized. Lists are validated (by ETag only) by the number of
+    objects matching the request and the time the most recently modified
+    one was modified, which takes a single aggregate query.
+    """
+
+    def get_max_age(self, instance):
+        """Get how many seconds clients can cache an object for.
+
+        Args:
+            instance: The object being retrieved.
+
+        Returns:
+            An integer specifying how many seconds clients can use their
+            copy of the object for before checking back. Defaults to 0.
+        """
+        return 0
+
+    def get_validators(self, request, last_modified, *etag_parts):
+        """Make a response's ETag and Last-Modified header values.
+
+        Args:
+            request: The request being responded to.
+            last_modified: A datetime (or None) specifying when what's
+                being sent was last modified.
+            *etag_parts: Whatever else identifies the version of what's
+                being sent.
+
+        Returns:
+            A tuple containing the ETag string and the Last-Modified
+            timestamp (or None).
+        """
+        # Responses vary by format and (for the browsable API) user
+        etag_parts += (
+            last_modified,
+            request.accepted_renderer.format,
+            request.user.pk,
+        )
+        etag = (
+            '"%s"'
+            % hashlib.md5(
+                ":".join(str(part) for part in etag_parts).encode()
+            ).hexdigest()
+        )
+
+        if last_modified is None:
+            return etag, None
+
+        return etag, timegm(last_modified.utctimetuple())
+
+    def get_response(
+        self, request, etag, last_modified, max_age, get_fresh_response
+    ):
+        """Respond to a GET request, if necessary with a 304 response.
+
+        Args:
+            request: The request being responded to.
+            etag: The ETag string of what's being sent.
+            last_modified: The Last-Modified timestamp (or None) of
+                what's being sent.
+            max_age: An integer specifying how many seconds clients can
+                cache what's being sent for.
+            get_fresh_response: A function taking no arguments which
+                returns a full response.
+
+        Returns:
+            The response to send.
+        """
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = get_fresh_response()
+
+        response["ETag"] = etag
+
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+
+        # Make clients check back with us before reusing what they have
+        # unless it's okay to reuse it for a while
+        if max_age:
+            patch_cache_control(response, private=True, max_age=max_age)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve an object unless the client already has it."""
+        instance = self.get_object()
+        etag, last_modified = self.get_validators(
+            request, instance.datetime_modified, instance.pk
+        )
+
+        return self.get_response(
+            request,
+            etag,
+            last_modified,
+            self.get_max_age(instance),
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """List objects unless the client already has them."""
+        stats = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .aggregate(
+                count=Count("pk"), last_modified=Max("datetime_modified")
+            )
+        )
+        # Deleting objects doesn't change the most recent modification
+        # time, so only use an ETag here
+        etag, _ = self.get_validators(
+            request,
+            stats["last_modified"],
+            request.get_full_path(),
+            stats["count"],
+        )
+
+        return self.get_response(
+            request,
+            etag,
+            None,
+            0,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            ),
+        )
+
+
+class UserInjectedModelViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Subclass this for a ModelViewSet with an injected user attribute.
 
     Injected means that the user as determined by the request's
@@ -72,7 +305,252 @@ class UserInjectedModelViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class ContainerTaskInstanceViewSet(UserInjectedModelViewSet):
+class TaskTypeModelViewSet(UserInjectedModelViewSet):
+    """Subclass this for a task type ModelViewSet.
+
+    This lets owners throw out the results cached for deterministic task
+    types.
+    """
+
+    @swagger_auto_schema(method="post", request_body=serializers.Serializer)
+    @action(methods=["post"], detail=True)
+    def invalidate_result_cache(self, request, pk):
+        """Stop reusing the results of a task type's past instances.
+
+        Do this whenever something a deterministic task type's results
+        depend on changes without the task type changing (e.g., a
+        container image tag is pushed to).
+        """
+        task_type = self.get_object()
+        task_type.invalidate_result_cache()
+
+        serialized_task_type = self.get_serializer(task_type)
+
+        return Response(serialized_task_type.data, status=HTTP_200_OK)
+
+
+class TaskInstanceModelViewSet(UserInjectedModelViewSet):
+    """Subclass this for a task instance ModelViewSet.
+
+    This makes sure new task instances are within their queue's limits,
+    and lets clients cache finished task instances.
+    """
+
+    def get_max_age(self, instance):
+        """Let clients cache finished task instances for a while."""
+        if instance.state in TERMINAL_STATES:
+            return FINISHED_TASK_INSTANCE_MAX_AGE
+
+        return 0
+
+    def get_bulk_action_queryset(self, request):
+        """Get the task instances a bulk action request chooses.
+
+        Task instances are chosen either by UUID, in the request body,
+        or with the same filters as task instance lists. Only staff can
+        choose other users' task instances.
+
+        Raises:
+            rest_framework.serializers.ValidationError: The request
+                doesn't choose task instances.
+        """
+        request_serializer = TaskInstanceBulkActionRequestSerializer(
+            data=request.data
+        )
+        request_serializer.is_valid(raise_exception=True)
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if not request.user.is_staff:
+            queryset = queryset.filter(user=request.user)
+
+        if "uuids" in request_serializer.validated_data:
+            return queryset.filter(
+                uuid__in=request_serializer.validated_data["uuids"]
+            )
+
+        # Don't act on every task instance just because the client
+        # forgot to say which ones
+        if not set(request.query_params) & set(self.filter_class.base_filters):
+            raise serializers.ValidationError(
+                "Choose task instances with either UUIDs or filters!"
+            )
+
+        return queryset
+
+    @swagger_auto_schema(
+        method="post",
+        request_body=TaskInstanceBulkActionRequestSerializer,
+        responses={HTTP_201_CREATED: TaskInstanceBulkCloneResponseSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_clone(self, request):
+        """Clone lots of jobs at once.
+
+        Choose the task instances to clone either by UUID or with the
+        same filters as task instance lists. The clones are created and
+        queued up in bulk, which makes this much faster than cloning
+        task instances one by one. If any of the clones isn't valid,
+        none of them are created.
+        """
+        instance_model = self.queryset.model
+        task_type_model = instance_model._meta.get_field(
+            "task_type"
+        ).related_model
+        queryset = self.get_bulk_action_queryset(request)
+
+        with transaction.atomic():
+            # Make sure the queues' limits allow the clones. Go through
+            # the queues in order, so that concurrent requests lock
+            # them in the same order.
+            for group in (
+                queryset.order_by()
+                .values("task_type", "task_queue")
+                .annotate(num_instances=Count("uuid"))
+                .order_by("task_queue", "task_type")
+            ):
+                enforce_task_queue_limits(
+                    instance_model=instance_model,
+                    task_queue=TaskQueue.objects.get(pk=group["task_queue"]),
+                    user=request.user,
+                    task_type=task_type_model.objects.get(
+                        pk=group["task_type"]
+                    ),
+                    num_instances=group["num_instances"],
+                )
+
+            try:
+                clones = clone_task_instances(
+                    instance_model=instance_model,
+                    queryset=queryset,
+                    user=request.user,
+                )
+            except ValidationError as e:
+                raise serializers.ValidationError(str(e))
+
+        response_serializer = TaskInstanceBulkCloneResponseSerializer(
+            {"uuids": [clone.uuid for clone in clones]}
+        )
+
+        return Response(response_serializer.data, status=HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        method="post",
+        request_body=TaskInstanceBulkActionRequestSerializer,
+        responses={
+            HTTP_202_ACCEPTED: TaskInstanceBulkTerminateResponseSerializer
+        },
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_terminate(self, request):
+        """Send a terminate signal to lots of jobs at once.
+
+        Choose the task instances to terminate either by UUID or with
+        the same filters as task instance lists. All of their jobs are
+        revoked with a single message, which makes this much faster than
+        terminating task instances one by one. Like terminating a single
+        task instance, terminating one in a batch terminates the whole
+        batch.
+        """
+        num_terminated = terminate_task_instances(
+            instance_model=self.queryset.model,
+            queryset=self.get_bulk_action_queryset(request),
+        )
+
+        response_serializer = TaskInstanceBulkTerminateResponseSerializer(
+            {"num_terminated": num_terminated}
+        )
+
+        return Response(response_serializer.data, status=HTTP_202_ACCEPTED)
+
+    @swagger_auto_schema(
+        method="get",
+        query_serializer=TaskInstanceExportRequestSerializer,
+        responses={HTTP_200_OK: "The exported task instances."},
+    )
+    @action(methods=["get"], detail=False)
+    def export(self, request):
+        """Export all matching task instances as CSV or JSON Lines.
+
+        This takes the same filters as task instance lists, but streams
+        back every matching task instance (with its database columns)
+        rather than a page of them, which makes it much faster for
+        pulling out lots of task instances.
+        """
+        request_serializer = TaskInstanceExportRequestSerializer(
+            data=request.query_params
+        )
+        request_serializer.is_valid(raise_exception=True)
+
+        export_format = request_serializer.validated_data["export_format"]
+
+        response = StreamingHttpResponse(
+            export_task_instances(
+                queryset=self.filter_queryset(self.get_queryset()),
+                export_format=export_format,
+            ),
+            content_type=EXPORT_CONTENT_TYPES_DICT[export_format],
+        )
+        response["Content-Disposition"] = 'attachment; filename="%s.%s"' % (
+            self.queryset.model._meta.verbose_name_plural.replace(" ", ""),
+            export_format,
+        )
+
+        return response
+
+    @swagger_auto_schema(
+        method="post",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description=(
+                "JSON Lines, where each line is a JSON dictionary "
+                "specifying a task instance's task type (task_type by "
+                "name or task_type_id by primary key), queue "
+                "(task_queue or task_queue_id), and, optionally, its "
+                "name, arguments, and priority."
+            ),
+        ),
+        responses={HTTP_201_CREATED: TaskInstanceImportResponseSerializer},
+    )
+    @action(methods=["post"], detail=False, url_path="import")
+    def import_instances(self, request):
+        """Create lots of task instances from JSON Lines.
+
+        The request body is read and the task instances created a chunk
+        at a time, which makes this much faster than creating task
+        instances one by one. Other keys on each line are ignored, so
+        exports can be imported as is to run their task instances
+        again. Invalid lines, and lines which their queue's limits
+        don't allow, are skipped and reported in the response.
+        """
+        stream = request.stream or []
+
+        num_created, errors = import_task_instances(
+            instance_model=self.queryset.model,
+            user=request.user,
+            lines=(line.decode("utf-8", errors="replace") for line in stream),
+            enforce_queue_limits=True,
+        )
+
+        response_serializer = TaskInstanceImportResponseSerializer(
+            {"num_created": num_created, "errors": errors}
+        )
+
+        return Response(response_serializer.data, status=HTTP_201_CREATED)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            enforce_task_queue_limits(
+                instance_model=self.queryset.model,
+                task_queue=serializer.validated_data["task_queue"],
+                user=self.request.user,
+                task_type=serializer.validated_data["task_type"],
+            )
+
+            super().perform_create(serializer)
+
+
+class ContainerTaskInstanceViewSet(TaskInstanceModelViewSet):
     """A viewset for container task instances."""
 
     queryset = ContainerTaskInstance.objects.all()
@@ -82,6 +560,23 @@ class ContainerTaskInstanceViewSet(UserInjectedModelViewSet):
     http_method_names = ["get", "post"]
     filter_class = ContainerTaskInstanceFilter
 
+    def get_max_age(self, instance):
+        """Don't let clients cache task instances awaiting their results.
+
+        Workers upload successful task instances' results after
+        reporting their success, so clients need to check back until
+        the results are recorded.
+        """
+        if (
+            settings.WORKERS_UPLOAD_RESULTS
+            and instance.state == SUCCESSFUL
+            and instance.cached_from is None
+            and not instance.results_location
+        ):
+            return 0
+
+        return super().get_max_age(instance)
+
     @swagger_auto_schema(
         method="post",
         request_body=serializers.Serializer,
@@ -93,14 +588,24 @@ class ContainerTaskInstanceViewSet(UserInjectedModelViewSet):
         # Get the instance to be cloned
         instance_to_clone = ContainerTaskInstance.objects.get(uuid=uuid)
 
-        # Build the new instance
-        cloned_instance = ContainerTaskInstance.objects.create(
-            name=instance_to_clone.name,
-            user=request.user,
-            task_type=instance_to_clone.task_type,
-            task_queue=instance_to_clone.task_queue,
-            arguments=instance_to_clone.arguments,
-        )
+        with transaction.atomic():
+            enforce_task_queue_limits(
+                instance_model=ContainerTaskInstance,
+                task_queue=instance_to_clone.task_queue,
+                user=request.user,
+                task_type=instance_to_clone.task_type,
+            )
+
+            # Build the new instance
+            cloned_instance = ContainerTaskInstance.objects.create(
+                name=instance_to_clone.name,
+                user=request.user,
+                task_type=instance_to_clone.task_type,
+                task_queue=instance_to_clone.task_queue,
+                arguments=instance_to_clone.arguments,
+                priority=instance_to_clone.priority,
+                depends_on=instance_to_clone.depends_on,
+            )
 
         # Serialize the new instance and return it in the response
         serialized_instance = ContainerTaskInstanceSerializer(cloned_instance)
@@ -114,18 +619,73 @@ class ContainerTaskInstanceViewSet(UserInjectedModelViewSet):
     )
     @action(methods=["post"], detail=True)
     def terminate(self, request, uuid):
-        """Send a terminate signal to a job."""
+        """Send a terminate signal to a job.
+
+        Note that task instances in a batch share a single job, so
+        terminating one of them terminates the whole batch.
+        """
+        this_instance = ContainerTaskInstance.objects.get(uuid=uuid)
+
         # Terminate the job
-        AsyncResult(uuid).revoke(terminate=True)
+        this_instance.terminate()
 
         # Post the object back as the response
-        this_instance = ContainerTaskInstance.objects.get(uuid=uuid)
         serialized_instance = ContainerTaskInstanceSerializer(this_instance)
         return Response(serialized_instance.data, status=HTTP_202_ACCEPTED)
 
+    @swagger_auto_schema(
+        method="post",
+        request_body=ContainerTaskInstanceBatchCreateRequestSerializer,
+        responses={
+            HTTP_201_CREATED: ContainerTaskInstanceSerializer(many=True)
+        },
+    )
+    @action(methods=["post"], detail=False)
+    def batch(self, request):
+        """Create a batch of jobs which run together in a single job.
+
+        Each set of arguments in the batch gets its own task instance,
+        but the worker runs all of them in one session, which saves the
+        per-job overhead of pulling and starting containers. Docker
+        instances in a batch are run in shared warm containers (after
+        the image's entrypoint, as usual), which requires a POSIX shell
+        (sh) in the task type's container image.
+        """
+        request_serializer = ContainerTaskInstanceBatchCreateRequestSerializer(
+            data=request.data
+        )
+        request_serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            enforce_task_queue_limits(
+                instance_model=ContainerTaskInstance,
+                task_queue=request_serializer.validated_data["task_queue"],
+                user=request.user,
+                task_type=request_serializer.validated_data["task_type"],
+                num_instances=len(
+                    request_serializer.validated_data["arguments_list"]
+                ),
+            )
+
+            try:
+                instances = create_task_instance_batch(
+                    instance_model=ContainerTaskInstance,
+                    user=request.user,
+                    **request_serializer.validated_data
+                )
+            except ValidationError as e:
+                raise serializers.ValidationError(str(e))
+
+        # Serialize the new instances and return them in the response
+        serialized_instances = ContainerTaskInstanceSerializer(
+            instances, many=True
+        )
+
+        return Response(serialized_instances.data, status=HTTP_201_CREATED)
+
 
 @permission_classes((IsAdminOrOwnerThenWriteElseReadOnly,))
-class ContainerTaskTypeViewSet(UserInjectedModelViewSet):
+class ContainerTaskTypeViewSet(TaskTypeModelViewSet):
     """A viewset for container task types."""
 
     queryset = ContainerTaskType.objects.all()
@@ -134,7 +694,7 @@ class ContainerTaskTypeViewSet(UserInjectedModelViewSet):
     filter_class = ContainerTaskTypeFilter
 
 
-class ExecutableTaskInstanceViewSet(UserInjectedModelViewSet):
+class ExecutableTaskInstanceViewSet(TaskInstanceModelViewSet):
     """A viewset for executable task instances."""
 
     queryset = ExecutableTaskInstance.objects.all()
@@ -155,14 +715,24 @@ class ExecutableTaskInstanceViewSet(UserInjectedModelViewSet):
         # Get the instance to be cloned
         instance_to_clone = ExecutableTaskInstance.objects.get(uuid=uuid)
 
-        # Build the new instance
-        cloned_instance = ExecutableTaskInstance.objects.create(
-            name=instance_to_clone.name,
-            user=request.user,
-            task_type=instance_to_clone.task_type,
-            task_queue=instance_to_clone.task_queue,
-            arguments=instance_to_clone.arguments,
-        )
+        with transaction.atomic():
+            enforce_task_queue_limits(
+                instance_model=ExecutableTaskInstance,
+                task_queue=instance_to_clone.task_queue,
+                user=request.user,
+                task_type=instance_to_clone.task_type,
+            )
+
+            # Build the new instance
+            cloned_instance = ExecutableTaskInstance.objects.create(
+                name=instance_to_clone.name,
+                user=request.user,
+                task_type=instance_to_clone.task_type,
+                task_queue=instance_to_clone.task_queue,
+                arguments=instance_to_clone.arguments,
+                priority=instance_to_clone.priority,
+                depends_on=instance_to_clone.depends_on,
+            )
 
         # Serialize the new instance and return it in the response
         serialized_instance = ExecutableTaskInstanceSerializer(cloned_instance)
@@ -176,18 +746,70 @@ class ExecutableTaskInstanceViewSet(UserInjectedModelViewSet):
     )
     @action(methods=["post"], detail=True)
     def terminate(self, request, uuid):
-        """Send a terminate signal to a job."""
+        """Send a terminate signal to a job.
+
+        Note that task instances in a batch share a single job, so
+        terminating one of them terminates the whole batch.
+        """
+        this_instance = ExecutableTaskInstance.objects.get(uuid=uuid)
+
         # Terminate the job
-        AsyncResult(uuid).revoke(terminate=True)
+        this_instance.terminate()
 
         # Post the object back as the response
-        this_instance = ExecutableTaskInstance.objects.get(uuid=uuid)
         serialized_instance = ExecutableTaskInstanceSerializer(this_instance)
         return Response(serialized_instance.data, status=HTTP_202_ACCEPTED)
 
+    @swagger_auto_schema(
+        method="post",
+        request_body=ExecutableTaskInstanceBatchCreateRequestSerializer,
+        responses={
+            HTTP_201_CREATED: ExecutableTaskInstanceSerializer(many=True)
+        },
+    )
+    @action(methods=["post"], detail=False)
+    def batch(self, request):
+        """Create a batch of jobs which run together in a single job.
+
+        Each set of arguments in the batch gets its own task instance,
+        but the worker runs all of them in one session, which saves the
+        per-job overhead of pulling and starting containers.
+        """
+        request_serializer = ExecutableTaskInstanceBatchCreateRequestSerializer(
+            data=request.data
+        )
+        request_serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            enforce_task_queue_limits(
+                instance_model=ExecutableTaskInstance,
+                task_queue=request_serializer.validated_data["task_queue"],
+                user=request.user,
+                task_type=request_serializer.validated_data["task_type"],
+                num_instances=len(
+                    request_serializer.validated_data["arguments_list"]
+                ),
+            )
+
+            try:
+                instances = create_task_instance_batch(
+                    instance_model=ExecutableTaskInstance,
+                    user=request.user,
+                    **request_serializer.validated_data
+                )
+            except ValidationError as e:
+                raise serializers.ValidationError(str(e))
+
+        # Serialize the new instances and return them in the response
+        serialized_instances = ExecutableTaskInstanceSerializer(
+            instances, many=True
+        )
+
+        return Response(serialized_instances.data, status=HTTP_201_CREATED)
+
 
 @permission_classes((IsAdminOrOwnerThenWriteElseReadOnly,))
-class ExecutableTaskTypeViewSet(UserInjectedModelViewSet):
+class ExecutableTaskTypeViewSet(TaskTypeModelViewSet):
     """A viewset for executable task types."""
 
     queryset = ExecutableTaskType.objects.all()
@@ -205,6 +827,32 @@ class TaskQueueViewSet(UserInjectedModelViewSet):
     http_method_names = ["get", "post", "patch", "put"]
     filter_class = TaskQueueFilter
 
+    def get_validators(self, request, last_modified, *etag_parts):
+        """Make validators which change along with the queues' workers.
+
+        Queues describe their live workers, which change without the
+        queues being modified (e.g., when a worker dies), so queues are
+        treated as modified whenever any worker changed or died.
+        """
+        if last_modified is not None:
+            last_modified = max(
+                last_modified, get_workers_last_changed() or last_modified
+            )
+
+        return super().get_validators(request, last_modified, *etag_parts)
+
+
+class WorkerViewSet(viewsets.ReadOnlyModelViewSet):
+    """A viewset for workers.
+
+    Workers register themselves by sending heartbeats, and are
+    considered dead once they stop.
+    """
+
+    queryset = Worker.objects.all()
+    serializer_class = WorkerSerializer
+    filter_class = WorkerFilter
+
 
 @permission_classes((IsAdminOrOwnerThenWriteElseReadOnly,))
 class TaskWhitelistViewSet(UserInjectedModelViewSet):
@@ -254,13 +902,33 @@ class TokenRefreshPermissiveView(TokenRefreshView):
 @api_view(["PATCH"])
 def update_task_instance_status(request, uuid):
     """Updates the status for task instances of any class of task."""
+    request_serializer = TaskInstanceStateUpdateRequestSerializer(
+        data=request.data
+    )
+    request_serializer.is_valid(raise_exception=True)
+
+    state = request_serializer.validated_data["state"]
+
+    # Use the time the state was reached at, if we were told it. Like
+    # bulk state updates, this doesn't overwrite times already recorded
+    # (e.g., when a retried job starts running again).
+    datetime_field = STATE_DATETIME_FIELDS_DICT.get(state)
+    state_datetime = request_serializer.validated_data.get("datetime")
+
     # Find the instance we need to update
-    state = request.data["state"]
 
     try:
         # Try finding a container task instance first
         instance = ContainerTaskInstance.objects.get(uuid=uuid)
         instance.state = state
+
+        if (
+            datetime_field is not None
+            and state_datetime is not None
+            and getattr(instance, datetime_field) is None
+        ):
+            setattr(instance, datetime_field, state_datetime)
+
         instance.save()
 
         serialized_instance = TaskInstanceStateUpdateResponseSerializer(
@@ -276,6 +944,14 @@ def update_task_instance_status(request, uuid):
     try:
         instance = ExecutableTaskInstance.objects.get(uuid=uuid)
         instance.state = state
+
+        if (
+            datetime_field is not None
+            and state_datetime is not None
+            and getattr(instance, datetime_field) is None
+        ):
+            setattr(instance, datetime_field, state_datetime)
+
         instance.save()
 
         serialized_instance = TaskInstanceStateUpdateResponseSerializer(
@@ -292,3 +968,177 @@ def update_task_instance_status(request, uuid):
         "No task instance with UUID {} found".format(uuid),
         status=HTTP_400_BAD_REQUEST,
     )
+
+
+@swagger_auto_schema(
+    method="patch",
+    request_body=TaskInstanceStatesUpdateRequestSerializer,
+    responses={HTTP_200_OK: TaskInstanceStatesUpdateResponseSerializer},
+)
+@api_view(["PATCH"])
+def update_task_instance_statuses(request):
+    """Updates the statuses for many task instances of any class of task.
+
+    Task instances are never moved back to a state they've already moved
+    on from; e.g., a finished task instance won't be marked as running.
+    """
+    request_serializer = TaskInstanceStatesUpdateRequestSerializer(
+        data=request.data
+    )
+    request_serializer.is_valid(raise_exception=True)
+
+    uuid_states = request_serializer.validated_data["states"]
+
+    if "datetime" in request_serializer.validated_data:
+        uuid_state_datetimes = {
+            uuid: {state: request_serializer.validated_data["datetime"]}
+            for uuid, state in uuid_states.items()
+        }
+    else:
+        uuid_state_datetimes = None
+
+    num_updated = bulk_update_task_instance_states(
+        uuid_states=uuid_states, uuid_state_datetimes=uuid_state_datetimes
+    )
+
+    serialized_response = TaskInstanceStatesUpdateResponseSerializer(
+        {"num_updated": num_updated}
+    )
+
+    return Response(serialized_response.data, status=HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method="post",
+    request_body=TaskInstanceRetryRequestSerializer,
+    responses={HTTP_200_OK: TaskInstanceRetryResponseSerializer},
+)
+@api_view(["POST"])
+def receive_task_instance_retry(request, uuid):
+    """Records a retry of a task instance's job.
+
+    Workers send these when a job fails in a way its task type's retry
+    policy allows, just before sending the job back to its queue.
+    """
+    request_serializer = TaskInstanceRetryRequestSerializer(data=request.data)
+    request_serializer.is_valid(raise_exception=True)
+
+    instance = record_task_instance_retry(
+        uuid=uuid,
+        failure=request_serializer.validated_data["failure"],
+        error=request_serializer.validated_data["error"],
+        retry_delay=request_serializer.validated_data["retry_delay"],
+        failure_datetime=request_serializer.validated_data.get("datetime"),
+    )
+
+    # Bad request :(
+    if instance is None:
+        return Response(
+            "No task instance with UUID {} found".format(uuid),
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    serialized_instance = TaskInstanceRetryResponseSerializer(instance)
+
+    return Response(serialized_instance.data, status=HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method="post",
+    request_body=TaskInstanceResultsRequestSerializer,
+    responses={HTTP_200_OK: TaskInstanceResultsResponseSerializer},
+)
+@api_view(["POST"])
+def receive_task_instance_results(request, uuid):
+    """Records where a container task instance's results were uploaded.
+
+    Workers send these once they've finished uploading the results of a
+    container task instance's job.
+    """
+    request_serializer = TaskInstanceResultsRequestSerializer(
+        data=request.data
+    )
+    request_serializer.is_valid(raise_exception=True)
+
+    location = request_serializer.validated_data["location"]
+    manifest = request_serializer.validated_data["manifest"]
+
+    # Bad request :(
+    if not record_task_instance_results(
+        uuid=uuid, location=location, manifest=manifest
+    ):
+        return Response(
+            "No container task instance with UUID {} found".format(uuid),
+            status=HTTP_400_BAD_REQUEST,
+        )
+
+    serialized_response = TaskInstanceResultsResponseSerializer(
+        {
+            "uuid": uuid,
+            "results_location": location,
+            "num_files": len(manifest),
+        }
+    )
+
+    return Response(serialized_response.data, status=HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method="get",
+    query_serializer=TaskInstanceStatesWaitRequestSerializer,
+    responses={HTTP_200_OK: TaskInstanceStatesWaitResponseSerializer},
+)
+@api_view(["GET"])
+def wait_for_task_instance_state_changes(request):
+    """Gets the states of task instances once any of them changes.
+
+    Use this instead of repeatedly polling task instances to find out
+    when they change state. Pass in the states the task instances were
+    last seen in and a number of seconds to wait, and the response will
+    be sent as soon as any of the task instances moves on to another
+    state (or once the wait is over).
+    """
+    request_serializer = TaskInstanceStatesWaitRequestSerializer(
+        data=request.query_params
+    )
+    request_serializer.is_valid(raise_exception=True)
+
+    uuid_states = wait_for_task_instance_states(
+        uuids=request_serializer.validated_data["uuids"],
+        known_states=request_serializer.validated_data["known_states"],
+        timeout=request_serializer.validated_data["wait"],
+    )
+
+    serialized_response = TaskInstanceStatesWaitResponseSerializer(
+        {"states": uuid_states}
+    )
+
+    return Response(serialized_response.data, status=HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method="post",
+    request_body=WorkerHeartbeatRequestSerializer,
+    responses={HTTP_200_OK: WorkerSerializer},
+)
+@api_view(["POST"])
+def receive_worker_heartbeat(request):
+    """Records a heartbeat sent by a worker.
+
+    Workers send these periodically to say which queues they're serving
+    and how busy they are.
+    """
+    request_serializer = WorkerHeartbeatRequestSerializer(data=request.data)
+    request_serializer.is_valid(raise_exception=True)
+
+    worker = record_worker_heartbeat(
+        name=request_serializer.validated_data["name"],
+        task_queue_names=request_serializer.validated_data["task_queues"],
+        concurrency=request_serializer.validated_data["concurrency"],
+        num_active_jobs=request_serializer.validated_data["num_active_jobs"],
+        load_average=request_serializer.validated_data.get("load_average"),
+    )
+
+    serialized_worker = WorkerSerializer(worker)
+
+    return Response(serialized_worker.data, status=HTTP_200_OK)